@@ -434,8 +434,8 @@ class APIDocumentation:
         self.app.description = self.get_api_description()
         self.app.version = self.get_current_version()
         
-        # Add custom middleware for documentation
-        self.add_documentation_middleware()
+        # API information headers are added by ApiHeadersStage in the request
+        # pipeline; add_documentation_middleware() remains for standalone apps
     
     def add_documentation_middleware(self):
         """Add middleware for documentation enhancement"""
@@ -57,33 +57,16 @@ class APIIntegration:
         
     def _setup_versioning(self) -> None:
         """Setup API versioning system"""
-        # Versions are already pre-configured in VersionRegistry
-        # Add version extraction middleware
-        @self.app.middleware("http")
-        async def version_middleware(request: Request, call_next):
-            try:
-                api_version = get_api_version(request)
-                request.state.api_version = api_version
-            except Exception:
-                request.state.api_version = None
-            
-            response = await call_next(request)
-            
-            # Add version headers
-            response.headers["X-API-Version"] = api_version.value
-            response.headers["X-API-Supported-Versions"] = ",".join(
-                [v.value for v in self.version_registry.get_active_versions()]
-            )
-            
-            return response
+        # Versions are pre-configured in VersionRegistry; per-request version
+        # extraction and headers are handled by ApiHeadersStage in the
+        # request pipeline (app.middleware.pipeline)
+        pass
             
     def _setup_validation(self) -> None:
         """Setup comprehensive validation system"""
-        # Configure enhanced middleware
-        enhanced_middleware = EnhancedMiddleware(self.app)
-        
-        # Add enhanced middleware for security and metrics
-        self.app.add_middleware(EnhancedMiddleware)
+        # Request metrics, rate limiting and threat scanning from
+        # EnhancedMiddleware run as RequestMetricsStage in the request pipeline
+        pass
             
     def _setup_documentation(self) -> None:
         """Setup enhanced API documentation"""
@@ -152,45 +135,10 @@ class APIIntegration:
             
     def _setup_security(self) -> None:
         """Setup security enhancements"""
-        @self.app.middleware("http")
-        async def security_middleware(request: Request, call_next):
-            # Security validation - scan request data for threats
-            try:
-                # Get request body for scanning if it exists
-                request_data = None
-                if request.method in ["POST", "PUT", "PATCH"]:
-                    body = await request.body()
-                    if body:
-                        try:
-                            request_data = json.loads(body.decode())
-                        except (json.JSONDecodeError, UnicodeDecodeError):
-                            request_data = body.decode('utf-8', errors='ignore')
-                
-                # Scan for security threats
-                if request_data:
-                    threats = self.security_validator.scan_for_threats(request_data)
-                    if threats:
-                        return JSONResponse(
-                            status_code=status.HTTP_400_BAD_REQUEST,
-                            content={"error": "Security validation failed", "threats": threats}
-                        )
-            except Exception as e:
-                # Continue processing if security validation fails
-                pass
-            
-            response = await call_next(request)
-            
-            # Add security headers
-            response.headers.update({
-                "X-Content-Type-Options": "nosniff",
-                "X-Frame-Options": "DENY",
-                "X-XSS-Protection": "1; mode=block",
-                "Strict-Transport-Security": "max-age=31536000; includeSubDomains",
-                "Content-Security-Policy": "default-src 'self'",
-                "Referrer-Policy": "strict-origin-when-cross-origin"
-            })
-            
-            return response
+        # Body threat scanning and security headers are handled by the
+        # ValidationStage and SecurityStage of the request pipeline, which
+        # share one buffered request body
+        pass
             
     def _setup_monitoring(self) -> None:
         """Setup API monitoring and metrics"""
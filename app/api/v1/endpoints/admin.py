@@ -547,7 +547,7 @@ async def delete_admin_job_post(
     try:
         # Check if job post exists
         job_post_service = JobPostService()
-        existing_job = await job_post_service.get_job_post_by_id(job_id)
+        existing_job = await job_post_service.get_job_post_by_id(db, job_id)
         if not existing_job:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -555,7 +555,7 @@ async def delete_admin_job_post(
             )
         
         # Delete job post
-        await job_post_service.delete_job_post(job_id)
+        await job_post_service.delete_job_post(db, job_id)
         
         logger.info(f"Job post deleted by admin: {job_id}")
         return {"message": "Job post deleted successfully"}
@@ -12,7 +12,7 @@ logger.info("[UPDATED] AUTH_ENDPOINTS MODULE LOADED - ENHANCED LOGGING ACTIVE")
 
 from app.core.local_auth import (
     authenticate_user, create_access_token, get_current_user,
-    create_user, get_password_hash, verify_password
+    create_user, get_password_hash_async, verify_password_async
 )
 from app.core.auth_middleware import (
     require_super_admin, require_admin, require_employer, require_job_seeker,
@@ -646,7 +646,7 @@ async def change_password(
         )
     
     # Verify current password
-    if not verify_password(password_data.current_password, user.password_hash):
+    if not await verify_password_async(password_data.current_password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Current password is incorrect"
@@ -654,7 +654,7 @@ async def change_password(
     
     # Update password
     try:
-        user.password_hash = get_password_hash(password_data.new_password)
+        user.password_hash = await get_password_hash_async(password_data.new_password)
         await user.save()
         return {"message": "Password changed successfully"}
     except Exception as e:
@@ -3,11 +3,12 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 from loguru import logger
+from bson import ObjectId
 import json
 
 from app.database.database import get_mongodb_session as get_db
 from app.core.auth import get_current_user, get_admin
-from app.database.services import JobSeekerService, UserService, JobPostService
+from app.database.services import JobSeekerService, UserService, JobPostService, JobAlertService
 from app.models.mongodb_models import (
     User, JobSeeker, UserRole, JobPost, JobApplication
     # SavedJob, Interview, AutoApplySettings models not available in MongoDB structure
@@ -29,6 +30,7 @@ from app.schemas.interview import InterviewResponse as Interview
 from app.schemas.saved_job import SavedJobCreate, SavedJobResponse, SavedJobList
 from app.schemas.interview import InterviewResponse, InterviewList, InterviewStats
 from app.schemas.auto_apply import AutoApplySettingsResponse, AutoApplySettingsUpdate, AutoApplyStats
+from app.schemas.job_alert import JobAlertCreate, JobAlertResponse, JobAlertList
 from app.services.ai_service import ai_service
 
 router = APIRouter()
@@ -407,6 +409,84 @@ async def unsave_job(
             detail="Failed to unsave job"
         )
 
+def _job_alert_response(alert: Dict[str, Any]) -> JobAlertResponse:
+    return JobAlertResponse(
+        id=str(alert["_id"]),
+        user_id=str(alert["user_id"]),
+        name=alert.get("name"),
+        keywords=alert.get("keywords", []),
+        job_types=alert.get("job_types", []),
+        remote_only=alert.get("remote_only", False),
+        min_salary=alert.get("min_salary"),
+        locations=alert.get("locations", []),
+        is_active=alert.get("is_active", True),
+        last_sent_at=alert.get("last_sent_at"),
+        created_at=alert["created_at"]
+    )
+
+@router.get("/job-alerts", response_model=JobAlertList)
+async def get_job_alerts(
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    db: AsyncIOMotorDatabase = Depends(get_db)
+):
+    """Get the current user's job alerts"""
+    if current_user.get("role") != "job_seeker":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only job seekers can have job alerts"
+        )
+    
+    try:
+        alerts = await JobAlertService.get_alerts_by_user(db, str(current_user.get("id")))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    return JobAlertList(alerts=[_job_alert_response(alert) for alert in alerts], total=len(alerts))
+
+@router.post("/job-alerts", response_model=JobAlertResponse, status_code=status.HTTP_201_CREATED)
+async def create_job_alert(
+    alert_data: JobAlertCreate,
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    db: AsyncIOMotorDatabase = Depends(get_db)
+):
+    """Create a job alert; matching new jobs are emailed as a digest"""
+    if current_user.get("role") != "job_seeker":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only job seekers can create job alerts"
+        )
+    
+    try:
+        alert = await JobAlertService.create_alert(db, str(current_user.get("id")), alert_data.model_dump())
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    return _job_alert_response(alert)
+
+@router.delete("/job-alerts/{alert_id}")
+async def delete_job_alert(
+    alert_id: str,
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    db: AsyncIOMotorDatabase = Depends(get_db)
+):
+    """Turn off one of the current user's job alerts"""
+    if current_user.get("role") != "job_seeker":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only job seekers can delete job alerts"
+        )
+    
+    if not ObjectId.is_valid(alert_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job alert not found")
+    try:
+        deactivated = await JobAlertService.deactivate_alert(db, ObjectId(alert_id), str(current_user.get("id")))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if not deactivated:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job alert not found")
+    
+    return {"message": "Job alert deleted successfully"}
+
 @router.get("/auto-apply-settings", response_model=AutoApplySettingsResponse)
 async def get_auto_apply_settings(
     current_user: Dict[str, Any] = Depends(get_current_user),
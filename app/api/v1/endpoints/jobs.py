@@ -6,6 +6,7 @@ import re
 
 from app.core.database import get_db
 from app.database.services import JobPostService, EmployerService
+from app.services.view_counter import get_trending_jobs
 from app.models.mongodb_models import User, JobPost, Employer
 from app.core.enums import JobStatus
 from app.core.auth_middleware import require_admin, require_employer, require_job_seeker
@@ -285,6 +286,39 @@ async def get_job_post_statistics(
             detail="Failed to retrieve job statistics"
         )
 
+@router.get("/trending")
+async def get_trending_job_posts(
+    limit: int = Query(10, ge=1, le=50, description="Number of jobs to return"),
+    window_hours: int = Query(48, ge=1, le=336, description="Only consider jobs viewed within this many hours"),
+    db: AsyncIOMotorDatabase = Depends(get_db)
+):
+    """Get active job posts ordered by recent view velocity"""
+    try:
+        jobs = await get_trending_jobs(db, limit=limit, window_hours=window_hours)
+        return {
+            "jobs": [
+                {
+                    "id": job.get("id") or str(job.get("_id")),
+                    "title": job.get("title"),
+                    "company_name": job.get("company_name"),
+                    "location": job.get("location"),
+                    "job_type": job.get("job_type"),
+                    "is_remote": job.get("is_remote"),
+                    "views_count": job.get("views_count", 0),
+                    "trending_score": round(job["trending_score"], 4)
+                }
+                for job in jobs
+            ],
+            "total": len(jobs)
+        }
+        
+    except Exception as e:
+        logger.error(f"Failed to get trending job posts: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve trending job posts"
+        )
+
 @router.get("/{job_id}", response_model=JobPostSchema)
 async def get_job_post(
     job_id: int,
@@ -302,7 +336,7 @@ async def get_job_post(
             )
         
         # Increment view count
-        job_post_service.increment_view_count(db, job_id)
+        await job_post_service.increment_view_count(db, job_id)
         
         return JobPostSchema.from_orm(job_post)
         
@@ -8,7 +8,7 @@ from app.database.database import get_mongodb_session as get_db
 from app.database.mongodb_models import User, UserRole
 from app.database.services import UserService
 from app.core.auth import get_current_user
-from app.core.security import get_password_hash, verify_password
+from app.core.security import get_password_hash_async, verify_password_async
 from app.schemas.user import User as UserResponse, UserUpdate, UserPasswordUpdate as PasswordUpdate, UserUpdate as UserUpdateRequest
 
 router = APIRouter()
@@ -66,14 +66,14 @@ async def update_current_user_password(
         user_service = UserService(db)
         
         # Verify current password
-        if not verify_password(password_update.current_password, current_user.hashed_password):
+        if not await verify_password_async(password_update.current_password, current_user.hashed_password):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Incorrect current password"
             )
         
         # Update password using MongoDB service
-        hashed_password = get_password_hash(password_update.new_password)
+        hashed_password = await get_password_hash_async(password_update.new_password)
         updated_user = await UserService.update_user(
             db,
             str(current_user.id), 
@@ -3,7 +3,6 @@ from datetime import datetime, timedelta
 # from sqlalchemy.orm import Session  # Using MongoDB instead
 from loguru import logger
 import requests
-import feedparser
 from bs4 import BeautifulSoup
 import re
 import time
@@ -11,6 +10,7 @@ import hashlib
 from urllib.parse import urljoin, urlparse
 from dataclasses import dataclass
 
+from app.core.config import settings
 from app.database.database import get_database_manager
 # TODO: MongoDB Migration - Update imports to use MongoDB models
 # from app.database.models import (
@@ -25,6 +25,9 @@ from app.models.mongodb_models import (
     JobBoardType, ScrapeJobStatus, JobPost
 )
 from app.services.job_post_service import JobPostService
+from app.services.feed_ingest import FeedUpdate, build_feed_update, conditional_headers, get_feed_fetcher
+from app.services.page_cache import get_page_cache
+from app.services.taxonomy import TaxonomyMatch, get_taxonomy
 
 
 @dataclass
@@ -58,10 +61,15 @@ class ScrapingService:
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
+        self.page_cache = get_page_cache()
+        self.feed_fetcher = get_feed_fetcher()
     
     def scrape_rss_feed(self, job_board: JobBoard, scrape_job: ScrapeJob) -> ScrapingResult:
         """
         Scrape RSS feed from a job board
+
+        The request is conditional on the feed's stored ETag/Last-Modified
+        and only entries newer than the stored watermark are stored.
         """
         try:
             logger.info(f"Starting RSS scraping for {job_board.name}")
@@ -75,108 +83,14 @@ class ScrapingService:
                     error_message="No RSS URL configured for job board"
                 )
             
-            # Apply custom headers if configured
-            headers = job_board.headers or {}
-            if headers:
-                self.session.headers.update(headers)
-            
-            # Fetch RSS feed
-            response = self.session.get(job_board.rss_url, timeout=30)
+            # Fetch RSS feed, letting the server answer 304 when nothing changed
+            state = self.feed_fetcher.store.get(job_board.rss_url)
+            headers = {**(job_board.headers or {}), **conditional_headers(state)}
+            response = self.session.get(job_board.rss_url, headers=headers, timeout=30)
             response.raise_for_status()
             
-            # Parse RSS feed
-            feed = feedparser.parse(response.content)
-            
-            if feed.bozo:
-                logger.warning(f"RSS feed parsing warning for {job_board.name}: {feed.bozo_exception}")
-            
-            items_found = len(feed.entries)
-            items_processed = 0
-            items_saved = 0
-            
-            logger.info(f"Found {items_found} RSS entries for {job_board.name}")
-            
-            for entry in feed.entries:
-                try:
-                    # Extract basic information
-                    title = entry.get('title', '').strip()
-                    link = entry.get('link', '').strip()
-                    description = entry.get('description', '').strip()
-                    pub_date = entry.get('published_parsed')
-                    
-                    if not title or not link:
-                        continue
-                    
-                    # Convert publication date
-                    published_at = None
-                    if pub_date:
-                        try:
-                            published_at = datetime(*pub_date[:6])
-                        except (TypeError, ValueError):
-                            pass
-                    
-                    # Create content hash for deduplication
-                    content_hash = self._create_content_hash(title, link, description)
-                    
-                    # Check for existing raw job
-                    existing_raw = self.db.query(RawJob).filter(
-                        RawJob.content_hash == content_hash,
-                        RawJob.job_board_id == job_board.id
-                    ).first()
-                    
-                    if existing_raw:
-                        logger.debug(f"Skipping duplicate RSS entry: {title}")
-                        continue
-                    
-                    # Create raw job entry
-                    raw_job = RawJob(
-                        job_board_id=job_board.id,
-                        scrape_job_id=scrape_job.id,
-                        source_url=link,
-                        content_hash=content_hash,
-                        raw_data={
-                            'title': title,
-                            'link': link,
-                            'description': description,
-                            'published': entry.get('published', ''),
-                            'author': entry.get('author', ''),
-                            'category': entry.get('category', ''),
-                            'tags': entry.get('tags', []),
-                            'source': 'rss',
-                            'scrape_timestamp': datetime.utcnow().isoformat()
-                        },
-                        scraped_at=datetime.utcnow(),
-                        published_at=published_at
-                    )
-                    
-                    self.db.add(raw_job)
-                    items_saved += 1
-                    
-                    # Apply rate limiting
-                    if job_board.rate_limit_delay > 0:
-                        time.sleep(job_board.rate_limit_delay)
-                    
-                    items_processed += 1
-                    
-                except Exception as e:
-                    logger.error(f"Error processing RSS entry: {str(e)}")
-                    continue
-            
-            self.db.commit()
-            
-            logger.info(f"RSS scraping completed for {job_board.name}: {items_saved} items saved")
-            
-            return ScrapingResult(
-                success=True,
-                items_found=items_found,
-                items_processed=items_processed,
-                items_saved=items_saved,
-                metadata={
-                    'feed_title': feed.feed.get('title', ''),
-                    'feed_description': feed.feed.get('description', ''),
-                    'feed_updated': feed.feed.get('updated', '')
-                }
-            )
+            update = build_feed_update(state, response.status_code, response.headers, response.content)
+            return self._store_feed_update(job_board, scrape_job, update)
             
         except Exception as e:
             logger.error(f"RSS scraping failed for {job_board.name}: {str(e)}")
@@ -189,6 +103,109 @@ class ScrapingService:
                 error_message=str(e)
             )
     
+    def _store_feed_update(self, job_board: JobBoard, scrape_job: ScrapeJob, update: FeedUpdate) -> ScrapingResult:
+        """Store the new entries of a feed update and advance the feed's state"""
+        if update.not_modified:
+            logger.info(f"RSS feed unchanged for {job_board.name}")
+            self.feed_fetcher.commit(update)
+            return ScrapingResult(
+                success=True,
+                items_found=0,
+                items_processed=0,
+                items_saved=0,
+                metadata={'not_modified': True}
+            )
+        
+        items_found = len(update.entries)
+        items_processed = 0
+        items_saved = 0
+        
+        logger.info(
+            f"Found {items_found} new RSS entries for {job_board.name} "
+            f"({update.total_entries} in feed)"
+        )
+        
+        for entry in update.entries:
+            try:
+                # Extract basic information
+                title = entry.get('title', '').strip()
+                link = entry.get('link', '').strip()
+                description = entry.get('description', '').strip()
+                pub_date = entry.get('published_parsed')
+                
+                if not title or not link:
+                    continue
+                
+                # Convert publication date
+                published_at = None
+                if pub_date:
+                    try:
+                        published_at = datetime(*pub_date[:6])
+                    except (TypeError, ValueError):
+                        pass
+                
+                # Create content hash for deduplication
+                content_hash = self._create_content_hash(title, link, description)
+                
+                # Check for existing raw job
+                existing_raw = self.db.query(RawJob).filter(
+                    RawJob.content_hash == content_hash,
+                    RawJob.job_board_id == job_board.id
+                ).first()
+                
+                if existing_raw:
+                    logger.debug(f"Skipping duplicate RSS entry: {title}")
+                    continue
+                
+                # Create raw job entry
+                raw_job = RawJob(
+                    job_board_id=job_board.id,
+                    scrape_job_id=scrape_job.id,
+                    source_url=link,
+                    content_hash=content_hash,
+                    raw_data={
+                        'title': title,
+                        'link': link,
+                        'description': description,
+                        'published': entry.get('published', ''),
+                        'author': entry.get('author', ''),
+                        'category': entry.get('category', ''),
+                        'tags': entry.get('tags', []),
+                        'source': 'rss',
+                        'scrape_timestamp': datetime.utcnow().isoformat()
+                    },
+                    scraped_at=datetime.utcnow(),
+                    published_at=published_at
+                )
+                
+                self.db.add(raw_job)
+                items_saved += 1
+                items_processed += 1
+                
+            except Exception as e:
+                logger.error(f"Error processing RSS entry: {str(e)}")
+                continue
+        
+        self.db.commit()
+        # Only advance the watermark once the entries are stored
+        self.feed_fetcher.commit(update)
+        
+        logger.info(f"RSS scraping completed for {job_board.name}: {items_saved} items saved")
+        
+        return ScrapingResult(
+            success=True,
+            items_found=items_found,
+            items_processed=items_processed,
+            items_saved=items_saved,
+            metadata={
+                'feed_title': update.feed.get('title', ''),
+                'feed_description': update.feed.get('description', ''),
+                'feed_updated': update.feed.get('updated', ''),
+                'feed_entries': update.total_entries,
+                'not_modified': False
+            }
+        )
+    
     def scrape_html_pages(self, job_board: JobBoard, scrape_job: ScrapeJob, max_pages: int = None) -> ScrapingResult:
         """
         Scrape HTML pages from a job board
@@ -234,10 +251,21 @@ class ScrapingService:
                     
                     logger.info(f"Scraping page {current_page}: {page_url}")
                     
-                    # Fetch page
-                    response = self.session.get(page_url, timeout=30)
+                    # Fetch page, conditionally when it was seen before
+                    response = self.session.get(
+                        page_url,
+                        timeout=30,
+                        headers=self.page_cache.conditional_headers(page_url) if self.page_cache else None
+                    )
                     response.raise_for_status()
                     
+                    # An unchanged page holds nothing new, like a page of duplicates
+                    if self.page_cache is not None and not self.page_cache.record(
+                        page_url, response.status_code, response.headers, response.content
+                    ).changed:
+                        logger.info(f"Page {current_page} unchanged since last scrape, stopping pagination")
+                        break
+                    
                     # Parse HTML
                     soup = BeautifulSoup(response.content, 'html.parser')
                     
@@ -246,6 +274,9 @@ class ScrapingService:
                     job_elements = soup.select(job_container_selector)
                     
                     if not job_elements:
+                        # Fetch it in full next time in case the selectors change
+                        if self.page_cache is not None:
+                            self.page_cache.forget(page_url)
                         logger.info(f"No job listings found on page {current_page}, stopping pagination")
                         break
                     
@@ -535,8 +566,8 @@ class NormalizationService:
                     raw_job.is_processed = True
                     raw_job.processed_at = datetime.utcnow()
                     
-                    # Optionally publish to main job posts
-                    if normalized_job.quality_score >= 0.8:  # High quality threshold for auto-publishing
+                    # Optionally publish to main job posts; otherwise the batched exporter does it
+                    if settings.AUTOSCRAPER_INLINE_PUBLISH and normalized_job.quality_score >= 0.8:  # High quality threshold for auto-publishing
                         try:
                             job_post = self._create_job_post(normalized_job)
                             if job_post:
@@ -618,11 +649,10 @@ class NormalizationService:
             # Experience level extraction
             normalized['experience_level'] = self._extract_experience_level(title, description)
             
-            # Skills extraction
-            normalized['skills'] = self._extract_skills(title, description)
-            
-            # Benefits extraction
-            normalized['benefits'] = self._extract_benefits(description)
+            # Skills and benefits come from a single taxonomy pass
+            tags = get_taxonomy().extract(f"{title} {description}")
+            normalized['skills'] = self._extract_skills(title, description, tags)
+            normalized['benefits'] = self._extract_benefits(description, tags)
             
             # Requirements extraction
             normalized['requirements'] = self._extract_requirements(description)
@@ -822,55 +852,22 @@ class NormalizationService:
         
         return 'Not specified'
     
-    def _extract_skills(self, title: str, description: str) -> List[str]:
+    def _extract_skills(self, title: str, description: str, tags: Optional[TaxonomyMatch] = None) -> List[str]:
         """
         Extract skills from title and description
         """
-        text = f"{title} {description}".lower()
-        
-        # Common tech skills
-        skills = []
-        skill_patterns = [
-            r'\b(python|java|javascript|typescript|react|angular|vue|node\.?js|php|ruby|go|rust|swift|kotlin)\b',
-            r'\b(sql|mysql|postgresql|mongodb|redis|elasticsearch)\b',
-            r'\b(aws|azure|gcp|docker|kubernetes|jenkins|git)\b',
-            r'\b(html|css|sass|less|bootstrap|tailwind)\b',
-            r'\b(django|flask|spring|express|laravel|rails)\b'
-        ]
-        
-        for pattern in skill_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            skills.extend([match.title() for match in matches])
-        
-        # Remove duplicates and return
-        return list(set(skills))
+        tags = tags or get_taxonomy().extract(f"{title} {description}")
+        return tags.labels('skills')
     
-    def _extract_benefits(self, description: str) -> List[str]:
+    def _extract_benefits(self, description: str, tags: Optional[TaxonomyMatch] = None) -> List[str]:
         """
         Extract benefits from job description
         """
         if not description:
             return []
         
-        text = description.lower()
-        benefits = []
-        
-        benefit_keywords = {
-            'health insurance': ['health insurance', 'medical insurance', 'healthcare'],
-            'dental insurance': ['dental insurance', 'dental coverage'],
-            'vision insurance': ['vision insurance', 'vision coverage'],
-            '401k': ['401k', '401(k)', 'retirement plan'],
-            'paid time off': ['pto', 'paid time off', 'vacation days'],
-            'remote work': ['remote work', 'work from home', 'wfh'],
-            'flexible hours': ['flexible hours', 'flexible schedule'],
-            'stock options': ['stock options', 'equity', 'stock grants']
-        }
-        
-        for benefit, keywords in benefit_keywords.items():
-            if any(keyword in text for keyword in keywords):
-                benefits.append(benefit)
-        
-        return benefits
+        tags = tags or get_taxonomy().extract(description)
+        return tags.labels('benefits')
     
     def _extract_requirements(self, description: str) -> List[str]:
         """
@@ -168,6 +168,16 @@ celery_app.conf.beat_schedule = {
         "schedule": crontab(hour=2, minute=0),  # Daily at 2 AM
         "options": {"queue": "maintenance", "priority": 3}
     },
+    "flush-job-view-counts": {
+        "task": "app.tasks.jobs.update_job_view_counts",
+        "schedule": crontab(minute='*/1'),  # Every minute
+        "options": {"queue": "maintenance", "priority": 4}
+    },
+    "send-job-alerts": {
+        "task": "app.tasks.jobs.send_job_alerts",
+        "schedule": crontab(hour=8, minute=0),  # Daily digest at 8 AM
+        "options": {"queue": "email", "priority": 6}
+    },
     "autoscraper-heartbeat": {
         "task": "app.autoscraper.tasks.heartbeat",
         "schedule": crontab(minute='*/1'),  # Every minute
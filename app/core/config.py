@@ -61,6 +61,15 @@ class Settings(BaseSettings):
     # Scraper Settings
     SCRAPER_ENABLED: bool = os.getenv("SCRAPER_ENABLED", "false").lower() == "true"
     SCRAPER_INTERVAL_MINUTES: int = int(os.getenv("SCRAPER_INTERVAL_MINUTES", "60"))
+    SCRAPER_PAGE_CACHE_ENABLED: bool = os.getenv("SCRAPER_PAGE_CACHE_ENABLED", "true").lower() == "true"
+    SCRAPER_CACHE_DIR: str = os.getenv("SCRAPER_CACHE_DIR", "./cache/scraper")
+    SCRAPER_FEED_CONCURRENCY: int = int(os.getenv("SCRAPER_FEED_CONCURRENCY", "10"))
+    SESSION_MAX_CONCURRENT_WEBSITES: int = int(os.getenv("SESSION_MAX_CONCURRENT_WEBSITES", "20"))
+    SCRAPER_TRACE_FILE: str = os.getenv("SCRAPER_TRACE_FILE", "")  # empty keeps spans in-process only
+    SCRAPER_TRACE_SAMPLE_RATE: float = float(os.getenv("SCRAPER_TRACE_SAMPLE_RATE", "1.0"))
+    SCRAPER_PROFILING_ENABLED: bool = os.getenv("SCRAPER_PROFILING_ENABLED", "false").lower() == "true"
+    SCRAPER_PROFILE_INTERVAL_MS: float = float(os.getenv("SCRAPER_PROFILE_INTERVAL_MS", "5"))
+    SCRAPER_PROFILE_DIR: str = os.getenv("SCRAPER_PROFILE_DIR", "logs/profiles")
     
     # Email Settings
     EMAIL_HOST: str = os.getenv("EMAIL_HOST", "smtp.gmail.com")
@@ -70,6 +79,9 @@ class Settings(BaseSettings):
     EMAIL_FROM: str = os.getenv("EMAIL_FROM", "noreply@remotehive.com")
     EMAIL_USE_TLS: bool = os.getenv("EMAIL_USE_TLS", "true").lower() == "true"
     SUPPORT_EMAIL: str = os.getenv("SUPPORT_EMAIL", "support@remotehive.com")
+    EMAIL_SMTP_POOL_SIZE: int = int(os.getenv("EMAIL_SMTP_POOL_SIZE", "4"))
+    EMAIL_RATE_LIMIT_PER_SECOND: float = float(os.getenv("EMAIL_RATE_LIMIT_PER_SECOND", "10"))
+    EMAIL_BATCH_SIZE: int = int(os.getenv("EMAIL_BATCH_SIZE", "100"))
     
     # Frontend URL (for email links)
     FRONTEND_URL: str = os.getenv("FRONTEND_URL", "http://localhost:3000")
@@ -77,6 +89,7 @@ class Settings(BaseSettings):
     # File Upload Settings
     UPLOAD_DIR: str = os.getenv("UPLOAD_DIR", "./uploads")
     MAX_FILE_SIZE: int = int(os.getenv("MAX_FILE_SIZE", "10485760"))  # 10MB
+    BULK_UPLOAD_CHUNK_SIZE: int = int(os.getenv("BULK_UPLOAD_CHUNK_SIZE", "500"))
     
     # External API Keys
     LINKEDIN_API_KEY: str = os.getenv("LINKEDIN_API_KEY", "")
@@ -84,6 +97,13 @@ class Settings(BaseSettings):
     GLASSDOOR_API_KEY: str = os.getenv("GLASSDOOR_API_KEY", "")
     GOOGLE_MAPS_API_KEY: str = os.getenv("GOOGLE_MAPS_API_KEY", "")
     GEMINI_API_KEY: str = os.getenv("GEMINI_API_KEY", "")
+    ML_MODEL_WORKERS: int = int(os.getenv("ML_MODEL_WORKERS", "4"))
+    ML_MODEL_BATCH_SIZE: int = int(os.getenv("ML_MODEL_BATCH_SIZE", "8"))
+    ML_PARSE_CACHE_SIZE: int = int(os.getenv("ML_PARSE_CACHE_SIZE", "2048"))
+    ML_PARSE_CACHE_TTL_SECONDS: int = int(os.getenv("ML_PARSE_CACHE_TTL_SECONDS", "86400"))
+    ML_CONFIG_CACHE_TTL_SECONDS: int = int(os.getenv("ML_CONFIG_CACHE_TTL_SECONDS", "300"))
+    ML_METRICS_FLUSH_SIZE: int = int(os.getenv("ML_METRICS_FLUSH_SIZE", "200"))
+    ML_METRICS_FLUSH_INTERVAL_SECONDS: float = float(os.getenv("ML_METRICS_FLUSH_INTERVAL_SECONDS", "5"))
     
     # Slack Integration
     SLACK_WEBHOOK_URL: str = os.getenv("SLACK_WEBHOOK_URL", "")
@@ -105,6 +125,11 @@ class Settings(BaseSettings):
     RATE_LIMIT_WINDOW: int = int(os.getenv("RATE_LIMIT_WINDOW", "60"))  # seconds
     RATE_LIMIT_BLOCK_DURATION: int = int(os.getenv("RATE_LIMIT_BLOCK_DURATION", "300"))  # 5 minutes
     
+    # Password Hashing (raising the rounds rehashes older hashes on next login)
+    PASSWORD_BCRYPT_ROUNDS: int = int(os.getenv("PASSWORD_BCRYPT_ROUNDS", "12"))
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "4"))
+    PASSWORD_HASH_MAX_QUEUE: int = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "64"))
+    
     # Request Security
     MAX_REQUEST_SIZE: int = int(os.getenv("MAX_REQUEST_SIZE", str(10 * 1024 * 1024)))  # 10MB
     MAX_JSON_DEPTH: int = int(os.getenv("MAX_JSON_DEPTH", "10"))
@@ -152,6 +177,9 @@ class Settings(BaseSettings):
     # Service URLs and Health Endpoints
     AUTOSCRAPER_SERVICE_URL: str = os.getenv("AUTOSCRAPER_SERVICE_URL", "http://localhost:8003")
     AUTOSCRAPER_SERVICE_HEALTH_ENDPOINT: str = os.getenv("AUTOSCRAPER_SERVICE_HEALTH_ENDPOINT", "/health")
+    # Normalized jobs reach job_posts through the autoscraper's batched exporter;
+    # only publish one at a time during normalization where that exporter is not run
+    AUTOSCRAPER_INLINE_PUBLISH: bool = os.getenv("AUTOSCRAPER_INLINE_PUBLISH", "false").lower() == "true"
     ADMIN_SERVICE_URL: str = os.getenv("ADMIN_SERVICE_URL", "http://localhost:8002")
     ADMIN_SERVICE_HEALTH_ENDPOINT: str = os.getenv("ADMIN_SERVICE_HEALTH_ENDPOINT", "/health")
     
@@ -1,7 +1,7 @@
 from loguru import logger
 from app.database.database import init_database
 from app.database.mongodb_models import User, UserRole
-from app.core.security import get_password_hash
+from app.core.security import get_password_hash_async
 
 # Database session dependency for FastAPI
 def get_db():
@@ -34,7 +34,7 @@ async def create_default_data():
             # Create super admin user
             super_admin = User(
                 email="admin@remotehive.in",
-                password_hash=get_password_hash("Ranjeet11$"),
+                password_hash=await get_password_hash_async("Ranjeet11$"),
                 first_name="Super",
                 last_name="Admin",
                 role=UserRole.SUPER_ADMIN,
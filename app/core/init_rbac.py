@@ -1,7 +1,7 @@
 import asyncio
 from datetime import datetime
 from app.models.mongodb_models import User, UserRole
-from app.core.security import get_password_hash
+from app.core.security import get_password_hash_async
 from app.core.rbac import UserRole, Permission
 
 def create_tables():
@@ -33,7 +33,7 @@ async def create_super_admin(db, email: str, password: str):
     # Create new super admin user
     super_admin = User(
         email=email,
-        password_hash=get_password_hash(password),
+        password_hash=await get_password_hash_async(password),
         first_name="Super",
         last_name="Admin",
         role=UserRole.SUPER_ADMIN,
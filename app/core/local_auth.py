@@ -1,6 +1,6 @@
 from datetime import datetime, timedelta
 from typing import Optional, Union, Dict, Any
-from passlib.context import CryptContext
+import logging
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
@@ -8,6 +8,10 @@ import warnings
 
 from app.core.config import settings
 from app.core.database import get_db
+from app.core.password_utils import (
+    verify_password, get_password_hash, verify_password_async, get_password_hash_async,
+    verify_and_update_password
+)
 from app.database.mongodb_models import User, UserRole
 from app.utils.jwt_auth import get_jwt_manager, JWTError, TokenExpiredError, TokenInvalidError
 
@@ -15,8 +19,7 @@ from app.utils.jwt_auth import get_jwt_manager, JWTError, TokenExpiredError, Tok
 warnings.filterwarnings("ignore", message=".*__about__.*")
 warnings.filterwarnings("ignore", category=UserWarning, module="passlib")
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+logger = logging.getLogger(__name__)
 
 # JWT token security
 security = HTTPBearer()
@@ -29,14 +32,6 @@ class AuthorizationError(Exception):
     """Custom authorization error"""
     pass
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash"""
-    return pwd_context.verify(plain_password, hashed_password)
-
-def get_password_hash(password: str) -> str:
-    """Hash a password"""
-    return pwd_context.hash(password)
-
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token using centralized JWT manager"""
     jwt_manager = get_jwt_manager()
@@ -79,8 +74,16 @@ async def authenticate_user(db: AsyncIOMotorDatabase, email: str, password: str)
     user = await User.find_one(User.email == email)
     if not user:
         return None
-    if not verify_password(password, user.password_hash):
+    verified, new_hash = await verify_and_update_password(password, user.password_hash)
+    if not verified:
         return None
+    if new_hash:
+        # Stored hash predates the current cost settings; upgrade it while we have the password
+        try:
+            user.password_hash = new_hash
+            await user.save()
+        except Exception as e:
+            logger.warning(f"Failed to rehash password for {email}: {e}")
     return user
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: AsyncIOMotorDatabase = Depends(get_db)) -> User:
@@ -195,7 +198,7 @@ async def create_user(db: AsyncIOMotorDatabase, email: str, password: str, first
     print(f"DEBUG: Creating user with role: {role} (type: {type(role)})")
     
     # Create new user
-    hashed_password = get_password_hash(password)
+    hashed_password = await get_password_hash_async(password)
     user = User(
         email=email,
         password_hash=hashed_password,
@@ -0,0 +1,153 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordHasherBusy(HTTPException):
+    """Raised instead of queueing when the hashing pool is saturated"""
+
+    def __init__(self, retry_after: int = 1):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication is busy, please retry shortly",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+def build_password_context(bcrypt_rounds: int = 12) -> CryptContext:
+    """
+    bcrypt context whose minimum cost equals the configured cost, so
+    hashes made with fewer rounds report ``needs_update`` and are
+    rehashed on the next successful login.
+    """
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__rounds=bcrypt_rounds,
+        bcrypt__min_rounds=bcrypt_rounds,
+    )
+
+
+class PasswordHasher:
+    """
+    Runs password hashing off the event loop on a bounded thread pool.
+
+    bcrypt releases the GIL while it works, so ``max_workers`` hashes run
+    in parallel while the loop keeps serving other requests. At most
+    ``max_queue`` further calls may wait for a worker; beyond that
+    callers get ``PasswordHasherBusy`` (a 503 with Retry-After) straight
+    away instead of piling up behind a login burst.
+    """
+
+    def __init__(self, context: Optional[CryptContext] = None, max_workers: int = 4, max_queue: int = 64):
+        self.context = context or build_password_context()
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="password-hash")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.rehashed = 0
+        self._wait_total = 0.0
+        self._run_total = 0.0
+        self._max_wait = 0.0
+
+    def _admit(self):
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise PasswordHasherBusy()
+            self._pending += 1
+
+    def _timed(self, func: Callable[..., Any], submitted: float, *args) -> Any:
+        started = time.perf_counter()
+        with self._lock:
+            self._running += 1
+        try:
+            return func(*args)
+        finally:
+            finished = time.perf_counter()
+            with self._lock:
+                self._running -= 1
+                self.completed += 1
+                wait = started - submitted
+                self._wait_total += wait
+                self._max_wait = max(self._max_wait, wait)
+                self._run_total += finished - started
+
+    async def _submit(self, func: Callable[..., Any], *args) -> Any:
+        self._admit()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, self._timed, func, time.perf_counter(), *args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(self.context.hash, password)
+
+    async def verify(self, password: str, hashed_password: Optional[str]) -> bool:
+        if not hashed_password:
+            return False
+        return await self._submit(self.context.verify, password, hashed_password)
+
+    async def verify_and_update(self, password: str, hashed_password: Optional[str]) -> Tuple[bool, Optional[str]]:
+        """
+        Verify a password and, when the stored hash uses outdated cost
+        parameters, also return a fresh hash for the caller to persist.
+        """
+        if not hashed_password:
+            return False, None
+        verified, new_hash = await self._submit(self.context.verify_and_update, password, hashed_password)
+        if new_hash:
+            with self._lock:
+                self.rehashed += 1
+        return verified, new_hash
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "running": self._running,
+                "queue_depth": self._pending - self._running,
+                "max_queue": self.max_queue,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "rehashed": self.rehashed,
+                "avg_wait_ms": round(self._wait_total / self.completed * 1000, 2) if self.completed else 0.0,
+                "max_wait_ms": round(self._max_wait * 1000, 2),
+                "avg_hash_ms": round(self._run_total / self.completed * 1000, 2) if self.completed else 0.0,
+            }
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+
+# Shared hasher; created on first use from settings
+_default_hasher: Optional[PasswordHasher] = None
+_default_hasher_lock = threading.Lock()
+
+
+def get_password_hasher() -> PasswordHasher:
+    """The process-wide password hasher"""
+    global _default_hasher
+    with _default_hasher_lock:
+        if _default_hasher is None:
+            from app.core.config import settings
+            _default_hasher = PasswordHasher(
+                build_password_context(settings.PASSWORD_BCRYPT_ROUNDS),
+                max_workers=settings.PASSWORD_HASH_WORKERS,
+                max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+            )
+        return _default_hasher
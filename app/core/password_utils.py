@@ -1,11 +1,23 @@
-from passlib.context import CryptContext
+from typing import Optional, Tuple
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.core.password_hasher import get_password_hasher
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    """Verify a password against its hash; blocks, so prefer verify_password_async in request handlers"""
+    return get_password_hasher().context.verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
-    """Generate password hash"""
-    return pwd_context.hash(password)
\ No newline at end of file
+    """Hash a password; blocks, so prefer get_password_hash_async in request handlers"""
+    return get_password_hasher().context.hash(password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the hashing pool"""
+    return await get_password_hasher().verify(plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password on the hashing pool"""
+    return await get_password_hasher().hash(password)
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password; the second item is a replacement hash when the stored one is outdated"""
+    return await get_password_hasher().verify_and_update(plain_password, hashed_password)
@@ -5,7 +5,10 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 # from sqlalchemy.orm import Session  # Removed for MongoDB migration
 
 from .config import settings
-from .password_utils import verify_password, get_password_hash
+from .password_utils import (
+    verify_password, get_password_hash, verify_password_async, get_password_hash_async,
+    verify_and_update_password
+)
 # from app.database.database import get_db_session  # Removed for MongoDB migration
 from app.database.services import UserService
 from app.utils.jwt_auth import get_jwt_manager, TokenExpiredError, TokenInvalidError, JWTError
@@ -33,7 +36,7 @@ async def authenticate_user(email: str, password: str) -> Union[Dict[str, Any],
     if not user:
         return False
     
-    if not verify_password(password, user.hashed_password):
+    if not await verify_password_async(password, user.hashed_password):
         return False
     
     if not user.is_active:
@@ -16,7 +16,7 @@ from contextlib import asynccontextmanager
 # Import all document models
 from app.models.mongodb_models import (
     User, ContactSubmission, ContactInformation, SeoSettings, Review, Ad,
-    JobSeeker, Employer, JobPost, JobApplication, PaymentGateway, Transaction, Refund
+    JobSeeker, Employer, JobPost, JobAlert, JobApplication, PaymentGateway, Transaction, Refund
 )
 from app.models.tasks import TaskResult
 from app.models.scraping_session import ScrapingSession, ScrapingResult, SessionWebsite
@@ -84,7 +84,7 @@ class MongoDBManager:
                 database=self.database,
                 document_models=[
                     User, ContactSubmission, ContactInformation, SeoSettings, Review, Ad,
-                    JobSeeker, Employer, JobPost, JobApplication, PaymentGateway, Transaction, Refund,
+                    JobSeeker, Employer, JobPost, JobAlert, JobApplication, PaymentGateway, Transaction, Refund,
                     TaskResult, ScrapingSession, ScrapingResult, SessionWebsite
                 ]
             )
@@ -470,6 +470,7 @@ class ScraperState(Document):
     is_paused: bool = False
     current_page: int = 0
     processed_urls: List[str] = Field(default_factory=list)
+    total_processed: int = 0
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     
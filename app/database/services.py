@@ -1,4 +1,6 @@
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from beanie import PydanticObjectId
+from bson.errors import InvalidId
 from typing import List, Optional, Dict, Any
 import json
 import logging
@@ -7,7 +9,9 @@ from datetime import datetime
 # from bson import ObjectId  # Removed to fix Pydantic schema generation
 
 from .mongodb_models import User, JobSeeker, Employer, JobPost, JobApplication, ScraperConfig, ScraperLog
-from ..core.password_utils import get_password_hash, verify_password
+from ..core.password_utils import get_password_hash, verify_and_update_password
+from ..services.recommendation_engine import job_document_id, recommendation_index
+from ..services.view_counter import job_view_buffer
 
 logger = logging.getLogger(__name__)
 
@@ -55,6 +59,23 @@ class UserService:
         except (ValueError, TypeError):
             return None
     
+    @staticmethod
+    async def get_user_by_object_id(db: AsyncIOMotorDatabase, user_id: Any) -> Optional[User]:
+        """Get user by document _id, which is what JobAlert.user_id references."""
+        try:
+            user_data = await db.users.find_one({"_id": PydanticObjectId(user_id)})
+        except (InvalidId, TypeError):
+            return None
+        return User(**user_data) if user_data else None
+    
+    @staticmethod
+    async def get_users_by_ids(db: AsyncIOMotorDatabase, user_ids: List[Any]) -> List[User]:
+        """Get many users with a single query."""
+        ids = [str(user_id) for user_id in user_ids]
+        cursor = db.users.find({"id": {"$in": ids}})
+        users_data = await cursor.to_list(length=len(ids))
+        return [User(**user_data) for user_data in users_data]
+    
     async def update_last_login(self, user_id: str) -> Optional[User]:
         """Update user's last login timestamp."""
         try:
@@ -74,13 +95,17 @@ class UserService:
     async def authenticate_user(db: AsyncIOMotorDatabase, email: str, password: str) -> Optional[User]:
         """Authenticate user with email and password."""
         user = await UserService.get_user_by_email(db, email)
-        if user and verify_password(password, user.hashed_password):
-            await db.users.update_one(
-                {"email": email},
-                {"$set": {"last_login": datetime.utcnow()}}
-            )
-            return user
-        return None
+        if not user:
+            return None
+        verified, new_hash = await verify_and_update_password(password, user.hashed_password)
+        if not verified:
+            return None
+        update = {"last_login": datetime.utcnow()}
+        if new_hash:
+            # Upgrade hashes made with older cost settings
+            update["hashed_password"] = new_hash
+        await db.users.update_one({"email": email}, {"$set": update})
+        return user
     
     @staticmethod
     async def update_user(db: AsyncIOMotorDatabase, user_id: str, **kwargs) -> Optional[User]:
@@ -212,6 +237,7 @@ class JobPostService:
             job_post_dict = job_post.dict()
             result = await db.job_posts.insert_one(job_post_dict)
             job_post_dict["_id"] = result.inserted_id
+            recommendation_index.upsert_job(job_post_dict)
             return JobPost(**job_post_dict)
         except (ValueError, TypeError):
             return None
@@ -222,6 +248,25 @@ class JobPostService:
         job_post_data = await db.job_posts.find_one({"id": job_id})
         return JobPost(**job_post_data) if job_post_data else None
     
+    @staticmethod
+    async def get_job_posts_by_ids(db: AsyncIOMotorDatabase, job_ids: List[Any]) -> List[Dict[str, Any]]:
+        """
+        Get many job post documents by _id with a single query, in the order requested.
+        
+        Raw documents are returned: posts written by the autoscraper export
+        and the denormalized company_name do not fit the JobPost model.
+        """
+        object_ids = []
+        for job_id in job_ids:
+            try:
+                object_ids.append(PydanticObjectId(job_id))
+            except (InvalidId, TypeError):
+                continue
+        cursor = db.job_posts.find({"_id": {"$in": object_ids}})
+        job_posts_data = await cursor.to_list(length=len(object_ids))
+        by_id = {str(job_post_data["_id"]): job_post_data for job_post_data in job_posts_data}
+        return [by_id[str(job_id)] for job_id in job_ids if str(job_id) in by_id]
+    
     @staticmethod
     async def get_job_posts(db: AsyncIOMotorDatabase, skip: int = 0, limit: int = 12, 
                      search: str = None, job_type: str = None, 
@@ -273,22 +318,31 @@ class JobPostService:
     @staticmethod
     async def update_job_post(db: AsyncIOMotorDatabase, job_id: int, **kwargs) -> Optional[JobPost]:
         """Update job post."""
+        kwargs.setdefault("updated_at", datetime.utcnow())
         result = await db.job_posts.update_one(
             {"id": job_id},
             {"$set": kwargs}
         )
         if result.modified_count > 0:
             job_post_data = await db.job_posts.find_one({"id": job_id})
+            if job_post_data:
+                recommendation_index.upsert_job(job_post_data)
             return JobPost(**job_post_data) if job_post_data else None
         return None
     
+    @staticmethod
+    async def delete_job_post(db: AsyncIOMotorDatabase, job_id: int) -> bool:
+        """Delete job post."""
+        job_post_data = await db.job_posts.find_one_and_delete({"id": job_id})
+        if job_post_data:
+            recommendation_index.remove_job(job_document_id(job_post_data))
+            return True
+        return False
+    
     @staticmethod
     async def increment_view_count(db: AsyncIOMotorDatabase, job_id: int):
-        """Increment view count for a job post."""
-        await db.job_posts.update_one(
-            {"id": job_id},
-            {"$inc": {"views_count": 1}}
-        )
+        """Record a job view; buffered views are flushed in bulk by update_job_view_counts."""
+        await job_view_buffer.record_view(db, job_id)
 
 class JobApplicationService:
     @staticmethod
@@ -398,6 +452,8 @@ class JobSeekerService:
         )
         if result.modified_count > 0:
             job_seeker_data = await db.job_seekers.find_one({"id": job_seeker_id})
+            if job_seeker_data:
+                recommendation_index.invalidate_user(job_seeker_data.get("user_id"))
             return JobSeeker(**job_seeker_data) if job_seeker_data else None
         return None
     
@@ -417,6 +473,67 @@ class JobSeekerService:
         job_seekers_data = await cursor.to_list(length=limit)
         return [JobSeeker(**job_seeker_data) for job_seeker_data in job_seekers_data]
 
+class JobAlertService:
+    @staticmethod
+    def _user_object_id(user_id: Any) -> PydanticObjectId:
+        """JobAlert.user_id references a User document; reject ids that are not ObjectIds."""
+        try:
+            return PydanticObjectId(user_id)
+        except (InvalidId, TypeError) as e:
+            raise ValueError(f"Invalid user id for job alert: {user_id!r}") from e
+    
+    @staticmethod
+    async def create_alert(db: AsyncIOMotorDatabase, user_id: str, criteria: Dict[str, Any]) -> Dict[str, Any]:
+        """Save job alert criteria for a job seeker."""
+        alert_dict = {
+            "user_id": JobAlertService._user_object_id(user_id),
+            "name": criteria.get("name"),
+            "keywords": criteria.get("keywords", []),
+            "job_types": criteria.get("job_types", []),
+            "remote_only": criteria.get("remote_only", False),
+            "min_salary": criteria.get("min_salary"),
+            "locations": criteria.get("locations", []),
+            "is_active": True,
+            "last_sent_at": None,
+            "created_at": datetime.utcnow(),
+            "updated_at": datetime.utcnow()
+        }
+        result = await db.job_alerts.insert_one(alert_dict)
+        alert_dict["_id"] = result.inserted_id
+        return alert_dict
+    
+    @staticmethod
+    async def get_alerts_by_user(db: AsyncIOMotorDatabase, user_id: str) -> List[Dict[str, Any]]:
+        """Get job alerts saved by a user."""
+        cursor = db.job_alerts.find({"user_id": JobAlertService._user_object_id(user_id)})
+        return await cursor.to_list(length=100)
+    
+    @staticmethod
+    async def get_active_alerts(db: AsyncIOMotorDatabase) -> List[Dict[str, Any]]:
+        """Get every active job alert."""
+        cursor = db.job_alerts.find({"is_active": True})
+        return await cursor.to_list(length=None)
+    
+    @staticmethod
+    async def deactivate_alert(db: AsyncIOMotorDatabase, alert_id: Any, user_id: str) -> bool:
+        """Turn off a job alert."""
+        result = await db.job_alerts.update_one(
+            {"_id": alert_id, "user_id": JobAlertService._user_object_id(user_id)},
+            {"$set": {"is_active": False, "updated_at": datetime.utcnow()}}
+        )
+        return result.modified_count > 0
+    
+    @staticmethod
+    async def mark_alerts_sent(db: AsyncIOMotorDatabase, alert_ids: List[Any], sent_at: datetime) -> int:
+        """Record the digest send time on a batch of alerts in one update."""
+        if not alert_ids:
+            return 0
+        result = await db.job_alerts.update_many(
+            {"_id": {"$in": alert_ids}},
+            {"$set": {"last_sent_at": sent_at}}
+        )
+        return result.modified_count
+
 class SystemService:
     @staticmethod
     async def get_setting(db: AsyncIOMotorDatabase, key: str) -> Optional[str]:
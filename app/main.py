@@ -6,6 +6,7 @@ from contextlib import asynccontextmanager
 from loguru import logger
 import logging
 from app.database import init_database
+from app.database.database import get_database_manager
 from app.api.v1 import api_router
 from app.api.employers import router as employers_router
 from app.core.config import settings
@@ -13,17 +14,19 @@ from app.core.logging import setup_logging, get_logger
 from app.core.monitoring import app_monitor
 from app.scraper.config import get_scraping_config, set_scraping_config, EnhancedScrapingConfig
 from app.middleware.error_handler import (
-    ErrorHandlingMiddleware,
-    HealthCheckMiddleware,
     validation_exception_handler,
     http_exception_handler
 )
-from app.middleware.security import SecurityMiddleware, CSRFProtectionMiddleware
-from app.middleware.validation import ValidationMiddleware
+from app.middleware.pipeline import RequestPipelineMiddleware, build_default_stages
 from app.middleware.enhanced_middleware import EnhancedMiddleware
 from app.api.versioning import VersionRegistry, add_version_headers
 from app.api.documentation import APIDocumentation
 from app.api.integration import setup_enhanced_api
+from app.services.websocket_service import websocket_manager
+from app.services.view_counter import job_view_buffer
+from app.services.recommendation_engine import recommendation_index
+from app.services.ml_analytics_service import ml_analytics_service
+from app.services.url_probe import get_probe_engine
 
 # Setup centralized logging
 setup_logging()
@@ -38,11 +41,21 @@ async def lifespan(app: FastAPI):
         await init_database()
         app_logger.info("MongoDB database initialized successfully")
         
+        # Persist ML metric rollups and flush buffered metrics in the background
+        await ml_analytics_service.start(get_database_manager().get_session())
+        
+        # Build the job recommendation index off the request path
+        recommendation_index.start(get_database_manager().get_session())
+        
         # Initialize enhanced scraping configuration
         scraping_config = EnhancedScrapingConfig.from_env()
         set_scraping_config(scraping_config)
         app_logger.info(f"Enhanced scraping engine initialized in {scraping_config.scraping_mode.value} mode")
         
+        # Subscribe to the cross-worker WebSocket backplane
+        await websocket_manager.start_backplane(settings.REDIS_URL)
+        app_logger.info(f"WebSocket backplane started ({type(websocket_manager.backplane).__name__})")
+        
         # Start monitoring systems (temporarily disabled for debugging)
         # await app_monitor.start()
         app_logger.info("Monitoring systems startup skipped for debugging")
@@ -56,6 +69,15 @@ async def lifespan(app: FastAPI):
     
     app_logger.info("Shutting down RemoteHive API...")
     try:
+        await websocket_manager.stop_backplane()
+        
+        # Flush views still buffered in this worker
+        await job_view_buffer.flush(get_database_manager().get_session())
+        await job_view_buffer.close()
+        await ml_analytics_service.close()
+        await recommendation_index.close()
+        await get_probe_engine().close()
+        
         # Stop monitoring systems (temporarily disabled for debugging)
         # await app_monitor.stop()
         app_logger.info("Monitoring systems shutdown skipped for debugging")
@@ -70,12 +92,13 @@ app = FastAPI(
     lifespan=lifespan
 )
 
-# Add basic middleware (order matters - add from innermost to outermost)
-app.add_middleware(ErrorHandlingMiddleware)
-app.add_middleware(HealthCheckMiddleware)
-app.add_middleware(ValidationMiddleware)
-app.add_middleware(SecurityMiddleware)
-app.add_middleware(CSRFProtectionMiddleware)
+# Error handling, health counting, CSRF, security, validation and API headers
+# run as stages of one ASGI middleware sharing a single buffered request
+pipeline_stages = build_default_stages()
+app.add_middleware(RequestPipelineMiddleware, stages=pipeline_stages)
+app.state.security_middleware = next(
+    stage.middleware for stage in pipeline_stages if stage.name == "security"
+)
 
 # Configure CORS
 app.add_middleware(
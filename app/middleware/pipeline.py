@@ -0,0 +1,533 @@
+#!/usr/bin/env python3
+"""
+RemoteHive Request Pipeline
+Runs error handling, health counting, request metrics, CSRF, security,
+validation and API header stages as one pure-ASGI middleware over a shared
+per-request context
+"""
+
+import json
+import time
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Dict, Any, Optional, List, Iterable, Sequence
+
+from fastapi import Request, Response, status
+from fastapi.responses import JSONResponse
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Receive, Scope, Send, Message
+
+from app.core.config import settings
+from app.middleware.error_handler import ErrorHandlingMiddleware, HealthCheckMiddleware
+from app.middleware.security import SecurityMiddleware, CSRFProtectionMiddleware
+from app.middleware.validation import ValidationMiddleware, ValidationConfig
+from app.middleware.enhanced_middleware import EnhancedMiddleware
+
+
+# Paths served straight by the application, without any pipeline stage
+DEFAULT_BYPASS_PATHS = ("/health", "/metrics", "/api/metrics", "/api/health", "/api/v1/health")
+
+BODY_METHODS = ("POST", "PUT", "PATCH")
+
+_UNSET = object()
+
+
+class RequestContext:
+    """
+    State shared by every stage for one request.
+
+    Wraps a single starlette ``Request`` whose body is read from the ASGI
+    receive channel at most once; the buffered body is replayed to the
+    application afterwards.
+    """
+
+    def __init__(self, scope: Scope, receive: Receive):
+        self.scope = scope
+        self._receive = receive
+        self.request = Request(scope, receive)
+        self.request_id = str(uuid.uuid4())
+        self.started_at = datetime.now()
+        self._start = time.perf_counter()
+        self.client_ip = _get_client_ip(self.request)
+        self.status_code: Optional[int] = None
+        self.response_started = False
+        self._body: Optional[bytes] = None
+        self._json: Any = _UNSET
+        # Per-request values a stage keeps between its hooks, keyed by stage name
+        self.stage_data: Dict[str, Any] = {}
+
+    @property
+    def method(self) -> str:
+        return self.scope["method"]
+
+    @property
+    def path(self) -> str:
+        return self.scope["path"]
+
+    @property
+    def content_type(self) -> str:
+        return self.request.headers.get("content-type", "").lower()
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._start
+
+    async def body(self) -> bytes:
+        """Request body, read from the client on first use only"""
+        if self._body is None:
+            self._body = await self.request.body()
+        return self._body
+
+    async def json(self) -> Any:
+        """Body parsed as JSON once; raises ``ValueError`` when malformed"""
+        if self._json is _UNSET:
+            self._json = json.loads(await self.body())
+        return self._json
+
+    def receive_for_app(self) -> Receive:
+        """Receive channel for the application, replaying a buffered body"""
+        # Stages may also have read the body through ``self.request``, which caches it
+        body = self._body if self._body is not None else getattr(self.request, "_body", None)
+        if body is None:
+            return self._receive
+
+        pending = [{"type": "http.request", "body": body, "more_body": False}]
+
+        async def receive() -> Message:
+            if pending:
+                return pending.pop()
+            return await self._receive()
+
+        return receive
+
+
+def _get_client_ip(request: Request) -> str:
+    forwarded_for = request.headers.get("x-forwarded-for")
+    if forwarded_for:
+        return forwarded_for.split(",")[0].strip()
+
+    real_ip = request.headers.get("x-real-ip")
+    if real_ip:
+        return real_ip
+
+    return request.client.host if request.client else "unknown"
+
+
+class PipelineStage:
+    """
+    One step of the request pipeline.
+
+    ``before`` may return a response to stop the request; ``after`` edits the
+    outgoing headers; ``on_error`` may turn an exception into a response;
+    ``finish`` always runs once the request is over.
+    """
+
+    name = "stage"
+
+    async def before(self, ctx: RequestContext) -> Optional[Response]:
+        return None
+
+    def after(self, ctx: RequestContext, headers: MutableHeaders):
+        pass
+
+    async def on_error(self, ctx: RequestContext, exc: Exception) -> Optional[Response]:
+        return None
+
+    def finish(self, ctx: RequestContext):
+        pass
+
+
+class ErrorHandlingStage(PipelineStage):
+    """Request IDs, request logging and exception mapping"""
+
+    name = "error_handling"
+
+    def __init__(self):
+        self.handler = ErrorHandlingMiddleware(app=None)
+
+    async def before(self, ctx: RequestContext) -> Optional[Response]:
+        self.handler.logger.set_context(
+            request_id=ctx.request_id,
+            method=ctx.method,
+            endpoint=ctx.path,
+            ip_address=ctx.client_ip,
+            user_agent=ctx.request.headers.get("user-agent", "")
+        )
+        ctx.request.state.request_id = ctx.request_id
+        return None
+
+    def after(self, ctx: RequestContext, headers: MutableHeaders):
+        self.handler.logger.info(
+            f"Request completed: {ctx.method} {ctx.path}",
+            status_code=ctx.status_code,
+            duration=ctx.elapsed
+        )
+        headers["X-Request-ID"] = ctx.request_id
+
+    async def on_error(self, ctx: RequestContext, exc: Exception) -> Optional[Response]:
+        return await self.handler._handle_exception(ctx.request, exc, ctx.request_id, ctx.started_at)
+
+    def finish(self, ctx: RequestContext):
+        self.handler.logger.clear_context()
+
+    def get_error_stats(self) -> Dict[str, int]:
+        return self.handler.get_error_stats()
+
+
+class HealthCheckStage(PipelineStage):
+    """Request and error counters"""
+
+    name = "health_check"
+
+    def __init__(self):
+        self.monitor = HealthCheckMiddleware(app=None)
+
+    async def before(self, ctx: RequestContext) -> Optional[Response]:
+        self.monitor.request_count += 1
+        return None
+
+    def after(self, ctx: RequestContext, headers: MutableHeaders):
+        if ctx.status_code >= 400:
+            self.monitor.error_count += 1
+
+    def get_health_stats(self) -> Dict[str, Any]:
+        return self.monitor.get_health_stats()
+
+
+class RequestMetricsStage(PipelineStage):
+    """Per-request metrics, rate-limit buckets and threat scanning"""
+
+    name = "request_metrics"
+
+    def __init__(self):
+        self.middleware = EnhancedMiddleware(app=None)
+
+    async def before(self, ctx: RequestContext) -> Optional[Response]:
+        enhanced = self.middleware
+        if ctx.path in enhanced.skip_paths:
+            return None
+
+        request_id = None
+        if enhanced.enable_metrics_collection:
+            request_id = enhanced.metrics_collector.start_request(ctx.request)
+        ctx.stage_data[self.name] = {"request_id": request_id, "start": time.time()}
+
+        try:
+            # Body scanning goes through the shared request, so it is buffered once
+            await enhanced._pre_process_request(ctx.request)
+        except Exception as e:
+            ctx.stage_data[self.name]["handled"] = True
+            return await enhanced._handle_error(ctx.request, e, ctx.stage_data[self.name]["start"], request_id)
+        return None
+
+    def after(self, ctx: RequestContext, headers: MutableHeaders):
+        data = ctx.stage_data.get(self.name)
+        if data is None or data.get("handled"):
+            return
+
+        enhanced = self.middleware
+        processing_time = time.time() - data["start"]
+        response = SimpleNamespace(headers=headers, status_code=ctx.status_code)
+        enhanced._add_response_headers(ctx.request, response, processing_time)
+
+        if data["request_id"]:
+            enhanced.metrics_collector.end_request(
+                data["request_id"],
+                ctx.status_code,
+                int(headers.get("content-length", 0) or 0),
+                getattr(ctx.request.state, 'user_id', None),
+                api_version=getattr(ctx.request.state, 'api_version', None)
+            )
+
+        if enhanced.enable_request_logging:
+            enhanced._log_response(ctx.request, response, processing_time)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return self.middleware.get_metrics()
+
+
+class CSRFStage(PipelineStage):
+    """CSRF token check for state-changing, non-API requests"""
+
+    name = "csrf"
+
+    def __init__(self):
+        self.protector = CSRFProtectionMiddleware(app=None)
+
+    async def before(self, ctx: RequestContext) -> Optional[Response]:
+        if ctx.method in ("GET", "HEAD", "OPTIONS") or ctx.path.startswith("/api/"):
+            return None
+
+        request = ctx.request
+        csrf_token = request.headers.get("X-CSRF-Token") or request.cookies.get("csrf_token")
+        if not csrf_token or not self.protector._validate_csrf_token(csrf_token):
+            return JSONResponse(
+                status_code=status.HTTP_403_FORBIDDEN,
+                content={
+                    "error": {
+                        "code": "CSRF_TOKEN_MISSING",
+                        "message": "CSRF token missing or invalid"
+                    }
+                }
+            )
+        return None
+
+
+class SecurityStage(PipelineStage):
+    """Rate limiting, size limits, injection filters and security headers"""
+
+    name = "security"
+
+    def __init__(self):
+        self.middleware = SecurityMiddleware(app=None)
+
+    async def before(self, ctx: RequestContext) -> Optional[Response]:
+        security = self.middleware
+        if not security._check_rate_limit(ctx.request, ctx.client_ip):
+            return security._create_security_response(
+                "Rate limit exceeded",
+                status.HTTP_429_TOO_MANY_REQUESTS,
+                ctx.client_ip,
+                "rate_limit_violation"
+            )
+
+        if not await security._validate_request_size(ctx.request):
+            return security._create_security_response(
+                "Request too large",
+                status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                ctx.client_ip,
+                "oversized_request"
+            )
+
+        # Reads the body through the shared request, so it is buffered once
+        violation = await security._validate_and_sanitize_input(ctx.request)
+        if violation:
+            return security._create_security_response(
+                f"Security violation detected: {violation}",
+                status.HTTP_400_BAD_REQUEST,
+                ctx.client_ip,
+                violation
+            )
+        return None
+
+    def after(self, ctx: RequestContext, headers: MutableHeaders):
+        self.middleware._add_security_headers(SimpleNamespace(headers=headers))
+
+    def get_security_stats(self) -> Dict[str, Any]:
+        return self.middleware.get_security_stats()
+
+
+class ValidationStage(PipelineStage):
+    """Content checks, JSON limits and threat scanning on the buffered body"""
+
+    name = "validation"
+
+    # Non-JSON bodies that are scanned as text; multipart uploads are not
+    TEXT_CONTENT_TYPES = ("text/plain", "application/x-www-form-urlencoded")
+
+    def __init__(self):
+        self.middleware = ValidationMiddleware(app=None)
+
+    async def before(self, ctx: RequestContext) -> Optional[Response]:
+        validation = self.middleware
+
+        if getattr(settings, 'RATE_LIMIT_ENABLED', True):
+            if not validation.rate_limiter.is_allowed(ctx.client_ip):
+                return validation.create_rate_limit_response(ctx.client_ip)
+
+        if ctx.method in BODY_METHODS:
+            if not validation.request_validator.validate_content_type(ctx.request):
+                return validation.create_error_response(
+                    "INVALID_CONTENT_TYPE",
+                    "Unsupported content type",
+                    status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+                )
+
+        try:
+            content_length = int(ctx.request.headers.get('content-length', 0))
+        except ValueError:
+            content_length = 0
+        if not validation.request_validator.validate_request_size(content_length):
+            return validation.create_error_response(
+                "REQUEST_TOO_LARGE",
+                f"Request size exceeds maximum of {ValidationConfig.MAX_REQUEST_SIZE} bytes",
+                status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+            )
+
+        if ctx.method in BODY_METHODS and content_length > 0:
+            return await self._validate_body(ctx)
+        return None
+
+    async def _validate_body(self, ctx: RequestContext) -> Optional[Response]:
+        validation = self.middleware
+        validator = validation.request_validator
+
+        if 'application/json' in ctx.content_type:
+            try:
+                data = await ctx.json()
+            except ValueError:
+                return validation.create_error_response(
+                    "INVALID_JSON",
+                    "Invalid JSON format",
+                    status.HTTP_400_BAD_REQUEST
+                )
+
+            if not validator.validate_json_depth(data):
+                return validation.create_error_response(
+                    "JSON_TOO_DEEP",
+                    f"JSON nesting exceeds maximum depth of {ValidationConfig.MAX_JSON_DEPTH}",
+                    status.HTTP_400_BAD_REQUEST
+                )
+
+            length_violations = validator.validate_field_lengths(data)
+            if length_violations:
+                return validation.create_validation_error_response(length_violations)
+        elif any(t in ctx.content_type for t in self.TEXT_CONTENT_TYPES):
+            data = (await ctx.body()).decode('utf-8', errors='ignore')
+        else:
+            return None
+
+        if getattr(settings, 'BLOCK_SUSPICIOUS_REQUESTS', True) and data:
+            threats = validator.scan_for_threats(data)
+            if threats:
+                return validation.create_security_error_response(threats)
+        return None
+
+    def after(self, ctx: RequestContext, headers: MutableHeaders):
+        # Security stage headers take precedence, as when it wrapped this one
+        target = MutableHeaders()
+        self.middleware.add_security_headers(SimpleNamespace(headers=target))
+        for key, value in target.items():
+            if key not in headers:
+                headers[key] = value
+
+
+class ApiHeadersStage(PipelineStage):
+    """API version negotiation and documentation headers"""
+
+    name = "api_headers"
+
+    def __init__(self, api_name: str = "RemoteHive API"):
+        from app.api.versioning import version_registry
+
+        self.api_name = api_name
+        self.supported_versions = ",".join(v.value for v in version_registry.get_active_versions())
+
+    async def before(self, ctx: RequestContext) -> Optional[Response]:
+        from app.api.versioning import get_api_version
+
+        try:
+            ctx.request.state.api_version = get_api_version(ctx.request)
+        except Exception:
+            ctx.request.state.api_version = None
+        return None
+
+    def after(self, ctx: RequestContext, headers: MutableHeaders):
+        api_version = getattr(ctx.request.state, "api_version", None)
+        if api_version is not None:
+            headers["X-API-Version"] = api_version.value
+        headers["X-API-Supported-Versions"] = self.supported_versions
+        headers["X-API-Name"] = self.api_name
+        if ctx.path == "/":
+            headers["X-API-Docs"] = "/docs"
+            headers["X-API-Schema"] = "/openapi.json"
+
+
+def build_default_stages() -> List[PipelineStage]:
+    """Stages in the order the separate middlewares used to wrap each other"""
+    return [
+        ErrorHandlingStage(),
+        HealthCheckStage(),
+        RequestMetricsStage(),
+        CSRFStage(),
+        SecurityStage(),
+        ValidationStage(),
+        ApiHeadersStage()
+    ]
+
+
+class RequestPipelineMiddleware:
+    """
+    Pure-ASGI middleware running a list of stages.
+
+    Stages run in order before the application and in reverse order on the
+    response headers, so the first stage sees every outcome. Responses are
+    streamed through untouched; only the ``http.response.start`` message is
+    edited. Health and metrics paths skip the pipeline entirely.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        stages: Optional[Sequence[PipelineStage]] = None,
+        bypass_paths: Iterable[str] = DEFAULT_BYPASS_PATHS
+    ):
+        self.app = app
+        self.stages = list(stages) if stages is not None else build_default_stages()
+        self.bypass_paths = tuple(bypass_paths)
+
+    def get_stage(self, name: str) -> Optional[PipelineStage]:
+        for stage in self.stages:
+            if stage.name == name:
+                return stage
+        return None
+
+    def _bypassed(self, path: str) -> bool:
+        return any(path == p or path.startswith(p + "/") for p in self.bypass_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or self._bypassed(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        ctx = RequestContext(scope, receive)
+        entered: List[PipelineStage] = []
+
+        async def send_with_headers(message: Message):
+            if message["type"] == "http.response.start":
+                ctx.status_code = message["status"]
+                ctx.response_started = True
+                headers = MutableHeaders(scope=message)
+                for stage in reversed(entered):
+                    stage.after(ctx, headers)
+            await send(message)
+
+        try:
+            try:
+                for stage in self.stages:
+                    entered.append(stage)
+                    response = await stage.before(ctx)
+                    if response is not None:
+                        await response(scope, receive, send_with_headers)
+                        return
+
+                await self.app(scope, ctx.receive_for_app(), send_with_headers)
+            except Exception as exc:
+                if ctx.response_started:
+                    raise
+                for stage in reversed(entered):
+                    response = await stage.on_error(ctx, exc)
+                    if response is not None:
+                        await response(scope, receive, send_with_headers)
+                        return
+                raise
+        finally:
+            for stage in reversed(entered):
+                stage.finish(ctx)
+
+
+__all__ = [
+    'RequestContext',
+    'PipelineStage',
+    'ErrorHandlingStage',
+    'HealthCheckStage',
+    'RequestMetricsStage',
+    'CSRFStage',
+    'SecurityStage',
+    'ValidationStage',
+    'ApiHeadersStage',
+    'RequestPipelineMiddleware',
+    'build_default_stages',
+    'DEFAULT_BYPASS_PATHS'
+]
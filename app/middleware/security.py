@@ -477,7 +477,7 @@ class SecurityMiddleware(BaseHTTPMiddleware):
             f"Security violation: {violation_type}",
             client_ip=client_ip,
             violation_type=violation_type,
-            message=message
+            detail=message
         )
         
         error_data = {
@@ -162,6 +162,8 @@ class JobPost(BaseDocument):
     application_deadline: Optional[datetime] = None
     external_url: Optional[str] = None
     views_count: int = Field(default=0)
+    trending_score: float = Field(default=0.0)
+    trending_updated_at: Optional[datetime] = None
     applications_count: int = Field(default=0)
     featured: bool = Field(default=False)
     
@@ -174,7 +176,29 @@ class JobPost(BaseDocument):
             "experience_level",
             "is_remote",
             "featured",
-            "created_at"
+            "created_at",
+            "trending_score"
+        ]
+
+class JobAlert(BaseDocument):
+    """Saved search a job seeker wants to be alerted about"""
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+    
+    user_id: PydanticObjectId = Field(..., description="Reference to User document")
+    name: Optional[str] = None
+    keywords: List[str] = Field(default_factory=list)
+    job_types: List[str] = Field(default_factory=list)
+    remote_only: bool = Field(default=False)
+    min_salary: Optional[int] = None
+    locations: List[str] = Field(default_factory=list)
+    is_active: bool = Field(default=True)
+    last_sent_at: Optional[datetime] = None
+    
+    class Settings:
+        name = "job_alerts"
+        indexes = [
+            "user_id",
+            "is_active"
         ]
 
 class JobApplication(BaseDocument):
@@ -382,6 +406,7 @@ __all__ = [
     "JobSeeker", 
     "Employer",
     "JobPost",
+    "JobAlert",
     "JobApplication",
     "ContactSubmission",
     "ContactInformation",
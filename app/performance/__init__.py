@@ -8,6 +8,7 @@ for web scraping operations, including:
 - Metric collection and aggregation
 - Error tracking and reporting
 - Performance analytics and insights
+- Stage-level spans, latency histograms and per-session profiling
 """
 
 from .tracker import (
@@ -19,6 +20,16 @@ from .tracker import (
     performance_tracker,
     track_performance
 )
+from .tracing import (
+    STAGES,
+    StageTracer,
+    Span,
+    LatencyHistogram,
+    JsonFileSpanSink,
+    SamplingProfiler,
+    TraceSession,
+    get_stage_tracer
+)
 
 __all__ = [
     'PerformanceTracker',
@@ -27,7 +38,15 @@ __all__ = [
     'PerformanceMetric',
     'MetricType',
     'performance_tracker',
-    'track_performance'
+    'track_performance',
+    'STAGES',
+    'StageTracer',
+    'Span',
+    'LatencyHistogram',
+    'JsonFileSpanSink',
+    'SamplingProfiler',
+    'TraceSession',
+    'get_stage_tracer'
 ]
 
 __version__ = '1.0.0'
\ No newline at end of file
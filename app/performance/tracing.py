@@ -0,0 +1,491 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from collections import Counter
+from contextvars import ContextVar
+from pathlib import Path
+import bisect
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Pipeline stages a span can cover, in pipeline order
+STAGES = ("fetch", "render", "parse", "normalize", "dedup", "store")
+
+# Upper bucket bounds in milliseconds; anything slower lands in the overflow bucket
+LATENCY_BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram; constant memory however many spans it sees"""
+
+    def __init__(self, bounds: Tuple[float, ...] = LATENCY_BUCKETS_MS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = float("inf")
+        self.max_ms = 0.0
+
+    def observe(self, value_ms: float):
+        self.counts[bisect.bisect_left(self.bounds, value_ms)] += 1
+        self.count += 1
+        self.total_ms += value_ms
+        self.min_ms = min(self.min_ms, value_ms)
+        self.max_ms = max(self.max_ms, value_ms)
+
+    def merge(self, other: "LatencyHistogram"):
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.count += other.count
+        self.total_ms += other.total_ms
+        self.min_ms = min(self.min_ms, other.min_ms)
+        self.max_ms = max(self.max_ms, other.max_ms)
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th observation, capped at the max seen"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                bound = self.bounds[index] if index < len(self.bounds) else self.max_ms
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.mean_ms, 3),
+            "min_ms": round(self.min_ms, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "p50_ms": round(self.quantile(0.5), 3),
+            "p95_ms": round(self.quantile(0.95), 3),
+            "p99_ms": round(self.quantile(0.99), 3),
+            "buckets": dict(zip([str(b) for b in self.bounds] + ["+Inf"], self.counts)),
+        }
+
+
+def _trace_id_for(session_id: str) -> str:
+    """All spans of one scraping session share a trace id derived from its session id"""
+    return hashlib.md5(session_id.encode("utf-8")).hexdigest()
+
+
+def _new_span_id() -> str:
+    return os.urandom(8).hex()
+
+
+class Span:
+    """
+    One timed stage of the pipeline.
+
+    Use as ``with tracer.span("fetch", url=url):`` or ``async with``.
+    Board, source and session are inherited from the enclosing span or
+    trace session unless given. Spans opened inside another span become
+    its children, and the parent's self time excludes them.
+    """
+
+    def __init__(self, tracer: "StageTracer", stage: str, board: str, source: str,
+                 session_id: Optional[str], attributes: Dict[str, Any]):
+        self.tracer = tracer
+        self.stage = stage
+        self.board = board
+        self.source = source
+        self.session_id = session_id
+        self.attributes = attributes
+        self.trace_id = _trace_id_for(session_id) if session_id else os.urandom(16).hex()
+        self.span_id = _new_span_id()
+        self.parent: Optional[Span] = None
+        self.start_ns = 0
+        self.end_ns = 0
+        self.child_ms = 0.0
+        self.error: Optional[str] = None
+        self._started = 0.0
+        self._token = None
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6 if self.end_ns else 0.0
+
+    @property
+    def self_ms(self) -> float:
+        return max(0.0, self.duration_ms - self.child_ms)
+
+    def __enter__(self) -> "Span":
+        self.parent = _current_span.get()
+        if self.parent is not None and self.parent.session_id == self.session_id:
+            self.trace_id = self.parent.trace_id
+        self._token = _current_span.set(self)
+        self.start_ns = time.time_ns()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        elapsed = time.perf_counter() - self._started
+        self.end_ns = self.start_ns + max(1, int(elapsed * 1e9))
+        _current_span.reset(self._token)
+        if exc_type is not None:
+            self.error = f"{exc_type.__name__}: {exc_val}"
+        if self.parent is not None:
+            self.parent.child_ms += self.duration_ms
+        self.tracer._finish(self)
+        return False
+
+    async def __aenter__(self) -> "Span":
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return self.__exit__(exc_type, exc_val, exc_tb)
+
+    def to_otlp(self) -> Dict[str, Any]:
+        attributes = {"stage": self.stage, "board": self.board, "source": self.source}
+        if self.session_id:
+            attributes["session.id"] = self.session_id
+        attributes.update(self.attributes)
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.stage,
+            "kind": 1,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [_otlp_attribute(k, v) for k, v in attributes.items() if v is not None],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+        if self.parent is not None:
+            span["parentSpanId"] = self.parent.span_id
+        return span
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(getattr(value, "value", value))}
+    return {"key": key, "value": typed}
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("stage_span", default=None)
+
+
+class JsonFileSpanSink:
+    """
+    Appends finished spans to a local file in OTLP JSON form.
+
+    Spans are buffered and written ``max_buffer`` at a time, one
+    ``resourceSpans`` export request per line, which is the layout the
+    OpenTelemetry collector's file exporter produces and its file
+    receiver reads back.
+    """
+
+    def __init__(self, path: str, service_name: str = "remotehive-scraper", max_buffer: int = 256):
+        self.path = Path(path)
+        self.service_name = service_name
+        self.max_buffer = max(1, max_buffer)
+        self._buffer: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self.exported = 0
+
+    def export(self, span: Span):
+        with self._lock:
+            self._buffer.append(span.to_otlp())
+            if len(self._buffer) < self.max_buffer:
+                return
+            batch, self._buffer = self._buffer, []
+        self._write(batch)
+
+    def flush(self):
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+        if batch:
+            self._write(batch)
+
+    def _write(self, batch: List[Dict[str, Any]]):
+        request = {
+            "resourceSpans": [{
+                "resource": {"attributes": [_otlp_attribute("service.name", self.service_name)]},
+                "scopeSpans": [{"scope": {"name": __name__}, "spans": batch}],
+            }]
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self._lock, open(self.path, "a", encoding="utf-8") as handle:
+                handle.write(json.dumps(request, separators=(",", ":")) + "\n")
+            self.exported += len(batch)
+        except OSError as e:
+            logger.warning(f"Failed to write {len(batch)} spans to {self.path}: {e}")
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler for one thread.
+
+    A daemon thread reads the target thread's stack every ``interval``
+    seconds and counts folded stacks (``module:function;...`` root
+    first), so the profiled code runs untouched and the overhead is
+    bounded by the sampling rate rather than the call rate.
+    """
+
+    def __init__(self, thread_id: Optional[int] = None, interval: float = 0.005, max_depth: int = 64):
+        self.thread_id = thread_id or threading.get_ident()
+        self.interval = interval
+        self.max_depth = max_depth
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="stage-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Dict[str, Any]:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        return self.summary()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None and len(names) < self.max_depth:
+                code = frame.f_code
+                names.append(f"{frame.f_globals.get('__name__', '?')}:{code.co_name}")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(names))] += 1
+            self.samples += 1
+
+    def top_functions(self, limit: int = 20) -> List[Tuple[str, int]]:
+        """Leaf functions by sample count, i.e. where the time is actually spent"""
+        leaves: Counter = Counter()
+        for stack, count in self.stacks.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        return leaves.most_common(limit)
+
+    def summary(self, limit: int = 20) -> Dict[str, Any]:
+        return {
+            "samples": self.samples,
+            "interval_ms": self.interval * 1000,
+            "top_functions": self.top_functions(limit),
+        }
+
+    def write_folded(self, path: str):
+        """Folded stacks, one ``stack count`` per line, as flamegraph tools expect"""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as handle:
+            for stack, count in self.stacks.most_common():
+                handle.write(f"{stack} {count}\n")
+
+
+class TraceSession:
+    """Defaults and per-stage self time for the spans of one scraping session"""
+
+    def __init__(self, session_id: str, board: str, source: str):
+        self.session_id = session_id
+        self.board = board
+        self.source = source
+        self.stage_ms: Dict[str, float] = {stage: 0.0 for stage in STAGES}
+        self.profiler: Optional[SamplingProfiler] = None
+        self.profile: Optional[Dict[str, Any]] = None
+
+    def breakdown(self) -> Dict[str, Any]:
+        total = sum(self.stage_ms.values())
+        return {
+            stage: {"self_ms": round(ms, 3), "share": round(ms / total, 3) if total else 0.0}
+            for stage, ms in self.stage_ms.items()
+        }
+
+
+_current_session: ContextVar[Optional[TraceSession]] = ContextVar("trace_session", default=None)
+
+
+class StageTracer:
+    """
+    Per-stage latency histograms keyed by (stage, board, source).
+
+    Every finished span is counted in its histogram; only spans of
+    sampled sessions (``sample_rate``, decided per trace so a session is
+    exported whole or not at all) are handed to the sink. Sessions opened
+    with ``session()`` can additionally run a ``SamplingProfiler`` when
+    profiling is enabled globally or requested for that session.
+    """
+
+    def __init__(self, sink: Optional[JsonFileSpanSink] = None, sample_rate: float = 1.0,
+                 profiling_enabled: bool = False, profile_interval: float = 0.005,
+                 profile_dir: Optional[str] = None):
+        self.sink = sink
+        self.sample_rate = sample_rate
+        self.profiling_enabled = profiling_enabled
+        self.profile_interval = profile_interval
+        self.profile_dir = profile_dir
+        self._histograms: Dict[Tuple[str, str, str], LatencyHistogram] = {}
+        self._errors: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def span(self, stage: str, board: Optional[str] = None, source: Optional[str] = None,
+             session_id: Optional[str] = None, **attributes: Any) -> Span:
+        if stage not in STAGES:
+            raise ValueError(f"Unknown pipeline stage '{stage}', expected one of {', '.join(STAGES)}")
+        inherited = _current_span.get() or _current_session.get()
+        if inherited is not None:
+            board = board or inherited.board
+            source = source or inherited.source
+            session_id = session_id or inherited.session_id
+        return Span(self, stage, _label(board), _label(source), session_id, attributes)
+
+    def _sampled(self, trace_id: str) -> bool:
+        if self.sample_rate >= 1.0:
+            return True
+        return int(trace_id[:8], 16) / 0xFFFFFFFF < self.sample_rate
+
+    def _finish(self, span: Span):
+        key = (span.stage, span.board, span.source)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = LatencyHistogram()
+            histogram.observe(span.duration_ms)
+            if span.error:
+                self._errors[key] += 1
+        session = _current_session.get()
+        if session is not None and session.session_id == span.session_id:
+            session.stage_ms[span.stage] += span.self_ms
+        if self.sink is not None and self._sampled(span.trace_id):
+            self.sink.export(span)
+
+    def session(self, session_id: str, board: Optional[str] = None, source: Optional[str] = None,
+                profile: Optional[bool] = None) -> "_SessionScope":
+        """Scope spans to a scraping session; ``profile`` overrides the global profiler toggle"""
+        return _SessionScope(self, TraceSession(session_id, _label(board), _label(source)),
+                             self.profiling_enabled if profile is None else profile)
+
+    def _iter_matching(self, stage: Optional[str], board: Optional[str],
+                       source: Optional[str]) -> Iterable[Tuple[Tuple[str, str, str], LatencyHistogram]]:
+        for key, histogram in self._histograms.items():
+            if (stage is None or key[0] == stage) and (board is None or key[1] == board) \
+                    and (source is None or key[2] == source):
+                yield key, histogram
+
+    def histogram(self, stage: str, board: Optional[str] = None,
+                  source: Optional[str] = None) -> LatencyHistogram:
+        """Merged histogram for a stage, optionally narrowed to a board and/or source"""
+        merged = LatencyHistogram()
+        with self._lock:
+            for _, histogram in self._iter_matching(stage, board, source):
+                merged.merge(histogram)
+        return merged
+
+    def summary(self, board: Optional[str] = None, source: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Latency stats per stage, in pipeline order, for the stages that have spans"""
+        result = {}
+        for stage in STAGES:
+            histogram = self.histogram(stage, board, source)
+            if histogram.count:
+                result[stage] = histogram.to_dict()
+        return result
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Every (stage, board, source) histogram, for export or an admin endpoint"""
+        with self._lock:
+            return [
+                {"stage": stage, "board": board, "source": source,
+                 "errors": self._errors.get((stage, board, source), 0), **histogram.to_dict()}
+                for (stage, board, source), histogram in sorted(self._histograms.items())
+            ]
+
+    def flush(self):
+        if self.sink is not None:
+            self.sink.flush()
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._errors.clear()
+
+
+class _SessionScope:
+    def __init__(self, tracer: StageTracer, session: TraceSession, profile: bool):
+        self.tracer = tracer
+        self.session = session
+        self.profile = profile
+        self._token = None
+
+    def __enter__(self) -> TraceSession:
+        self._token = _current_session.set(self.session)
+        if self.profile:
+            self.session.profiler = SamplingProfiler(interval=self.tracer.profile_interval)
+            self.session.profiler.start()
+        return self.session
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        _current_session.reset(self._token)
+        profiler = self.session.profiler
+        if profiler is not None:
+            self.session.profile = profiler.stop()
+            if self.tracer.profile_dir:
+                path = os.path.join(self.tracer.profile_dir, f"{self.session.session_id}.folded")
+                try:
+                    profiler.write_folded(path)
+                    self.session.profile["folded_path"] = path
+                except OSError as e:
+                    logger.warning(f"Failed to write profile for session {self.session.session_id}: {e}")
+        self.tracer.flush()
+        return False
+
+    async def __aenter__(self) -> TraceSession:
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return self.__exit__(exc_type, exc_val, exc_tb)
+
+
+def _label(value: Any) -> str:
+    if value is None:
+        return "unknown"
+    return str(getattr(value, "value", value))
+
+
+# Shared tracer; created on first use from settings
+_default_tracer: Optional[StageTracer] = None
+_default_tracer_lock = threading.Lock()
+
+
+def get_stage_tracer() -> StageTracer:
+    """The process-wide stage tracer every engine reports into"""
+    global _default_tracer
+    with _default_tracer_lock:
+        if _default_tracer is None:
+            from app.core.config import settings
+            sink = JsonFileSpanSink(settings.SCRAPER_TRACE_FILE) if settings.SCRAPER_TRACE_FILE else None
+            _default_tracer = StageTracer(
+                sink=sink,
+                sample_rate=settings.SCRAPER_TRACE_SAMPLE_RATE,
+                profiling_enabled=settings.SCRAPER_PROFILING_ENABLED,
+                profile_interval=settings.SCRAPER_PROFILE_INTERVAL_MS / 1000,
+                profile_dir=settings.SCRAPER_PROFILE_DIR or None,
+            )
+        return _default_tracer
@@ -1,12 +1,12 @@
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
+from typing import Deque, Dict, Any, List, Optional
 from dataclasses import dataclass, field
 from enum import Enum
 import logging
 import time
 import psutil
 import threading
-from collections import defaultdict
+from collections import defaultdict, deque
 
 logger = logging.getLogger(__name__)
 
@@ -97,9 +97,10 @@ class ScrapingSession:
 class PerformanceTracker:
     """Enhanced performance tracking for scraping operations"""
     
-    def __init__(self):
+    def __init__(self, max_global_metrics: int = 10000):
         self.sessions: Dict[str, ScrapingSession] = {}
-        self.global_metrics: List[PerformanceMetric] = []
+        # Metrics for unknown sessions; oldest are dropped once full
+        self.global_metrics: Deque[PerformanceMetric] = deque(maxlen=max_global_metrics)
         self._lock = threading.Lock()
         self._system_monitor_active = False
         self._system_metrics = {}
@@ -231,10 +232,10 @@ class PerformanceTracker:
         
         with self._lock:
             initial_count = len(self.global_metrics)
-            self.global_metrics = [
-                metric for metric in self.global_metrics 
-                if metric.timestamp > cutoff_time
-            ]
+            self.global_metrics = deque(
+                (metric for metric in self.global_metrics if metric.timestamp > cutoff_time),
+                maxlen=self.global_metrics.maxlen
+            )
             cleaned_count = initial_count - len(self.global_metrics)
             
             if cleaned_count > 0:
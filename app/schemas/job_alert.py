@@ -0,0 +1,33 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+
+
+class JobAlertBase(BaseModel):
+    """Base schema for job alert criteria"""
+    name: Optional[str] = None
+    keywords: List[str] = Field(default_factory=list, description="Words that must all appear in the job")
+    job_types: List[str] = Field(default_factory=list)
+    remote_only: bool = False
+    min_salary: Optional[int] = Field(None, ge=0)
+    locations: List[str] = Field(default_factory=list)
+
+
+class JobAlertCreate(JobAlertBase):
+    """Schema for creating a job alert"""
+    pass
+
+
+class JobAlertResponse(JobAlertBase):
+    """Schema for job alert response"""
+    id: str
+    user_id: str
+    is_active: bool
+    last_sent_at: Optional[datetime] = None
+    created_at: datetime
+
+
+class JobAlertList(BaseModel):
+    """Schema for job alerts list response"""
+    alerts: List[JobAlertResponse]
+    total: int
@@ -21,7 +21,10 @@ from .exceptions import (
 from .playwright_engine import PlaywrightScrapingEngine, PlaywrightConfig
 from .config import get_scraping_config, EnhancedScrapingConfig, ScrapingMode
 from ..core.enums import ScraperSource
-from ..performance.tracker import PerformanceTracker, MetricType
+from ..performance.tracker import performance_tracker, MetricType
+from ..performance.tracing import get_stage_tracer
+from ..services.page_cache import get_page_cache
+from ..services.taxonomy import get_taxonomy
 
 logger = logging.getLogger(__name__)
 
@@ -55,6 +58,10 @@ class ScrapingConfig:
     enable_stealth: bool = True
     enable_deduplication: bool = True
     intelligent_rate_limiting: bool = True
+    # Conditional requests and raw page archive (see app.services.page_cache)
+    use_page_cache: bool = True
+    # Sample this session's stacks even when profiling is off globally
+    enable_profiling: bool = False
 
 @dataclass
 class ScrapingSession:
@@ -64,12 +71,15 @@ class ScrapingSession:
     start_time: datetime
     end_time: Optional[datetime] = None
     pages_scraped: int = 0
+    pages_unchanged: int = 0
     jobs_found: int = 0
     jobs_parsed: int = 0
     jobs_valid: int = 0
     errors: List[str] = field(default_factory=list)
     raw_jobs: List[Dict[str, Any]] = field(default_factory=list)
     parsed_jobs: List[ParsedJobPost] = field(default_factory=list)
+    # Pages whose validators this session recorded; forgotten if their jobs never land
+    cached_pages: List[str] = field(default_factory=list)
     performance_metrics: Dict[str, Any] = field(default_factory=dict)
     success: bool = False
     
@@ -127,11 +137,13 @@ class WebScrapingEngine:
             source=config.source
         )
         
-        # Performance tracking
-        if performance_session_id:
-            self.performance_tracker = PerformanceTracker()
-        else:
-            self.performance_tracker = None
+        # Validators and archived bodies from earlier runs
+        self.page_cache = get_page_cache() if config.use_page_cache else None
+        
+        # Performance tracking goes to the shared tracker so sessions aggregate
+        self.performance_tracker = performance_tracker if performance_session_id else None
+        self.tracer = get_stage_tracer()
+        self.trace_board = urlparse(config.base_url).netloc or config.source.value
     
     def _create_session(self) -> requests.Session:
         """Create configured requests session"""
@@ -194,53 +206,66 @@ class WebScrapingEngine:
                 self.performance_session_id, "scraping_session_started", 1, MetricType.COUNTER
             )
         
-        try:
-            if use_playwright and self.playwright_engine:
-                # Use Playwright-based scraping
-                result = await self._scrape_with_playwright(
-                    scraping_session,
-                    search_query or self.config.search_query,
-                    location or self.config.location,
-                    job_type or self.config.job_type
-                )
-                scraping_session = result
-            elif self.session:
-                # Use traditional requests-based scraping
-                self._scrape_with_requests(scraping_session, search_query, location, job_type)
-            else:
-                raise ScrapingError("No suitable scraping engine available")
+        trace_scope = self.tracer.session(
+            self.performance_session_id or session_id,
+            board=self.trace_board,
+            source=self.config.source,
+            profile=True if self.config.enable_profiling else None
+        )
+        with trace_scope as trace:
+            try:
+                if use_playwright and self.playwright_engine:
+                    # Use Playwright-based scraping
+                    result = await self._scrape_with_playwright(
+                        scraping_session,
+                        search_query or self.config.search_query,
+                        location or self.config.location,
+                        job_type or self.config.job_type
+                    )
+                    scraping_session = result
+                elif self.session:
+                    # Use traditional requests-based scraping
+                    self._scrape_with_requests(scraping_session, search_query, location, job_type)
+                else:
+                    raise ScrapingError("No suitable scraping engine available")
             
-            # Mark as successful if we got some valid jobs
-            scraping_session.success = scraping_session.jobs_valid > 0
+                # Mark as successful if we got some valid jobs
+                scraping_session.success = scraping_session.jobs_valid > 0
             
-        except Exception as e:
-            error_msg = f"Scraping session failed: {str(e)}"
-            logger.error(error_msg)
-            scraping_session.errors.append(error_msg)
-            scraping_session.success = False
+            except Exception as e:
+                error_msg = f"Scraping session failed: {str(e)}"
+                logger.error(error_msg)
+                scraping_session.errors.append(error_msg)
+                scraping_session.success = False
+                self.forget_cached_pages(scraping_session)
         
-        finally:
-            scraping_session.end_time = datetime.utcnow()
+            finally:
+                scraping_session.end_time = datetime.utcnow()
             
-            # Record final performance metrics
-            if self.performance_tracker and self.performance_session_id:
-                self.performance_tracker.record_metric(
-                    self.performance_session_id, "scraping_session_completed", 1, MetricType.COUNTER
-                )
-                self.performance_tracker.record_metric(
-                    self.performance_session_id, "jobs_scraped_total", scraping_session.jobs_found, MetricType.COUNTER
-                )
-                self.performance_tracker.record_metric(
-                    self.performance_session_id, "jobs_valid_total", scraping_session.jobs_valid, MetricType.COUNTER
-                )
+                # Record final performance metrics
+                if self.performance_tracker and self.performance_session_id:
+                    self.performance_tracker.record_metric(
+                        self.performance_session_id, "scraping_session_completed", 1, MetricType.COUNTER
+                    )
+                    self.performance_tracker.record_metric(
+                        self.performance_session_id, "jobs_scraped_total", scraping_session.jobs_found, MetricType.COUNTER
+                    )
+                    self.performance_tracker.record_metric(
+                        self.performance_session_id, "jobs_valid_total", scraping_session.jobs_valid, MetricType.COUNTER
+                    )
             
-            logger.info(
-                f"Scraping session {session_id} completed. "
-                f"Pages: {scraping_session.pages_scraped}, "
-                f"Jobs found: {scraping_session.jobs_found}, "
-                f"Valid jobs: {scraping_session.jobs_valid}, "
-                f"Duration: {scraping_session.duration:.2f}s"
-            )
+                logger.info(
+                    f"Scraping session {session_id} completed. "
+                    f"Pages: {scraping_session.pages_scraped}, "
+                    f"Jobs found: {scraping_session.jobs_found}, "
+                    f"Valid jobs: {scraping_session.jobs_valid}, "
+                    f"Duration: {scraping_session.duration:.2f}s"
+                )
+        
+        # Where this session spent its time, by stage
+        scraping_session.performance_metrics['stages'] = trace.breakdown()
+        if trace.profile:
+            scraping_session.performance_metrics['profile'] = trace.profile
         
         return scraping_session
     
@@ -490,6 +515,7 @@ class WebScrapingEngine:
         current_page = 1
         
         while current_page <= self.config.max_pages:
+            page_url = None
             try:
                 # Build page URL
                 page_url = self._build_page_url(search_url, current_page)
@@ -505,26 +531,36 @@ class WebScrapingEngine:
                 
                 scraping_session.pages_scraped += 1
                 
-                # Extract job listings from page
-                jobs_on_page = self._extract_jobs_from_page(response.text, page_url)
-                
-                if not jobs_on_page:
-                    logger.info(f"No jobs found on page {current_page}, stopping pagination")
-                    break
-                
-                scraping_session.raw_jobs.extend(jobs_on_page)
-                scraping_session.jobs_found += len(jobs_on_page)
-                
-                logger.info(f"Found {len(jobs_on_page)} jobs on page {current_page}")
-                
-                # Record performance metrics
-                if self.performance_tracker and self.performance_session_id:
-                    self.performance_tracker.record_metric(
-                        self.performance_session_id, "page_scraped", 1, MetricType.COUNTER
-                    )
-                    self.performance_tracker.record_metric(
-                        self.performance_session_id, "jobs_found_on_page", len(jobs_on_page), MetricType.COUNTER
-                    )
+                if self._is_unchanged_page(page_url, response):
+                    # Jobs on this page were extracted by an earlier run
+                    scraping_session.pages_unchanged += 1
+                    logger.info(f"Page {current_page} unchanged since last scrape, skipping parse")
+                else:
+                    if self.page_cache is not None:
+                        scraping_session.cached_pages.append(page_url)
+                    
+                    # Extract job listings from page
+                    jobs_on_page = self._extract_jobs_from_page(response.text, page_url)
+                    
+                    if not jobs_on_page:
+                        # Fetch it in full next time in case the selectors change
+                        self._forget_page(scraping_session, page_url)
+                        logger.info(f"No jobs found on page {current_page}, stopping pagination")
+                        break
+                    
+                    scraping_session.raw_jobs.extend(jobs_on_page)
+                    scraping_session.jobs_found += len(jobs_on_page)
+                    
+                    logger.info(f"Found {len(jobs_on_page)} jobs on page {current_page}")
+                    
+                    # Record performance metrics
+                    if self.performance_tracker and self.performance_session_id:
+                        self.performance_tracker.record_metric(
+                            self.performance_session_id, "page_scraped", 1, MetricType.COUNTER
+                        )
+                        self.performance_tracker.record_metric(
+                            self.performance_session_id, "jobs_found_on_page", len(jobs_on_page), MetricType.COUNTER
+                        )
                 
                 current_page += 1
                 
@@ -537,6 +573,9 @@ class WebScrapingEngine:
                 error_msg = f"Error scraping page {current_page} of {search_url}: {str(e)}"
                 logger.error(error_msg)
                 scraping_session.errors.append(error_msg)
+                # The validator may already be recorded; make the next run refetch in full
+                if page_url is not None:
+                    self._forget_page(scraping_session, page_url)
                 break
     
     def _build_page_url(self, base_search_url: str, page_number: int) -> str:
@@ -560,62 +599,106 @@ class WebScrapingEngine:
     
     def _make_request(self, url: str) -> Optional[requests.Response]:
         """Make HTTP request with error handling"""
-        try:
-            logger.debug(f"Making request to: {url}")
+        with self.tracer.span('fetch', url=url) as span:
+            try:
+                logger.debug(f"Making request to: {url}")
             
-            response = self.session.get(
-                url,
-                timeout=self.config.request_timeout,
-                verify=self.config.verify_ssl,
-                allow_redirects=self.config.follow_redirects
-            )
+                # Let the server answer 304 for pages seen on an earlier run
+                conditional_headers = self.page_cache.conditional_headers(url) if self.page_cache else None
             
-            # Check for common error conditions
-            if response.status_code == 429:
-                raise RateLimitError(f"Rate limited by {urlparse(url).netloc}")
-            elif response.status_code == 403:
-                # Check for CAPTCHA
-                if 'captcha' in response.text.lower() or 'robot' in response.text.lower():
-                    raise CaptchaError(f"CAPTCHA detected on {url}")
-                else:
-                    raise AuthenticationError(f"Access forbidden to {url}")
-            elif response.status_code >= 400:
-                raise NetworkError(f"HTTP {response.status_code} error for {url}")
+                response = self.session.get(
+                    url,
+                    headers=conditional_headers,
+                    timeout=self.config.request_timeout,
+                    verify=self.config.verify_ssl,
+                    allow_redirects=self.config.follow_redirects
+                )
+            
+                # Check for common error conditions
+                if response.status_code == 429:
+                    raise RateLimitError(f"Rate limited by {urlparse(url).netloc}")
+                elif response.status_code == 403:
+                    # Check for CAPTCHA
+                    if 'captcha' in response.text.lower() or 'robot' in response.text.lower():
+                        raise CaptchaError(f"CAPTCHA detected on {url}")
+                    else:
+                        raise AuthenticationError(f"Access forbidden to {url}")
+                elif response.status_code >= 400:
+                    raise NetworkError(f"HTTP {response.status_code} error for {url}")
             
-            response.raise_for_status()
-            return response
+                response.raise_for_status()
+                span.set_attribute('http.status_code', response.status_code)
+                return response
             
-        except requests.exceptions.Timeout:
-            raise TimeoutError(f"Request timeout for {url}")
-        except requests.exceptions.ConnectionError as e:
-            raise NetworkError(f"Connection error for {url}: {str(e)}")
-        except requests.exceptions.RequestException as e:
-            raise ScrapingError(f"Request failed for {url}: {str(e)}")
+            except requests.exceptions.Timeout:
+                raise TimeoutError(f"Request timeout for {url}")
+            except requests.exceptions.ConnectionError as e:
+                raise NetworkError(f"Connection error for {url}: {str(e)}")
+            except requests.exceptions.RequestException as e:
+                raise ScrapingError(f"Request failed for {url}: {str(e)}")
+    
+    def _is_unchanged_page(self, url: str, response: requests.Response) -> bool:
+        """Record a page in the cache; True for a 304 or a body identical to the last fetch"""
+        if self.page_cache is None:
+            return False
+        try:
+            fetch = self.page_cache.record(url, response.status_code, response.headers, response.content)
+        except Exception as e:
+            logger.warning(f"Page cache unavailable for {url}: {str(e)}")
+            return False
+        return not fetch.changed
+    
+    def _forget_page(self, scraping_session: ScrapingSession, url: str):
+        """Drop one page's validators so the next run extracts it again"""
+        if self.page_cache is None:
+            return
+        try:
+            self.page_cache.forget(url)
+        except Exception as e:
+            logger.warning(f"Could not forget cached page {url}: {str(e)}")
+        if url in scraping_session.cached_pages:
+            scraping_session.cached_pages.remove(url)
+    
+    def forget_cached_pages(self, scraping_session: ScrapingSession):
+        """Forget every page this session recorded; call when its jobs fail to parse or store"""
+        for url in list(scraping_session.cached_pages):
+            self._forget_page(scraping_session, url)
+    
+    def extract_jobs_from_archive(self, page_url: str) -> List[Dict[str, Any]]:
+        """Re-run extraction on the archived body of a page without refetching it"""
+        if self.page_cache is None:
+            raise ConfigurationError("Page cache is disabled")
+        body = self.page_cache.load_body(page_url)
+        if body is None:
+            return []
+        return self._extract_jobs_from_page(body.decode('utf-8', errors='replace'), page_url)
     
     def _extract_jobs_from_page(self, html_content: str, page_url: str) -> List[Dict[str, Any]]:
         """Extract job listings from a search results page"""
         jobs = []
         
-        try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+        with self.tracer.span('parse', url=page_url) as span:
+            try:
+                soup = BeautifulSoup(html_content, 'html.parser')
             
-            # Source-specific job extraction
-            if self.config.source == ScraperSource.INDEED:
-                jobs = self._extract_indeed_jobs(soup, page_url)
-            elif self.config.source == ScraperSource.LINKEDIN:
-                jobs = self._extract_linkedin_jobs(soup, page_url)
-            elif self.config.source == ScraperSource.GLASSDOOR:
-                jobs = self._extract_glassdoor_jobs(soup, page_url)
-            elif self.config.source == ScraperSource.REMOTE_OK:
-                jobs = self._extract_remote_ok_jobs(soup, page_url)
-            elif self.config.source == ScraperSource.WE_WORK_REMOTELY:
-                jobs = self._extract_wwr_jobs(soup, page_url)
-            else:
-                # Generic extraction using parsing rules
-                jobs = self._extract_generic_jobs(soup, page_url)
+                # Source-specific job extraction
+                if self.config.source == ScraperSource.INDEED:
+                    jobs = self._extract_indeed_jobs(soup, page_url)
+                elif self.config.source == ScraperSource.LINKEDIN:
+                    jobs = self._extract_linkedin_jobs(soup, page_url)
+                elif self.config.source == ScraperSource.GLASSDOOR:
+                    jobs = self._extract_glassdoor_jobs(soup, page_url)
+                elif self.config.source == ScraperSource.REMOTE_OK:
+                    jobs = self._extract_remote_ok_jobs(soup, page_url)
+                elif self.config.source == ScraperSource.WE_WORK_REMOTELY:
+                    jobs = self._extract_wwr_jobs(soup, page_url)
+                else:
+                    # Generic extraction using parsing rules
+                    jobs = self._extract_generic_jobs(soup, page_url)
             
-        except Exception as e:
-            logger.error(f"Failed to extract jobs from page {page_url}: {str(e)}")
+            except Exception as e:
+                logger.error(f"Failed to extract jobs from page {page_url}: {str(e)}")
+            span.set_attribute('jobs', len(jobs))
         
         return jobs
     
@@ -844,16 +927,18 @@ class WebScrapingEngine:
         
         for raw_job in scraping_session.raw_jobs:
             try:
-                # For jobs that have detailed URLs, fetch full content
-                if raw_job.get('job_url'):
-                    full_job_content = self._fetch_job_details(raw_job['job_url'])
-                    if full_job_content:
-                        parsed_job = self.parser.parse_job(full_job_content, raw_job['job_url'])
+                # Detail fetches show up as child fetch spans
+                with self.tracer.span('normalize'):
+                    # For jobs that have detailed URLs, fetch full content
+                    if raw_job.get('job_url'):
+                        full_job_content = self._fetch_job_details(raw_job['job_url'])
+                        if full_job_content:
+                            parsed_job = self.parser.parse_job(full_job_content, raw_job['job_url'])
+                        else:
+                            # Fallback to parsing from summary data
+                            parsed_job = self._parse_job_from_summary(raw_job)
                     else:
-                        # Fallback to parsing from summary data
                         parsed_job = self._parse_job_from_summary(raw_job)
-                else:
-                    parsed_job = self._parse_job_from_summary(raw_job)
                 
                 if parsed_job and parsed_job.is_valid():
                     scraping_session.parsed_jobs.append(parsed_job)
@@ -863,6 +948,8 @@ class WebScrapingEngine:
                 
             except Exception as e:
                 logger.warning(f"Failed to parse job: {str(e)}")
+                # The job is lost unless its page is extracted again next run
+                self.forget_cached_pages(scraping_session)
                 continue
         
         logger.info(f"Successfully parsed {scraping_session.jobs_valid} valid jobs out of {scraping_session.jobs_parsed}")
@@ -901,10 +988,10 @@ class WebScrapingEngine:
                 job.salary_max = salary_info.get('max_salary')
                 job.salary_currency = salary_info.get('currency')
             
-            # Detect job type and experience level
-            combined_text = f"{job.title or ''} {job.description or ''}"
-            job.job_type = ScrapingUtils.detect_job_type(combined_text)
-            job.experience_level = ScrapingUtils.extract_experience_level(combined_text)
+            # Detect job type and experience level in one pass over the text
+            tags = get_taxonomy().extract(f"{job.title or ''} {job.description or ''}")
+            job.job_type = tags.primary('job_type', 'unknown')
+            job.experience_level = tags.primary('seniority', 'unknown')
             
             # Set remote friendly based on location or description
             if job.location:
@@ -21,7 +21,8 @@ from .exceptions import (
     CaptchaError, AuthenticationError, ConfigurationError
 )
 from ..core.enums import ScraperSource
-from ..performance.tracker import PerformanceTracker, MetricType
+from ..performance.tracker import performance_tracker, MetricType
+from ..performance.tracing import get_stage_tracer
 
 logger = logging.getLogger(__name__)
 
@@ -171,7 +172,8 @@ class PlaywrightScrapingEngine:
     
     def __init__(self, config: PlaywrightConfig, performance_session_id: str = None):
         self.config = config
-        self.performance_tracker = PerformanceTracker()
+        self.performance_tracker = performance_tracker
+        self.tracer = get_stage_tracer()
         self.performance_session_id = performance_session_id
         self.rate_limiter = IntelligentRateLimiter()
         self.deduplication = ContentDeduplication()
@@ -265,7 +267,9 @@ class PlaywrightScrapingEngine:
         for url in urls:
             try:
                 # Check for duplicate URL
-                if self.deduplication.is_duplicate_url(url):
+                with self.tracer.span('dedup', source=source):
+                    duplicate_url = self.deduplication.is_duplicate_url(url)
+                if duplicate_url:
                     logger.info(f"Skipping duplicate URL: {url}")
                     self.stats['duplicates_filtered'] += 1
                     continue
@@ -298,28 +302,35 @@ class PlaywrightScrapingEngine:
     async def _scrape_single_page(self, url: str, source: ScraperSource) -> List[ParsedJobPost]:
         """Scrape a single page for job listings"""
         try:
-            # Navigate with retry logic
-            await self._navigate_with_retry(url)
-            
-            # Wait for content to load
-            await self._wait_for_content_load(source)
+            async with self.tracer.span('render', source=source, url=url):
+                # Navigate with retry logic
+                await self._navigate_with_retry(url)
+                
+                # Wait for content to load
+                await self._wait_for_content_load(source)
             
             # Extract job data
-            job_elements = await self._extract_job_elements(source)
+            async with self.tracer.span('parse', source=source, url=url) as span:
+                job_elements = await self._extract_job_elements(source)
+                span.set_attribute('jobs', len(job_elements))
             
             # Parse jobs
             jobs = []
             for element in job_elements:
                 try:
-                    job_data = await self._extract_job_data(element, source, url)
+                    async with self.tracer.span('parse', source=source):
+                        job_data = await self._extract_job_data(element, source, url)
                     
                     # Check for duplicate content
-                    if self.deduplication.is_duplicate_content(job_data.get('description', '')):
+                    with self.tracer.span('dedup', source=source):
+                        duplicate = self.deduplication.is_duplicate_content(job_data.get('description', ''))
+                    if duplicate:
                         self.stats['duplicates_filtered'] += 1
                         continue
                     
                     # Parse job post
-                    parsed_job = self.job_parser.parse_job_post(job_data)
+                    with self.tracer.span('normalize', source=source):
+                        parsed_job = self.job_parser.parse_job_post(job_data)
                     if parsed_job:
                         jobs.append(parsed_job)
                         self.stats['jobs_found'] += 1
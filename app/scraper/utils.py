@@ -11,6 +11,7 @@ from dataclasses import dataclass
 import logging
 
 from .exceptions import RateLimitError, ValidationError
+from ..services.taxonomy import get_taxonomy
 
 logger = logging.getLogger(__name__)
 
@@ -192,47 +193,12 @@ class ScrapingUtils:
     @staticmethod
     def detect_job_type(text: str) -> str:
         """Detect job type from text"""
-        if not text:
-            return 'unknown'
-        
-        text_lower = text.lower()
-        
-        # Job type patterns
-        patterns = {
-            'full-time': ['full-time', 'full time', 'permanent', 'ft'],
-            'part-time': ['part-time', 'part time', 'pt'],
-            'contract': ['contract', 'contractor', 'freelance', 'temporary', 'temp'],
-            'internship': ['intern', 'internship', 'trainee'],
-            'remote': ['remote', 'work from home', 'wfh', '100% remote'],
-        }
-        
-        for job_type, keywords in patterns.items():
-            if any(keyword in text_lower for keyword in keywords):
-                return job_type
-        
-        return 'unknown'
+        return get_taxonomy().primary(text, 'job_type', 'unknown')
     
     @staticmethod
     def extract_experience_level(text: str) -> str:
         """Extract experience level from text"""
-        if not text:
-            return 'unknown'
-        
-        text_lower = text.lower()
-        
-        # Experience level patterns
-        patterns = {
-            'entry': ['entry', 'junior', 'graduate', 'new grad', '0-1 year', '0-2 year'],
-            'mid': ['mid', 'intermediate', '2-5 year', '3-5 year', '2+ year'],
-            'senior': ['senior', 'lead', '5+ year', '5-10 year', 'experienced'],
-            'executive': ['director', 'vp', 'vice president', 'cto', 'ceo', 'head of']
-        }
-        
-        for level, keywords in patterns.items():
-            if any(keyword in text_lower for keyword in keywords):
-                return level
-        
-        return 'unknown'
+        return get_taxonomy().primary(text, 'seniority', 'unknown')
     
     @staticmethod
     def generate_user_agent() -> str:
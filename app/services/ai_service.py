@@ -13,6 +13,7 @@ except ImportError:
     genai = None
 
 from ..core.config import settings
+from .recommendation_engine import recommendation_index, parse_json_list
 
 logger = logging.getLogger(__name__)
 
@@ -60,36 +61,44 @@ class AIService:
             saved_job_ids = [saved.get("job_post_id") for saved in saved_jobs]
             excluded_ids = list(set(applied_job_ids + saved_job_ids))
             
-            query_filter = {"status": "active"}
-            if excluded_ids:
-                query_filter["_id"] = {"$nin": excluded_ids}
-            
-            # Apply basic filtering based on user preferences
-            if job_seeker.get("preferred_job_types"):
-                try:
-                    job_types = json.loads(job_seeker.get("preferred_job_types"))
-                    if job_types:
-                        query_filter["job_type"] = {"$in": job_types}
-                except:
-                    pass
-            
-            if job_seeker.get("remote_work_preference"):
-                query_filter["is_remote"] = True
-            
-            if job_seeker.get("min_salary"):
-                query_filter["salary_min"] = {"$gte": job_seeker.get("min_salary")}
-            
-            available_jobs = await db.job_posts.find(query_filter).sort("created_at", -1).limit(50).to_list(length=50)
-            
-            if not available_jobs:
+            # Score the whole active catalogue against the profile using the
+            # precomputed index; only the small top-k goes to the LLM
+            await recommendation_index.ensure_synced(db)
+            excluded_ids = [str(i) for i in excluded_ids if i]
+            fingerprint = recommendation_index.profile_fingerprint(job_seeker, excluded_ids, limit)
+            cached = recommendation_index.get_cached(user_id, fingerprint)
+            if cached is not None:
+                return cached[:limit]
+            
+            job_types = parse_json_list(job_seeker.get("preferred_job_types"))
+            top_k = max(limit * 2, 20) if self.available else limit
+            scored = await recommendation_index.score_async(
+                recommendation_index.profile_text(job_seeker),
+                top_k=top_k,
+                job_types=job_types or None,
+                remote_only=bool(job_seeker.get("remote_work_preference")),
+                min_salary=job_seeker.get("min_salary"),
+                exclude_ids=excluded_ids
+            )
+            
+            if not scored:
                 return []
             
-            # Use AI to rank and recommend jobs if available
+            available_jobs = []
+            for job_id, similarity in scored:
+                job = dict(recommendation_index.get_job(job_id) or {})
+                job["match_score"] = similarity
+                available_jobs.append(job)
+            
+            # Use AI to re-rank the top candidates if available
             if self.available:
-                return await self._ai_rank_jobs(job_seeker, available_jobs, limit)
+                recommendations = await self._ai_rank_jobs(job_seeker, available_jobs, limit)
             else:
                 # Fallback to simple scoring
-                return self._simple_rank_jobs(job_seeker, available_jobs, limit)
+                recommendations = self._simple_rank_jobs(job_seeker, available_jobs, limit)
+            
+            recommendation_index.set_cached(user_id, fingerprint, recommendations)
+            return recommendations
                 
         except Exception as e:
             logger.error(f"Error generating job recommendations: {e}")
@@ -189,7 +198,8 @@ class AIService:
         scored_jobs = []
         
         for job in jobs:
-            score = 0
+            # Start from the index similarity when the job came from the index
+            score = round(job.get("match_score", 0) * 50)
             
             # Score based on job type preference
             if job_seeker.get("preferred_job_types"):
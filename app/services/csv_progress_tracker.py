@@ -96,6 +96,19 @@ class CSVProgressTracker:
         
         # TODO: Implement progress callbacks when MongoDB model is available
         # await self._trigger_progress_callbacks(upload_id, csv_import)
+        
+        # Fan the update out to subscribers on every worker
+        progress_data = {
+            'upload_id': upload_id,
+            'processed_count': processed_count,
+            'status': status.value if status else None,
+            'updated_at': datetime.utcnow().isoformat()
+        }
+        if additional_data:
+            progress_data.update(additional_data)
+        
+        from app.services.websocket_service import websocket_manager
+        await websocket_manager.send_csv_import_update(upload_id, progress_data)
     
     async def log_row_result(
         self,
@@ -0,0 +1,393 @@
+import html
+import logging
+import queue
+import re
+import smtplib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from email.message import Message
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from typing import Dict, Any, List, Optional, Iterable
+
+logger = logging.getLogger(__name__)
+
+# Recipient fields that caller-supplied bulk templates may reference as
+# ``{{ name }}``; everything else in a template is sent verbatim
+RECIPIENT_VARIABLES = ("user_name", "to_email", "base_url")
+_PLACEHOLDER_PATTERN = re.compile(r"\{\{\s*(" + "|".join(RECIPIENT_VARIABLES) + r")\s*\}\}")
+
+
+@dataclass
+class OutboundEmail:
+    """A fully rendered email ready for delivery"""
+    to_email: str
+    subject: str
+    html_content: str
+    reply_to: Optional[str] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class DeliveryResult:
+    to_email: str
+    success: bool
+    error: Optional[str] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class BatchReport:
+    """Outcome of one delivery batch"""
+    batch_number: int
+    total: int
+    sent: int
+    failed: int
+    duration_seconds: float
+    results: List[DeliveryResult] = field(default_factory=list)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "batch_number": self.batch_number,
+            "total": self.total,
+            "sent": self.sent,
+            "failed": self.failed,
+            "duration_seconds": round(self.duration_seconds, 3)
+        }
+
+
+class PlaceholderTemplate:
+    """
+    Caller-supplied text with ``{{ name }}`` slots for whitelisted recipient fields.
+
+    The source is split once; rendering only joins the literal text with
+    the recipient's values, so nothing in the template is evaluated and
+    any other ``{{``/``{%`` sequences pass through unchanged.
+    """
+
+    def __init__(self, source: str, escape):
+        parts = _PLACEHOLDER_PATTERN.split(source)
+        self._literals = parts[0::2]
+        self._names = parts[1::2]
+        self._escape = escape
+
+    def render(self, variables: Dict[str, Any]) -> str:
+        rendered = [self._literals[0]]
+        for name, literal in zip(self._names, self._literals[1:]):
+            value = variables.get(name)
+            rendered.append(self._escape("" if value is None else str(value)))
+            rendered.append(literal)
+        return "".join(rendered)
+
+
+def _escape_header(value: str) -> str:
+    # Keep substituted values from breaking out of the subject header
+    return value.replace("\r", " ").replace("\n", " ")
+
+
+class RateLimiter:
+    """Thread-safe token bucket"""
+
+    def __init__(self, rate_per_second: float, burst: Optional[int] = None):
+        self.rate = rate_per_second
+        self.capacity = burst or max(1, int(rate_per_second))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def set_rate(self, rate_per_second: float, burst: Optional[int] = None):
+        """Change the refill rate; tokens already earned are kept up to the new capacity"""
+        with self._lock:
+            self.rate = rate_per_second
+            self.capacity = burst or max(1, int(rate_per_second))
+            self._tokens = min(self._tokens, float(self.capacity))
+
+    def acquire(self):
+        """Block until a token is available"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+# One limiter per SMTP provider, shared by every engine in the process
+_provider_limiters: Dict[str, RateLimiter] = {}
+_provider_limiters_lock = threading.Lock()
+
+
+def get_provider_rate_limiter(host: str, rate_per_second: float) -> RateLimiter:
+    """The shared limiter for a provider, retuned when a different rate is configured"""
+    with _provider_limiters_lock:
+        limiter = _provider_limiters.get(host)
+        if limiter is None:
+            limiter = RateLimiter(rate_per_second)
+            _provider_limiters[host] = limiter
+        elif limiter.rate != rate_per_second:
+            logger.info(f"SMTP rate limit for {host} changed from {limiter.rate}/s to {rate_per_second}/s")
+            limiter.set_rate(rate_per_second)
+        return limiter
+
+
+class SMTPConnectionPool:
+    """
+    Small pool of persistent, authenticated SMTP sessions.
+
+    Connections are checked with NOOP before reuse and discarded on any
+    error; at most ``size`` sessions are open at once.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        use_tls: bool = False,
+        size: int = 4,
+        timeout: int = 30
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.size = size
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[smtplib.SMTP]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._closed = False
+
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.use_tls:
+            server.starttls()
+        if self.username and self.password:
+            server.login(self.username, self.password)
+        return server
+
+    @staticmethod
+    def _is_alive(server: smtplib.SMTP) -> bool:
+        try:
+            return server.noop()[0] == 250
+        except smtplib.SMTPException:
+            return False
+        except OSError:
+            return False
+
+    @staticmethod
+    def _quietly_close(server: smtplib.SMTP):
+        try:
+            server.quit()
+        except Exception:
+            try:
+                server.close()
+            except Exception:
+                pass
+
+    @contextmanager
+    def connection(self):
+        """Borrow a live SMTP session"""
+        self._slots.acquire()
+        server = None
+        try:
+            while server is None:
+                try:
+                    candidate = self._idle.get_nowait()
+                except queue.Empty:
+                    server = self._connect()
+                    break
+                if self._is_alive(candidate):
+                    server = candidate
+                else:
+                    self._quietly_close(candidate)
+            try:
+                yield server
+            except (smtplib.SMTPServerDisconnected, OSError):
+                self._quietly_close(server)
+                server = None
+                raise
+        finally:
+            if server is not None:
+                if self._closed:
+                    self._quietly_close(server)
+                else:
+                    self._idle.put(server)
+            self._slots.release()
+
+    def close(self):
+        """Close every idle session"""
+        self._closed = True
+        while True:
+            try:
+                self._quietly_close(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+
+class EmailDeliveryEngine:
+    """
+    Concurrent email delivery over pooled SMTP sessions.
+
+    Messages are sent by a thread pool no larger than the connection pool,
+    throttled by a per-provider token bucket, and reported per batch.
+    """
+
+    def __init__(
+        self,
+        pool: SMTPConnectionPool,
+        from_email: str,
+        rate_per_second: float = 10.0,
+        batch_size: int = 100
+    ):
+        self.pool = pool
+        self.from_email = from_email
+        self.batch_size = batch_size
+        self.rate_limiter = get_provider_rate_limiter(pool.host, rate_per_second)
+        self._executor = ThreadPoolExecutor(max_workers=pool.size, thread_name_prefix="smtp")
+        self._template_cache: Dict[Any, PlaceholderTemplate] = {}
+
+    @classmethod
+    def from_settings(cls) -> "EmailDeliveryEngine":
+        from app.core.config import settings
+
+        pool = SMTPConnectionPool(
+            host=settings.EMAIL_HOST,
+            port=settings.EMAIL_PORT,
+            username=settings.EMAIL_USERNAME,
+            password=settings.EMAIL_PASSWORD,
+            use_tls=settings.EMAIL_USE_TLS,
+            size=settings.EMAIL_SMTP_POOL_SIZE
+        )
+        return cls(
+            pool,
+            from_email=settings.EMAIL_FROM,
+            rate_per_second=settings.EMAIL_RATE_LIMIT_PER_SECOND,
+            batch_size=settings.EMAIL_BATCH_SIZE
+        )
+
+    def _compile(self, source: str, is_html: bool) -> PlaceholderTemplate:
+        """Split a template into literal text and recipient slots once per distinct source"""
+        key = (source, is_html)
+        template = self._template_cache.get(key)
+        if template is None:
+            template = PlaceholderTemplate(source, html.escape if is_html else _escape_header)
+            self._template_cache[key] = template
+        return template
+
+    def render_messages(
+        self,
+        html_template: str,
+        subject_template: str,
+        recipients: Iterable[Dict[str, Any]],
+        reply_to: Optional[str] = None
+    ) -> List[OutboundEmail]:
+        """
+        Render one message per recipient from shared templates.
+
+        Only the ``RECIPIENT_VARIABLES`` placeholders are substituted; values
+        are HTML-escaped in the body. Templates are not evaluated, so content
+        from callers cannot run template code.
+
+        Args:
+            html_template: Body source, split once
+            subject_template: Subject source, split once
+            recipients: Per-recipient variables; each must include ``to_email``
+
+        Returns:
+            Rendered messages
+        """
+        body = self._compile(html_template, is_html=True)
+        subject = self._compile(subject_template, is_html=False)
+        messages = []
+        for variables in recipients:
+            messages.append(OutboundEmail(
+                to_email=variables["to_email"],
+                subject=subject.render(variables),
+                html_content=body.render(variables),
+                reply_to=reply_to,
+                metadata={k: v for k, v in variables.items() if k == "user_id"}
+            ))
+        return messages
+
+    def build_mime(self, email: OutboundEmail) -> Message:
+        msg = MIMEMultipart('alternative')
+        msg['From'] = self.from_email
+        msg['To'] = email.to_email
+        msg['Subject'] = email.subject
+        if email.reply_to:
+            msg['Reply-To'] = email.reply_to
+        msg.attach(MIMEText(email.html_content, 'html'))
+        return msg
+
+    def send_message(self, msg: Message, retries: int = 1):
+        """Send a prepared MIME message over a pooled session"""
+        for attempt in range(retries + 1):
+            self.rate_limiter.acquire()
+            try:
+                with self.pool.connection() as server:
+                    server.send_message(msg)
+                return
+            except (smtplib.SMTPServerDisconnected, OSError):
+                # Stale session; the pool has discarded it
+                if attempt == retries:
+                    raise
+
+    def _deliver(self, email: OutboundEmail) -> DeliveryResult:
+        try:
+            self.send_message(self.build_mime(email))
+            return DeliveryResult(email.to_email, True, metadata=email.metadata)
+        except Exception as e:
+            logger.error(f"Failed to send email to {email.to_email}: {str(e)}")
+            return DeliveryResult(email.to_email, False, error=str(e), metadata=email.metadata)
+
+    def send_batch(self, emails: List[OutboundEmail], batch_number: int = 1) -> BatchReport:
+        """Send a batch concurrently and report its outcome"""
+        started = time.monotonic()
+        results = list(self._executor.map(self._deliver, emails))
+        sent = sum(1 for r in results if r.success)
+        report = BatchReport(
+            batch_number=batch_number,
+            total=len(results),
+            sent=sent,
+            failed=len(results) - sent,
+            duration_seconds=time.monotonic() - started,
+            results=results
+        )
+        logger.info(
+            f"Email batch {batch_number}: {report.sent}/{report.total} sent "
+            f"in {report.duration_seconds:.2f}s"
+        )
+        return report
+
+    def send_all(self, emails: List[OutboundEmail]) -> List[BatchReport]:
+        """Send messages in batches of ``batch_size``"""
+        return [
+            self.send_batch(emails[start:start + self.batch_size], batch_number=number)
+            for number, start in enumerate(range(0, len(emails), self.batch_size), start=1)
+        ]
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self.pool.close()
+
+
+_default_engine: Optional[EmailDeliveryEngine] = None
+_default_engine_lock = threading.Lock()
+
+
+def get_delivery_engine() -> EmailDeliveryEngine:
+    """Process-wide engine so single sends reuse pooled SMTP sessions"""
+    global _default_engine
+    with _default_engine_lock:
+        if _default_engine is None:
+            _default_engine = EmailDeliveryEngine.from_settings()
+        return _default_engine
@@ -3,7 +3,7 @@ from motor.motor_asyncio import AsyncIOMotorDatabase
 from typing import List, Optional, Dict, Any
 # MongoDB models are handled as dictionaries
 from app.services.email_service import EmailService
-from app.core.security import get_password_hash
+from app.core.security import get_password_hash_async
 import uuid
 from datetime import datetime
 import secrets
@@ -36,7 +36,7 @@ class EmailManagementService:
                 "email_address": email_address,
                 "full_name": full_name,
                 "personal_email": personal_email,
-                "password_hash": get_password_hash(temp_password),
+                "password_hash": await get_password_hash_async(temp_password),
                 "role": role,
                 "is_active": True,
                 "created_by": created_by,
@@ -137,7 +137,7 @@ class EmailManagementService:
                 {"_id": user_id},
                 {
                     "$set": {
-                        "password_hash": get_password_hash(new_temp_password),
+                        "password_hash": await get_password_hash_async(new_temp_password),
                         "password_reset_by": reset_by,
                         "password_reset_at": datetime.utcnow(),
                         "must_change_password": True
@@ -0,0 +1,323 @@
+import asyncio
+import calendar
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+import aiohttp
+import feedparser
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (compatible; RemoteHive/1.0; +https://remotehive.com)"
+
+
+@dataclass
+class FeedState:
+    """Per-feed ingestion state carried between runs"""
+    feed_url: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    last_guid: Optional[str] = None
+    watermark: Optional[float] = None  # newest entry timestamp seen, UTC epoch seconds
+    updated_at: Optional[float] = None
+
+
+@dataclass
+class FeedUpdate:
+    """Result of fetching one feed against its stored state"""
+    feed_url: str
+    not_modified: bool = False
+    entries: List[Any] = field(default_factory=list)
+    total_entries: int = 0
+    feed: Dict[str, Any] = field(default_factory=dict)
+    status_code: Optional[int] = None
+    response_size: int = 0
+    error: Optional[str] = None
+    next_state: Optional[FeedState] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def entry_guid(entry) -> str:
+    """Stable identity of a feed entry: its id/guid, falling back to the link"""
+    return (entry.get("id") or entry.get("link") or "").strip()
+
+
+def entry_timestamp(entry) -> Optional[float]:
+    """Publication time of an entry as UTC epoch seconds"""
+    parsed = entry.get("published_parsed") or entry.get("updated_parsed")
+    if not parsed:
+        return None
+    try:
+        return float(calendar.timegm(parsed))
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def select_new_entries(entries: List[Any], state: FeedState) -> Tuple[List[Any], Optional[str], Optional[float]]:
+    """
+    Pick the entries a feed has gained since the stored state.
+
+    Dated entries are new when they are newer than the watermark (or as
+    new and not the last one seen). Undated entries are new when they come
+    before the last-seen GUID in feed order, since feeds list the newest
+    first. Returns (new entries, next last GUID, next watermark).
+    """
+    new_entries = []
+    watermark = state.watermark
+    reached_last_seen = False
+
+    for entry in entries:
+        guid = entry_guid(entry)
+        if state.last_guid and guid == state.last_guid:
+            reached_last_seen = True
+            continue
+
+        published = entry_timestamp(entry)
+        if published is not None and state.watermark is not None:
+            is_new = published > state.watermark or (
+                published == state.watermark and guid != state.last_guid
+            )
+        elif published is not None:
+            is_new = True
+        else:
+            is_new = not reached_last_seen
+
+        if is_new:
+            new_entries.append(entry)
+        if published is not None and (watermark is None or published > watermark):
+            watermark = published
+
+    next_guid = entry_guid(entries[0]) if entries else state.last_guid
+    return new_entries, next_guid or state.last_guid, watermark
+
+
+def build_feed_update(
+    state: FeedState,
+    status_code: int,
+    headers: Mapping[str, str],
+    body: Optional[bytes]
+) -> FeedUpdate:
+    """
+    Turn a feed response into a FeedUpdate.
+
+    Parses the body (CPU-bound; run it off the event loop) and keeps only
+    entries newer than the stored state. ``next_state`` should be saved
+    once the returned entries have been stored.
+    """
+    now = time.time()
+    if status_code == 304:
+        return FeedUpdate(
+            feed_url=state.feed_url,
+            not_modified=True,
+            status_code=status_code,
+            next_state=replace(state, updated_at=now)
+        )
+
+    normalized = {key.lower(): value for key, value in headers.items()}
+    parsed = feedparser.parse(body or b"")
+    if parsed.bozo:
+        logger.warning(f"RSS feed parsing warning for {state.feed_url}: {parsed.bozo_exception}")
+
+    new_entries, last_guid, watermark = select_new_entries(parsed.entries, state)
+    return FeedUpdate(
+        feed_url=state.feed_url,
+        entries=new_entries,
+        total_entries=len(parsed.entries),
+        feed=dict(parsed.feed),
+        status_code=status_code,
+        response_size=len(body or b""),
+        next_state=FeedState(
+            feed_url=state.feed_url,
+            etag=normalized.get("etag"),
+            last_modified=normalized.get("last-modified"),
+            last_guid=last_guid,
+            watermark=watermark,
+            updated_at=now
+        )
+    )
+
+
+def conditional_headers(state: FeedState) -> Dict[str, str]:
+    headers = {}
+    if state.etag:
+        headers["If-None-Match"] = state.etag
+    if state.last_modified:
+        headers["If-Modified-Since"] = state.last_modified
+    return headers
+
+
+class FeedStateStore:
+    """SQLite-backed FeedState per feed URL"""
+
+    def __init__(self, path: Union[str, Path]):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS feeds (
+                feed_url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                last_guid TEXT,
+                watermark REAL,
+                updated_at REAL
+            )
+            """
+        )
+        self._db.commit()
+
+    def get(self, feed_url: str) -> FeedState:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT feed_url, etag, last_modified, last_guid, watermark, updated_at FROM feeds WHERE feed_url = ?",
+                (feed_url,)
+            ).fetchone()
+        return FeedState(*row) if row else FeedState(feed_url=feed_url)
+
+    def save(self, state: FeedState):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO feeds (feed_url, etag, last_modified, last_guid, watermark, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (state.feed_url, state.etag, state.last_modified, state.last_guid, state.watermark, state.updated_at)
+            )
+            self._db.commit()
+
+    def reset(self, feed_url: str):
+        """Forget a feed so the next run ingests it from scratch"""
+        with self._lock:
+            self._db.execute("DELETE FROM feeds WHERE feed_url = ?", (feed_url,))
+            self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class FeedFetcher:
+    """
+    Incremental RSS/Atom fetcher shared by every job board.
+
+    One pooled aiohttp session serves all feeds, with concurrency bounded
+    globally and per host. Each fetch is conditional on the feed's stored
+    ETag/Last-Modified, and only entries newer than the stored watermark
+    are returned. Call ``commit`` after storing an update's entries so a
+    failed run is retried from the same state.
+    """
+
+    def __init__(
+        self,
+        store: FeedStateStore,
+        max_concurrency: int = 10,
+        per_host_limit: int = 2,
+        timeout: float = 30.0,
+        user_agent: str = DEFAULT_USER_AGENT
+    ):
+        self.store = store
+        self.max_concurrency = max_concurrency
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency, limit_per_host=self.per_host_limit),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={"User-Agent": self.user_agent}
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+
+    async def fetch(
+        self,
+        feed_url: str,
+        headers: Optional[Mapping[str, str]] = None,
+        timeout: Optional[float] = None
+    ) -> FeedUpdate:
+        """Fetch one feed; network and HTTP errors are reported in ``error``"""
+        session = await self._get_session()
+        state = await asyncio.to_thread(self.store.get, feed_url)
+        request_headers = {**(headers or {}), **conditional_headers(state)}
+        kwargs = {"headers": request_headers}
+        if timeout:
+            kwargs["timeout"] = aiohttp.ClientTimeout(total=timeout)
+
+        try:
+            async with self._semaphore:
+                async with session.get(feed_url, **kwargs) as response:
+                    status_code = response.status
+                    response_headers = dict(response.headers)
+                    body = await response.read() if status_code != 304 else None
+        except asyncio.TimeoutError:
+            return FeedUpdate(feed_url=feed_url, error="Feed request timed out")
+        except aiohttp.ClientError as e:
+            return FeedUpdate(feed_url=feed_url, error=f"Feed request failed: {str(e)}")
+
+        if status_code >= 400:
+            return FeedUpdate(feed_url=feed_url, status_code=status_code, error=f"HTTP {status_code} error for {feed_url}")
+
+        return await asyncio.to_thread(build_feed_update, state, status_code, response_headers, body)
+
+    async def fetch_many(
+        self,
+        feeds: Iterable[Union[str, Tuple[str, Optional[Mapping[str, str]]]]],
+        timeout: Optional[float] = None
+    ) -> Dict[str, FeedUpdate]:
+        """Fetch many feeds concurrently; items are URLs or (url, headers) pairs"""
+        requests = {}
+        for feed in feeds:
+            url, headers = (feed, None) if isinstance(feed, str) else feed
+            if url and url not in requests:
+                requests[url] = headers
+
+        updates = await asyncio.gather(*(self.fetch(url, headers, timeout) for url, headers in requests.items()))
+        return dict(zip(requests, updates))
+
+    def commit(self, update: FeedUpdate):
+        """Persist the state an update was computed against as consumed"""
+        if update.next_state is not None:
+            self.store.save(update.next_state)
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+# Shared fetcher; its session is created on first use in the running loop
+_default_fetcher: Optional[FeedFetcher] = None
+_default_store: Optional[FeedStateStore] = None
+_default_lock = threading.Lock()
+
+
+def get_feed_state_store() -> FeedStateStore:
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = FeedStateStore(Path(settings.SCRAPER_CACHE_DIR) / "feeds.sqlite3")
+        return _default_store
+
+
+def get_feed_fetcher() -> FeedFetcher:
+    global _default_fetcher
+    store = get_feed_state_store()
+    with _default_lock:
+        if _default_fetcher is None:
+            _default_fetcher = FeedFetcher(store, max_concurrency=settings.SCRAPER_FEED_CONCURRENCY)
+        return _default_fetcher
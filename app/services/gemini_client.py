@@ -11,16 +11,39 @@ except ImportError:
         GEMINI_API_KEY = None
     settings = MockSettings()
 
+from .model_backend import (
+    GeminiBackend, ModelBackend, ModelWorkerPool, TTLCache, config_fingerprint, text_hash
+)
+
 logger = logging.getLogger(__name__)
 
 class GeminiClient:
-    """Client for interacting with Google's Gemini API for job data parsing"""
+    """Client for interacting with Google's Gemini API for job data parsing
+    
+    Requests run on a bounded worker pool and results are cached by
+    cleaned-content hash and field mapping; pass a ``backend`` to use a
+    different model (``FakeModelBackend`` for offline tests).
+    """
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, backend: Optional[ModelBackend] = None):
         self.api_key = api_key or getattr(settings, 'GEMINI_API_KEY', None)
         self.model = None
         self.available = False
-        self._initialize()
+        self.backend = backend
+        self.pool: Optional[ModelWorkerPool] = None
+        self.cache = TTLCache(
+            max_size=getattr(settings, 'ML_PARSE_CACHE_SIZE', 2048),
+            ttl=getattr(settings, 'ML_PARSE_CACHE_TTL_SECONDS', 86400)
+        )
+        if backend is None:
+            self._initialize()
+        if self.backend is not None:
+            self.pool = ModelWorkerPool(
+                self.backend,
+                max_workers=getattr(settings, 'ML_MODEL_WORKERS', 4),
+                max_batch_size=getattr(settings, 'ML_MODEL_BATCH_SIZE', 8)
+            )
+            self.available = True
     
     def _initialize(self):
         """Initialize the Gemini API client"""
@@ -28,7 +51,7 @@ class GeminiClient:
             if self.api_key:
                 genai.configure(api_key=self.api_key)
                 self.model = genai.GenerativeModel('gemini-1.5-flash')
-                self.available = True
+                self.backend = GeminiBackend(self.model)
                 logger.info("Gemini client initialized successfully")
             else:
                 logger.warning("Gemini API key not provided")
@@ -43,18 +66,25 @@ class GeminiClient:
         
         try:
             # Build parsing prompt
-            prompt = self._build_parsing_prompt(html_content, field_mapping)
+            cleaned_content = self._clean_html(html_content)
+            cache_key = (text_hash(cleaned_content), config_fingerprint(field_mapping))
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return dict(cached)
+            
+            prompt = self._build_parsing_prompt(html_content, field_mapping, cleaned_content)
             
-            # Generate content with Gemini
-            response = self.model.generate_content(prompt)
+            # Generate content off the event loop through the worker pool
+            response_text = await self.pool.submit(prompt)
             
             # Parse JSON response
-            parsed_data = json.loads(response.text)
+            parsed_data = json.loads(response_text)
             
             # Add confidence score if not present
             if 'confidence' not in parsed_data:
                 parsed_data['confidence'] = self._calculate_confidence(parsed_data)
             
+            self.cache.set(cache_key, dict(parsed_data))
             return parsed_data
             
         except json.JSONDecodeError as e:
@@ -64,10 +94,12 @@ class GeminiClient:
             logger.error(f"Error parsing job data with Gemini: {e}")
             raise
     
-    def _build_parsing_prompt(self, html_content: str, field_mapping: Dict[str, Any] = None) -> str:
+    def _build_parsing_prompt(self, html_content: str, field_mapping: Dict[str, Any] = None,
+                              cleaned_content: Optional[str] = None) -> str:
         """Build the parsing prompt for Gemini"""
         # Clean HTML content
-        cleaned_content = self._clean_html(html_content)
+        if cleaned_content is None:
+            cleaned_content = self._clean_html(html_content)
         
         # Base prompt
         prompt = f"""
@@ -152,8 +184,8 @@ Important:
         
         try:
             # Simple test prompt
-            response = self.model.generate_content("Return the JSON: {\"test\": \"success\"}")
-            test_data = json.loads(response.text)
+            response_text = await self.pool.submit("Return the JSON: {\"test\": \"success\"}")
+            test_data = json.loads(response_text)
             return test_data.get('test') == 'success'
         except Exception as e:
             logger.error(f"Gemini connection test failed: {e}")
@@ -163,6 +195,9 @@ Important:
         """Get information about the current model"""
         return {
             "model_name": "gemini-1.5-flash",
+            "backend": self.backend.name if self.backend else None,
             "available": self.available,
-            "api_key_configured": bool(self.api_key)
+            "api_key_configured": bool(self.api_key),
+            "pool": self.pool.stats() if self.pool else None,
+            "cache": self.cache.stats()
         }
\ No newline at end of file
@@ -0,0 +1,198 @@
+import re
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Set, Iterable
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.\-]*")
+
+# Posting key for alerts with no indexable term; checked against every job
+_MATCH_ALL = "*"
+
+
+def tokenize(text: str) -> Set[str]:
+    """Lower-cased word tokens; keeps tech names such as c++, c# and node.js"""
+    if not text:
+        return set()
+    return {token.rstrip(".") for token in _TOKEN_RE.findall(text.lower())}
+
+
+def _as_text(value: Any) -> str:
+    if not value:
+        return ""
+    if isinstance(value, (list, tuple)):
+        return " ".join(str(v) for v in value)
+    return str(value)
+
+
+@dataclass
+class AlertCriteria:
+    """A job seeker's stored alert, normalized for matching"""
+    alert_id: str
+    user_id: str
+    keywords: List[str] = field(default_factory=list)
+    job_types: Set[str] = field(default_factory=set)
+    remote_only: bool = False
+    min_salary: Optional[int] = None
+    locations: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_document(cls, doc: Dict[str, Any]) -> "AlertCriteria":
+        return cls(
+            alert_id=str(doc.get("_id") or doc.get("id")),
+            user_id=str(doc.get("user_id")),
+            keywords=[k for k in (doc.get("keywords") or []) if k and k.strip()],
+            job_types={t.lower() for t in (doc.get("job_types") or []) if t},
+            remote_only=bool(doc.get("remote_only")),
+            min_salary=doc.get("min_salary"),
+            locations=[l.lower() for l in (doc.get("locations") or []) if l]
+        )
+
+
+class JobAlertPercolator:
+    """
+    Reverse index of saved job alerts.
+
+    Instead of running every alert as a query, each alert is broken into
+    keyword clauses (all tokens of one keyword phrase must appear; any clause
+    may match) and indexed under its clause tokens. A job is matched by
+    walking the postings of its own tokens, so the work depends on the job's
+    vocabulary and the alerts that share it, not on the total alert count.
+    Alerts without keywords are indexed under their job types, or under a
+    catch-all key when they have neither. Remaining filters are verified on
+    the small candidate set.
+    """
+
+    def __init__(self):
+        self._alerts: Dict[str, AlertCriteria] = {}
+        # token -> clause ids
+        self._postings: Dict[str, Set[str]] = defaultdict(set)
+        # clause id -> (alert id, clause tokens)
+        self._clauses: Dict[str, tuple] = {}
+        self._alert_clauses: Dict[str, List[str]] = defaultdict(list)
+
+    def __len__(self) -> int:
+        return len(self._alerts)
+
+    def add_alert(self, criteria: AlertCriteria):
+        """Index an alert, replacing any previous version"""
+        self.remove_alert(criteria.alert_id)
+        self._alerts[criteria.alert_id] = criteria
+
+        clauses = [tokenize(keyword) for keyword in criteria.keywords]
+        clauses = [tokens for tokens in clauses if tokens]
+        if clauses:
+            for position, tokens in enumerate(clauses):
+                self._add_clause(criteria.alert_id, f"{criteria.alert_id}:k{position}", tokens)
+        elif criteria.job_types:
+            for job_type in criteria.job_types:
+                self._add_clause(criteria.alert_id, f"{criteria.alert_id}:t:{job_type}", {f"type:{job_type}"})
+        else:
+            self._add_clause(criteria.alert_id, f"{criteria.alert_id}:all", {_MATCH_ALL})
+
+    def _add_clause(self, alert_id: str, clause_id: str, tokens: Set[str]):
+        self._clauses[clause_id] = (alert_id, tokens)
+        self._alert_clauses[alert_id].append(clause_id)
+        for token in tokens:
+            self._postings[token].add(clause_id)
+
+    def remove_alert(self, alert_id: str):
+        """Drop an alert and its postings"""
+        if alert_id not in self._alerts:
+            return
+        del self._alerts[alert_id]
+        for clause_id in self._alert_clauses.pop(alert_id, []):
+            _, tokens = self._clauses.pop(clause_id)
+            for token in tokens:
+                postings = self._postings.get(token)
+                if postings is None:
+                    continue
+                postings.discard(clause_id)
+                if not postings:
+                    del self._postings[token]
+
+    def load(self, alert_documents: Iterable[Dict[str, Any]]) -> int:
+        """Index a batch of alert documents"""
+        count = 0
+        for doc in alert_documents:
+            self.add_alert(AlertCriteria.from_document(doc))
+            count += 1
+        return count
+
+    @staticmethod
+    def job_tokens(job: Dict[str, Any]) -> Set[str]:
+        """Tokens a job exposes to keyword clauses"""
+        tokens = tokenize(" ".join([
+            _as_text(job.get("title")),
+            _as_text(job.get("description")),
+            _as_text(job.get("requirements")),
+            _as_text(job.get("skills_required")),
+            _as_text(job.get("company_name"))
+        ]))
+        if job.get("job_type"):
+            tokens.add(f"type:{str(job['job_type']).lower()}")
+        tokens.add(_MATCH_ALL)
+        return tokens
+
+    def match(self, job: Dict[str, Any]) -> List[AlertCriteria]:
+        """Return the alerts that a job post satisfies"""
+        hits: Dict[str, int] = defaultdict(int)
+        for token in self.job_tokens(job):
+            for clause_id in self._postings.get(token, ()):
+                hits[clause_id] += 1
+
+        candidates: Set[str] = set()
+        for clause_id, count in hits.items():
+            alert_id, tokens = self._clauses[clause_id]
+            if count >= len(tokens):
+                candidates.add(alert_id)
+
+        return [self._alerts[a] for a in candidates if self._passes_filters(self._alerts[a], job)]
+
+    @staticmethod
+    def _passes_filters(criteria: AlertCriteria, job: Dict[str, Any]) -> bool:
+        if criteria.job_types and str(job.get("job_type") or "").lower() not in criteria.job_types:
+            return False
+        if criteria.remote_only and not job.get("is_remote"):
+            return False
+        if criteria.min_salary:
+            offered = job.get("salary_max") or job.get("salary_min")
+            # Jobs that do not publish a salary are kept
+            if offered is not None and offered < criteria.min_salary:
+                return False
+        if criteria.locations:
+            location = " ".join(_as_text(job.get(key)) for key in (
+                "location", "location_city", "location_state", "location_country"
+            )).lower()
+            wants_remote = "remote" in criteria.locations
+            if not (any(l in location for l in criteria.locations) or (wants_remote and job.get("is_remote"))):
+                return False
+        return True
+
+    def build_digests(
+        self,
+        jobs: Iterable[Dict[str, Any]],
+        max_jobs_per_user: int = 20
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Match a batch of jobs and group the results per user.
+
+        Args:
+            jobs: Newly posted job documents, as stored (with ``_id``)
+            max_jobs_per_user: Cap on jobs included in one digest
+
+        Returns:
+            Mapping of user id to {"job_ids": [...], "alert_ids": set(...)}
+        """
+        digests: Dict[str, Dict[str, Any]] = {}
+        for job in jobs:
+            # Same key JobPostService.get_job_posts_by_ids looks jobs up by
+            job_id = str(job["_id"])
+            for criteria in self.match(job):
+                digest = digests.setdefault(criteria.user_id, {"job_ids": [], "alert_ids": set()})
+                digest["alert_ids"].add(criteria.alert_id)
+                if job_id not in digest["job_ids"] and len(digest["job_ids"]) < max_jobs_per_user:
+                    digest["job_ids"].append(job_id)
+        return digests
@@ -7,7 +7,6 @@ from datetime import datetime
 from typing import Dict, List, Optional, Tuple, Any
 from urllib.parse import urlparse
 
-import aiohttp
 import pandas as pd
 # from sqlalchemy.orm import Session  # Using MongoDB instead
 # from sqlalchemy import select, and_  # Using MongoDB instead
@@ -18,6 +17,7 @@ from app.database.mongodb_models import ScraperConfig
 # ScraperMemory and CSVImport need to be migrated to MongoDB
 from app.database import get_db_session
 from app.core.config import settings
+from app.services.url_probe import get_probe_engine
 
 logger = logging.getLogger(__name__)
 
@@ -146,17 +146,13 @@ class JobBoardConfigService:
     
     async def test_website_accessibility(self, url: str, timeout: int = 10) -> Tuple[bool, str]:
         """Test if a website is accessible."""
-        try:
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=timeout)) as session:
-                async with session.get(url, allow_redirects=True) as response:
-                    if response.status == 200:
-                        return True, "Website is accessible"
-                    else:
-                        return False, f"Website returned status code: {response.status}"
-        except aiohttp.ClientError as e:
-            return False, f"Connection error: {str(e)}"
-        except Exception as e:
-            return False, f"Accessibility test failed: {str(e)}"
+        result = await get_probe_engine().probe(url, timeout=timeout)
+        return result.accessible, result.message
+    
+    async def test_websites_accessibility(self, urls: List[str], timeout: int = 10) -> Dict[str, Tuple[bool, str]]:
+        """Test many websites concurrently through the shared probe engine."""
+        results = await get_probe_engine().probe_many(urls, timeout=timeout)
+        return {url: (result.accessible, result.message) for url, result in results.items()}
     
     async def process_csv_import(self, 
                                upload_id: str, 
@@ -191,11 +187,19 @@ class JobBoardConfigService:
             # self.db.add(csv_import)
             # self.db.commit()
             
-            for index, row in df.iterrows():
+            rows = df.to_dict('records')
+            
+            # Probe every board up front, concurrently, instead of once per row
+            accessibility = {}
+            if test_accessibility:
+                urls = [str(row['url']).strip() for row in rows if not pd.isna(row.get('url'))]
+                accessibility = await self.test_websites_accessibility(urls)
+            
+            for index, row in enumerate(rows):
                 try:
                     # Process each row
-                    row_result = self._process_job_board_row(
-                        row, index + 1, test_accessibility
+                    row_result = await self._process_job_board_row(
+                        row, index + 1, accessibility.get(str(row['url']).strip())
                     )
                     
                     results['processed'] += 1
@@ -239,9 +243,9 @@ class JobBoardConfigService:
         return results
     
     async def _process_job_board_row(self, 
-                                   row: pd.Series, 
+                                   row: Dict[str, Any], 
                                    row_number: int, 
-                                   test_accessibility: bool) -> Dict[str, Any]:
+                                   accessibility: Optional[Tuple[bool, str]] = None) -> Dict[str, Any]:
         """Process individual job board row and create/update scraper config."""
         
         result = {
@@ -256,15 +260,11 @@ class JobBoardConfigService:
         search_url = str(row.get('search_url', '')).strip() if not pd.isna(row.get('search_url')) else ''
         region = str(row.get('region', '')).strip() if not pd.isna(row.get('region')) else ''
         
-        # Test website accessibility if requested
-        if test_accessibility:
-            try:
-                import asyncio
-                accessible, access_msg = asyncio.run(self.test_website_accessibility(url))
-                if not accessible:
-                    result['warnings'].append(f"Row {row_number}: {access_msg}")
-            except Exception as e:
-                result['warnings'].append(f"Row {row_number}: Accessibility test failed: {str(e)}")
+        # Accessibility is probed for the whole import before rows are processed
+        if accessibility is not None:
+            accessible, access_msg = accessibility
+            if not accessible:
+                result['warnings'].append(f"Row {row_number}: {access_msg}")
         
         # Check if scraper config already exists
         existing_config = self.db.execute(
@@ -317,7 +317,7 @@ class JobBoardConfigService:
         self.db.commit()
         return result
     
-    def _prepare_config_data(self, row: pd.Series) -> Dict[str, Any]:
+    def _prepare_config_data(self, row: Dict[str, Any]) -> Dict[str, Any]:
         """Prepare scraper configuration data from CSV row."""
         # Handle optional search_url and region
         search_url = str(row.get('search_url', '')).strip() if not pd.isna(row.get('search_url')) else ''
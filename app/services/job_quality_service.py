@@ -5,6 +5,8 @@ import hashlib
 import logging
 from difflib import SequenceMatcher
 
+from app.services.taxonomy import get_taxonomy
+
 logger = logging.getLogger(__name__)
 
 class JobQualityService:
@@ -549,24 +551,7 @@ class JobQualityService:
         if not description:
             return []
         
-        # Common technical skills
-        skills_patterns = {
-            'Programming Languages': r'\b(python|java|javascript|typescript|c\+\+|c#|php|ruby|go|rust|swift|kotlin)\b',
-            'Web Technologies': r'\b(html|css|react|angular|vue|node\.js|express|django|flask|spring)\b',
-            'Databases': r'\b(sql|mysql|postgresql|mongodb|redis|elasticsearch|oracle)\b',
-            'Cloud Platforms': r'\b(aws|azure|gcp|google cloud|docker|kubernetes|terraform)\b',
-            'Tools': r'\b(git|jenkins|jira|confluence|slack|figma|photoshop)\b'
-        }
-        
-        extracted_skills = []
-        description_lower = description.lower()
-        
-        for category, pattern in skills_patterns.items():
-            matches = re.findall(pattern, description_lower, re.I)
-            extracted_skills.extend([match.upper() if len(match) <= 3 else match.title() for match in matches])
-        
-        # Remove duplicates and return
-        return list(set(extracted_skills))
+        return get_taxonomy().extract(description).labels('skills')
     
     def _determine_remote_status(self, job_data: Dict) -> str:
         """Determine remote work status."""
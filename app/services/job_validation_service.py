@@ -1,8 +1,12 @@
 import re
+import os
 import json
+import asyncio
 import logging
-from typing import Dict, List, Any, Optional, Tuple
-from datetime import datetime
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple, Iterable, AsyncIterable, AsyncIterator, Deque, Pattern, Union
+from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict
 from enum import Enum
 
@@ -44,11 +48,44 @@ class ValidationResult:
     recommendations: List[str]
     metadata: Dict[str, Any]
 
+# Batches at least this large are validated on a process pool
+PROCESS_POOL_THRESHOLD = 500
+
+# Pattern groups matched case-insensitively (the rest are case-sensitive)
+CASE_INSENSITIVE_PATTERNS = {'quality_indicators', 'remote_indicators', 'placeholder_text'}
+
+@dataclass
+class CompiledRuleSet:
+    """Validation rules with every regex compiled once"""
+    field_rules: Dict[str, Dict[str, Any]]
+    field_patterns: Dict[str, Dict[str, List[Pattern]]]
+    industry_rules: Dict[str, Dict[str, Any]]
+    quality_patterns: Dict[str, List[Pattern]]
+
+def _compile_group(name: str, patterns: List[str]) -> List[Pattern]:
+    flags = re.IGNORECASE if name in CASE_INSENSITIVE_PATTERNS else 0
+    return [re.compile(pattern, flags) for pattern in patterns]
+
+def compile_rule_set(field_rules: Dict[str, Dict[str, Any]], industry_rules: Dict[str, Dict[str, Any]],
+                     quality_patterns: Dict[str, List[str]]) -> CompiledRuleSet:
+    """Compile field and quality patterns so validation never re-parses a regex"""
+    return CompiledRuleSet(
+        field_rules=field_rules,
+        field_patterns={
+            field_name: {name: _compile_group(name, patterns) for name, patterns in rules.get('patterns', {}).items()}
+            for field_name, rules in field_rules.items()
+        },
+        industry_rules=industry_rules,
+        quality_patterns={name: _compile_group(name, patterns) for name, patterns in quality_patterns.items()}
+    )
+
 class JobDataValidator:
     """Comprehensive job data validation and quality assurance"""
     
     def __init__(self):
         self.logger = logging.getLogger(__name__)
+        self.config_field_rules: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._rule_sets: Dict[Optional[str], CompiledRuleSet] = {}
         
         # Field validation rules
         self.field_rules = {
@@ -138,51 +175,77 @@ class JobDataValidator:
             'suspicious_urls': [r'bit\.ly', r'tinyurl', r'goo\.gl']
         }
     
+    def get_rule_set(self, config_id: Optional[str] = None) -> CompiledRuleSet:
+        """Compiled rules for a config (its overrides on top of the defaults), built once"""
+        rule_set = self._rule_sets.get(config_id)
+        if rule_set is None:
+            field_rules = self.field_rules
+            overrides = self.config_field_rules.get(config_id) if config_id else None
+            if overrides:
+                field_rules = {**field_rules}
+                for field_name, rules in overrides.items():
+                    field_rules[field_name] = {**field_rules.get(field_name, {}), **rules}
+            rule_set = compile_rule_set(field_rules, self.industry_rules, self.quality_patterns)
+            self._rule_sets[config_id] = rule_set
+        return rule_set
+    
+    def set_config_rules(self, config_id: str, field_rules: Dict[str, Dict[str, Any]]):
+        """Override field rules for one config; it is recompiled on next use"""
+        self.config_field_rules[config_id] = field_rules
+        self._rule_sets.pop(config_id, None)
+    
     async def validate_job_data(self, job_data: ParsedJobData, config_id: Optional[str] = None) -> ValidationResult:
         """Comprehensive job data validation"""
+        result = self._evaluate(job_data, self.get_rule_set(config_id), config_id)
+        
+        # Store validation metrics if config_id provided
+        if config_id:
+            await self._store_validation_metrics(config_id, result.quality_score, len(result.issues), result.is_valid)
+        
+        return result
+    
+    def _evaluate(self, job_data: ParsedJobData, rule_set: CompiledRuleSet,
+                  config_id: Optional[str] = None) -> ValidationResult:
+        """Validate one job against a compiled rule set (pure CPU work, safe to run in a worker)"""
         issues = []
         field_scores = {}
         recommendations = []
         
         # Validate individual fields
-        for field_name, rules in self.field_rules.items():
+        for field_name, rules in rule_set.field_rules.items():
             field_value = getattr(job_data, field_name, None)
-            field_result = await self._validate_field(field_name, field_value, rules)
+            field_result = self._validate_field(field_name, field_value, rules, rule_set.field_patterns.get(field_name, {}))
             
             field_scores[field_name] = field_result['score']
             issues.extend(field_result['issues'])
             recommendations.extend(field_result['recommendations'])
         
         # Cross-field validation
-        cross_field_issues = await self._validate_cross_fields(job_data)
-        issues.extend(cross_field_issues)
+        issues.extend(self._validate_cross_fields(job_data))
         
         # Industry-specific validation
-        industry_issues = await self._validate_industry_context(job_data)
-        issues.extend(industry_issues)
+        issues.extend(self._validate_industry_context(job_data, rule_set))
         
         # Data quality checks
-        quality_issues = await self._validate_data_quality(job_data)
-        issues.extend(quality_issues)
+        issues.extend(self._validate_data_quality(job_data, rule_set))
+        
+        # Count severities once; scoring and recommendations reuse the counts
+        severity_counts = Counter(issue.severity for issue in issues)
         
         # Calculate scores
-        completeness_score = self._calculate_completeness_score(job_data, field_scores)
+        completeness_score = self._calculate_completeness_score(job_data, field_scores, rule_set.field_rules)
         accuracy_score = self._calculate_accuracy_score(issues)
-        quality_score = self._calculate_overall_quality_score(completeness_score, accuracy_score, issues)
+        quality_score = self._calculate_overall_quality_score(completeness_score, accuracy_score, severity_counts)
         
         # Determine if valid (no critical issues and quality score above threshold)
         is_valid = (
-            not any(issue.severity == ValidationSeverity.CRITICAL for issue in issues) and
+            not severity_counts[ValidationSeverity.CRITICAL] and
             quality_score >= 0.6
         )
         
         # Generate additional recommendations
         if quality_score < 0.8:
-            recommendations.extend(self._generate_improvement_recommendations(job_data, issues))
-        
-        # Store validation metrics if config_id provided
-        if config_id:
-            await self._store_validation_metrics(config_id, quality_score, len(issues), is_valid)
+            recommendations.extend(self._generate_improvement_recommendations(job_data, severity_counts))
         
         return ValidationResult(
             is_valid=is_valid,
@@ -194,14 +257,15 @@ class JobDataValidator:
             recommendations=recommendations,
             metadata={
                 'total_issues': len(issues),
-                'critical_issues': len([i for i in issues if i.severity == ValidationSeverity.CRITICAL]),
-                'warning_issues': len([i for i in issues if i.severity == ValidationSeverity.WARNING]),
+                'critical_issues': severity_counts[ValidationSeverity.CRITICAL],
+                'warning_issues': severity_counts[ValidationSeverity.WARNING],
                 'validation_timestamp': datetime.utcnow().isoformat(),
                 'config_id': config_id
             }
         )
     
-    async def _validate_field(self, field_name: str, field_value: Any, rules: Dict[str, Any]) -> Dict[str, Any]:
+    def _validate_field(self, field_name: str, field_value: Any, rules: Dict[str, Any],
+                        patterns: Dict[str, List[Pattern]]) -> Dict[str, Any]:
         """Validate individual field"""
         issues = []
         recommendations = []
@@ -223,13 +287,13 @@ class JobDataValidator:
         else:
             # Validate field content
             if isinstance(field_value, str):
-                score = await self._validate_string_field(field_name, field_value, rules, issues, recommendations)
+                score = self._validate_string_field(field_name, field_value, rules, patterns, issues, recommendations)
             elif isinstance(field_value, (int, float)):
-                score = await self._validate_numeric_field(field_name, field_value, rules, issues, recommendations)
+                score = self._validate_numeric_field(field_name, field_value, rules, issues, recommendations)
             elif isinstance(field_value, bool):
                 score = 1.0  # Boolean fields are always valid if present
             elif isinstance(field_value, list):
-                score = await self._validate_list_field(field_name, field_value, rules, issues, recommendations)
+                score = self._validate_list_field(field_name, field_value, rules, issues, recommendations)
         
         return {
             'score': max(0.0, min(1.0, score)),
@@ -237,9 +301,10 @@ class JobDataValidator:
             'recommendations': recommendations
         }
     
-    async def _validate_string_field(self, field_name: str, value: str, rules: Dict[str, Any], 
-                                   issues: List[ValidationIssue], recommendations: List[str]) -> float:
-        """Validate string field"""
+    def _validate_string_field(self, field_name: str, value: str, rules: Dict[str, Any],
+                               patterns: Dict[str, List[Pattern]],
+                               issues: List[ValidationIssue], recommendations: List[str]) -> float:
+        """Validate string field against its pre-compiled patterns"""
         score = 1.0
         
         # Length validation
@@ -263,44 +328,31 @@ class JobDataValidator:
             ))
             score -= 0.2
         
-        # Pattern validation
-        patterns = rules.get('patterns', {})
-        
         # Check valid patterns
-        if 'valid' in patterns:
-            for pattern in patterns['valid']:
-                if not re.search(pattern, value):
-                    issues.append(ValidationIssue(
-                        field=field_name,
-                        severity=ValidationSeverity.WARNING,
-                        message=f"{field_name} doesn't match expected format",
-                        suggestion=f"Verify {field_name} extraction accuracy",
-                        impact_score=0.2
-                    ))
-                    score -= 0.2
-                    break
+        if any(not pattern.search(value) for pattern in patterns.get('valid', ())):
+            issues.append(ValidationIssue(
+                field=field_name,
+                severity=ValidationSeverity.WARNING,
+                message=f"{field_name} doesn't match expected format",
+                suggestion=f"Verify {field_name} extraction accuracy",
+                impact_score=0.2
+            ))
+            score -= 0.2
         
         # Check suspicious patterns
-        if 'suspicious' in patterns:
-            for pattern in patterns['suspicious']:
-                if re.search(pattern, value):
-                    issues.append(ValidationIssue(
-                        field=field_name,
-                        severity=ValidationSeverity.WARNING,
-                        message=f"{field_name} contains suspicious content",
-                        suggestion=f"Review {field_name} for accuracy",
-                        impact_score=0.3
-                    ))
-                    score -= 0.3
-                    break
+        if any(pattern.search(value) for pattern in patterns.get('suspicious', ())):
+            issues.append(ValidationIssue(
+                field=field_name,
+                severity=ValidationSeverity.WARNING,
+                message=f"{field_name} contains suspicious content",
+                suggestion=f"Review {field_name} for accuracy",
+                impact_score=0.3
+            ))
+            score -= 0.3
         
         # Check for quality indicators (positive)
         if 'quality_indicators' in patterns:
-            quality_found = False
-            for pattern in patterns['quality_indicators']:
-                if re.search(pattern, value, re.IGNORECASE):
-                    quality_found = True
-                    break
+            quality_found = any(pattern.search(value) for pattern in patterns['quality_indicators'])
             
             if field_name == 'description' and not quality_found:
                 issues.append(ValidationIssue(
@@ -314,15 +366,13 @@ class JobDataValidator:
         
         # Check for remote work indicators
         if field_name == 'location' and 'remote_indicators' in patterns:
-            for pattern in patterns['remote_indicators']:
-                if re.search(pattern, value, re.IGNORECASE):
-                    recommendations.append(f"Consider setting is_remote=True for this job")
-                    break
+            if any(pattern.search(value) for pattern in patterns['remote_indicators']):
+                recommendations.append(f"Consider setting is_remote=True for this job")
         
         return max(0.0, score)
     
-    async def _validate_numeric_field(self, field_name: str, value: float, rules: Dict[str, Any],
-                                    issues: List[ValidationIssue], recommendations: List[str]) -> float:
+    def _validate_numeric_field(self, field_name: str, value: float, rules: Dict[str, Any],
+                                issues: List[ValidationIssue], recommendations: List[str]) -> float:
         """Validate numeric field"""
         score = 1.0
         
@@ -349,8 +399,8 @@ class JobDataValidator:
         
         return max(0.0, score)
     
-    async def _validate_list_field(self, field_name: str, value: List[Any], rules: Dict[str, Any],
-                                 issues: List[ValidationIssue], recommendations: List[str]) -> float:
+    def _validate_list_field(self, field_name: str, value: List[Any], rules: Dict[str, Any],
+                             issues: List[ValidationIssue], recommendations: List[str]) -> float:
         """Validate list field"""
         score = 1.0
         
@@ -368,7 +418,7 @@ class JobDataValidator:
         
         return max(0.0, score)
     
-    async def _validate_cross_fields(self, job_data: ParsedJobData) -> List[ValidationIssue]:
+    def _validate_cross_fields(self, job_data: ParsedJobData) -> List[ValidationIssue]:
         """Validate relationships between fields"""
         issues = []
         
@@ -423,7 +473,7 @@ class JobDataValidator:
         
         return issues
     
-    async def _validate_industry_context(self, job_data: ParsedJobData) -> List[ValidationIssue]:
+    def _validate_industry_context(self, job_data: ParsedJobData, rule_set: CompiledRuleSet) -> List[ValidationIssue]:
         """Validate job data against industry-specific rules"""
         issues = []
         
@@ -434,13 +484,13 @@ class JobDataValidator:
         detected_industry = None
         title_lower = job_data.title.lower()
         
-        for industry, rules in self.industry_rules.items():
+        for industry, rules in rule_set.industry_rules.items():
             if any(keyword in title_lower for keyword in rules['title_keywords']):
                 detected_industry = industry
                 break
         
         if detected_industry:
-            industry_rules = self.industry_rules[detected_industry]
+            industry_rules = rule_set.industry_rules[detected_industry]
             
             # Validate salary against industry standards
             if job_data.salary_min or job_data.salary_max:
@@ -467,9 +517,10 @@ class JobDataValidator:
         
         return issues
     
-    async def _validate_data_quality(self, job_data: ParsedJobData) -> List[ValidationIssue]:
+    def _validate_data_quality(self, job_data: ParsedJobData, rule_set: CompiledRuleSet) -> List[ValidationIssue]:
         """Check for common data quality issues"""
         issues = []
+        quality_patterns = rule_set.quality_patterns
         
         # Check all string fields for quality issues
         string_fields = ['title', 'company', 'location', 'description']
@@ -480,74 +531,65 @@ class JobDataValidator:
                 continue
             
             # Check for placeholder text
-            for pattern in self.quality_patterns['placeholder_text']:
-                if re.search(pattern, field_value, re.IGNORECASE):
-                    issues.append(ValidationIssue(
-                        field=field_name,
-                        severity=ValidationSeverity.ERROR,
-                        message=f"{field_name} contains placeholder text",
-                        suggestion="Extract actual content instead of placeholders",
-                        impact_score=0.8
-                    ))
-                    break
+            if any(pattern.search(field_value) for pattern in quality_patterns['placeholder_text']):
+                issues.append(ValidationIssue(
+                    field=field_name,
+                    severity=ValidationSeverity.ERROR,
+                    message=f"{field_name} contains placeholder text",
+                    suggestion="Extract actual content instead of placeholders",
+                    impact_score=0.8
+                ))
             
             # Check for encoding issues
-            for pattern in self.quality_patterns['encoding_issues']:
-                if re.search(pattern, field_value):
-                    issues.append(ValidationIssue(
-                        field=field_name,
-                        severity=ValidationSeverity.WARNING,
-                        message=f"{field_name} has encoding issues",
-                        suggestion="Fix text encoding during extraction",
-                        impact_score=0.4
-                    ))
-                    break
+            if any(pattern.search(field_value) for pattern in quality_patterns['encoding_issues']):
+                issues.append(ValidationIssue(
+                    field=field_name,
+                    severity=ValidationSeverity.WARNING,
+                    message=f"{field_name} has encoding issues",
+                    suggestion="Fix text encoding during extraction",
+                    impact_score=0.4
+                ))
             
             # Check for HTML artifacts
-            for pattern in self.quality_patterns['html_artifacts']:
-                if re.search(pattern, field_value):
-                    issues.append(ValidationIssue(
-                        field=field_name,
-                        severity=ValidationSeverity.WARNING,
-                        message=f"{field_name} contains HTML artifacts",
-                        suggestion="Clean HTML tags during extraction",
-                        impact_score=0.3
-                    ))
-                    break
+            if any(pattern.search(field_value) for pattern in quality_patterns['html_artifacts']):
+                issues.append(ValidationIssue(
+                    field=field_name,
+                    severity=ValidationSeverity.WARNING,
+                    message=f"{field_name} contains HTML artifacts",
+                    suggestion="Clean HTML tags during extraction",
+                    impact_score=0.3
+                ))
             
             # Check for duplicate content
-            for pattern in self.quality_patterns['duplicate_content']:
-                if re.search(pattern, field_value):
-                    issues.append(ValidationIssue(
-                        field=field_name,
-                        severity=ValidationSeverity.WARNING,
-                        message=f"{field_name} has duplicate content",
-                        suggestion="Remove duplicate text during extraction",
-                        impact_score=0.3
-                    ))
-                    break
+            if any(pattern.search(field_value) for pattern in quality_patterns['duplicate_content']):
+                issues.append(ValidationIssue(
+                    field=field_name,
+                    severity=ValidationSeverity.WARNING,
+                    message=f"{field_name} has duplicate content",
+                    suggestion="Remove duplicate text during extraction",
+                    impact_score=0.3
+                ))
         
         # Check for suspicious URLs in application_url
         if job_data.application_url:
-            for pattern in self.quality_patterns['suspicious_urls']:
-                if re.search(pattern, job_data.application_url):
-                    issues.append(ValidationIssue(
-                        field="application_url",
-                        severity=ValidationSeverity.WARNING,
-                        message="Application URL uses URL shortener",
-                        suggestion="Extract direct application URLs when possible",
-                        impact_score=0.2
-                    ))
-                    break
+            if any(pattern.search(job_data.application_url) for pattern in quality_patterns['suspicious_urls']):
+                issues.append(ValidationIssue(
+                    field="application_url",
+                    severity=ValidationSeverity.WARNING,
+                    message="Application URL uses URL shortener",
+                    suggestion="Extract direct application URLs when possible",
+                    impact_score=0.2
+                ))
         
         return issues
     
-    def _calculate_completeness_score(self, job_data: ParsedJobData, field_scores: Dict[str, float]) -> float:
+    def _calculate_completeness_score(self, job_data: ParsedJobData, field_scores: Dict[str, float],
+                                      field_rules: Optional[Dict[str, Dict[str, Any]]] = None) -> float:
         """Calculate data completeness score"""
         total_weight = 0.0
         weighted_score = 0.0
         
-        for field_name, rules in self.field_rules.items():
+        for field_name, rules in (field_rules or self.field_rules).items():
             weight = rules.get('weight', 0.1)
             score = field_scores.get(field_name, 0.0)
             
@@ -568,41 +610,35 @@ class JobDataValidator:
         return max(0.0, accuracy_score)
     
     def _calculate_overall_quality_score(self, completeness_score: float, accuracy_score: float, 
-                                       issues: List[ValidationIssue]) -> float:
+                                       severity_counts: Counter) -> float:
         """Calculate overall quality score"""
         # Base score from completeness and accuracy
         base_score = (completeness_score * 0.6) + (accuracy_score * 0.4)
         
         # Apply penalties for critical issues
-        critical_issues = [i for i in issues if i.severity == ValidationSeverity.CRITICAL]
-        if critical_issues:
+        if severity_counts[ValidationSeverity.CRITICAL]:
             base_score *= 0.5  # 50% penalty for critical issues
         
         # Apply smaller penalties for errors
-        error_issues = [i for i in issues if i.severity == ValidationSeverity.ERROR]
-        if error_issues:
-            penalty = min(0.3, len(error_issues) * 0.1)  # Up to 30% penalty
+        error_count = severity_counts[ValidationSeverity.ERROR]
+        if error_count:
+            penalty = min(0.3, error_count * 0.1)  # Up to 30% penalty
             base_score *= (1.0 - penalty)
         
         return max(0.0, min(1.0, base_score))
     
     def _generate_improvement_recommendations(self, job_data: ParsedJobData, 
-                                            issues: List[ValidationIssue]) -> List[str]:
+                                            severity_counts: Counter) -> List[str]:
         """Generate recommendations for improving data quality"""
         recommendations = []
         
-        # Group issues by severity
-        critical_issues = [i for i in issues if i.severity == ValidationSeverity.CRITICAL]
-        error_issues = [i for i in issues if i.severity == ValidationSeverity.ERROR]
-        warning_issues = [i for i in issues if i.severity == ValidationSeverity.WARNING]
-        
-        if critical_issues:
+        if severity_counts[ValidationSeverity.CRITICAL]:
             recommendations.append("Address critical data issues before processing")
         
-        if error_issues:
+        if severity_counts[ValidationSeverity.ERROR]:
             recommendations.append("Fix data extraction errors to improve quality")
         
-        if len(warning_issues) > 5:
+        if severity_counts[ValidationSeverity.WARNING] > 5:
             recommendations.append("Review extraction logic to reduce data quality warnings")
         
         # Field-specific recommendations
@@ -641,37 +677,85 @@ class JobDataValidator:
         except Exception as e:
             self.logger.error(f"Error storing validation metrics: {e}")
     
-    async def validate_job_batch(self, jobs: List[ParsedJobData], 
-                               config_id: Optional[str] = None) -> Dict[str, Any]:
-        """Validate a batch of jobs and return aggregate statistics"""
+    async def iter_validate_jobs(self, jobs: Union[Iterable[ParsedJobData], AsyncIterable[ParsedJobData]],
+                                 config_id: Optional[str] = None, chunk_size: int = 100,
+                                 use_processes: Optional[bool] = None) -> AsyncIterator[ValidationResult]:
+        """
+        Validate jobs in chunks and yield results in input order.
+        
+        Jobs are pulled lazily from ``jobs`` (sync or async iterable), so a
+        batch never has to be held in memory. Each chunk runs off the event
+        loop; with ``use_processes`` (default: inputs of at least
+        ``PROCESS_POOL_THRESHOLD`` jobs) chunks run in parallel on a process
+        pool, a bounded number at a time.
+        """
+        rule_set = self.get_rule_set(config_id)
+        if use_processes is None:
+            size = len(jobs) if hasattr(jobs, '__len__') else None
+            use_processes = size is not None and size >= PROCESS_POOL_THRESHOLD
+        
+        loop = asyncio.get_running_loop()
+        executor = _get_process_pool() if use_processes else None
+        max_in_flight = (executor._max_workers * 2) if executor else 1
+        pending: Deque[asyncio.Future] = deque()
+        
+        def submit(chunk: List[ParsedJobData]):
+            if executor:
+                pending.append(loop.run_in_executor(executor, _validate_chunk, chunk, rule_set, config_id))
+            else:
+                pending.append(asyncio.ensure_future(asyncio.to_thread(_validate_chunk, chunk, rule_set, config_id)))
+        
+        async for chunk in _chunked(jobs, chunk_size):
+            submit(chunk)
+            while len(pending) >= max_in_flight:
+                for result in await pending.popleft():
+                    yield result
+        while pending:
+            for result in await pending.popleft():
+                yield result
+    
+    async def validate_job_batch(self, jobs: Union[Iterable[ParsedJobData], AsyncIterable[ParsedJobData]], 
+                               config_id: Optional[str] = None,
+                               include_results: bool = True) -> Dict[str, Any]:
+        """Validate a batch of jobs and return aggregate statistics
+        
+        Results are aggregated as they stream in; pass
+        ``include_results=False`` for batches too large to keep every
+        ``ValidationResult`` in memory.
+        """
         results = []
+        total_jobs = 0
         total_quality_score = 0.0
         valid_jobs = 0
+        severity_counts = Counter()
         
-        for job in jobs:
-            result = await self.validate_job_data(job, config_id)
-            results.append(result)
+        async for result in self.iter_validate_jobs(jobs, config_id):
+            total_jobs += 1
             total_quality_score += result.quality_score
             if result.is_valid:
                 valid_jobs += 1
+            
+            # Aggregate issues by severity in the same pass
+            for issue in result.issues:
+                severity_counts[issue.severity] += 1
+            
+            if include_results:
+                results.append(result)
+            if config_id:
+                await self._store_validation_metrics(config_id, result.quality_score, len(result.issues), result.is_valid)
         
-        avg_quality_score = total_quality_score / len(jobs) if jobs else 0.0
-        validation_rate = valid_jobs / len(jobs) if jobs else 0.0
-        
-        # Aggregate issues by severity
-        all_issues = []
-        for result in results:
-            all_issues.extend(result.issues)
+        avg_quality_score = total_quality_score / total_jobs if total_jobs else 0.0
+        validation_rate = valid_jobs / total_jobs if total_jobs else 0.0
         
         issue_summary = {
-            'critical': len([i for i in all_issues if i.severity == ValidationSeverity.CRITICAL]),
-            'error': len([i for i in all_issues if i.severity == ValidationSeverity.ERROR]),
-            'warning': len([i for i in all_issues if i.severity == ValidationSeverity.WARNING]),
-            'info': len([i for i in all_issues if i.severity == ValidationSeverity.INFO])
+            'critical': severity_counts[ValidationSeverity.CRITICAL],
+            'error': severity_counts[ValidationSeverity.ERROR],
+            'warning': severity_counts[ValidationSeverity.WARNING],
+            'info': severity_counts[ValidationSeverity.INFO]
         }
         
         return {
-            'total_jobs': len(jobs),
+            'total_jobs': total_jobs,
             'valid_jobs': valid_jobs,
             'validation_rate': validation_rate,
             'avg_quality_score': avg_quality_score,
@@ -725,4 +809,35 @@ class JobDataValidator:
             }
 
 # Global job data validator instance
-job_validator = JobDataValidator()
\ No newline at end of file
+job_validator = JobDataValidator()
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """Shared process pool for large validation batches, created on first use"""
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(max_workers=min(8, os.cpu_count() or 1))
+    return _process_pool
+
+def _validate_chunk(jobs: List[ParsedJobData], rule_set: CompiledRuleSet,
+                    config_id: Optional[str]) -> List[ValidationResult]:
+    """Worker entry point: validate a chunk of jobs with an already compiled rule set"""
+    return [job_validator._evaluate(job, rule_set, config_id) for job in jobs]
+
+async def _chunked(items: Union[Iterable[Any], AsyncIterable[Any]], size: int) -> AsyncIterator[List[Any]]:
+    chunk = []
+    if hasattr(items, '__aiter__'):
+        async for item in items:
+            chunk.append(item)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+    else:
+        for item in items:
+            chunk.append(item)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
@@ -5,6 +5,7 @@ from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 from pathlib import Path
 import logging
+import re
 from dataclasses import dataclass
 
 # from app.database.models import MemoryUpload  # TODO: Migrate MemoryUpload to MongoDB models
@@ -15,6 +16,23 @@ from app.database import get_db_session
 
 logger = logging.getLogger(__name__)
 
+URL_PATTERN = re.compile(
+    r'^https?://'  # http:// or https://
+    r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+'  # domain...
+    r'(?:[A-Z]{2,6}\.?|[A-Z0-9-]{2,}\.?)|'  # host...
+    r'localhost|'  # localhost...
+    r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
+    r'(?::\d+)?'  # optional port
+    r'(?:/?|[/?]\S+)$', re.IGNORECASE)
+
+# Same netloc urlparse() would return for absolute URLs
+DOMAIN_PATTERN = r'^[A-Za-z][A-Za-z0-9+.-]*://([^/?#]*)'
+
+SUPPORTED_DATA_TYPES = ['text', 'links', 'images', 'tables', 'forms', 'custom']
+
+# Rows per DataFrame chunk; bounds memory regardless of file size
+DEFAULT_CHUNK_SIZE = 5000
+
 @dataclass
 class MemoryContext:
     """Represents processed memory context from CSV"""
@@ -48,7 +66,8 @@ class ProcessingProgress:
 class MemoryLoader:
     """Service for loading and processing memory CSV files"""
     
-    def __init__(self):
+    def __init__(self, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.chunk_size = chunk_size
         self.required_columns = [
             'website_url',
             'target_data_type',
@@ -67,68 +86,83 @@ class MemoryLoader:
     
     async def validate_csv_format(self, file_path: str) -> Tuple[bool, List[str]]:
         """Validate CSV file format and structure"""
+        errors, _ = await asyncio.to_thread(self._scan_csv, file_path)
+        return len(errors) == 0, errors
+    
+    def _scan_csv(self, file_path: str) -> Tuple[List[str], int]:
+        """
+        Validate a CSV chunk by chunk; returns (errors, data row count).
+        
+        Runs in a worker thread. Only the set of seen URLs is kept across
+        chunks, so memory does not grow with the size of the other columns.
+        """
         errors = []
         
         try:
-            # Read CSV file
-            df = pd.read_csv(file_path)
-            
-            # Check if file is empty
-            if df.empty:
-                errors.append("CSV file is empty")
-                return False, errors
-            
-            # Check required columns
-            missing_columns = [col for col in self.required_columns if col not in df.columns]
+            columns = pd.read_csv(file_path, nrows=0).columns
+            missing_columns = [col for col in self.required_columns if col not in columns]
             if missing_columns:
                 errors.append(f"Missing required columns: {', '.join(missing_columns)}")
+                return errors, 0
             
-            # Check for duplicate URLs
-            if df['website_url'].duplicated().any():
-                duplicate_count = df['website_url'].duplicated().sum()
-                errors.append(f"Found {duplicate_count} duplicate website URLs")
-            
-            # Validate URL format
+            total_rows = 0
+            duplicate_count = 0
+            seen_urls = set()
+            seen_missing = False
             invalid_urls = []
-            for idx, url in enumerate(df['website_url']):
-                if pd.isna(url) or not self._is_valid_url(str(url)):
-                    invalid_urls.append(f"Row {idx + 2}: Invalid URL format")
+            invalid_types = []
+            
+            for chunk in pd.read_csv(file_path, chunksize=self.chunk_size,
+                                     usecols=['website_url', 'target_data_type']):
+                row_numbers = pd.RangeIndex(total_rows + 2, total_rows + 2 + len(chunk))
+                total_rows += len(chunk)
+                
+                # Check for duplicate URLs, within the chunk and against earlier ones
+                urls = chunk['website_url']
+                duplicated = urls.duplicated() | urls.isin(seen_urls) | (urls.isna() & seen_missing)
+                duplicate_count += int(duplicated.sum())
+                seen_urls.update(urls.dropna().unique())
+                seen_missing = seen_missing or bool(urls.isna().any())
+                
+                # Validate URL format
+                url_text = urls.astype(str)
+                url_ok = urls.notna() & url_text.map(lambda url: bool(URL_PATTERN.match(url)))
+                invalid_urls.extend(f"Row {row}: Invalid URL format" for row in row_numbers[~url_ok.to_numpy()])
+                
+                # Check data types
+                data_types = chunk['target_data_type']
+                type_bad = data_types.notna() & ~data_types.astype(str).str.lower().isin(SUPPORTED_DATA_TYPES)
+                invalid_types.extend(
+                    f"Row {row}: Invalid data type '{value}'"
+                    for row, value in zip(row_numbers[type_bad.to_numpy()], data_types[type_bad])
+                )
+            
+            if total_rows == 0:
+                errors.append("CSV file is empty")
+                return errors, 0
+            
+            if duplicate_count:
+                errors.append(f"Found {duplicate_count} duplicate website URLs")
             
             if invalid_urls:
                 errors.extend(invalid_urls[:10])  # Limit to first 10 errors
                 if len(invalid_urls) > 10:
                     errors.append(f"... and {len(invalid_urls) - 10} more URL format errors")
             
-            # Check data types
-            required_data_types = ['text', 'links', 'images', 'tables', 'forms', 'custom']
-            invalid_types = []
-            for idx, data_type in enumerate(df['target_data_type']):
-                if pd.notna(data_type) and str(data_type).lower() not in required_data_types:
-                    invalid_types.append(f"Row {idx + 2}: Invalid data type '{data_type}'")
-            
             if invalid_types:
                 errors.extend(invalid_types[:5])  # Limit to first 5 errors
                 if len(invalid_types) > 5:
                     errors.append(f"... and {len(invalid_types) - 5} more data type errors")
             
-            return len(errors) == 0, errors
+            return errors, total_rows
             
         except Exception as e:
             errors.append(f"Error reading CSV file: {str(e)}")
-            return False, errors
+            return errors, 0
     
     def _is_valid_url(self, url: str) -> bool:
         """Basic URL validation"""
-        import re
-        url_pattern = re.compile(
-            r'^https?://'  # http:// or https://
-            r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+'  # domain...
-            r'(?:[A-Z]{2,6}\.?|[A-Z0-9-]{2,}\.?)|'  # host...
-            r'localhost|'  # localhost...
-            r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
-            r'(?::\d+)?'  # optional port
-            r'(?:/?|[/?]\S+)$', re.IGNORECASE)
-        return bool(url_pattern.match(url))
+        return bool(URL_PATTERN.match(url))
     
     async def process_memory_upload(
         self, 
@@ -159,50 +193,51 @@ class MemoryLoader:
             if progress_callback:
                 await progress_callback(progress)
             
-            is_valid, validation_errors = await self.validate_csv_format(file_path)
-            if not is_valid:
+            validation_errors, total_rows = await asyncio.to_thread(self._scan_csv, file_path)
+            if validation_errors:
                 progress.errors.extend(validation_errors)
                 await self._update_upload_status(upload_id, "FAILED", validation_errors)
                 raise ValueError(f"CSV validation failed: {'; '.join(validation_errors)}")
             
-            # Step 2: Load and parse CSV
+            # Step 2: Open a chunked reader over the CSV
             progress.current_step = "Loading CSV data"
-            df = pd.read_csv(file_path)
-            progress.total_rows = len(df)
+            progress.total_rows = total_rows
+            reader = pd.read_csv(file_path, chunksize=self.chunk_size)
             
             if progress_callback:
                 await progress_callback(progress)
             
-            # Step 3: Process each row
+            # Step 3: Process the file chunk by chunk off the event loop
             progress.current_step = "Processing memory records"
             
             website_patterns = {}
             extraction_rules = {}
-            success_indicators = []
-            failure_patterns = []
+            success_indicators = set()
+            failure_patterns = set()
             custom_selectors = {}
             
-            for idx, row in df.iterrows():
-                try:
-                    # Process individual row
-                    await self._process_memory_row(row, website_patterns, extraction_rules, 
-                                                 success_indicators, failure_patterns, custom_selectors)
-                    progress.successful_rows += 1
+            try:
+                while True:
+                    # Parsing and aggregation both run in a worker thread; chunks
+                    # are handled one at a time so the accumulators need no lock
+                    processed = await asyncio.to_thread(
+                        self._process_next_chunk, reader, progress.processed_rows,
+                        website_patterns, extraction_rules, success_indicators,
+                        failure_patterns, custom_selectors
+                    )
+                    if processed is None:
+                        break
                     
-                except Exception as e:
-                    progress.failed_rows += 1
-                    progress.errors.append(f"Row {idx + 2}: {str(e)}")
-                    logger.warning(f"Failed to process row {idx + 2}: {str(e)}")
-                
-                progress.processed_rows += 1
-                
-                # Update progress every 10 rows
-                if progress.processed_rows % 10 == 0 and progress_callback:
-                    await progress_callback(progress)
-                
-                # Small delay to prevent blocking
-                if progress.processed_rows % 100 == 0:
-                    await asyncio.sleep(0.01)
+                    chunk_rows, row_errors = processed
+                    progress.processed_rows += chunk_rows
+                    progress.failed_rows += len(row_errors)
+                    progress.successful_rows += chunk_rows - len(row_errors)
+                    progress.errors.extend(row_errors)
+                    
+                    if progress_callback:
+                        await progress_callback(progress)
+            finally:
+                reader.close()
             
             # Step 4: Finalize processing
             progress.current_step = "Finalizing memory context"
@@ -213,8 +248,8 @@ class MemoryLoader:
             memory_context = MemoryContext(
                 website_patterns=website_patterns,
                 extraction_rules=extraction_rules,
-                success_indicators=list(set(success_indicators)),
-                failure_patterns=list(set(failure_patterns)),
+                success_indicators=list(success_indicators),
+                failure_patterns=list(failure_patterns),
                 custom_selectors=custom_selectors,
                 metadata={
                     'total_websites': len(website_patterns),
@@ -244,74 +279,127 @@ class MemoryLoader:
             await self._update_upload_status(upload_id, "FAILED", [str(e)])
             raise
     
-    async def _process_memory_row(
-        self, 
-        row: pd.Series, 
+    def _process_next_chunk(
+        self,
+        reader,
+        first_row_offset: int,
         website_patterns: Dict,
         extraction_rules: Dict,
-        success_indicators: List,
-        failure_patterns: List,
+        success_indicators: set,
+        failure_patterns: set,
         custom_selectors: Dict
-    ):
-        """Process individual memory row"""
-        url = str(row['website_url']).strip()
-        data_type = str(row['target_data_type']).lower().strip()
-        selectors = str(row['successful_selectors']).strip()
-        context = str(row['extraction_context']).strip()
+    ) -> Optional[Tuple[int, List[str]]]:
+        """
+        Read the next chunk and fold it into the accumulators.
         
-        # Extract domain for pattern grouping
-        domain = self._extract_domain(url)
+        Returns (rows in chunk, per-row errors), or None once the reader is
+        exhausted.
+        """
+        chunk = next(reader, None)
+        if chunk is None:
+            return None
+        
+        row_numbers = pd.RangeIndex(first_row_offset + 2, first_row_offset + 2 + len(chunk))
+        chunk = chunk.set_axis(row_numbers)
+        
+        missing_url = chunk['website_url'].isna()
+        row_errors = [f"Row {row}: Missing website_url" for row in row_numbers[missing_url.to_numpy()]]
+        chunk = chunk[~missing_url]
+        
+        if not chunk.empty:
+            self._aggregate_memory_chunk(
+                chunk, website_patterns, extraction_rules,
+                success_indicators, failure_patterns, custom_selectors
+            )
+        return len(row_numbers), row_errors
+    
+    def _aggregate_memory_chunk(
+        self,
+        chunk: pd.DataFrame,
+        website_patterns: Dict,
+        extraction_rules: Dict,
+        success_indicators: set,
+        failure_patterns: set,
+        custom_selectors: Dict
+    ):
+        """Clean one chunk with column operations and merge it in per domain"""
+        url = chunk['website_url'].astype(str).str.strip()
+        frame = pd.DataFrame({
+            'url': url,
+            # Extract domain for pattern grouping
+            'domain': url.str.extract(DOMAIN_PATTERN, expand=False).str.lower().fillna(''),
+            'data_type': chunk['target_data_type'].astype(str).str.lower().str.strip(),
+            'selectors': chunk['successful_selectors'].astype(str).str.strip(),
+            'context': chunk['extraction_context'].astype(str).str.strip()
+        })
+        has_selectors = (frame['selectors'] != '') & (frame['selectors'] != 'nan')
         
         # Store website patterns
-        if domain not in website_patterns:
-            website_patterns[domain] = {
-                'urls': [],
-                'data_types': set(),
-                'selectors': {},
-                'context': [],
-                'metadata': {}
-            }
+        for domain, group in frame.groupby('domain', sort=False):
+            pattern = website_patterns.get(domain)
+            if pattern is None:
+                pattern = website_patterns[domain] = {
+                    'urls': [],
+                    'data_types': set(),
+                    'selectors': {},
+                    'context': [],
+                    'metadata': {}
+                }
+            pattern['urls'].extend(group['url'].tolist())
+            pattern['data_types'].update(group['data_type'].unique())
+            pattern['context'].extend(group['context'].tolist())
         
-        website_patterns[domain]['urls'].append(url)
-        website_patterns[domain]['data_types'].add(data_type)
-        website_patterns[domain]['context'].append(context)
+        # Process selectors: one row per (domain, data type, selector)
+        selector_rows = frame.loc[has_selectors, ['domain', 'data_type']]
+        for domain, data_type in selector_rows.drop_duplicates().itertuples(index=False):
+            website_patterns[domain]['selectors'].setdefault(data_type, [])
         
-        # Process selectors
-        if selectors and selectors != 'nan':
-            selector_list = [s.strip() for s in selectors.split(',') if s.strip()]
-            if data_type not in website_patterns[domain]['selectors']:
-                website_patterns[domain]['selectors'][data_type] = []
-            website_patterns[domain]['selectors'][data_type].extend(selector_list)
-            
-            # Add to custom selectors
-            for selector in selector_list:
-                custom_selectors[f"{domain}_{data_type}_{len(custom_selectors)}"] = selector
+        exploded = selector_rows.assign(
+            selector=frame.loc[has_selectors, 'selectors'].str.split(',')
+        ).explode('selector')
+        exploded['selector'] = exploded['selector'].str.strip()
+        exploded = exploded[exploded['selector'] != '']
+        
+        for (domain, data_type), group in exploded.groupby(['domain', 'data_type'], sort=False):
+            website_patterns[domain]['selectors'][data_type].extend(group['selector'].tolist())
+        
+        # Custom selector keys carry a running counter in file order
+        if not exploded.empty:
+            counter = pd.RangeIndex(len(custom_selectors), len(custom_selectors) + len(exploded)).astype(str)
+            keys = exploded['domain'] + '_' + exploded['data_type'] + '_' + counter.to_numpy()
+            custom_selectors.update(zip(keys, exploded['selector']))
         
         # Store extraction rules
-        if data_type not in extraction_rules:
-            extraction_rules[data_type] = []
-        extraction_rules[data_type].append({
-            'domain': domain,
-            'context': context,
-            'selectors': selectors.split(',') if selectors and selectors != 'nan' else []
-        })
+        raw_selectors = frame['selectors'].str.split(',').where(has_selectors, None)
+        rules = frame[['domain', 'context', 'data_type']].assign(selectors=raw_selectors)
+        for data_type, group in rules.groupby('data_type', sort=False):
+            extraction_rules.setdefault(data_type, []).extend(
+                {'domain': domain, 'context': context, 'selectors': selectors or []}
+                for domain, context, selectors in zip(group['domain'], group['context'], group['selectors'])
+            )
         
         # Process optional fields
-        if 'success_indicators' in row and pd.notna(row['success_indicators']):
-            indicators = [s.strip() for s in str(row['success_indicators']).split(',')]
-            success_indicators.extend(indicators)
+        if 'success_indicators' in chunk:
+            success_indicators.update(self._split_values(chunk['success_indicators']))
         
-        if 'failure_patterns' in row and pd.notna(row['failure_patterns']):
-            patterns = [s.strip() for s in str(row['failure_patterns']).split(',')]
-            failure_patterns.extend(patterns)
+        if 'failure_patterns' in chunk:
+            failure_patterns.update(self._split_values(chunk['failure_patterns']))
         
-        # Add metadata
-        if 'priority' in row and pd.notna(row['priority']):
-            website_patterns[domain]['metadata']['priority'] = row['priority']
+        # Add metadata; the last value seen for a domain wins
+        if 'priority' in chunk:
+            priorities = chunk['priority'].groupby(frame['domain'], sort=False).last().dropna()
+            for domain, priority in priorities.items():
+                website_patterns[domain]['metadata']['priority'] = priority
         
-        if 'tags' in row and pd.notna(row['tags']):
-            tags = [s.strip() for s in str(row['tags']).split(',')]
-            website_patterns[domain]['metadata']['tags'] = tags
+        if 'tags' in chunk:
+            tags = chunk['tags'].groupby(frame['domain'], sort=False).last().dropna()
+            for domain, value in tags.items():
+                website_patterns[domain]['metadata']['tags'] = [s.strip() for s in str(value).split(',')]
+    
+    @staticmethod
+    def _split_values(column: pd.Series) -> List[str]:
+        """Comma-separated cells flattened into stripped values"""
+        return column.dropna().astype(str).str.split(',').explode().str.strip().tolist()
     
     def _extract_domain(self, url: str) -> str:
         """Extract domain from URL"""
@@ -0,0 +1,437 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from pymongo import UpdateOne
+
+logger = logging.getLogger(__name__)
+
+GRANULARITIES = ("minute", "hour", "day")
+
+# How long each rollup level is kept before pruning
+ROLLUP_RETENTION = {
+    "minute": timedelta(days=2),
+    "hour": timedelta(days=35),
+    "day": timedelta(days=400),
+}
+
+
+def bucket_start(timestamp: datetime, granularity: str) -> datetime:
+    if granularity == "minute":
+        return timestamp.replace(second=0, microsecond=0)
+    if granularity == "hour":
+        return timestamp.replace(minute=0, second=0, microsecond=0)
+    return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+STEPS = {"minute": timedelta(minutes=1), "hour": timedelta(hours=1), "day": timedelta(days=1)}
+
+
+def granularity_for(start: datetime, end: datetime) -> str:
+    """Finest rollup level that keeps a range to a few hundred buckets"""
+    span = end - start
+    if span <= timedelta(hours=3):
+        return "minute"
+    if span <= timedelta(days=4):
+        return "hour"
+    return "day"
+
+
+@dataclass
+class RollupStats:
+    """Mergeable aggregate of one metric within one bucket"""
+    count: int = 0
+    total: float = 0.0
+    minimum: float = float("inf")
+    maximum: float = float("-inf")
+    high_count: int = 0
+    low_count: int = 0
+    tokens: int = 0
+
+    HIGH = 0.7
+    LOW = 0.3
+
+    def add(self, value: float, tokens: int = 0):
+        self.count += 1
+        self.total += value
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+        if value > self.HIGH:
+            self.high_count += 1
+        if value < self.LOW:
+            self.low_count += 1
+        self.tokens += tokens
+
+    def merge(self, other: "RollupStats"):
+        self.count += other.count
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self.high_count += other.high_count
+        self.low_count += other.low_count
+        self.tokens += other.tokens
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def high_rate(self) -> float:
+        return self.high_count / self.count if self.count else 0.0
+
+    @property
+    def low_rate(self) -> float:
+        return self.low_count / self.count if self.count else 0.0
+
+
+# (config_id, bucket start, metric type, dimension such as a field name)
+RollupKey = Tuple[Any, datetime, str, str]
+
+
+class MetricRollupStore:
+    """
+    Per-config minute, hour and day rollups of metric values.
+
+    Every recorded value updates one bucket at each level, so reads merge
+    at most a few hundred pre-aggregated buckets instead of scanning raw
+    rows. Distinct session ids are tracked per bucket for job counts.
+    """
+
+    def __init__(self, retention: Optional[Dict[str, timedelta]] = None):
+        self.retention = retention or ROLLUP_RETENTION
+        self._buckets: Dict[str, Dict[RollupKey, RollupStats]] = {g: {} for g in GRANULARITIES}
+        self._sessions: Dict[str, Dict[Tuple[Any, datetime], Set[str]]] = {g: defaultdict(set) for g in GRANULARITIES}
+        self._lock = threading.Lock()
+
+    def add(self, config_id: Any, metric_type: str, value: float, timestamp: datetime,
+            dimension: Optional[str] = None, session_id: Optional[str] = None, tokens: int = 0):
+        with self._lock:
+            for granularity in GRANULARITIES:
+                start = bucket_start(timestamp, granularity)
+                key = (config_id, start, metric_type, dimension or "")
+                stats = self._buckets[granularity].get(key)
+                if stats is None:
+                    stats = self._buckets[granularity][key] = RollupStats()
+                stats.add(value, tokens)
+                if session_id:
+                    self._sessions[granularity][(config_id, start)].add(session_id)
+
+    def collect(self, config_id: Any, start: datetime, end: datetime,
+                granularity: str) -> Tuple[Dict[Tuple[str, str], RollupStats], Set[str]]:
+        """Merged stats per (metric type, dimension) over a range, plus the session ids seen"""
+        first = bucket_start(start, granularity)
+        merged: Dict[Tuple[str, str], RollupStats] = defaultdict(RollupStats)
+        sessions: Set[str] = set()
+        with self._lock:
+            for (cid, bucket, metric_type, dimension), stats in self._buckets[granularity].items():
+                if cid == config_id and first <= bucket <= end:
+                    merged[(metric_type, dimension)].merge(stats)
+            for (cid, bucket), ids in self._sessions[granularity].items():
+                if cid == config_id and first <= bucket <= end:
+                    sessions |= ids
+        return dict(merged), sessions
+
+    def collect_series(self, config_id: Any, metric_type: str, start: datetime, end: datetime,
+                       granularity: str) -> Dict[datetime, RollupStats]:
+        """Merged stats of one metric per bucket, only for buckets that have values"""
+        first = bucket_start(start, granularity)
+        by_bucket: Dict[datetime, RollupStats] = defaultdict(RollupStats)
+        with self._lock:
+            for (cid, bucket, mtype, _), stats in self._buckets[granularity].items():
+                if cid == config_id and mtype == metric_type and first <= bucket < end:
+                    by_bucket[bucket].merge(stats)
+        return dict(by_bucket)
+
+    def aggregate(self, config_id: Any, start: datetime, end: datetime,
+                  granularity: Optional[str] = None) -> Tuple[Dict[Tuple[str, str], RollupStats], int]:
+        """Merged stats per (metric type, dimension) over a range, plus distinct sessions"""
+        merged, sessions = self.collect(config_id, start, end, granularity or granularity_for(start, end))
+        return merged, len(sessions)
+
+    def series(self, config_id: Any, metric_type: str, start: datetime, end: datetime,
+               granularity: str = "day") -> List[Tuple[datetime, RollupStats]]:
+        """One merged stats entry per bucket in the range, empty buckets included"""
+        return fill_series(self.collect_series(config_id, metric_type, start, end, granularity),
+                           start, end, granularity)
+
+    def drain(self) -> "MetricRollupStore":
+        """Move every bucket into a new store and start empty"""
+        drained = MetricRollupStore(self.retention)
+        with self._lock:
+            drained._buckets, self._buckets = self._buckets, {g: {} for g in GRANULARITIES}
+            drained._sessions, self._sessions = self._sessions, {g: defaultdict(set) for g in GRANULARITIES}
+        return drained
+
+    def merge(self, other: "MetricRollupStore"):
+        """Add another store's buckets to this one, e.g. deltas that failed to persist"""
+        with self._lock:
+            for granularity in GRANULARITIES:
+                buckets = self._buckets[granularity]
+                for key, stats in other._buckets[granularity].items():
+                    buckets.setdefault(key, RollupStats()).merge(stats)
+                for key, ids in other._sessions[granularity].items():
+                    self._sessions[granularity][key] |= ids
+
+    def entries(self, granularity: str) -> Iterator[Tuple[RollupKey, RollupStats]]:
+        return iter(list(self._buckets[granularity].items()))
+
+    def session_entries(self, granularity: str) -> Iterator[Tuple[Tuple[Any, datetime], Set[str]]]:
+        return iter(list(self._sessions[granularity].items()))
+
+    def prune(self, now: Optional[datetime] = None):
+        now = now or datetime.now()
+        with self._lock:
+            for granularity, keep in self.retention.items():
+                cutoff = bucket_start(now - keep, granularity)
+                self._buckets[granularity] = {k: v for k, v in self._buckets[granularity].items() if k[1] >= cutoff}
+                sessions = self._sessions[granularity]
+                for key in [k for k in sessions if k[1] < cutoff]:
+                    del sessions[key]
+
+    def is_empty(self, config_id: Any = None) -> bool:
+        with self._lock:
+            return not any(config_id is None or key[0] == config_id for key in self._buckets["day"])
+
+
+def fill_series(by_bucket: Dict[datetime, RollupStats], start: datetime, end: datetime,
+                granularity: str) -> List[Tuple[datetime, RollupStats]]:
+    result = []
+    current = bucket_start(start, granularity)
+    while current < end:
+        result.append((current, by_bucket.get(current, RollupStats())))
+        current += STEPS[granularity]
+    return result
+
+
+class MongoRollupStore:
+    """
+    Rollups persisted in MongoDB, shared by every worker and kept across restarts.
+
+    ``write`` upserts the buckets of a drained ``MetricRollupStore``: counts
+    and sums are ``$inc``-ed, extremes go through ``$min``/``$max`` and
+    session ids through ``$addToSet``, so concurrent writers merge instead
+    of overwriting. Documents expire via a TTL index on ``expires_at``.
+    """
+
+    def __init__(self, database, collection: str = "ml_metric_rollups",
+                 sessions_collection: str = "ml_metric_rollup_sessions",
+                 retention: Optional[Dict[str, timedelta]] = None):
+        self.buckets = database[collection]
+        self.sessions = database[sessions_collection]
+        self.retention = retention or ROLLUP_RETENTION
+
+    async def ensure_indexes(self):
+        await self.buckets.create_index(
+            [("granularity", 1), ("config_id", 1), ("bucket", 1), ("metric_type", 1), ("dimension", 1)],
+            unique=True
+        )
+        await self.buckets.create_index("expires_at", expireAfterSeconds=0)
+        await self.sessions.create_index([("granularity", 1), ("config_id", 1), ("bucket", 1)], unique=True)
+        await self.sessions.create_index("expires_at", expireAfterSeconds=0)
+
+    async def write(self, rollups: MetricRollupStore):
+        bucket_ops, session_ops = [], []
+        for granularity in GRANULARITIES:
+            keep = self.retention[granularity]
+            for (config_id, bucket, metric_type, dimension), stats in rollups.entries(granularity):
+                bucket_ops.append(UpdateOne(
+                    {"granularity": granularity, "config_id": config_id, "bucket": bucket,
+                     "metric_type": metric_type, "dimension": dimension},
+                    {
+                        "$inc": {"count": stats.count, "total": stats.total, "high_count": stats.high_count,
+                                 "low_count": stats.low_count, "tokens": stats.tokens},
+                        "$min": {"minimum": stats.minimum},
+                        "$max": {"maximum": stats.maximum},
+                        "$set": {"expires_at": bucket + keep},
+                    },
+                    upsert=True
+                ))
+            for (config_id, bucket), ids in rollups.session_entries(granularity):
+                session_ops.append(UpdateOne(
+                    {"granularity": granularity, "config_id": config_id, "bucket": bucket},
+                    {"$addToSet": {"session_ids": {"$each": sorted(ids)}}, "$set": {"expires_at": bucket + keep}},
+                    upsert=True
+                ))
+        if bucket_ops:
+            await self.buckets.bulk_write(bucket_ops, ordered=False)
+        if session_ops:
+            await self.sessions.bulk_write(session_ops, ordered=False)
+
+    @staticmethod
+    def _stats(document: Dict[str, Any]) -> RollupStats:
+        return RollupStats(
+            count=document.get("count", 0), total=document.get("total", 0.0),
+            minimum=document.get("minimum", float("inf")), maximum=document.get("maximum", float("-inf")),
+            high_count=document.get("high_count", 0), low_count=document.get("low_count", 0),
+            tokens=document.get("tokens", 0)
+        )
+
+    async def collect(self, config_id: Any, start: datetime, end: datetime,
+                      granularity: str) -> Tuple[Dict[Tuple[str, str], RollupStats], Set[str]]:
+        query = {"granularity": granularity, "config_id": config_id,
+                 "bucket": {"$gte": bucket_start(start, granularity), "$lte": end}}
+        merged: Dict[Tuple[str, str], RollupStats] = defaultdict(RollupStats)
+        async for document in self.buckets.find(query):
+            merged[(document["metric_type"], document["dimension"])].merge(self._stats(document))
+        sessions: Set[str] = set()
+        async for document in self.sessions.find(query, {"session_ids": 1}):
+            sessions.update(document.get("session_ids", []))
+        return dict(merged), sessions
+
+    async def collect_series(self, config_id: Any, metric_type: str, start: datetime, end: datetime,
+                             granularity: str) -> Dict[datetime, RollupStats]:
+        query = {"granularity": granularity, "config_id": config_id, "metric_type": metric_type,
+                 "bucket": {"$gte": bucket_start(start, granularity), "$lt": end}}
+        by_bucket: Dict[datetime, RollupStats] = defaultdict(RollupStats)
+        async for document in self.buckets.find(query):
+            by_bucket[document["bucket"]].merge(self._stats(document))
+        return dict(by_bucket)
+
+
+class MetricSink:
+    """
+    Buffers metric records and writes them in batches.
+
+    Rollups are updated as records arrive so reads are always current;
+    the raw rows are handed to ``writer`` (a blocking callable run in a
+    thread) once ``max_batch`` records are buffered or the oldest has
+    waited ``flush_interval`` seconds. ``start`` runs a background task
+    so quiet periods still flush on time.
+
+    With a ``store``, each flush also moves the local rollups into it and
+    reads merge the stored buckets with the ones not yet written.
+    """
+
+    def __init__(self, writer: Optional[Callable[[List[Any]], None]], rollups: MetricRollupStore,
+                 to_rollup: Callable[[Any], Dict[str, Any]], max_batch: int = 200,
+                 flush_interval: float = 5.0, clock: Callable[[], float] = time.monotonic,
+                 store: Optional[MongoRollupStore] = None):
+        self.writer = writer
+        self.rollups = rollups
+        self.store = store
+        self.to_rollup = to_rollup
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.clock = clock
+        self._buffer: List[Any] = []
+        self._pending = 0
+        self._oldest: Optional[float] = None
+        self._persisting: Optional[MetricRollupStore] = None
+        self._persist_failed = False
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.flushed = 0
+        self.flushes = 0
+        self.dropped = 0
+
+    def _due(self) -> bool:
+        if self._pending >= self.max_batch:
+            return True
+        return self._oldest is not None and self.clock() - self._oldest >= self.flush_interval
+
+    async def add_many(self, records: Sequence[Any]):
+        for record in records:
+            self.rollups.add(**self.to_rollup(record))
+        if (self.writer is None and self.store is None) or not records:
+            return
+        if self._oldest is None:
+            self._oldest = self.clock()
+        if self.writer is not None:
+            self._buffer.extend(records)
+        self._pending += len(records)
+        if self._due():
+            await self.flush()
+
+    async def add(self, record: Any):
+        await self.add_many([record])
+
+    async def flush(self) -> int:
+        async with self._flush_lock:
+            if not self._pending and not self._persist_failed:
+                return 0
+            pending, batch = self._pending, self._buffer
+            self._pending, self._buffer, self._oldest = 0, [], None
+            if batch:
+                try:
+                    await asyncio.to_thread(self.writer, batch)
+                    self.flushed += len(batch)
+                    self.flushes += 1
+                except Exception as e:
+                    # Rollups already hold these values; only the raw rows are lost
+                    self.dropped += len(batch)
+                    logger.error(f"Failed to flush {len(batch)} metric records: {e}")
+            if self.store is not None:
+                await self._persist_rollups()
+            self.rollups.prune()
+            return pending
+
+    async def _persist_rollups(self):
+        self._persisting = self.rollups.drain()
+        try:
+            await self.store.write(self._persisting)
+            self._persist_failed = False
+        except Exception as e:
+            # Keep the deltas locally; the next flush writes them again
+            self.rollups.merge(self._persisting)
+            self._persist_failed = True
+            if self._oldest is None:
+                self._oldest = self.clock()
+            logger.error(f"Failed to persist metric rollups: {e}")
+        finally:
+            self._persisting = None
+
+    def _local_stores(self) -> List[MetricRollupStore]:
+        return [store for store in (self.rollups, self._persisting) if store is not None]
+
+    async def aggregate(self, config_id: Any, start: datetime, end: datetime,
+                        granularity: Optional[str] = None) -> Tuple[Dict[Tuple[str, str], RollupStats], int]:
+        """Rollups over a range from the store plus what this process has not written yet"""
+        granularity = granularity or granularity_for(start, end)
+        merged: Dict[Tuple[str, str], RollupStats] = defaultdict(RollupStats)
+        sessions: Set[str] = set()
+        parts = [store.collect(config_id, start, end, granularity) for store in self._local_stores()]
+        if self.store is not None:
+            parts.append(await self.store.collect(config_id, start, end, granularity))
+        for part, ids in parts:
+            for key, stats in part.items():
+                merged[key].merge(stats)
+            sessions |= ids
+        return dict(merged), len(sessions)
+
+    async def series(self, config_id: Any, metric_type: str, start: datetime, end: datetime,
+                     granularity: str = "day") -> List[Tuple[datetime, RollupStats]]:
+        """Like ``MetricRollupStore.series``, including stored buckets"""
+        by_bucket: Dict[datetime, RollupStats] = defaultdict(RollupStats)
+        parts = [store.collect_series(config_id, metric_type, start, end, granularity)
+                 for store in self._local_stores()]
+        if self.store is not None:
+            parts.append(await self.store.collect_series(config_id, metric_type, start, end, granularity))
+        for part in parts:
+            for bucket, stats in part.items():
+                by_bucket[bucket].merge(stats)
+        return fill_series(by_bucket, start, end, granularity)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            if self._due():
+                await self.flush()
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+
+    def stats(self) -> Dict[str, int]:
+        return {"buffered": len(self._buffer), "flushed": self.flushed, "flushes": self.flushes, "dropped": self.dropped}
@@ -3,7 +3,6 @@ from dataclasses import dataclass, asdict
 from enum import Enum
 from datetime import datetime, timedelta
 import json
-import statistics
 import logging
 from collections import defaultdict, Counter
 
@@ -19,6 +18,13 @@ except ImportError:
     ScraperConfig = None
     ScraperLog = None
 
+try:
+    from app.core.config import settings
+except ImportError:
+    settings = None
+
+from app.services.metric_rollups import MetricRollupStore, MetricSink, MongoRollupStore, RollupStats
+
 class MetricType(Enum):
     """Types of ML analytics metrics"""
     PARSING_ACCURACY = "parsing_accuracy"
@@ -83,42 +89,95 @@ class PerformanceInsight:
     confidence: float
 
 class MLAnalyticsService:
-    """Service for ML parsing analytics and insights"""
+    """Service for ML parsing analytics and insights
+    
+    Metrics go through a buffered ``MetricSink``: raw rows are written in
+    batches, and per-config minute/hour/day rollups are updated as metrics
+    arrive. Summaries, trends and cost analysis read the rollups. Once
+    ``start`` is given a database the rollups are persisted there on every
+    flush, so they outlive the process and are shared between workers.
+    """
     
-    def __init__(self):
+    def __init__(self, writer=None):
         self.logger = logging.getLogger(__name__)
         self._metric_cache = defaultdict(list)
         self._cache_ttl = timedelta(minutes=15)
         self._last_cache_update = datetime.now()
+        self.rollups = MetricRollupStore()
+        if writer is None and get_db_session and AnalyticsMetrics:
+            writer = self._write_metric_rows
+        self.sink = MetricSink(
+            writer=writer,
+            rollups=self.rollups,
+            to_rollup=self._rollup_fields,
+            max_batch=getattr(settings, 'ML_METRICS_FLUSH_SIZE', 200),
+            flush_interval=getattr(settings, 'ML_METRICS_FLUSH_INTERVAL_SECONDS', 5.0)
+        )
+    
+    @staticmethod
+    def _rollup_fields(metric: MLMetric) -> Dict[str, Any]:
+        """Map a metric onto the rollup dimensions it is aggregated by"""
+        metadata = metric.metadata or {}
+        return {
+            'config_id': metric.config_id,
+            'metric_type': metric.metric_type.value,
+            'value': float(metric.value) if isinstance(metric.value, (int, float)) else 0.0,
+            'timestamp': metric.timestamp,
+            'dimension': metadata.get('field_name'),
+            'session_id': metric.session_id,
+            'tokens': int(metadata.get('tokens_used', 0) or 0)
+        }
+    
+    def _write_metric_rows(self, metrics: List[MLMetric]):
+        """Write a batch of raw metric rows in one session and commit"""
+        with get_db_session() as db:
+            db.add_all([
+                AnalyticsMetrics(
+                    scraper_config_id=metric.config_id,
+                    metric_type=metric.metric_type.value,
+                    metric_value=float(metric.value) if isinstance(metric.value, (int, float)) else 0.0,
+                    metadata=json.dumps({
+                        'source': metric.source,
+                        'session_id': metric.session_id,
+                        'original_value': metric.value,
+                        **(metric.metadata or {})
+                    }),
+                    created_at=metric.timestamp
+                )
+                for metric in metrics
+            ])
+            db.commit()
+    
+    def _update_metric_cache(self, metric: MLMetric):
+        cache_key = f"{metric.config_id}_{metric.metric_type.value}"
+        self._metric_cache[cache_key].append(metric)
+        
+        # Keep cache size manageable
+        if len(self._metric_cache[cache_key]) > 1000:
+            self._metric_cache[cache_key] = self._metric_cache[cache_key][-500:]
+    
+    async def start(self, database=None):
+        """Persist rollups in ``database`` (when given) and start the background flusher"""
+        if database is not None:
+            store = MongoRollupStore(database)
+            await store.ensure_indexes()
+            self.sink.store = store
+        self.sink.start()
+    
+    async def flush_metrics(self) -> int:
+        """Write any buffered metric rows now"""
+        return await self.sink.flush()
+    
+    async def close(self):
+        """Stop the background flusher and write what is left"""
+        await self.sink.close()
     
     async def record_ml_metric(self, metric: MLMetric) -> Dict[str, Any]:
         """Record a single ML parsing metric"""
         try:
-            # Store in database
-            if get_db_session and AnalyticsMetrics:
-                with get_db_session() as db:
-                    analytics_record = AnalyticsMetrics(
-                        scraper_config_id=metric.config_id,
-                        metric_type=metric.metric_type.value,
-                        metric_value=float(metric.value) if isinstance(metric.value, (int, float)) else 0.0,
-                        metadata=json.dumps({
-                            'source': metric.source,
-                            'session_id': metric.session_id,
-                            'original_value': metric.value,
-                            **(metric.metadata or {})
-                        }),
-                        created_at=metric.timestamp
-                    )
-                    db.add(analytics_record)
-                    db.commit()
-            
-            # Update cache
-            cache_key = f"{metric.config_id}_{metric.metric_type.value}"
-            self._metric_cache[cache_key].append(metric)
-            
-            # Keep cache size manageable
-            if len(self._metric_cache[cache_key]) > 1000:
-                self._metric_cache[cache_key] = self._metric_cache[cache_key][-500:]
+            # Buffer for the batched writer; rollups are updated immediately
+            await self.sink.add(metric)
+            self._update_metric_cache(metric)
             
             return {'success': True, 'metric_id': f"{metric.config_id}_{metric.timestamp.isoformat()}"}
             
@@ -206,18 +265,15 @@ class MLAnalyticsService:
                     metadata=session_data['api_usage']
                 ))
             
-            # Record all metrics
-            results = []
+            # Record all metrics as one buffered batch
+            await self.sink.add_many(metrics_to_record)
             for metric in metrics_to_record:
-                result = await self.record_ml_metric(metric)
-                results.append(result)
-            
-            successful_records = sum(1 for r in results if r.get('success', False))
+                self._update_metric_cache(metric)
             
             return {
                 'success': True,
                 'session_id': session_id,
-                'metrics_recorded': successful_records,
+                'metrics_recorded': len(metrics_to_record),
                 'total_metrics': len(metrics_to_record)
             }
             
@@ -245,42 +301,28 @@ class MLAnalyticsService:
                 else:  # YEAR
                     start_date = end_date - timedelta(days=365)
             
-            # Get metrics from database
-            metrics_data = await self._get_metrics_for_period(config_id, start_date, end_date)
+            # Read pre-aggregated rollups instead of raw metric rows
+            aggregates, sessions = await self.sink.aggregate(config_id, start_date, end_date)
             
-            if not metrics_data:
+            if not aggregates:
                 return None
             
-            # Calculate summary statistics
-            confidence_scores = [m['value'] for m in metrics_data if m['type'] == MetricType.CONFIDENCE_SCORE.value]
-            quality_scores = [m['value'] for m in metrics_data if m['type'] == MetricType.QUALITY_SCORE.value]
-            processing_times = [m['value'] for m in metrics_data if m['type'] == MetricType.PROCESSING_TIME.value]
-            
-            # Calculate field extraction rates
-            field_extraction_data = [m for m in metrics_data if m['type'] == MetricType.FIELD_EXTRACTION_SUCCESS.value]
-            field_extraction_rates = {}
-            for field_data in field_extraction_data:
-                field_name = field_data.get('metadata', {}).get('field_name', 'unknown')
-                if field_name not in field_extraction_rates:
-                    field_extraction_rates[field_name] = []
-                field_extraction_rates[field_name].append(field_data['value'])
-            
-            # Average the rates
-            for field_name in field_extraction_rates:
-                field_extraction_rates[field_name] = statistics.mean(field_extraction_rates[field_name])
-            
-            # Calculate validation scores by field
-            validation_data = [m for m in metrics_data if m['type'] == MetricType.VALIDATION_SCORE.value]
-            validation_scores = {}
-            for val_data in validation_data:
-                field_name = val_data.get('metadata', {}).get('field_name', 'overall')
-                if field_name not in validation_scores:
-                    validation_scores[field_name] = []
-                validation_scores[field_name].append(val_data['value'])
-            
-            # Average the validation scores
-            for field_name in validation_scores:
-                validation_scores[field_name] = statistics.mean(validation_scores[field_name])
+            empty = RollupStats()
+            confidence = aggregates.get((MetricType.CONFIDENCE_SCORE.value, ''), empty)
+            quality = aggregates.get((MetricType.QUALITY_SCORE.value, ''), empty)
+            processing = aggregates.get((MetricType.PROCESSING_TIME.value, ''), empty)
+            
+            # Field extraction rates and validation scores are kept per field
+            field_extraction_rates = {
+                field_name or 'unknown': stats.mean
+                for (metric_type, field_name), stats in aggregates.items()
+                if metric_type == MetricType.FIELD_EXTRACTION_SUCCESS.value
+            }
+            validation_scores = {
+                field_name or 'overall': stats.mean
+                for (metric_type, field_name), stats in aggregates.items()
+                if metric_type == MetricType.VALIDATION_SCORE.value
+            }
             
             # Calculate trends (daily averages)
             trends = await self._calculate_trends(config_id, start_date, end_date)
@@ -299,12 +341,12 @@ class MLAnalyticsService:
                 time_range=time_range,
                 start_date=start_date,
                 end_date=end_date,
-                total_jobs_processed=len(set(m.get('session_id') for m in metrics_data if m.get('session_id'))),
-                average_confidence_score=statistics.mean(confidence_scores) if confidence_scores else 0.0,
-                average_quality_score=statistics.mean(quality_scores) if quality_scores else 0.0,
-                success_rate=len([s for s in confidence_scores if s > 0.7]) / len(confidence_scores) if confidence_scores else 0.0,
-                error_rate=len([s for s in confidence_scores if s < 0.3]) / len(confidence_scores) if confidence_scores else 0.0,
-                average_processing_time=statistics.mean(processing_times) if processing_times else 0.0,
+                total_jobs_processed=sessions,
+                average_confidence_score=confidence.mean,
+                average_quality_score=quality.mean,
+                success_rate=confidence.high_rate,
+                error_rate=confidence.low_rate,
+                average_processing_time=processing.mean,
                 field_extraction_rates=field_extraction_rates,
                 validation_scores=validation_scores,
                 cost_metrics=await self._calculate_cost_metrics(config_id, start_date, end_date),
@@ -425,11 +467,9 @@ class MLAnalyticsService:
             config_costs = {}
             
             for cid in config_ids:
-                metrics = await self._get_metrics_for_period(cid, start_date, end_date)
-                api_metrics = [m for m in metrics if m['type'] == MetricType.GEMINI_API_USAGE.value]
-                
-                config_requests = sum(m['value'] for m in api_metrics)
-                config_tokens = sum(m.get('metadata', {}).get('tokens_used', 0) for m in api_metrics)
+                usage = await self._get_api_usage(cid, start_date, end_date)
+                config_requests = usage.total
+                config_tokens = usage.tokens
                 
                 # Estimate cost (approximate Gemini API pricing)
                 config_cost = (config_tokens / 1000) * 0.002  # $0.002 per 1K tokens (approximate)
@@ -495,6 +535,11 @@ class MLAnalyticsService:
             self.logger.error(f"Error getting metrics for period: {str(e)}")
             return []
     
+    async def _get_api_usage(self, config_id: int, start_date: datetime, end_date: datetime) -> RollupStats:
+        """Gemini request and token totals for a period, from the rollups"""
+        aggregates, _ = await self.sink.aggregate(config_id, start_date, end_date)
+        return aggregates.get((MetricType.GEMINI_API_USAGE.value, ''), RollupStats())
+    
     async def _calculate_trends(self, config_id: int, start_date: datetime, end_date: datetime) -> Dict[str, List[float]]:
         """Calculate daily trends for key metrics"""
         try:
@@ -505,23 +550,15 @@ class MLAnalyticsService:
                 'success_rate': []
             }
             
-            # Calculate daily averages
-            current_date = start_date
-            while current_date < end_date:
-                next_date = current_date + timedelta(days=1)
-                daily_metrics = await self._get_metrics_for_period(config_id, current_date, next_date)
-                
-                # Calculate daily averages
-                confidence_scores = [m['value'] for m in daily_metrics if m['type'] == MetricType.CONFIDENCE_SCORE.value]
-                quality_scores = [m['value'] for m in daily_metrics if m['type'] == MetricType.QUALITY_SCORE.value]
-                processing_times = [m['value'] for m in daily_metrics if m['type'] == MetricType.PROCESSING_TIME.value]
-                
-                trends['confidence_score'].append(statistics.mean(confidence_scores) if confidence_scores else 0)
-                trends['quality_score'].append(statistics.mean(quality_scores) if quality_scores else 0)
-                trends['processing_time'].append(statistics.mean(processing_times) if processing_times else 0)
-                trends['success_rate'].append(len([s for s in confidence_scores if s > 0.7]) / len(confidence_scores) if confidence_scores else 0)
-                
-                current_date = next_date
+            # Daily averages straight from the day rollups
+            confidence = await self.sink.series(config_id, MetricType.CONFIDENCE_SCORE.value, start_date, end_date)
+            quality = await self.sink.series(config_id, MetricType.QUALITY_SCORE.value, start_date, end_date)
+            processing = await self.sink.series(config_id, MetricType.PROCESSING_TIME.value, start_date, end_date)
+            
+            trends['confidence_score'] = [stats.mean for _, stats in confidence]
+            trends['quality_score'] = [stats.mean for _, stats in quality]
+            trends['processing_time'] = [stats.mean for _, stats in processing]
+            trends['success_rate'] = [stats.high_rate for _, stats in confidence]
             
             return trends
             
@@ -532,11 +569,9 @@ class MLAnalyticsService:
     async def _calculate_cost_metrics(self, config_id: int, start_date: datetime, end_date: datetime) -> Dict[str, float]:
         """Calculate cost-related metrics"""
         try:
-            metrics = await self._get_metrics_for_period(config_id, start_date, end_date)
-            api_metrics = [m for m in metrics if m['type'] == MetricType.GEMINI_API_USAGE.value]
-            
-            total_requests = sum(m['value'] for m in api_metrics)
-            total_tokens = sum(m.get('metadata', {}).get('tokens_used', 0) for m in api_metrics)
+            usage = await self._get_api_usage(config_id, start_date, end_date)
+            total_requests = usage.total
+            total_tokens = usage.tokens
             estimated_cost = (total_tokens / 1000) * 0.002  # Approximate pricing
             
             return {
@@ -248,6 +248,13 @@ class MLConfigurationService:
                 {"_id": config_id}
             )
             
+            # Parsers cache configs; make the update visible immediately
+            try:
+                from app.services.ml_parsing_service import ml_parsing_service
+                ml_parsing_service.invalidate_config(updated_config["scraper_config_id"])
+            except ImportError:
+                pass
+            
             # Log configuration update
             await self._log_config_event(
                 updated_config["scraper_config_id"], "ML_CONFIG_UPDATED",
@@ -4,6 +4,7 @@ from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 import asyncio
 import re
+import copy
 from dataclasses import dataclass
 
 import google.generativeai as genai
@@ -32,7 +33,11 @@ except ImportError:
         pass
     
     def get_db_session():
-        return [None]
+        return iter([None])
+
+from .model_backend import (
+    GeminiBackend, ModelBackend, ModelWorkerPool, TTLCache, config_fingerprint, text_hash
+)
 
 logger = logging.getLogger(__name__)
 
@@ -64,12 +69,30 @@ class ParsedJobData:
             self.parsing_metadata = {}
 
 class MLParsingService:
-    """Service for ML-powered job data parsing using Gemini API"""
+    """Service for ML-powered job data parsing using Gemini API
+    
+    Model calls go through a bounded ``ModelWorkerPool`` instead of blocking
+    the event loop, parse results are cached by cleaned-text hash and config
+    version, and ML configs are cached per scraper config. Pass a
+    ``backend`` (e.g. ``FakeModelBackend``) to run without the Gemini API.
+    """
     
-    def __init__(self):
+    def __init__(self, backend: Optional[ModelBackend] = None):
         self.model = None
         self.available = False
-        self._initialize_gemini()
+        self.backend = backend
+        self.pool: Optional[ModelWorkerPool] = None
+        self.parse_cache = TTLCache(
+            max_size=getattr(settings, 'ML_PARSE_CACHE_SIZE', 2048),
+            ttl=getattr(settings, 'ML_PARSE_CACHE_TTL_SECONDS', 86400)
+        )
+        self.config_cache = TTLCache(
+            max_size=256,
+            ttl=getattr(settings, 'ML_CONFIG_CACHE_TTL_SECONDS', 300)
+        )
+        if backend is None:
+            self._initialize_gemini()
+        self._initialize_pool()
         
     def _initialize_gemini(self):
         """Initialize Gemini API client"""
@@ -77,7 +100,7 @@ class MLParsingService:
             if hasattr(settings, 'GEMINI_API_KEY') and settings.GEMINI_API_KEY:
                 genai.configure(api_key=settings.GEMINI_API_KEY)
                 self.model = genai.GenerativeModel('gemini-1.5-flash')
-                self.available = True
+                self.backend = GeminiBackend(self.model)
                 logger.info("Gemini API initialized successfully for ML parsing")
             else:
                 logger.warning("Gemini API key not found. ML parsing will use fallback methods.")
@@ -85,6 +108,42 @@ class MLParsingService:
             logger.error(f"Failed to initialize Gemini API: {e}")
             self.available = False
     
+    def _initialize_pool(self):
+        """Start the bounded model worker pool for the configured backend"""
+        if self.backend is None:
+            return
+        self.pool = ModelWorkerPool(
+            self.backend,
+            max_workers=getattr(settings, 'ML_MODEL_WORKERS', 4),
+            max_batch_size=getattr(settings, 'ML_MODEL_BATCH_SIZE', 8)
+        )
+        self.available = True
+    
+    def _get_ml_config(self, scraper_config_id: str, db):
+        """Load the ML parsing config for a scraper, cached for a few minutes"""
+        cached = self.config_cache.get(scraper_config_id)
+        if cached is not None:
+            return cached[0]
+        
+        ml_config = db.query(MLParsingConfig).filter(
+            MLParsingConfig.scraper_config_id == scraper_config_id
+        ).first()
+        # Cache misses too, so scrapers without a config don't query every page
+        self.config_cache.set(scraper_config_id, (ml_config,))
+        return ml_config
+    
+    def invalidate_config(self, scraper_config_id: Optional[str] = None):
+        """Drop cached configs after an update (all of them when no id is given)"""
+        self.config_cache.invalidate(scraper_config_id)
+    
+    def _config_version(self, ml_config: MLParsingConfig) -> str:
+        """Fingerprint of the config fields that change what the model is asked"""
+        return config_fingerprint(
+            getattr(ml_config, 'field_mapping', None),
+            getattr(ml_config, 'updated_at', None),
+            getattr(ml_config, 'version', None)
+        )
+    
     async def parse_job_data(self, 
                            raw_html: str, 
                            scraper_config_id: str,
@@ -93,9 +152,7 @@ class MLParsingService:
         try:
             # Get ML parsing configuration
             db = next(get_db_session())
-            ml_config = db.query(MLParsingConfig).filter(
-                MLParsingConfig.scraper_config_id == scraper_config_id
-            ).first()
+            ml_config = self._get_ml_config(scraper_config_id, db)
             
             if not ml_config or not ml_config.gemini_api_enabled:
                 return await self._fallback_parse(raw_html)
@@ -104,8 +161,18 @@ class MLParsingService:
                 logger.warning("Gemini API not available, using fallback parsing")
                 return await self._fallback_parse(raw_html)
             
+            # Identical pages under the same config are parsed once
+            cleaned_text = self._clean_html(raw_html)
+            cache_key = (text_hash(cleaned_text), self._config_version(ml_config), confidence_threshold)
+            cached = self.parse_cache.get(cache_key)
+            if cached is not None:
+                parsed_data = copy.deepcopy(cached)
+                parsed_data.parsing_metadata['cache_hit'] = True
+                return parsed_data
+            
             # Use Gemini for intelligent parsing
-            parsed_data = await self._gemini_parse(raw_html, ml_config)
+            parsed_data = await self._gemini_parse(raw_html, ml_config, cleaned_text)
+            model_failed = parsed_data.confidence_score == 0.0
             
             # Validate confidence score
             if parsed_data.confidence_score < confidence_threshold:
@@ -114,6 +181,9 @@ class MLParsingService:
                 # Combine results with preference for high-confidence fields
                 parsed_data = self._merge_parsing_results(parsed_data, fallback_data)
             
+            if not model_failed:
+                self.parse_cache.set(cache_key, copy.deepcopy(parsed_data))
+            
             # Log analytics
             await self._log_parsing_analytics(scraper_config_id, parsed_data, db)
             
@@ -123,20 +193,22 @@ class MLParsingService:
             logger.error(f"Error in ML parsing: {e}")
             return await self._fallback_parse(raw_html)
     
-    async def _gemini_parse(self, raw_html: str, ml_config: MLParsingConfig) -> ParsedJobData:
+    async def _gemini_parse(self, raw_html: str, ml_config: MLParsingConfig,
+                            cleaned_text: Optional[str] = None) -> ParsedJobData:
         """Use Gemini API to parse job data"""
         try:
             # Clean HTML for better processing
-            cleaned_text = self._clean_html(raw_html)
+            if cleaned_text is None:
+                cleaned_text = self._clean_html(raw_html)
             
             # Build parsing prompt based on configuration
             prompt = self._build_parsing_prompt(cleaned_text, ml_config)
             
-            # Generate content with Gemini
-            response = self.model.generate_content(prompt)
+            # Generate content off the event loop through the worker pool
+            response_text = await self.pool.submit(prompt)
             
             # Parse response
-            parsed_json = json.loads(response.text)
+            parsed_json = json.loads(response_text)
             
             # Convert to ParsedJobData
             parsed_data = self._json_to_parsed_data(parsed_json)
@@ -0,0 +1,240 @@
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+
+def text_hash(text: str) -> str:
+    """Stable digest of cleaned page text, used as the parse cache key"""
+    return hashlib.sha256(text.encode("utf-8", "ignore")).hexdigest()
+
+
+def config_fingerprint(*parts: Any) -> str:
+    """Short digest of whatever configuration shapes a prompt"""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
+
+
+class ModelBackend:
+    """
+    What the parsers need from an LLM: prompt in, text out.
+
+    ``generate`` is synchronous and is always called from a worker thread,
+    never on the event loop. Backends with a native batch endpoint can
+    override ``generate_batch``; the default answers prompts one by one.
+    """
+
+    name = "base"
+
+    def generate(self, prompt: str) -> str:
+        raise NotImplementedError
+
+    def generate_batch(self, prompts: List[str]) -> List[Union[str, Exception]]:
+        results: List[Union[str, Exception]] = []
+        for prompt in prompts:
+            try:
+                results.append(self.generate(prompt))
+            except Exception as e:
+                results.append(e)
+        return results
+
+
+class GeminiBackend(ModelBackend):
+    """Backend over a ``google.generativeai`` GenerativeModel"""
+
+    name = "gemini"
+
+    def __init__(self, model):
+        self.model = model
+
+    def generate(self, prompt: str) -> str:
+        return self.model.generate_content(prompt).text
+
+
+class FakeModelBackend(ModelBackend):
+    """
+    Offline backend for tests and local runs.
+
+    Answers with ``responder(prompt)`` when given, otherwise with canned
+    ``responses`` in order (the last one repeats). Every prompt is recorded
+    so tests can assert how many model calls were actually made.
+    """
+
+    name = "fake"
+
+    def __init__(self, responses: Optional[List[Union[str, Dict[str, Any]]]] = None,
+                 responder: Optional[Callable[[str], Union[str, Dict[str, Any]]]] = None,
+                 delay: float = 0.0):
+        self.responses = list(responses or [{}])
+        self.responder = responder
+        self.delay = delay
+        self.prompts: List[str] = []
+        self.batches: List[int] = []
+        self._lock = threading.Lock()
+
+    def generate(self, prompt: str) -> str:
+        if self.delay:
+            time.sleep(self.delay)
+        with self._lock:
+            index = len(self.prompts)
+            self.prompts.append(prompt)
+        if self.responder is not None:
+            response = self.responder(prompt)
+        else:
+            response = self.responses[min(index, len(self.responses) - 1)]
+        return response if isinstance(response, str) else json.dumps(response)
+
+    def generate_batch(self, prompts: List[str]) -> List[Union[str, Exception]]:
+        with self._lock:
+            self.batches.append(len(prompts))
+        return super().generate_batch(prompts)
+
+
+class TTLCache:
+    """Small thread-safe LRU with per-entry expiry"""
+
+    def __init__(self, max_size: int = 1024, ttl: Optional[float] = 3600.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self._data: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Any) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or (self.ttl is not None and entry[0] <= self.clock()):
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Any, value: Any):
+        expires = self.clock() + self.ttl if self.ttl is not None else float("inf")
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key: Any = None):
+        with self._lock:
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0
+        }
+
+
+class ModelWorkerPool:
+    """
+    Bounded async front for a blocking model backend.
+
+    Callers ``await submit(prompt)``; prompts go on a queue that at most
+    ``max_workers`` workers drain. Each worker collects up to
+    ``max_batch_size`` queued prompts (waiting at most ``batch_window``
+    seconds for stragglers) and hands them to ``backend.generate_batch``
+    in a thread, so the event loop never waits on the LLM. Identical
+    prompts already in flight share one call.
+    """
+
+    def __init__(self, backend: ModelBackend, max_workers: int = 4,
+                 max_batch_size: int = 8, batch_window: float = 0.02):
+        self.backend = backend
+        self.max_workers = max(1, max_workers)
+        self.max_batch_size = max(1, max_batch_size)
+        self.batch_window = batch_window
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.calls = 0
+        self.batches = 0
+
+    def _ensure_started(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Pools are created at import time; bind to whichever loop first uses them
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._inflight = {}
+            self._workers = [loop.create_task(self._worker()) for _ in range(self.max_workers)]
+
+    async def submit(self, prompt: str) -> str:
+        self._ensure_started()
+        future = self._inflight.get(prompt)
+        if future is None:
+            future = self._loop.create_future()
+            self._inflight[prompt] = future
+            future.add_done_callback(lambda _: self._inflight.pop(prompt, None))
+            self._queue.put_nowait((prompt, future))
+        return await asyncio.shield(future)
+
+    async def _collect_batch(self) -> List[Tuple[str, asyncio.Future]]:
+        batch = [await self._queue.get()]
+        deadline = self._loop.time() + self.batch_window
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - self._loop.time()
+            try:
+                if timeout <= 0:
+                    batch.append(self._queue.get_nowait())
+                else:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                break
+        return batch
+
+    async def _worker(self):
+        while True:
+            batch = await self._collect_batch()
+            prompts = [prompt for prompt, _ in batch]
+            try:
+                results = await asyncio.to_thread(self.backend.generate_batch, prompts)
+            except Exception as e:
+                results = [e] * len(batch)
+            self.calls += len(batch)
+            self.batches += 1
+            for (_, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    async def close(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._loop = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.backend.name,
+            "workers": self.max_workers,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "in_flight": len(self._inflight),
+            "calls": self.calls,
+            "batches": self.batches
+        }
@@ -0,0 +1,415 @@
+import asyncio
+import json
+import hashlib
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Any, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+logger = logging.getLogger(__name__)
+
+# Fields kept per indexed job; enough to format results and feed an LLM re-rank
+_JOB_PROJECTION = {
+    "_id": 1,
+    "id": 1,
+    "title": 1,
+    "company_name": 1,
+    "description": 1,
+    "requirements": 1,
+    "skills_required": 1,
+    "job_type": 1,
+    "location": 1,
+    "location_city": 1,
+    "location_country": 1,
+    "is_remote": 1,
+    "salary_min": 1,
+    "salary_max": 1,
+    "status": 1,
+    "created_at": 1,
+    "updated_at": 1,
+}
+
+
+def parse_json_list(value: Any) -> List[str]:
+    """Profile list fields are stored as JSON strings; accept lists as well"""
+    if not value:
+        return []
+    if isinstance(value, list):
+        return [str(v) for v in value]
+    try:
+        parsed = json.loads(value)
+        if isinstance(parsed, list):
+            return [str(v) for v in parsed]
+        return [str(parsed)]
+    except (TypeError, ValueError):
+        return [part.strip() for part in str(value).split(",") if part.strip()]
+
+
+def as_text(value: Any) -> str:
+    """Job text fields are strings in some collections and lists in others"""
+    if not value:
+        return ""
+    if isinstance(value, (list, tuple)):
+        return " ".join(str(v) for v in value)
+    return str(value)
+
+
+def job_document_id(job: Dict[str, Any]) -> str:
+    """Stable string id for a job document"""
+    return str(job.get("_id") or job.get("id"))
+
+
+class _ScoringState(NamedTuple):
+    """IDF-weighted matrix and filter columns for one version of the index"""
+    ids: List[str]
+    matrix: Optional[sparse.csr_matrix]
+    idf: Optional[sparse.csr_matrix]
+    job_types: np.ndarray
+    is_remote: np.ndarray
+    salary_min: np.ndarray
+
+
+_EMPTY_STATE = _ScoringState([], None, None, np.array([], dtype=object), np.array([], dtype=bool), np.array([]))
+
+
+class JobRecommendationIndex:
+    """
+    In-memory TF-IDF index over active job posts.
+
+    Job text is hashed into a fixed feature space so that posts can be added
+    or removed one at a time; document frequencies are maintained
+    incrementally and the IDF-weighted, L2-normalized matrix is rebuilt
+    lazily on the first query after a write. Scoring a profile is a single
+    sparse matrix-vector product.
+
+    Loading, rebuilding and scoring are CPU bound and run in worker threads;
+    ``start`` builds the index in the background when the app starts and
+    keeps pulling writes from other workers. Every sync also reconciles the
+    indexed ids with the active posts in MongoDB, so posts deleted or closed
+    by another worker drop out within one sync interval.
+    """
+
+    def __init__(
+        self,
+        n_features: int = 2 ** 18,
+        sync_interval_seconds: int = 300,
+        cache_ttl_seconds: int = 900,
+        max_cached_users: int = 10000
+    ):
+        self.vectorizer = HashingVectorizer(
+            n_features=n_features,
+            alternate_sign=False,
+            norm=None,
+            stop_words="english",
+            ngram_range=(1, 2)
+        )
+        self.n_features = n_features
+        self.sync_interval_seconds = sync_interval_seconds
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.max_cached_users = max_cached_users
+
+        self._rows: Dict[str, sparse.csr_matrix] = {}
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._doc_freq = np.zeros(n_features, dtype=np.int32)
+        self._lock = threading.RLock()
+
+        # Lazily rebuilt scoring state, swapped in whole so readers never see a mix
+        self._state = _EMPTY_STATE
+        self._dirty = True
+
+        self.version = 0
+        self._built = False
+        self._last_sync: Optional[datetime] = None
+        self._last_sync_monotonic = 0.0
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._task: Optional[asyncio.Task] = None
+        self._user_cache: Dict[str, Tuple[str, float, List[Dict[str, Any]]]] = {}
+
+    @property
+    def size(self) -> int:
+        return len(self._rows)
+
+    @staticmethod
+    def job_text(job: Dict[str, Any]) -> str:
+        """Text indexed for a job; the title is repeated to weigh it up"""
+        title = job.get("title") or ""
+        skills = " ".join(parse_json_list(job.get("skills_required")))
+        return " ".join([
+            title, title, skills, skills,
+            as_text(job.get("description")),
+            as_text(job.get("requirements"))
+        ])
+
+    @staticmethod
+    def profile_text(job_seeker: Dict[str, Any]) -> str:
+        """Text used as the query vector for a job seeker profile"""
+        title = job_seeker.get("current_title") or ""
+        skills = " ".join(parse_json_list(job_seeker.get("skills")))
+        return " ".join([
+            title, title, skills, skills,
+            job_seeker.get("experience_level") or "",
+            job_seeker.get("field_of_study") or ""
+        ])
+
+    @staticmethod
+    def profile_fingerprint(job_seeker: Dict[str, Any], excluded_ids: List[str], limit: int = 0) -> str:
+        """Hash of everything that influences a user's recommendations, including how many were asked for"""
+        relevant = {
+            key: job_seeker.get(key)
+            for key in (
+                "current_title", "skills", "experience_level", "field_of_study",
+                "preferred_job_types", "remote_work_preference", "min_salary"
+            )
+        }
+        relevant["excluded"] = sorted(excluded_ids)
+        relevant["limit"] = limit
+        return hashlib.sha1(json.dumps(relevant, sort_keys=True, default=str).encode()).hexdigest()
+
+    def upsert_job(self, job: Dict[str, Any]):
+        """Add or refresh a job post; non-active posts are removed"""
+        job_id = job_document_id(job)
+        if job.get("status", "active") != "active":
+            self.remove_job(job_id)
+            return
+
+        row = self.vectorizer.transform([self.job_text(job)]).tocsr()
+        row.data = np.log1p(row.data)  # sublinear term frequency
+        stored = {key: job.get(key) for key in _JOB_PROJECTION if key in job}
+        stored["description"] = as_text(stored.get("description"))[:500]
+        stored["requirements"] = as_text(stored.get("requirements"))[:300]
+
+        with self._lock:
+            previous = self._rows.get(job_id)
+            if previous is not None:
+                self._doc_freq[previous.indices] -= 1
+            self._rows[job_id] = row
+            self._jobs[job_id] = stored
+            self._doc_freq[row.indices] += 1
+            self._mark_dirty()
+
+    def remove_job(self, job_id: str):
+        """Drop a job post from the index"""
+        with self._lock:
+            row = self._rows.pop(str(job_id), None)
+            if row is None:
+                return
+            self._jobs.pop(str(job_id), None)
+            self._doc_freq[row.indices] -= 1
+            self._mark_dirty()
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self._jobs.get(str(job_id))
+
+    def _mark_dirty(self):
+        self._dirty = True
+        self.version += 1
+
+    def _rebuild(self):
+        # Snapshot under the lock and build outside it, so writers are not
+        # held up for the length of the stack
+        with self._lock:
+            if not self._dirty:
+                return
+            version = self.version
+            ids = list(self._rows.keys())
+            rows = [self._rows[i] for i in ids]
+            jobs = [self._jobs[i] for i in ids]
+            doc_freq = self._doc_freq.copy()
+
+        n_docs = len(ids)
+        idf = sparse.diags((np.log((1 + n_docs) / (1 + doc_freq)) + 1).astype(np.float32), format="csr")
+        matrix = normalize(sparse.vstack(rows, format="csr") @ idf, norm="l2", copy=False) if n_docs else None
+        state = _ScoringState(
+            ids=ids,
+            matrix=matrix,
+            idf=idf,
+            job_types=np.array([j.get("job_type") or "" for j in jobs], dtype=object),
+            is_remote=np.array([bool(j.get("is_remote")) for j in jobs], dtype=bool),
+            salary_min=np.array(
+                [j.get("salary_min") if j.get("salary_min") is not None else np.nan for j in jobs],
+                dtype=float
+            )
+        )
+
+        with self._lock:
+            self._state = state
+            # A write that landed while building leaves the index dirty
+            self._dirty = self.version != version
+
+    def _apply(
+        self,
+        jobs: Iterable[Dict[str, Any]],
+        active_ids: Optional[Set[str]] = None,
+        known_ids: Iterable[str] = ()
+    ) -> int:
+        """Upsert jobs, drop known ids that are no longer active, then rebuild"""
+        count = 0
+        for job in jobs:
+            self.upsert_job(job)
+            count += 1
+        if active_ids is not None:
+            for job_id in set(known_ids) - active_ids:
+                self.remove_job(job_id)
+        self._rebuild()
+        return count
+
+    def score(
+        self,
+        query_text: str,
+        top_k: int = 20,
+        job_types: Optional[List[str]] = None,
+        remote_only: bool = False,
+        min_salary: Optional[float] = None,
+        exclude_ids: Optional[List[str]] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Cosine-score every indexed job against a query and return the top k.
+
+        Args:
+            query_text: Profile text to match
+            top_k: Number of results to return
+            job_types: Only keep these job types
+            remote_only: Only keep remote jobs
+            min_salary: Only keep jobs with salary_min at or above this value
+            exclude_ids: Job ids to leave out
+
+        Returns:
+            List of (job_id, similarity) tuples, best first
+        """
+        self._rebuild()
+        state = self._state
+        if state.matrix is None or top_k <= 0:
+            return []
+
+        query = self.vectorizer.transform([query_text]).tocsr()
+        query.data = np.log1p(query.data)
+        query = normalize(query @ state.idf, norm="l2", copy=False)
+        scores = np.asarray((state.matrix @ query.T).todense()).ravel()
+
+        mask = np.ones(len(state.ids), dtype=bool)
+        if job_types:
+            mask &= np.isin(state.job_types, job_types)
+        if remote_only:
+            mask &= state.is_remote
+        if min_salary:
+            mask &= np.nan_to_num(state.salary_min, nan=-1.0) >= float(min_salary)
+        if exclude_ids:
+            excluded = set(str(i) for i in exclude_ids)
+            mask &= np.array([i not in excluded for i in state.ids], dtype=bool)
+
+        candidates = np.flatnonzero(mask)
+        if candidates.size == 0:
+            return []
+        candidate_scores = scores[candidates]
+        k = min(top_k, candidates.size)
+        top = np.argpartition(-candidate_scores, k - 1)[:k]
+        top = top[np.argsort(-candidate_scores[top])]
+        return [(state.ids[candidates[i]], float(candidate_scores[i])) for i in top]
+
+    async def score_async(self, query_text: str, **kwargs) -> List[Tuple[str, float]]:
+        """``score`` in a worker thread, so a pending rebuild does not block the event loop"""
+        return await asyncio.to_thread(self.score, query_text, **kwargs)
+
+    async def ensure_synced(self, db: AsyncIOMotorDatabase):
+        """
+        Wait for the first build, then serve the current index and refresh it
+        in the background once the sync interval has passed.
+        """
+        if not self._built:
+            await self._refresh(db)
+            return
+        if time.monotonic() - self._last_sync_monotonic >= self.sync_interval_seconds:
+            self._refresh(db)
+
+    def _refresh(self, db: AsyncIOMotorDatabase) -> asyncio.Task:
+        """Build or sync once; concurrent callers share the refresh in flight"""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.get_running_loop().create_task(self._run_refresh(db))
+        return self._refresh_task
+
+    async def _run_refresh(self, db: AsyncIOMotorDatabase):
+        try:
+            if self._built:
+                await self.sync(db)
+            else:
+                await self.build(db)
+        except Exception as e:
+            logger.error(f"Job recommendation index refresh failed: {e}")
+
+    async def build(self, db: AsyncIOMotorDatabase):
+        """Load every active job post into the index"""
+        started = time.monotonic()
+        sync_started = datetime.utcnow()
+        jobs = await db.job_posts.find({"status": "active"}, _JOB_PROJECTION).to_list(length=None)
+        count = await asyncio.to_thread(self._apply, jobs)
+        self._built = True
+        self._last_sync = sync_started
+        self._last_sync_monotonic = time.monotonic()
+        logger.info(f"Job recommendation index built with {count} jobs in {time.monotonic() - started:.2f}s")
+
+    async def sync(self, db: AsyncIOMotorDatabase):
+        """
+        Apply job posts written since the last sync and drop indexed posts
+        that are no longer active. Deletes leave nothing behind to pull by
+        ``updated_at``, so the active ids are read in full (ids only) and
+        compared with the ids indexed before the read started.
+        """
+        sync_started = datetime.utcnow()
+        with self._lock:
+            known_ids = list(self._rows)
+        query = {"updated_at": {"$gte": self._last_sync}} if self._last_sync else {}
+        jobs = await db.job_posts.find(query, _JOB_PROJECTION).to_list(length=None)
+        active = await db.job_posts.find({"status": "active"}, {"_id": 1, "id": 1}).to_list(length=None)
+        active_ids = {job_document_id(job) for job in active}
+        await asyncio.to_thread(self._apply, jobs, active_ids, known_ids)
+        self._last_sync = sync_started
+        self._last_sync_monotonic = time.monotonic()
+
+    async def _run(self, db: AsyncIOMotorDatabase):
+        while True:
+            await self._refresh(db)
+            await asyncio.sleep(self.sync_interval_seconds)
+
+    def start(self, db: AsyncIOMotorDatabase):
+        """Build the index in the background and keep it synced"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run(db))
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def get_cached(self, user_id: str, fingerprint: str) -> Optional[List[Dict[str, Any]]]:
+        entry = self._user_cache.get(str(user_id))
+        if not entry:
+            return None
+        cached_fingerprint, expires_at, results = entry
+        if cached_fingerprint != fingerprint or expires_at < time.monotonic():
+            self._user_cache.pop(str(user_id), None)
+            return None
+        # Drop jobs closed since the results were cached
+        return [r for r in results if r.get("id") in self._jobs]
+
+    def set_cached(self, user_id: str, fingerprint: str, results: List[Dict[str, Any]]):
+        if len(self._user_cache) >= self.max_cached_users:
+            # Evict the entry closest to expiry
+            oldest = min(self._user_cache, key=lambda k: self._user_cache[k][1])
+            self._user_cache.pop(oldest, None)
+        self._user_cache[str(user_id)] = (fingerprint, time.monotonic() + self.cache_ttl_seconds, results)
+
+    def invalidate_user(self, user_id: str):
+        """Forget cached recommendations after a profile change"""
+        self._user_cache.pop(str(user_id), None)
+
+
+# Global recommendation index instance
+recommendation_index = JobRecommendationIndex()
@@ -1,36 +1,81 @@
 import json
-import redis
+import time
+import uuid
 import asyncio
-from typing import Dict, Any, Optional, List
+import redis.asyncio as redis
+from typing import Dict, Any, Optional, List, Set
 from datetime import datetime, timedelta
 from app.database.mongodb_models import ScraperState, ScraperConfig
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Delete / extend the lock only while it still holds our token
+RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+EXTEND_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('expire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
 class RedisStateManager:
-    """Redis-based state management for scraper operations"""
+    """Redis-based state management for scraper operations
     
-    def __init__(self, redis_url: str = "redis://localhost:6379", db: int = 0):
-        self.redis_client = redis.Redis.from_url(redis_url, db=db, decode_responses=True)
+    Scalar state lives in a Redis hash and is updated field by field;
+    processed URLs go into a set (or a HyperLogLog when only the count is
+    needed), so each progress update costs O(new URLs) rather than
+    rewriting the whole crawl history. The database copy is a checkpoint
+    written at most every ``checkpoint_interval`` seconds per scraper, and
+    immediately on pause/resume/stop.
+    """
+    
+    def __init__(self, redis_url: str = "redis://localhost:6379", db: int = 0,
+                 client: Optional[redis.Redis] = None, url_tracking: str = "set",
+                 checkpoint_interval: float = 30.0):
+        if url_tracking not in ("set", "hll"):
+            raise ValueError("url_tracking must be 'set' or 'hll'")
+        self.redis_client = client or redis.Redis.from_url(redis_url, db=db, decode_responses=True)
         self.state_prefix = "scraper_state:"
+        self.urls_prefix = "scraper_urls:"
         self.lock_prefix = "scraper_lock:"
         self.metrics_prefix = "scraper_metrics:"
+        self.url_tracking = url_tracking
+        self.checkpoint_interval = checkpoint_interval
+        self._last_checkpoint: Dict[Any, float] = {}
+        self._dirty: Set[Any] = set()
+        self._lock_tokens: Dict[Any, str] = {}
         
     async def connect(self) -> bool:
         """Test Redis connection"""
         try:
-            self.redis_client.ping()
+            await self.redis_client.ping()
             logger.info("Redis connection established successfully")
             return True
         except Exception as e:
             logger.error(f"Failed to connect to Redis: {e}")
             return False
     
+    async def close(self):
+        """Write pending checkpoints and close the client"""
+        await self.flush_checkpoints()
+        await self.redis_client.aclose()
+    
     def _get_state_key(self, scraper_id: int) -> str:
         """Generate Redis key for scraper state"""
         return f"{self.state_prefix}{scraper_id}"
     
+    def _get_urls_key(self, scraper_id: int) -> str:
+        """Generate Redis key for the processed URL set"""
+        return f"{self.urls_prefix}{scraper_id}"
+    
     def _get_lock_key(self, scraper_id: int) -> str:
         """Generate Redis key for scraper lock"""
         return f"{self.lock_prefix}{scraper_id}"
@@ -39,18 +84,52 @@ class RedisStateManager:
         """Generate Redis key for scraper metrics"""
         return f"{self.metrics_prefix}{scraper_id}"
     
+    @staticmethod
+    def _encode_fields(fields: Dict[str, Any]) -> Dict[str, str]:
+        # Hash values are JSON so ints, bools and nested dicts round-trip
+        return {key: json.dumps(value, default=str) for key, value in fields.items()}
+    
+    @staticmethod
+    def _decode_fields(raw: Dict[str, str]) -> Dict[str, Any]:
+        decoded = {}
+        for key, value in raw.items():
+            try:
+                decoded[key] = json.loads(value)
+            except (TypeError, ValueError):
+                decoded[key] = value
+        return decoded
+    
+    def _add_urls(self, pipe, scraper_id: int, urls: List[str]):
+        key = self._get_urls_key(scraper_id)
+        if urls:
+            if self.url_tracking == "hll":
+                pipe.pfadd(key, *urls)
+            else:
+                pipe.sadd(key, *urls)
+        if self.url_tracking == "hll":
+            pipe.pfcount(key)
+        else:
+            pipe.scard(key)
+    
     async def set_scraper_state(self, scraper_id: int, state_data: Dict[str, Any], ttl: int = 3600) -> bool:
-        """Set scraper state in Redis with TTL"""
+        """Replace scraper state in Redis with TTL"""
         try:
             key = self._get_state_key(scraper_id)
+            state_data = dict(state_data)
+            processed_urls = state_data.pop('processed_urls', None) or []
             state_data['last_updated'] = datetime.now().isoformat()
             state_data['scraper_id'] = scraper_id
             
-            # Store in Redis
-            self.redis_client.setex(key, ttl, json.dumps(state_data))
+            async with self.redis_client.pipeline(transaction=True) as pipe:
+                pipe.delete(key)
+                pipe.hset(key, mapping=self._encode_fields(state_data))
+                pipe.expire(key, ttl)
+                self._add_urls(pipe, scraper_id, processed_urls)
+                pipe.expire(self._get_urls_key(scraper_id), ttl)
+                await pipe.execute()
             
-            # Also backup to database
-            await self._backup_state_to_db(scraper_id, state_data)
+            self._dirty.add(scraper_id)
+            await self._maybe_checkpoint(scraper_id)
             
             logger.info(f"State set for scraper {scraper_id}")
             return True
@@ -58,14 +137,46 @@ class RedisStateManager:
             logger.error(f"Failed to set state for scraper {scraper_id}: {e}")
             return False
     
-    async def get_scraper_state(self, scraper_id: int) -> Optional[Dict[str, Any]]:
-        """Get scraper state from Redis, fallback to database"""
+    async def update_scraper_state(self, scraper_id: int, fields: Dict[str, Any], ttl: int = 3600,
+                                   checkpoint: bool = False) -> bool:
+        """Update only the given state fields"""
         try:
             key = self._get_state_key(scraper_id)
-            state_json = self.redis_client.get(key)
+            fields = {**fields, 'last_updated': datetime.now().isoformat(), 'scraper_id': scraper_id}
             
-            if state_json:
-                return json.loads(state_json)
+            async with self.redis_client.pipeline(transaction=True) as pipe:
+                pipe.hset(key, mapping=self._encode_fields(fields))
+                pipe.expire(key, ttl)
+                await pipe.execute()
+            
+            self._dirty.add(scraper_id)
+            await self._maybe_checkpoint(scraper_id, force=checkpoint)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to update state for scraper {scraper_id}: {e}")
+            return False
+    
+    async def get_scraper_state(self, scraper_id: int, include_urls: bool = False) -> Optional[Dict[str, Any]]:
+        """Get scraper state from Redis, fallback to database
+        
+        The processed URL list is only loaded with ``include_urls`` (and
+        only in set mode); ``total_processed`` is always present.
+        """
+        try:
+            urls_key = self._get_urls_key(scraper_id)
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                pipe.hgetall(self._get_state_key(scraper_id))
+                self._add_urls(pipe, scraper_id, [])
+                if include_urls and self.url_tracking == "set":
+                    pipe.smembers(urls_key)
+                results = await pipe.execute()
+            
+            if results[0]:
+                state = self._decode_fields(results[0])
+                state['total_processed'] = results[1]
+                if include_urls and self.url_tracking == "set":
+                    state['processed_urls'] = sorted(results[2])
+                return state
             
             # Fallback to database
             return await self._get_state_from_db(scraper_id)
@@ -74,33 +185,49 @@ class RedisStateManager:
             logger.error(f"Failed to get state for scraper {scraper_id}: {e}")
             return None
     
-    async def update_scraper_progress(self, scraper_id: int, current_page: int, processed_urls: List[str]) -> bool:
-        """Update scraper progress in real-time"""
+    async def update_scraper_progress(self, scraper_id: int, current_page: int, processed_urls: List[str],
+                                      ttl: int = 3600) -> bool:
+        """Update scraper progress in real-time
+        
+        ``processed_urls`` may be just the URLs new since the last update;
+        passing the full list again is still correct, only slower.
+        """
         try:
-            current_state = await self.get_scraper_state(scraper_id) or {}
-            current_state.update({
-                'current_page': current_page,
-                'processed_urls': processed_urls,
-                'total_processed': len(processed_urls),
-                'last_updated': datetime.now().isoformat()
-            })
+            state_key = self._get_state_key(scraper_id)
+            urls_key = self._get_urls_key(scraper_id)
+            
+            async with self.redis_client.pipeline(transaction=True) as pipe:
+                pipe.hset(state_key, mapping=self._encode_fields({
+                    'scraper_id': scraper_id,
+                    'current_page': current_page,
+                    'last_updated': datetime.now().isoformat()
+                }))
+                self._add_urls(pipe, scraper_id, processed_urls)
+                pipe.expire(state_key, ttl)
+                pipe.expire(urls_key, ttl)
+                await pipe.execute()
             
-            return await self.set_scraper_state(scraper_id, current_state)
+            self._dirty.add(scraper_id)
+            await self._maybe_checkpoint(scraper_id)
+            return True
         except Exception as e:
             logger.error(f"Failed to update progress for scraper {scraper_id}: {e}")
             return False
     
+    async def is_url_processed(self, scraper_id: int, url: str) -> bool:
+        """Whether a URL was already processed in this run (set mode only)"""
+        if self.url_tracking != "set":
+            raise ValueError("URL membership needs url_tracking='set'")
+        return bool(await self.redis_client.sismember(self._get_urls_key(scraper_id), url))
+    
     async def pause_scraper(self, scraper_id: int) -> bool:
         """Pause scraper execution"""
         try:
-            current_state = await self.get_scraper_state(scraper_id) or {}
-            current_state.update({
+            return await self.update_scraper_state(scraper_id, {
                 'current_state': 'paused',
                 'is_paused': True,
                 'paused_at': datetime.now().isoformat()
-            })
-            
-            return await self.set_scraper_state(scraper_id, current_state)
+            }, checkpoint=True)
         except Exception as e:
             logger.error(f"Failed to pause scraper {scraper_id}: {e}")
             return False
@@ -108,14 +235,11 @@ class RedisStateManager:
     async def resume_scraper(self, scraper_id: int) -> bool:
         """Resume scraper execution"""
         try:
-            current_state = await self.get_scraper_state(scraper_id) or {}
-            current_state.update({
+            return await self.update_scraper_state(scraper_id, {
                 'current_state': 'running',
                 'is_paused': False,
                 'resumed_at': datetime.now().isoformat()
-            })
-            
-            return await self.set_scraper_state(scraper_id, current_state)
+            }, checkpoint=True)
         except Exception as e:
             logger.error(f"Failed to resume scraper {scraper_id}: {e}")
             return False
@@ -123,15 +247,12 @@ class RedisStateManager:
     async def stop_scraper(self, scraper_id: int) -> bool:
         """Stop scraper execution and clean up state"""
         try:
-            current_state = await self.get_scraper_state(scraper_id) or {}
-            current_state.update({
+            # Set final state
+            await self.update_scraper_state(scraper_id, {
                 'current_state': 'stopped',
                 'is_paused': False,
                 'stopped_at': datetime.now().isoformat()
-            })
-            
-            # Set final state
-            await self.set_scraper_state(scraper_id, current_state)
+            }, checkpoint=True)
             
             # Clean up Redis keys after a delay
             await asyncio.sleep(1)
@@ -142,16 +263,39 @@ class RedisStateManager:
             logger.error(f"Failed to stop scraper {scraper_id}: {e}")
             return False
     
+    async def _maybe_checkpoint(self, scraper_id: int, force: bool = False):
+        """Back the state up to the database if the interval has passed"""
+        now = time.monotonic()
+        last = self._last_checkpoint.get(scraper_id)
+        if not force and last is not None and now - last < self.checkpoint_interval:
+            return
+        state = await self.get_scraper_state(scraper_id, include_urls=True)
+        if state is None:
+            return
+        self._last_checkpoint[scraper_id] = now
+        self._dirty.discard(scraper_id)
+        await self._backup_state_to_db(scraper_id, state)
+    
+    async def flush_checkpoints(self):
+        """Checkpoint every scraper updated since its last checkpoint"""
+        for scraper_id in list(self._dirty):
+            await self._maybe_checkpoint(scraper_id, force=True)
+    
     async def acquire_scraper_lock(self, scraper_id: int, timeout: int = 300) -> bool:
-        """Acquire distributed lock for scraper"""
+        """Acquire distributed lock for scraper
+        
+        The lock value is a random token kept by this manager, so release
+        and extend only ever touch a lock we still own.
+        """
         try:
             lock_key = self._get_lock_key(scraper_id)
-            lock_value = f"lock_{scraper_id}_{datetime.now().timestamp()}"
+            token = uuid.uuid4().hex
             
             # Try to acquire lock with timeout
-            result = self.redis_client.set(lock_key, lock_value, nx=True, ex=timeout)
+            result = await self.redis_client.set(lock_key, token, nx=True, ex=timeout)
             
             if result:
+                self._lock_tokens[scraper_id] = token
                 logger.info(f"Lock acquired for scraper {scraper_id}")
                 return True
             else:
@@ -162,17 +306,33 @@ class RedisStateManager:
             logger.error(f"Failed to acquire lock for scraper {scraper_id}: {e}")
             return False
     
+    async def extend_scraper_lock(self, scraper_id: int, timeout: int = 300) -> bool:
+        """Push out the expiry of a lock this manager holds"""
+        token = self._lock_tokens.get(scraper_id)
+        if token is None:
+            return False
+        try:
+            result = await self.redis_client.eval(EXTEND_LOCK_SCRIPT, 1, self._get_lock_key(scraper_id), token, timeout)
+            return bool(result)
+        except Exception as e:
+            logger.error(f"Failed to extend lock for scraper {scraper_id}: {e}")
+            return False
+    
     async def release_scraper_lock(self, scraper_id: int) -> bool:
-        """Release distributed lock for scraper"""
+        """Release distributed lock for scraper, if it is still ours"""
         try:
-            lock_key = self._get_lock_key(scraper_id)
-            result = self.redis_client.delete(lock_key)
+            token = self._lock_tokens.pop(scraper_id, None)
+            if token is None:
+                logger.warning(f"No lock held to release for scraper {scraper_id}")
+                return False
+            
+            result = await self.redis_client.eval(RELEASE_LOCK_SCRIPT, 1, self._get_lock_key(scraper_id), token)
             
             if result:
                 logger.info(f"Lock released for scraper {scraper_id}")
                 return True
             else:
-                logger.warning(f"No lock found to release for scraper {scraper_id}")
+                logger.warning(f"Lock for scraper {scraper_id} expired or is held by another owner")
                 return False
                 
         except Exception as e:
@@ -187,7 +347,7 @@ class RedisStateManager:
             metrics['scraper_id'] = scraper_id
             
             # Store with 1 hour TTL
-            self.redis_client.setex(key, 3600, json.dumps(metrics))
+            await self.redis_client.setex(key, 3600, json.dumps(metrics))
             
             logger.debug(f"Metrics updated for scraper {scraper_id}")
             return True
@@ -199,7 +359,7 @@ class RedisStateManager:
         """Get real-time scraper metrics"""
         try:
             key = self._get_metrics_key(scraper_id)
-            metrics_json = self.redis_client.get(key)
+            metrics_json = await self.redis_client.get(key)
             
             if metrics_json:
                 return json.loads(metrics_json)
@@ -213,10 +373,10 @@ class RedisStateManager:
         """Get list of all active scraper IDs"""
         try:
             pattern = f"{self.state_prefix}*"
-            keys = self.redis_client.keys(pattern)
             
             scraper_ids = []
-            for key in keys:
+            # SCAN rather than KEYS so large keyspaces don't block Redis
+            async for key in self.redis_client.scan_iter(match=pattern, count=500):
                 try:
                     scraper_id = int(key.replace(self.state_prefix, ""))
                     scraper_ids.append(scraper_id)
@@ -248,6 +408,7 @@ class RedisStateManager:
             scraper_state.is_paused = state_data.get('is_paused', False)
             scraper_state.current_page = state_data.get('current_page', 0)
             scraper_state.processed_urls = state_data.get('processed_urls', [])
+            scraper_state.total_processed = state_data.get('total_processed', len(scraper_state.processed_urls))
             scraper_state.last_updated = datetime.utcnow()
             scraper_state.updated_at = datetime.utcnow()
             
@@ -271,6 +432,7 @@ class RedisStateManager:
                     'is_paused': scraper_state.is_paused,
                     'current_page': scraper_state.current_page,
                     'processed_urls': scraper_state.processed_urls or [],
+                    'total_processed': scraper_state.total_processed,
                     'last_updated': scraper_state.last_updated.isoformat() if scraper_state.last_updated else None
                 }
             
@@ -283,14 +445,15 @@ class RedisStateManager:
     async def _cleanup_scraper_keys(self, scraper_id: int):
         """Clean up all Redis keys for a scraper"""
         try:
-            keys_to_delete = [
+            await self.redis_client.delete(
                 self._get_state_key(scraper_id),
+                self._get_urls_key(scraper_id),
                 self._get_lock_key(scraper_id),
                 self._get_metrics_key(scraper_id)
-            ]
-            
-            for key in keys_to_delete:
-                self.redis_client.delete(key)
+            )
+            self._lock_tokens.pop(scraper_id, None)
+            self._last_checkpoint.pop(scraper_id, None)
+            self._dirty.discard(scraper_id)
             
             logger.info(f"Cleaned up Redis keys for scraper {scraper_id}")
             
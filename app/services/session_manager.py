@@ -5,7 +5,6 @@ from enum import Enum
 import asyncio
 import json
 import logging
-from concurrent.futures import ThreadPoolExecutor
 import threading
 
 from app.models.scraping_session import ScrapingSession, SessionStatus, SessionWebsite, WebsiteStatus
@@ -13,6 +12,8 @@ from app.services.memory_loader import MemoryLoader, MemoryContext
 from app.services.scraper_orchestrator import ScraperOrchestrator, ScrapingConfig
 from app.services.web_scraper import WebScraperService
 from app.services.ml_service import MLService
+from app.services.session_scheduler import SessionScheduler, SessionSnapshot, CancellationToken
+from app.core.config import settings
 from app.database import get_db_session
 # from sqlalchemy.orm import Session  # Using MongoDB instead
 
@@ -76,7 +77,10 @@ class SessionManager:
         self.active_sessions: Dict[int, ScrapingSession] = {}
         self.session_progress: Dict[int, SessionProgress] = {}
         self.event_callbacks: List[Callable[[SessionEvent], None]] = []
-        self.executor = ThreadPoolExecutor(max_workers=10)
+        # One dispatcher for all sessions, with a global concurrency budget
+        self.scheduler = SessionScheduler(max_concurrency=settings.SESSION_MAX_CONCURRENT_WEBSITES)
+        # Websites already finished before the current scheduling run
+        self._finished_before_run: Dict[int, int] = {}
         self.memory_loader = MemoryLoader()
         self.orchestrator = ScraperOrchestrator()
         self.web_scraper = WebScraperService()
@@ -205,8 +209,8 @@ class SessionManager:
             session.started_at = datetime.utcnow()
             db.commit()
             
-            # Start processing in background
-            self.executor.submit(self._process_session, session_id)
+            # Hand the session's websites to the shared scheduler
+            self._schedule_session(session, db)
             
             # Emit event
             self._emit_event(SessionEvent(
@@ -236,6 +240,9 @@ class SessionManager:
             session.paused_at = datetime.utcnow()
             db.commit()
             
+            # Running websites finish; no new ones are dispatched
+            self.scheduler.pause(session_id)
+            
             # Emit event
             self._emit_event(SessionEvent(
                 event_type=SessionEventType.SESSION_PAUSED,
@@ -264,8 +271,10 @@ class SessionManager:
             session.resumed_at = datetime.utcnow()
             db.commit()
             
-            # Resume processing
-            self.executor.submit(self._process_session, session_id)
+            # Resume processing; reschedule if the session is no longer
+            # held by the scheduler (e.g. after a restart)
+            if not self.scheduler.resume(session_id):
+                self._schedule_session(session, db)
             
             # Emit event
             self._emit_event(SessionEvent(
@@ -295,6 +304,9 @@ class SessionManager:
             session.stopped_at = datetime.utcnow()
             db.commit()
             
+            # Cancel running websites and drop pending ones
+            self.scheduler.stop(session_id)
+            
             # Emit event
             self._emit_event(SessionEvent(
                 event_type=SessionEventType.SESSION_STOPPED,
@@ -309,69 +321,71 @@ class SessionManager:
             logger.error(f"Failed to stop session {session_id}: {str(e)}")
             return False
     
-    def _process_session(self, session_id: int):
-        """Process session in background thread"""
-        try:
-            with get_db_session() as db:
-                session = db.query(ScrapingSession).filter(ScrapingSession.id == session_id).first()
-                if not session:
-                    return
-                
-                # Get session websites
-                websites = db.query(SessionWebsite).filter(
-                    SessionWebsite.session_id == session_id,
-                    SessionWebsite.status.in_([WebsiteStatus.PENDING, WebsiteStatus.FAILED])
-                ).order_by(SessionWebsite.order_index).all()
-                
-                config = SessionConfiguration(**session.configuration)
-                
-                # Process websites with concurrency control
-                semaphore = asyncio.Semaphore(config.max_concurrent_websites)
-                
-                async def process_website(website: SessionWebsite):
-                    async with semaphore:
-                        await self._process_single_website(session_id, website, config, db)
-                
-                # Run async processing
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                
-                try:
-                    tasks = [process_website(website) for website in websites]
-                    loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
-                finally:
-                    loop.close()
-                
-                # Update final session status
-                self._finalize_session(session_id, db)
-                
-        except Exception as e:
-            logger.error(f"Error processing session {session_id}: {str(e)}")
-            self._handle_session_error(session_id, str(e))
+    def _schedule_session(self, session: ScrapingSession, db: Session):
+        """Queue a session's pending and failed websites on the scheduler"""
+        websites = db.query(SessionWebsite).filter(
+            SessionWebsite.session_id == session.id,
+            SessionWebsite.status.in_([WebsiteStatus.PENDING, WebsiteStatus.FAILED])
+        ).order_by(SessionWebsite.order_index).all()
+        
+        config = SessionConfiguration(**session.configuration)
+        session_id = session.id
+        self._finished_before_run[session_id] = max(0, (session.total_websites or 0) - len(websites))
+        
+        # Only plain values cross into the scheduler; each write opens its
+        # own DB session instead of sharing the caller's
+        items = [(website.id, website.url) for website in websites]
+        
+        async def handler(item, token: CancellationToken) -> bool:
+            website_id, url = item
+            return await self._process_single_website(session_id, website_id, url, config, token)
+        
+        async def on_complete(snapshot: SessionSnapshot):
+            await asyncio.to_thread(self._finalize_session, session_id, snapshot)
+        
+        self.scheduler.submit(
+            session_id,
+            items,
+            handler,
+            max_concurrency=config.max_concurrent_websites,
+            on_progress=lambda snapshot: self._update_progress(session_id, snapshot),
+            on_complete=on_complete
+        )
     
-    async def _process_single_website(self, session_id: int, website: SessionWebsite, config: SessionConfiguration, db: Session):
-        """Process a single website"""
+    def _save_website(self, website_id: int, **fields):
+        """Persist website fields using a short-lived DB session"""
+        with get_db_session() as db:
+            db.query(SessionWebsite).filter(SessionWebsite.id == website_id).update(fields)
+            db.commit()
+    
+    async def _process_single_website(
+        self,
+        session_id: int,
+        website_id: int,
+        url: str,
+        config: SessionConfiguration,
+        token: CancellationToken
+    ) -> bool:
+        """Process a single website; returns True when it was scraped successfully"""
         try:
-            # Check if session is still running
-            session = db.query(ScrapingSession).filter(ScrapingSession.id == session_id).first()
-            if not session or session.status not in [SessionStatus.RUNNING]:
-                return
+            # Paused or stopped sessions are not dispatched; this only
+            # covers a stop that lands before the website starts
+            if token.stopped:
+                return False
             
             # Update website status
-            website.status = WebsiteStatus.IN_PROGRESS
-            website.started_at = datetime.utcnow()
-            db.commit()
-            
-            # Update progress
-            self._update_progress(session_id, db)
+            await asyncio.to_thread(
+                self._save_website, website_id,
+                status=WebsiteStatus.IN_PROGRESS, started_at=datetime.utcnow()
+            )
             
             # Emit event
             self._emit_event(SessionEvent(
                 event_type=SessionEventType.WEBSITE_STARTED,
                 session_id=session_id,
-                website_id=website.id,
+                website_id=website_id,
                 timestamp=datetime.utcnow(),
-                data={"url": website.url}
+                data={"url": url}
             ))
             
             # Create scraping config
@@ -385,108 +399,97 @@ class SessionManager:
             )
             
             # Perform scraping
-            result = await self.web_scraper.scrape_website(website.url, scraping_config)
+            result = await self.web_scraper.scrape_website(url, scraping_config)
             
             # Apply ML optimization if enabled
             if config.enable_ml_optimization and result.success:
                 try:
-                    ml_service = self._get_ml_service(db)
+                    ml_service = self._get_ml_service()
                     if ml_service:
-                        optimized_result = await ml_service.optimize_extraction(website.url, result)
+                        optimized_result = await ml_service.optimize_extraction(url, result)
                         if optimized_result:
                             result = optimized_result
                 except Exception as e:
-                    logger.warning(f"ML optimization failed for {website.url}: {str(e)}")
+                    logger.warning(f"ML optimization failed for {url}: {str(e)}")
             
             # Update website with results
-            website.status = WebsiteStatus.COMPLETED if result.success else WebsiteStatus.FAILED
-            website.completed_at = datetime.utcnow()
-            website.extracted_data = result.data if result.success else None
-            website.error_message = result.error if not result.success else None
-            website.response_time = result.response_time
-            website.status_code = result.status_code
-            
-            db.commit()
+            await asyncio.to_thread(
+                self._save_website, website_id,
+                status=WebsiteStatus.COMPLETED if result.success else WebsiteStatus.FAILED,
+                completed_at=datetime.utcnow(),
+                extracted_data=result.data if result.success else None,
+                error_message=result.error if not result.success else None,
+                response_time=result.response_time,
+                status_code=result.status_code
+            )
             
             # Emit completion event
             event_type = SessionEventType.WEBSITE_COMPLETED if result.success else SessionEventType.WEBSITE_FAILED
             self._emit_event(SessionEvent(
                 event_type=event_type,
                 session_id=session_id,
-                website_id=website.id,
+                website_id=website_id,
                 timestamp=datetime.utcnow(),
-                data={"url": website.url, "success": result.success}
+                data={"url": url, "success": result.success}
             ))
             
-            # Update progress
-            self._update_progress(session_id, db)
-            
-            # Add delay between requests
+            # Add delay between requests; this holds the session's slot,
+            # so it paces the session without blocking other sessions
             if config.request_delay > 0:
                 await asyncio.sleep(config.request_delay)
+            
+            return result.success
                 
+        except asyncio.CancelledError:
+            # Stopped mid-scrape; put the website back for a later run
+            await asyncio.shield(asyncio.to_thread(
+                self._save_website, website_id, status=WebsiteStatus.PENDING, started_at=None
+            ))
+            raise
         except Exception as e:
-            logger.error(f"Error processing website {website.url}: {str(e)}")
+            logger.error(f"Error processing website {url}: {str(e)}")
             
             # Update website with error
-            website.status = WebsiteStatus.FAILED
-            website.completed_at = datetime.utcnow()
-            website.error_message = str(e)
-            db.commit()
+            await asyncio.to_thread(
+                self._save_website, website_id,
+                status=WebsiteStatus.FAILED, completed_at=datetime.utcnow(), error_message=str(e)
+            )
             
             # Emit error event
             self._emit_event(SessionEvent(
                 event_type=SessionEventType.WEBSITE_FAILED,
                 session_id=session_id,
-                website_id=website.id,
+                website_id=website_id,
                 timestamp=datetime.utcnow(),
-                data={"url": website.url, "error": str(e)}
+                data={"url": url, "error": str(e)}
             ))
+            return False
     
-    def _update_progress(self, session_id: int, db: Session):
-        """Update session progress"""
+    def _update_progress(self, session_id: int, snapshot: SessionSnapshot):
+        """Update session progress from the scheduler's in-memory counters"""
         try:
-            # Get website counts
-            website_counts = db.query(
-                SessionWebsite.status,
-                db.func.count(SessionWebsite.id)
-            ).filter(
-                SessionWebsite.session_id == session_id
-            ).group_by(SessionWebsite.status).all()
-            
-            counts = {status.value: 0 for status in WebsiteStatus}
-            for status, count in website_counts:
-                counts[status.value] = count
-            
-            total = sum(counts.values())
-            completed = counts[WebsiteStatus.COMPLETED.value]
-            failed = counts[WebsiteStatus.FAILED.value]
-            in_progress = counts[WebsiteStatus.IN_PROGRESS.value]
-            pending = counts[WebsiteStatus.PENDING.value]
-            
-            progress_percentage = ((completed + failed) / total * 100) if total > 0 else 0
+            # Websites completed in an earlier run are not rescheduled
+            completed = self._finished_before_run.get(session_id, 0) + snapshot.completed
+            failed = snapshot.failed
+            total = completed + failed + snapshot.in_progress + snapshot.pending
+            finished = completed + failed
+            
+            progress_percentage = (finished / total * 100) if total > 0 else 0
             
             # Calculate rate and ETA
-            session = db.query(ScrapingSession).filter(ScrapingSession.id == session_id).first()
-            current_rate = 0.0
+            current_rate = snapshot.rate_per_minute
             estimated_completion = None
+            if current_rate > 0 and snapshot.pending > 0:
+                eta_minutes = snapshot.pending / current_rate
+                estimated_completion = datetime.utcnow() + timedelta(minutes=eta_minutes)
             
-            if session and session.started_at:
-                elapsed_minutes = (datetime.utcnow() - session.started_at).total_seconds() / 60
-                if elapsed_minutes > 0:
-                    current_rate = (completed + failed) / elapsed_minutes
-                    if current_rate > 0 and pending > 0:
-                        eta_minutes = pending / current_rate
-                        estimated_completion = datetime.utcnow() + timedelta(minutes=eta_minutes)
-            
-            # Update progress
             progress = SessionProgress(
                 session_id=session_id,
                 total_websites=total,
                 completed_websites=completed,
                 failed_websites=failed,
-                in_progress_websites=in_progress,
-                pending_websites=pending,
+                in_progress_websites=snapshot.in_progress,
+                pending_websites=snapshot.pending,
                 progress_percentage=progress_percentage,
                 estimated_completion=estimated_completion,
                 current_rate=current_rate
@@ -495,13 +498,6 @@ class SessionManager:
             with self._lock:
                 self.session_progress[session_id] = progress
             
-            # Update session record
-            if session:
-                session.completed_websites = completed
-                session.failed_websites = failed
-                session.progress_percentage = progress_percentage
-                db.commit()
-            
             # Emit progress event
             self._emit_event(SessionEvent(
                 event_type=SessionEventType.PROGRESS_UPDATE,
@@ -513,41 +509,48 @@ class SessionManager:
         except Exception as e:
             logger.error(f"Error updating progress for session {session_id}: {str(e)}")
     
-    def _finalize_session(self, session_id: int, db: Session):
-        """Finalize session when processing is complete"""
+    def _finalize_session(self, session_id: int, snapshot: SessionSnapshot):
+        """Persist final counters once the scheduler has released a session"""
         try:
-            session = db.query(ScrapingSession).filter(ScrapingSession.id == session_id).first()
-            if not session:
-                return
-            
-            # Check if all websites are processed
-            pending_count = db.query(SessionWebsite).filter(
-                SessionWebsite.session_id == session_id,
-                SessionWebsite.status == WebsiteStatus.PENDING
-            ).count()
+            with self._lock:
+                progress = self.session_progress.get(session_id)
             
-            if pending_count == 0 and session.status == SessionStatus.RUNNING:
-                session.status = SessionStatus.COMPLETED
-                session.completed_at = datetime.utcnow()
-                
-                # Calculate final metrics
-                total_time = (session.completed_at - session.started_at).total_seconds() if session.started_at else 0
-                session.total_duration = total_time
-                
-                db.commit()
+            with get_db_session() as db:
+                session = db.query(ScrapingSession).filter(ScrapingSession.id == session_id).first()
+                if not session:
+                    return
                 
-                # Emit completion event
-                self._emit_event(SessionEvent(
-                    event_type=SessionEventType.SESSION_COMPLETED,
-                    session_id=session_id,
-                    timestamp=datetime.utcnow(),
-                    data={"total_duration": total_time}
-                ))
+                if progress:
+                    session.completed_websites = progress.completed_websites
+                    session.failed_websites = progress.failed_websites
+                    session.progress_percentage = progress.progress_percentage
                 
-                logger.info(f"Session {session_id} completed successfully")
+                if snapshot.pending == 0 and not snapshot.stopped and session.status == SessionStatus.RUNNING:
+                    session.status = SessionStatus.COMPLETED
+                    session.completed_at = datetime.utcnow()
+                    
+                    # Calculate final metrics
+                    total_time = (session.completed_at - session.started_at).total_seconds() if session.started_at else 0
+                    session.total_duration = total_time
+                    
+                    db.commit()
+                    
+                    # Emit completion event
+                    self._emit_event(SessionEvent(
+                        event_type=SessionEventType.SESSION_COMPLETED,
+                        session_id=session_id,
+                        timestamp=datetime.utcnow(),
+                        data={"total_duration": total_time}
+                    ))
+                    
+                    logger.info(f"Session {session_id} completed successfully")
+                else:
+                    db.commit()
             
         except Exception as e:
             logger.error(f"Error finalizing session {session_id}: {str(e)}")
+        finally:
+            self._finished_before_run.pop(session_id, None)
     
     def _handle_session_error(self, session_id: int, error_message: str):
         """Handle session-level errors"""
@@ -576,6 +579,10 @@ class SessionManager:
         with self._lock:
             return self.session_progress.get(session_id)
     
+    def get_scheduler_snapshot(self, session_id: int) -> Optional[SessionSnapshot]:
+        """Live scheduler counters for a session that is still scheduled"""
+        return self.scheduler.snapshot(session_id)
+    
     def get_active_sessions(self) -> List[int]:
         """Get list of active session IDs"""
         with self._lock:
@@ -603,8 +610,8 @@ class SessionManager:
         except Exception as e:
             logger.error(f"Error cleaning up sessions: {str(e)}")
     
-    def shutdown(self):
+    async def shutdown(self):
         """Shutdown session manager"""
         logger.info("Shutting down SessionManager")
-        self.executor.shutdown(wait=True)
+        await self.scheduler.close()
         self.web_scraper.cleanup()
\ No newline at end of file
@@ -0,0 +1,292 @@
+import asyncio
+import functools
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class CancellationToken:
+    """
+    Cooperative pause/stop signal shared by one session's work items.
+
+    Handlers may check ``stopped`` or await ``wait_until_runnable`` between
+    steps; the scheduler itself stops dispatching as soon as a session is
+    paused and cancels in-flight items when it is stopped.
+    """
+
+    def __init__(self):
+        self._runnable = asyncio.Event()
+        self._runnable.set()
+        self.stopped = False
+
+    @property
+    def paused(self) -> bool:
+        return not self._runnable.is_set() and not self.stopped
+
+    def pause(self):
+        if not self.stopped:
+            self._runnable.clear()
+
+    def resume(self):
+        self._runnable.set()
+
+    def stop(self):
+        self.stopped = True
+        self._runnable.set()
+
+    async def wait_until_runnable(self) -> bool:
+        """Block while paused; returns False once the session is stopped"""
+        await self._runnable.wait()
+        return not self.stopped
+
+
+@dataclass
+class SessionSnapshot:
+    """In-memory progress counters for one scheduled session"""
+    session_id: Any
+    total: int
+    completed: int
+    failed: int
+    in_progress: int
+    pending: int
+    paused: bool
+    stopped: bool
+    started_at: float
+    finished_at: Optional[float] = None
+
+    @property
+    def done(self) -> int:
+        return self.completed + self.failed
+
+    @property
+    def rate_per_minute(self) -> float:
+        elapsed = (self.finished_at or time.monotonic()) - self.started_at
+        return self.done / elapsed * 60 if elapsed > 0 else 0.0
+
+
+class _ScheduledSession:
+    def __init__(self, session_id, items, handler, max_concurrency: int, on_progress, on_complete):
+        self.session_id = session_id
+        self.pending: Deque[Any] = deque(items)
+        self.handler = handler
+        self.semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        self.token = CancellationToken()
+        self.on_progress = on_progress
+        self.on_complete = on_complete
+        self.tasks: Set[asyncio.Task] = set()
+        self.total = len(self.pending)
+        self.completed = 0
+        self.failed = 0
+        self.started_at = time.monotonic()
+        self.finished_at: Optional[float] = None
+        self.finished = asyncio.get_running_loop().create_future()
+
+    @property
+    def runnable(self) -> bool:
+        return (
+            bool(self.pending)
+            and not self.token.stopped
+            and not self.token.paused
+            and not self.semaphore.locked()
+        )
+
+    def snapshot(self) -> SessionSnapshot:
+        return SessionSnapshot(
+            session_id=self.session_id,
+            total=self.total,
+            completed=self.completed,
+            failed=self.failed,
+            in_progress=len(self.tasks),
+            pending=len(self.pending),
+            paused=self.token.paused,
+            stopped=self.token.stopped,
+            started_at=self.started_at,
+            finished_at=self.finished_at
+        )
+
+
+class SessionScheduler:
+    """
+    One long-lived dispatcher for every scraping session.
+
+    A global semaphore bounds how many work items run at once across all
+    sessions, and each session has its own semaphore for its configured
+    concurrency. The dispatcher hands free global slots to sessions in
+    round-robin order so a large session cannot starve smaller ones.
+    Progress is kept in memory and read through ``snapshot``.
+    """
+
+    def __init__(self, max_concurrency: int = 20):
+        self.max_concurrency = max_concurrency
+        self._sessions: Dict[Any, _ScheduledSession] = {}
+        self._rotation: Deque[Any] = deque()
+        self._budget: Optional[asyncio.Semaphore] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+
+    def _ensure_dispatcher(self):
+        if self._dispatcher is None or self._dispatcher.done():
+            self._budget = asyncio.Semaphore(self.max_concurrency)
+            self._wakeup = asyncio.Event()
+            self._dispatcher = asyncio.get_running_loop().create_task(self._dispatch_loop())
+
+    def submit(
+        self,
+        session_id,
+        items: Iterable[Any],
+        handler: Callable[[Any, CancellationToken], Awaitable[bool]],
+        max_concurrency: int = 5,
+        on_progress: Optional[Callable[[SessionSnapshot], None]] = None,
+        on_complete: Optional[Callable[[SessionSnapshot], Awaitable[None]]] = None
+    ) -> CancellationToken:
+        """
+        Queue a session's work items.
+
+        ``handler(item, token)`` returns True when the item succeeded;
+        returning False or raising counts it as failed. ``on_progress`` is
+        called with a fresh snapshot after every item and ``on_complete``
+        is awaited once the session has drained or been stopped.
+        """
+        if session_id in self._sessions:
+            raise ValueError(f"Session {session_id} is already scheduled")
+
+        self._ensure_dispatcher()
+        session = _ScheduledSession(session_id, items, handler, max_concurrency, on_progress, on_complete)
+        self._sessions[session_id] = session
+        self._rotation.append(session_id)
+        if not session.pending:
+            self._finish(session)
+        self._wakeup.set()
+        return session.token
+
+    def is_scheduled(self, session_id) -> bool:
+        return session_id in self._sessions
+
+    def pause(self, session_id) -> bool:
+        """Stop dispatching new items; running items finish normally"""
+        session = self._sessions.get(session_id)
+        if session is None:
+            return False
+        session.token.pause()
+        return True
+
+    def resume(self, session_id) -> bool:
+        session = self._sessions.get(session_id)
+        if session is None:
+            return False
+        session.token.resume()
+        self._wakeup.set()
+        return True
+
+    def stop(self, session_id) -> bool:
+        """Drop pending items and cancel the ones in flight"""
+        session = self._sessions.get(session_id)
+        if session is None:
+            return False
+        session.token.stop()
+        session.pending.clear()
+        for task in list(session.tasks):
+            task.cancel()
+        if not session.tasks:
+            self._finish(session)
+        return True
+
+    def snapshot(self, session_id) -> Optional[SessionSnapshot]:
+        session = self._sessions.get(session_id)
+        return session.snapshot() if session else None
+
+    async def wait(self, session_id) -> Optional[SessionSnapshot]:
+        """Wait until the session has drained or been stopped"""
+        session = self._sessions.get(session_id)
+        if session is None:
+            return None
+        return await asyncio.shield(session.finished)
+
+    def _next_runnable(self) -> Optional[_ScheduledSession]:
+        for _ in range(len(self._rotation)):
+            session_id = self._rotation[0]
+            self._rotation.rotate(-1)
+            session = self._sessions.get(session_id)
+            if session is not None and session.runnable:
+                return session
+        return None
+
+    async def _dispatch_loop(self):
+        while True:
+            await self._budget.acquire()
+            session = self._next_runnable()
+            if session is None:
+                self._budget.release()
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            # Never blocks: runnable means the session semaphore has a slot
+            await session.semaphore.acquire()
+            item = session.pending.popleft()
+            task = asyncio.get_running_loop().create_task(self._run_item(session, item))
+            session.tasks.add(task)
+            task.add_done_callback(functools.partial(self._item_done, session))
+
+    async def _run_item(self, session: _ScheduledSession, item):
+        try:
+            succeeded = bool(await session.handler(item, session.token))
+        except asyncio.CancelledError:
+            return
+        except Exception as e:
+            logger.error(f"Work item failed in session {session.session_id}: {str(e)}")
+            succeeded = False
+
+        if succeeded:
+            session.completed += 1
+        else:
+            session.failed += 1
+        if session.on_progress is not None:
+            try:
+                session.on_progress(session.snapshot())
+            except Exception as e:
+                logger.error(f"Progress callback failed for session {session.session_id}: {str(e)}")
+
+    def _item_done(self, session: _ScheduledSession, task: asyncio.Task):
+        # A done callback, not a finally: a task cancelled before its first
+        # step never runs its coroutine, but still has to give back its slots
+        session.tasks.discard(task)
+        session.semaphore.release()
+        self._budget.release()
+        self._wakeup.set()
+        if not session.tasks and (not session.pending or session.token.stopped):
+            self._finish(session)
+
+    def _finish(self, session: _ScheduledSession):
+        if self._sessions.get(session.session_id) is not session:
+            return
+        del self._sessions[session.session_id]
+        self._rotation.remove(session.session_id)
+        session.finished_at = time.monotonic()
+        snapshot = session.snapshot()
+        if not session.finished.done():
+            session.finished.set_result(snapshot)
+        if session.on_complete is not None:
+            task = asyncio.get_running_loop().create_task(session.on_complete(snapshot))
+            task.add_done_callback(_log_callback_error)
+
+    async def close(self):
+        """Stop every session and the dispatcher"""
+        for session_id in list(self._sessions):
+            self.stop(session_id)
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+            self._dispatcher = None
+
+
+def _log_callback_error(task: asyncio.Task):
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Session completion callback failed: {task.exception()}")
@@ -0,0 +1,236 @@
+import asyncio
+import logging
+import math
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+logger = logging.getLogger(__name__)
+
+PENDING_VIEWS_KEY = "job_views:pending"
+FLUSHING_VIEWS_PREFIX = "job_views:flushing:"
+
+# Trending score half-life; a view counts half as much after this long
+TRENDING_HALF_LIFE_HOURS = 6.0
+TRENDING_DECAY_PER_SECOND = math.log(2) / (TRENDING_HALF_LIFE_HOURS * 3600)
+
+
+class JobViewBuffer:
+    """
+    Aggregates job view events and flushes them to MongoDB in bulk.
+
+    Views are counted in a Redis hash shared by every worker so that the
+    periodic flush task sees all of them. When Redis is unreachable the
+    buffer falls back to an in-process counter that flushes itself once it
+    is large or old enough.
+    """
+
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        local_flush_threshold: int = 500,
+        local_flush_interval_seconds: int = 60
+    ):
+        self.redis_url = redis_url
+        self.local_flush_threshold = local_flush_threshold
+        self.local_flush_interval_seconds = local_flush_interval_seconds
+        self._redis = None
+        self._redis_failed_at: Optional[float] = None
+        self._local: Counter = Counter()
+        self._local_since = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def _get_redis(self):
+        if self._redis is not None:
+            return self._redis
+        # Back off for a minute after a connection failure
+        if self._redis_failed_at and time.monotonic() - self._redis_failed_at < 60:
+            return None
+        try:
+            import redis.asyncio as aioredis
+            from app.core.config import settings
+
+            client = aioredis.from_url(self.redis_url or settings.REDIS_URL, decode_responses=True)
+            await client.ping()
+            self._redis = client
+            return client
+        except Exception as e:
+            logger.warning(f"Redis unavailable for view counting, buffering in process: {e}")
+            self._redis_failed_at = time.monotonic()
+            return None
+
+    async def record_view(self, db: AsyncIOMotorDatabase, job_id: Any, count: int = 1):
+        """Count a view without touching the job document"""
+        client = await self._get_redis()
+        if client is not None:
+            try:
+                await client.hincrby(PENDING_VIEWS_KEY, str(job_id), count)
+                return
+            except Exception as e:
+                logger.warning(f"Failed to buffer view in Redis: {e}")
+                self._redis = None
+                self._redis_failed_at = time.monotonic()
+
+        self._local[str(job_id)] += count
+        if (sum(self._local.values()) >= self.local_flush_threshold or
+                time.monotonic() - self._local_since >= self.local_flush_interval_seconds):
+            await self.flush(db)
+
+    async def _drain(self) -> Dict[str, int]:
+        """Take every pending increment, leaving the buffers empty"""
+        pending: Counter = Counter()
+        async with self._lock:
+            pending.update(self._local)
+            self._local.clear()
+            self._local_since = time.monotonic()
+
+        client = await self._get_redis()
+        if client is not None:
+            # Rename first so views recorded during the flush go to a fresh hash
+            flushing_key = f"{FLUSHING_VIEWS_PREFIX}{uuid.uuid4().hex}"
+            try:
+                await client.rename(PENDING_VIEWS_KEY, flushing_key)
+            except Exception:
+                # No pending views
+                flushing_key = None
+            if flushing_key:
+                values = await client.hgetall(flushing_key)
+                await client.delete(flushing_key)
+                for job_id, count in values.items():
+                    pending[job_id] += int(count)
+        return dict(pending)
+
+    async def _restore(self, counts: Dict[str, int]):
+        """Put drained counts back after a failed write so the next flush retries them"""
+        if not counts:
+            return
+        client = await self._get_redis()
+        if client is not None:
+            try:
+                pipe = client.pipeline(transaction=False)
+                for job_id, count in counts.items():
+                    pipe.hincrby(PENDING_VIEWS_KEY, job_id, count)
+                await pipe.execute()
+                logger.warning(f"View flush failed; re-queued {sum(counts.values())} views")
+                return
+            except Exception as e:
+                logger.warning(f"Failed to re-queue views in Redis, keeping them in process: {e}")
+        async with self._lock:
+            self._local.update(counts)
+
+    async def flush(self, db: AsyncIOMotorDatabase) -> Dict[str, Any]:
+        """
+        Apply buffered views with one bulk write and update trending scores.
+
+        The trending score is an exponentially decayed view count: the stored
+        score is decayed by the time since its last update and the new views
+        are added, all inside the update pipeline so concurrent flushes stay
+        consistent. Views whose update fails are re-queued for the next flush.
+
+        Returns:
+            Flush statistics
+        """
+        pending = await self._drain()
+        if not pending:
+            return {"jobs_updated": 0, "views_flushed": 0}
+
+        now = datetime.utcnow()
+        job_ids = list(pending)
+        operations = [
+            UpdateOne({"id": _coerce_job_id(job_id)}, _view_update_pipeline(pending[job_id], now))
+            for job_id in job_ids
+        ]
+        try:
+            result = await db.job_posts.bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            # Unordered writes: everything but the reported operations was applied
+            failed = {job_ids[error["index"]] for error in e.details.get("writeErrors", [])}
+            await self._restore({job_id: pending[job_id] for job_id in failed})
+            raise
+        except Exception:
+            await self._restore(pending)
+            raise
+
+        stats = {
+            "jobs_updated": result.modified_count,
+            "views_flushed": sum(pending.values())
+        }
+        logger.info(f"Flushed {stats['views_flushed']} job views to {stats['jobs_updated']} jobs")
+        return stats
+
+    async def close(self):
+        if self._redis is not None:
+            await self._redis.close()
+            self._redis = None
+
+
+def _coerce_job_id(job_id: str) -> Any:
+    """Job ids arrive as strings from the buffer; numeric ids are stored as ints"""
+    return int(job_id) if job_id.isdigit() else job_id
+
+
+def _view_update_pipeline(count: int, now: datetime) -> List[Dict[str, Any]]:
+    elapsed_seconds = {
+        "$divide": [
+            {"$subtract": [now, {"$ifNull": ["$trending_updated_at", now]}]},
+            1000
+        ]
+    }
+    return [{
+        "$set": {
+            "views_count": {"$add": [{"$ifNull": ["$views_count", 0]}, count]},
+            "trending_score": {
+                "$add": [
+                    {"$multiply": [
+                        {"$ifNull": ["$trending_score", 0]},
+                        {"$exp": {"$multiply": [-TRENDING_DECAY_PER_SECOND, elapsed_seconds]}}
+                    ]},
+                    count
+                ]
+            },
+            "trending_updated_at": now
+        }
+    }]
+
+
+def decayed_trending_score(job: Dict[str, Any], now: Optional[datetime] = None) -> float:
+    """Trending score of a job as of now"""
+    score = job.get("trending_score") or 0.0
+    updated_at = job.get("trending_updated_at")
+    if not score or not updated_at:
+        return 0.0
+    elapsed = ((now or datetime.utcnow()) - updated_at).total_seconds()
+    return score * math.exp(-TRENDING_DECAY_PER_SECOND * max(elapsed, 0))
+
+
+async def get_trending_jobs(
+    db: AsyncIOMotorDatabase,
+    limit: int = 10,
+    window_hours: int = 48
+) -> List[Dict[str, Any]]:
+    """
+    Get jobs ordered by decayed view velocity.
+
+    Only jobs viewed within the window are considered; their stored scores
+    are decayed to the current time before ranking.
+    """
+    now = datetime.utcnow()
+    cursor = db.job_posts.find({
+        "status": "active",
+        "trending_updated_at": {"$gte": now - timedelta(hours=window_hours)}
+    }).sort("trending_score", -1).limit(limit * 5)
+    jobs = await cursor.to_list(length=limit * 5)
+    for job in jobs:
+        job["trending_score"] = decayed_trending_score(job, now)
+    jobs.sort(key=lambda j: j["trending_score"], reverse=True)
+    return jobs[:limit]
+
+
+# Global view buffer instance
+job_view_buffer = JobViewBuffer()
@@ -10,6 +10,7 @@ import re
 import asyncio
 from urllib.parse import urlparse
 
+from app.core.config import settings
 # from app.models.mongodb_models import ManagedWebsite, MemoryUpload  # Models not available in MongoDB structure
 from app.schemas.website_management import (
     WebsiteUploadResponse, WebsiteUploadStatus, WebsiteValidationResult, WebsiteConfig
@@ -17,6 +18,23 @@ from app.schemas.website_management import (
 
 logger = logging.getLogger(__name__)
 
+# Ordered URL keyword rules for auto-categorization; the first match wins
+DOMAIN_CATEGORY_RULES = [
+    ('job_boards', ['job', 'career', 'employment', 'hiring']),
+    ('news_media', ['news', 'blog', 'article']),
+    ('ecommerce', ['shop', 'store', 'buy', 'sell', 'commerce']),
+    ('social_media', ['social', 'community', 'forum']),
+    ('education', ['edu', 'university', 'school', 'learn']),
+]
+DEFAULT_CATEGORY = 'general'
+
+# One alternation per category, compiled once at import
+_COMPILED_CATEGORY_RULES = [
+    (category, re.compile('|'.join(re.escape(keyword) for keyword in keywords)))
+    for category, keywords in DOMAIN_CATEGORY_RULES
+]
+
+
 class WebsiteManagementService:
     """Service for managing bulk website uploads and operations."""
     
@@ -117,62 +135,58 @@ class WebsiteManagementService:
         processed_count = 0
         failed_count = 0
         error_details = []
+        chunk_size = max(1, settings.BULK_UPLOAD_CHUNK_SIZE)
         
         try:
-            for idx, website_data in enumerate(websites_data):
+            for chunk_start in range(0, len(websites_data), chunk_size):
+                chunk = websites_data[chunk_start:chunk_start + chunk_size]
+                
+                # Validate the whole chunk before touching the database
+                if enable_validation:
+                    valid_rows, chunk_errors = self._validate_chunk(chunk, chunk_start)
+                    failed_count += len(chunk_errors)
+                    error_details.extend(chunk_errors)
+                else:
+                    valid_rows = [(chunk_start + offset + 2, data) for offset, data in enumerate(chunk)]
+                
+                # A row that cannot be mapped fails on its own, not with its chunk
+                mappings = []
+                mapped_rows = []
+                for row, website_data in valid_rows:
+                    try:
+                        mappings.append(self._build_website_mapping(
+                            website_data, user_id, auto_categorize, default_rate_limit, default_max_pages
+                        ))
+                        mapped_rows.append(row)
+                    except Exception as e:
+                        failed_count += 1
+                        error_details.append({"row": row, "errors": [f"Processing error: {str(e)}"]})
+                        logger.error(f"Error processing website at row {row}: {str(e)}")
+                
                 try:
-                    # Validate website data
-                    if enable_validation:
-                        validation_errors = self._validate_website_data(website_data)
-                        if validation_errors:
-                            failed_count += 1
-                            error_details.append({
-                                "row": idx + 2,  # +2 for header and 0-based index
-                                "errors": validation_errors
-                            })
-                            continue
-                    
-                    # Auto-categorize if enabled
-                    if auto_categorize and not website_data.get('category'):
-                        website_data['category'] = self._auto_categorize_website(
-                            website_data['url']
-                        )
-                    
-                    # Apply defaults
-                    website_data.setdefault('rate_limit', default_rate_limit)
-                    website_data.setdefault('max_pages', default_max_pages)
-                    website_data.setdefault('scraping_enabled', True)
-                    
-                    # Create website record
-                    website = ManagedWebsite(
-                        user_id=user_id,
-                        name=website_data['name'],
-                        url=website_data['url'],
-                        category=website_data['category'],
-                        scraping_enabled=website_data.get('scraping_enabled', True),
-                        rate_limit=website_data.get('rate_limit', default_rate_limit),
-                        max_pages=website_data.get('max_pages', default_max_pages),
-                        custom_headers=website_data.get('custom_headers', {}),
-                        selectors=website_data.get('selectors', {}),
-                        status="active"
-                    )
-                    
-                    self.db.add(website)
-                    processed_count += 1
-                    
-                    # Update progress every 10 websites
-                    if processed_count % 10 == 0:
-                        upload_record.processed_records = processed_count
-                        upload_record.failed_records = failed_count
-                        self.db.commit()
-                    
+                    if mappings:
+                        self.db.bulk_insert_mappings(ManagedWebsite, mappings)
+                    processed_count += len(mappings)
+                    upload_record.processed_records = processed_count
+                    upload_record.failed_records = failed_count
+                    self.db.commit()
                 except Exception as e:
-                    failed_count += 1
-                    error_details.append({
-                        "row": idx + 2,
-                        "errors": [f"Processing error: {str(e)}"]
-                    })
-                    logger.error(f"Error processing website {idx}: {str(e)}")
+                    self.db.rollback()
+                    logger.error(f"Error inserting websites {chunk_start}-{chunk_start + len(chunk)}: {str(e)}")
+                    failed_count += len(mappings)
+                    error_details.extend(
+                        {"row": row, "errors": [f"Processing error: {str(e)}"]}
+                        for row in mapped_rows
+                    )
+                
+                # Stop between chunks if the upload was cancelled meanwhile
+                self.db.refresh(upload_record)
+                if upload_record.status == "cancelled":
+                    logger.info(f"Upload {upload_id} cancelled after {processed_count} websites")
+                    return
+                
+                # The session is synchronous; let other tasks run between chunks
+                await asyncio.sleep(0)
             
             # Final update
             upload_record.processed_records = processed_count
@@ -189,6 +203,54 @@ class WebsiteManagementService:
             upload_record.error_message = str(e)
             self.db.commit()
     
+    def _validate_chunk(
+        self,
+        chunk: List[Dict[str, Any]],
+        chunk_start: int
+    ) -> tuple:
+        """
+        Validate a chunk of website rows.
+        
+        Returns (valid_rows, error_details) where valid_rows holds
+        (csv_row_number, website_data) pairs.
+        """
+        valid_rows = []
+        error_details = []
+        for offset, website_data in enumerate(chunk):
+            row = chunk_start + offset + 2  # +2 for header and 0-based index
+            validation_errors = self._validate_website_data(website_data)
+            if validation_errors:
+                error_details.append({"row": row, "errors": validation_errors})
+            else:
+                valid_rows.append((row, website_data))
+        return valid_rows, error_details
+    
+    def _build_website_mapping(
+        self,
+        website_data: Dict[str, Any],
+        user_id: int,
+        auto_categorize: bool,
+        default_rate_limit: int,
+        default_max_pages: int
+    ) -> Dict[str, Any]:
+        """Column values for one ManagedWebsite row in a bulk insert."""
+        category = website_data.get('category')
+        if auto_categorize and not category:
+            category = self._auto_categorize_website(website_data['url'])
+        
+        return {
+            "user_id": user_id,
+            "name": website_data['name'],
+            "url": website_data['url'],
+            "category": category,
+            "scraping_enabled": website_data.get('scraping_enabled', True),
+            "rate_limit": website_data.get('rate_limit', default_rate_limit),
+            "max_pages": website_data.get('max_pages', default_max_pages),
+            "custom_headers": website_data.get('custom_headers', {}),
+            "selectors": website_data.get('selectors', {}),
+            "status": "active"
+        }
+    
     def _parse_csv_content(self, csv_content: str) -> List[Dict[str, Any]]:
         """Parse CSV content and return list of website data."""
         
@@ -270,20 +332,10 @@ class WebsiteManagementService:
         """Auto-categorize website based on URL patterns."""
         
         url_lower = url.lower()
-        
-        # Simple categorization rules
-        if any(keyword in url_lower for keyword in ['job', 'career', 'employment', 'hiring']):
-            return 'job_boards'
-        elif any(keyword in url_lower for keyword in ['news', 'blog', 'article']):
-            return 'news_media'
-        elif any(keyword in url_lower for keyword in ['shop', 'store', 'buy', 'sell', 'commerce']):
-            return 'ecommerce'
-        elif any(keyword in url_lower for keyword in ['social', 'community', 'forum']):
-            return 'social_media'
-        elif any(keyword in url_lower for keyword in ['edu', 'university', 'school', 'learn']):
-            return 'education'
-        else:
-            return 'general'
+        for category, pattern in _COMPILED_CATEGORY_RULES:
+            if pattern.search(url_lower):
+                return category
+        return DEFAULT_CATEGORY
     
     async def get_upload_status(self, upload_id: str, user_id: int) -> Optional[WebsiteUploadStatus]:
         """Get upload status by ID."""
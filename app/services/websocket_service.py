@@ -1,19 +1,265 @@
 import asyncio
 import json
-from typing import Dict, Set, Any, Optional
+import threading
+import uuid
+from typing import Dict, Set, Any, Optional, Callable, Awaitable
 from fastapi import WebSocket, WebSocketDisconnect
 from datetime import datetime, timedelta
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Redis channel shared by every API worker and Celery task
+WEBSOCKET_EVENTS_CHANNEL = "remotehive:websocket_events"
+
+DROP_OLDEST = "drop_oldest"
+DISCONNECT = "disconnect"
+
+
+class ConnectionChannel:
+    """
+    Outbound queue and sender task for a single WebSocket connection.
+
+    Broadcasts only enqueue pre-serialized payloads, so a slow client fills
+    its own bounded queue instead of delaying every other connection.
+    """
+    
+    def __init__(
+        self,
+        websocket: WebSocket,
+        on_failure: Callable[[WebSocket], Awaitable[None]],
+        max_queue_size: int = 100,
+        drop_policy: str = DROP_OLDEST
+    ):
+        self.websocket = websocket
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self.drop_policy = drop_policy
+        self.dropped_messages = 0
+        self._on_failure = on_failure
+        self._task: Optional[asyncio.Task] = None
+    
+    def start(self):
+        """Start the sender task for this connection"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._sender())
+    
+    async def stop(self):
+        """Cancel the sender task"""
+        if self._task is not None and self._task is not asyncio.current_task():
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._task = None
+    
+    def enqueue(self, payload: str) -> bool:
+        """
+        Queue a serialized message without waiting.
+        
+        Returns:
+            False if the connection should be dropped under the drop policy
+        """
+        try:
+            self.queue.put_nowait(payload)
+            return True
+        except asyncio.QueueFull:
+            self.dropped_messages += 1
+            if self.drop_policy == DISCONNECT:
+                return False
+            # Drop the oldest pending message to make room for the newest one
+            try:
+                self.queue.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+            self.queue.put_nowait(payload)
+            return True
+    
+    async def _sender(self):
+        try:
+            while True:
+                payload = await self.queue.get()
+                await self.websocket.send_text(payload)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error broadcasting to WebSocket: {str(e)}")
+            self._task = None
+            await self._on_failure(self.websocket)
+
+
+class LocalBackplane:
+    """
+    In-process stand-in for the Redis backplane.
+
+    Events are delivered only to connections held by this process, which is
+    the behaviour of a single-worker deployment and of the test suite.
+    """
+    
+    def __init__(self):
+        self._handler: Optional[Callable[[str, Optional[str], str], Awaitable[None]]] = None
+    
+    async def start(self, handler: Callable[[str, Optional[str], str], Awaitable[None]]):
+        self._handler = handler
+    
+    async def stop(self):
+        self._handler = None
+    
+    async def publish(self, connection_type: str, identifier: Optional[str], payload: str) -> bool:
+        # Local delivery is already done by the manager
+        return True
+
+
+class RedisBackplane:
+    """
+    Redis pub/sub backplane that fans WebSocket events out to every worker.
+
+    Each message carries the publishing worker's origin id so that the
+    publisher, which has already delivered to its own sockets, skips it.
+    """
+    
+    def __init__(self, redis_url: str, channel: str = WEBSOCKET_EVENTS_CHANNEL):
+        self.redis_url = redis_url
+        self.channel = channel
+        self.origin_id = uuid.uuid4().hex
+        self._redis = None
+        self._pubsub = None
+        self._listener: Optional[asyncio.Task] = None
+        self._handler: Optional[Callable[[str, Optional[str], str], Awaitable[None]]] = None
+    
+    async def start(self, handler: Callable[[str, Optional[str], str], Awaitable[None]]):
+        import redis.asyncio as aioredis
+        
+        self._handler = handler
+        self._redis = aioredis.from_url(self.redis_url, decode_responses=True)
+        self._pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        await self._pubsub.subscribe(self.channel)
+        self._listener = asyncio.create_task(self._listen())
+        logger.info(f"WebSocket backplane subscribed to {self.channel}")
+    
+    async def stop(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._listener = None
+        if self._pubsub is not None:
+            await self._pubsub.unsubscribe(self.channel)
+            await self._pubsub.close()
+            self._pubsub = None
+        if self._redis is not None:
+            await self._redis.close()
+            self._redis = None
+    
+    async def publish(self, connection_type: str, identifier: Optional[str], payload: str) -> bool:
+        if self._redis is None:
+            return False
+        try:
+            envelope = _build_envelope(connection_type, identifier, payload, self.origin_id)
+            await self._redis.publish(self.channel, envelope)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to publish WebSocket event to backplane: {str(e)}")
+            return False
+    
+    async def _listen(self):
+        while True:
+            try:
+                async for message in self._pubsub.listen():
+                    if message.get('type') != 'message':
+                        continue
+                    try:
+                        envelope = json.loads(message['data'])
+                    except (TypeError, ValueError):
+                        continue
+                    if envelope.get('origin') == self.origin_id:
+                        continue
+                    await self._handler(
+                        envelope['connection_type'],
+                        envelope.get('identifier'),
+                        envelope['payload']
+                    )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"WebSocket backplane listener error: {str(e)}")
+                await asyncio.sleep(1)
+
+
+def _build_envelope(
+    connection_type: str,
+    identifier: Optional[str],
+    payload: str,
+    origin: Optional[str] = None
+) -> str:
+    """Wrap an already-serialized payload for the backplane channel"""
+    return json.dumps({
+        'origin': origin,
+        'connection_type': connection_type,
+        'identifier': identifier,
+        'payload': payload
+    })
+
+
+# Sync Redis clients for publish_websocket_event, one per URL; each holds
+# its own connection pool, so tasks publishing many events reuse connections
+_publish_clients: Dict[str, Any] = {}
+_publish_clients_lock = threading.Lock()
+
+
+def _get_publish_client(redis_url: str):
+    """The shared synchronous Redis client for a URL"""
+    with _publish_clients_lock:
+        client = _publish_clients.get(redis_url)
+        if client is None:
+            import redis
+            client = _publish_clients[redis_url] = redis.Redis.from_url(redis_url)
+        return client
+
+
+def publish_websocket_event(
+    connection_type: str,
+    identifier: Optional[str],
+    data: Dict[str, Any],
+    redis_url: Optional[str] = None
+) -> bool:
+    """
+    Publish a WebSocket event from synchronous code such as Celery tasks.
+
+    The event is delivered by every API worker subscribed to the backplane.
+    
+    Args:
+        connection_type: Type of connections to broadcast to
+        identifier: Specific identifier (optional)
+        data: Data to broadcast
+        redis_url: Redis URL (defaults to settings.REDIS_URL)
+    
+    Returns:
+        True if the event was published
+    """
+    try:
+        from app.core.config import settings
+        
+        client = _get_publish_client(redis_url or settings.REDIS_URL)
+        client.publish(
+            WEBSOCKET_EVENTS_CHANNEL,
+            _build_envelope(connection_type, identifier, json.dumps(data, default=str))
+        )
+        return True
+    except Exception as e:
+        logger.error(f"Failed to publish WebSocket event: {str(e)}")
+        return False
+
+
 class WebSocketManager:
     """
     WebSocket manager for real-time updates in the admin interface.
     Handles connections for CSV import progress, scraper status, and analytics.
     """
     
-    def __init__(self):
+    def __init__(self, max_queue_size: int = 100, drop_policy: str = DROP_OLDEST):
         # Store active connections by type and identifier
         self.connections: Dict[str, Dict[str, Set[WebSocket]]] = {
             'csv_import': {},  # upload_id -> set of websockets
@@ -22,6 +268,37 @@ class WebSocketManager:
             'admin_general': set()  # general admin notifications
         }
         self.connection_metadata: Dict[WebSocket, Dict[str, Any]] = {}
+        self.channels: Dict[WebSocket, ConnectionChannel] = {}
+        self.max_queue_size = max_queue_size
+        self.drop_policy = drop_policy
+        self.backplane = LocalBackplane()
+    
+    async def start_backplane(self, redis_url: Optional[str] = None):
+        """
+        Subscribe to the cross-worker backplane.
+        
+        Args:
+            redis_url: Redis URL; the in-process backplane is used when omitted
+                or when Redis is unreachable
+        """
+        if redis_url:
+            backplane = RedisBackplane(redis_url)
+            try:
+                await backplane.start(self._deliver_local)
+                self.backplane = backplane
+                return
+            except Exception as e:
+                logger.warning(f"Redis WebSocket backplane unavailable, using local delivery: {str(e)}")
+                await backplane.stop()
+        self.backplane = LocalBackplane()
+        await self.backplane.start(self._deliver_local)
+    
+    async def stop_backplane(self):
+        """Unsubscribe from the backplane and stop all sender tasks"""
+        await self.backplane.stop()
+        self.backplane = LocalBackplane()
+        for channel in list(self.channels.values()):
+            await channel.stop()
     
     async def connect(
         self,
@@ -41,6 +318,15 @@ class WebSocketManager:
         """
         await websocket.accept()
         
+        channel = ConnectionChannel(
+            websocket,
+            on_failure=self.disconnect,
+            max_queue_size=self.max_queue_size,
+            drop_policy=self.drop_policy
+        )
+        self.channels[websocket] = channel
+        channel.start()
+        
         # Store connection metadata
         self.connection_metadata[websocket] = {
             'type': connection_type,
@@ -95,6 +381,10 @@ class WebSocketManager:
         # Remove metadata
         del self.connection_metadata[websocket]
         
+        channel = self.channels.pop(websocket, None)
+        if channel is not None:
+            await channel.stop()
+        
         logger.info(f"WebSocket disconnected: {connection_type}:{identifier}")
     
     async def send_to_connection(self, websocket: WebSocket, data: Dict[str, Any]):
@@ -105,8 +395,14 @@ class WebSocketManager:
             websocket: WebSocket connection
             data: Data to send
         """
+        channel = self.channels.get(websocket)
+        if channel is not None:
+            # Keep per-connection ordering with broadcasts
+            if not channel.enqueue(json.dumps(data, default=str)):
+                await self.disconnect(websocket)
+            return
         try:
-            await websocket.send_text(json.dumps(data))
+            await websocket.send_text(json.dumps(data, default=str))
         except Exception as e:
             logger.error(f"Error sending WebSocket message: {str(e)}")
             await self.disconnect(websocket)
@@ -118,31 +414,53 @@ class WebSocketManager:
         data: Dict[str, Any]
     ):
         """
-        Broadcast data to all connections of a specific type.
+        Broadcast data to all connections of a specific type on every worker.
+        
+        The message is serialized once, delivered to this worker's connections
+        and published on the backplane for the others.
         
         Args:
             connection_type: Type of connections to broadcast to
             identifier: Specific identifier (optional)
             data: Data to broadcast
         """
+        payload = json.dumps(data, default=str)
+        await self._deliver_local(connection_type, identifier, payload)
+        await self.backplane.publish(connection_type, identifier, payload)
+    
+    async def _deliver_local(
+        self,
+        connection_type: str,
+        identifier: Optional[str],
+        payload: str
+    ):
+        """
+        Queue a serialized payload on this worker's matching connections.
+        
+        Args:
+            connection_type: Type of connections to deliver to
+            identifier: Specific identifier (optional)
+            payload: JSON-encoded message
+        """
         if connection_type == 'admin_general':
             connections = list(self.connections['admin_general'])
         else:
-            if not identifier or identifier not in self.connections[connection_type]:
+            group = self.connections.get(connection_type, {})
+            if not identifier or identifier not in group:
                 return
-            connections = list(self.connections[connection_type][identifier])
+            connections = list(group[identifier])
         
-        # Send to all connections
-        disconnected = []
+        overflowed = []
         for websocket in connections:
-            try:
-                await websocket.send_text(json.dumps(data))
-            except Exception as e:
-                logger.error(f"Error broadcasting to WebSocket: {str(e)}")
-                disconnected.append(websocket)
-        
-        # Clean up disconnected sockets
-        for websocket in disconnected:
+            channel = self.channels.get(websocket)
+            if channel is None:
+                continue
+            if not channel.enqueue(payload):
+                overflowed.append(websocket)
+        
+        # Drop connections that cannot keep up under the disconnect policy
+        for websocket in overflowed:
+            logger.warning("Disconnecting slow WebSocket client: outbound queue full")
             await self.disconnect(websocket)
     
     async def send_csv_import_update(
@@ -239,7 +557,10 @@ class WebSocketManager:
             'active_imports': len(self.connections['csv_import']),
             'active_scrapers': len(self.connections['scraper_status']),
             'active_dashboards': len(self.connections['analytics']),
-            'admin_connections': len(self.connections['admin_general'])
+            'admin_connections': len(self.connections['admin_general']),
+            'queued_messages': sum(c.queue.qsize() for c in self.channels.values()),
+            'dropped_messages': sum(c.dropped_messages for c in self.channels.values()),
+            'backplane': type(self.backplane).__name__
         }
         
         # Count connections by type
@@ -3,7 +3,6 @@ from app.core.database import get_db
 from app.core.config import settings
 from app.database.services import UserService, JobPostService, JobApplicationService
 from app.database.database import get_database_manager
-import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
@@ -11,6 +10,9 @@ from email import encoders
 import logging
 from typing import List, Dict, Any, Optional
 from jinja2 import Template
+import asyncio
+from functools import lru_cache
+from app.services.email_delivery import get_delivery_engine, EmailDeliveryEngine
 
 logger = logging.getLogger(__name__)
 
@@ -212,22 +214,10 @@ def send_email(to_email: str, subject: str, template_name: str = None, template_
                 except Exception as e:
                     logger.error(f"Failed to attach file {file_path}: {str(e)}")
         
-        # Send email
-        logger.info("Starting SMTP connection...")
-        with smtplib.SMTP(settings.EMAIL_HOST, settings.EMAIL_PORT) as server:
-            logger.info("SMTP connection established")
-            if settings.EMAIL_USE_TLS:
-                logger.info("Starting TLS...")
-                server.starttls()
-                logger.info("TLS started successfully")
-            if settings.EMAIL_USERNAME and settings.EMAIL_PASSWORD:
-                logger.info("Authenticating with SMTP server...")
-                server.login(settings.EMAIL_USERNAME, settings.EMAIL_PASSWORD)
-                logger.info("Authentication successful")
-            
-            logger.info("Sending email message...")
-            server.send_message(msg)
-            logger.info("Email message sent successfully")
+        # Send email over a pooled SMTP session
+        logger.info("Sending email message...")
+        get_delivery_engine().send_message(msg)
+        logger.info("Email message sent successfully")
         
         logger.info(f"Email sent successfully to {to_email}")
         return {'success': True, 'message': f'Email sent to {to_email}'}
@@ -252,8 +242,16 @@ def render_email_template(template_name: str, template_data: dict) -> str:
     if template_name not in templates:
         raise ValueError(f"Template '{template_name}' not found")
     
-    template = Template(templates[template_name])
-    return template.render(**template_data)
+    return _compiled_template(templates[template_name]).render(**template_data)
+
+def _summary(text: str, length: int = 200) -> str:
+    """First ``length`` characters of a job description for digest emails."""
+    return text[:length] + '...' if len(text) > length else text
+
+@lru_cache(maxsize=32)
+def _compiled_template(source: str) -> Template:
+    """Compile each email template once per process."""
+    return Template(source)
 
 @celery_app.task(bind=True, max_retries=3)
 def send_verification_email_task(self, to_email: str, user_name: str, verification_token: str):
@@ -338,24 +336,24 @@ def send_welcome_email(self, user_id: int):
         raise self.retry(countdown=300, max_retries=3)
 
 @celery_app.task(bind=True)
-def send_job_alert_email(self, user_id: int, job_ids: List[int]):
+def send_job_alert_email(self, user_id: str, job_ids: List[str]):
     """Send job alert email to user."""
     try:
         db_manager = get_database_manager()
         
         with db_manager.session_scope() as db:
-            user_service = UserService(db)
-            user = user_service.get_user_by_id(str(user_id))
-            
-            if not user:
-                raise ValueError(f"User {user_id} not found")
-            
-            # Get job posts by IDs
-            jobs = []
-            for job_id in job_ids:
-                job = JobPostService.get_job_post_by_id(db, job_id)
-                if job:
-                    jobs.append(job)
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            try:
+                # Alerts reference users and digests reference jobs by document _id
+                user = loop.run_until_complete(UserService.get_user_by_object_id(db, user_id))
+                if not user:
+                    raise ValueError(f"User {user_id} not found")
+                
+                # Get all digest job posts with one query
+                jobs = loop.run_until_complete(JobPostService.get_job_posts_by_ids(db, job_ids))
+            finally:
+                loop.close()
             
             if not jobs:
                 logger.warning(f"No jobs found for IDs: {job_ids}")
@@ -363,17 +361,16 @@ def send_job_alert_email(self, user_id: int, job_ids: List[int]):
             
             # Convert job objects to dict for template rendering
             jobs_data = [{
-                'id': job.id,
-                'title': job.title,
-                'company_name': job.company_name,
-                'location_city': job.location_city,
-                'location_state': job.location_state,
-                'job_type': job.job_type,
-                'description': job.description[:200] + '...' if len(job.description) > 200 else job.description
+                'id': str(job['_id']),
+                'title': job.get('title'),
+                'company_name': job.get('company_name'),
+                'location_city': job.get('location_city'),
+                'location_state': job.get('location_state'),
+                'job_type': job.get('job_type'),
+                'description': _summary(job.get('description') or '')
             } for job in jobs]
             
-            template = Template(JOB_ALERT_TEMPLATE)
-            html_content = template.render(
+            html_content = _compiled_template(JOB_ALERT_TEMPLATE).render(
                 user_name=user.first_name or user.email,
                 job_count=len(jobs),
                 jobs=jobs_data,
@@ -420,7 +417,7 @@ def send_application_status_email(self, application_id: int):
             if not user or not job:
                 raise ValueError(f"Missing user or job data for application {application_id}")
             
-            template = Template(APPLICATION_STATUS_TEMPLATE)
+            template = _compiled_template(APPLICATION_STATUS_TEMPLATE)
             html_content = template.render(
                 user_name=user.first_name or user.email,
                 job_title=job.title,
@@ -451,50 +448,53 @@ def send_application_status_email(self, application_id: int):
 
 @celery_app.task(bind=True)
 def send_bulk_email(self, user_ids: List[int], subject: str, html_content: str):
-    """Send bulk email to multiple users."""
+    """Send bulk email to multiple users.
+    
+    Recipients are resolved with one query, ``{{ user_name }}``,
+    ``{{ to_email }}`` and ``{{ base_url }}`` in the subject and body are
+    filled in per user (the rest is sent verbatim) and messages go out
+    concurrently over pooled SMTP sessions.
+    """
     try:
         db_manager = get_database_manager()
         
         with db_manager.session_scope() as db:
-            user_service = UserService(db)
-            users = []
-            
-            # Get users by IDs
-            for user_id in user_ids:
-                user = user_service.get_user_by_id(str(user_id))
-                if user:
-                    users.append(user)
-            
-            results = []
-            for user in users:
-                try:
-                    success = send_email(
-                        to_email=user.email,
-                        subject=subject,
-                        html_content=html_content
-                    )
-                    results.append({
-                        "user_id": user.id,
-                        "email": user.email,
-                        "success": success
-                    })
-                except Exception as e:
-                    logger.error(f"Failed to send email to user {user.id}: {str(e)}")
-                    results.append({
-                        "user_id": user.id,
-                        "email": user.email,
-                        "success": False,
-                        "error": str(e)
-                    })
-            
-            successful_sends = sum(1 for r in results if r["success"])
-            
-            return {
-                "total_users": len(users),
-                "successful_sends": successful_sends,
-                "failed_sends": len(users) - successful_sends,
-                "results": results
-            }
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            try:
+                users = loop.run_until_complete(UserService.get_users_by_ids(db, user_ids))
+            finally:
+                loop.close()
+        
+        recipients = [{
+            "to_email": user.email,
+            "user_id": str(user.id),
+            "user_name": user.first_name or user.email,
+            "base_url": settings.FRONTEND_URL
+        } for user in users if user.email]
+        
+        engine = EmailDeliveryEngine.from_settings()
+        try:
+            messages = engine.render_messages(html_content, subject, recipients)
+            reports = engine.send_all(messages)
+        finally:
+            engine.close()
+        
+        results = [{
+            "user_id": result.metadata.get("user_id"),
+            "email": result.to_email,
+            "success": result.success,
+            **({"error": result.error} if result.error else {})
+        } for report in reports for result in report.results]
+        successful_sends = sum(report.sent for report in reports)
+        
+        return {
+            "total_users": len(recipients),
+            "successful_sends": successful_sends,
+            "failed_sends": len(recipients) - successful_sends,
+            "batches": [report.summary() for report in reports],
+            "results": results
+        }
     
     except Exception as e:
         logger.error(f"Error in bulk email send: {str(e)}")
@@ -1,12 +1,16 @@
 from celery import current_app as celery_app
+from celery import group
 from app.core.database import get_db
-from app.database.services import JobPostService, JobApplicationService, UserService
+from app.database.services import JobPostService, JobApplicationService, UserService, JobAlertService, SystemService
 from app.database.database import get_database_manager
 # from app.database.models import ScraperConfig, ScraperLog, ScraperMemory, JobPost, JobApplication
 from app.models.mongodb_models import JobPost, JobApplication
 from app.database.mongodb_models import ScraperConfig, ScraperLog
 # Note: ScraperMemory needs to be implemented in MongoDB models if needed
+from app.services.job_alert_percolator import JobAlertPercolator
+from app.services.view_counter import job_view_buffer
 from datetime import datetime, timedelta
+import asyncio
 import logging
 from typing import List, Dict, Any
 # from sqlalchemy import and_, or_  # Using MongoDB instead
@@ -73,68 +77,121 @@ def cleanup_old_job_posts():
 
 @celery_app.task
 def update_job_view_counts():
-    """Update job view counts and calculate trending jobs."""
+    """Flush buffered job views in one bulk write and update trending scores."""
     try:
         db_manager = get_database_manager()
         
         with db_manager.session_scope() as db:
-            # This is a placeholder for view count analytics
-            # In a real implementation, you might:
-            # 1. Aggregate view data from Redis or analytics service
-            # 2. Update job popularity scores
-            # 3. Calculate trending jobs
-            
-            active_jobs = db.query(JobPost).filter(JobPost.status == "active").all()
-            
-            updated_count = 0
-            for job in active_jobs:
-                # Simulate view count updates (replace with actual analytics)
-                # JobPostService.update_job_post(db, job.id, view_count=get_actual_view_count(job.id))
-                updated_count += 1
-            
-            logger.info(f"Updated view counts for {updated_count} jobs")
-            return {"updated_jobs": updated_count}
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            try:
+                result = loop.run_until_complete(job_view_buffer.flush(db))
+            finally:
+                loop.run_until_complete(job_view_buffer.close())
+                loop.close()
+        
+        logger.info(f"Updated view counts for {result['jobs_updated']} jobs")
+        return {"updated_jobs": result["jobs_updated"], "views_flushed": result["views_flushed"]}
     
     except Exception as e:
         logger.error(f"Error updating job view counts: {str(e)}")
         raise
 
+JOB_ALERTS_WATERMARK_KEY = "job_alerts_last_run"
+JOB_ALERT_EMAIL_BATCH_SIZE = 100
+
 @celery_app.task
-def send_job_alerts():
-    """Send job alerts to users based on their preferences."""
+def send_job_alerts(max_jobs_per_digest: int = 20):
+    """Match new job posts against saved alerts and send per-user digests."""
     try:
         db_manager = get_database_manager()
         
         with db_manager.session_scope() as db:
-            # This is a placeholder for job alert functionality
-            # In a real implementation, you would:
-            # 1. Get users with job alert preferences
-            # 2. Find matching new jobs
-            # 3. Send email notifications
-            
-            # Get new jobs from the last 24 hours
-            yesterday = datetime.utcnow() - timedelta(days=1)
-            new_jobs = db.query(JobPost).filter(
-                and_(
-                    JobPost.created_at >= yesterday,
-                    JobPost.status == "active"
-                )
-            ).all()
-            
-            alerts_sent = 0
-            # Placeholder for actual alert logic
-            for job in new_jobs:
-                # Find matching users and send alerts
-                # alerts_sent += send_alert_to_matching_users(job)
-                pass
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            try:
+                result = loop.run_until_complete(_percolate_new_jobs(db, max_jobs_per_digest))
+            finally:
+                loop.close()
         
-        logger.info(f"Sent {alerts_sent} job alerts")
-        return {"alerts_sent": alerts_sent, "new_jobs": len(new_jobs.data)}
+        logger.info(
+            f"Sent {result['alerts_sent']} job alert digests for {result['new_jobs']} new jobs "
+            f"against {result['active_alerts']} alerts"
+        )
+        return result
     
     except Exception as e:
         logger.error(f"Error sending job alerts: {str(e)}")
         raise
 
+async def _percolate_new_jobs(db, max_jobs_per_digest: int) -> Dict[str, Any]:
+    """Stream jobs posted since the last run through the alert percolator."""
+    from app.tasks.email import send_job_alert_email
+    
+    run_started = datetime.utcnow()
+    watermark = await SystemService.get_setting(db, JOB_ALERTS_WATERMARK_KEY)
+    since = datetime.fromisoformat(watermark) if watermark else run_started - timedelta(days=1)
+    
+    alert_documents = await JobAlertService.get_active_alerts(db)
+    percolator = JobAlertPercolator()
+    percolator.load(alert_documents)
+    alert_object_ids = {str(doc["_id"]): doc["_id"] for doc in alert_documents}
+    
+    new_jobs = 0
+    digests: Dict[str, Dict[str, Any]] = {}
+    if len(percolator):
+        cursor = db.job_posts.find({
+            "status": "active",
+            "created_at": {"$gt": since, "$lte": run_started}
+        })
+        batch = []
+        async for job in cursor:
+            batch.append(job)
+            new_jobs += 1
+            if len(batch) >= 500:
+                _merge_digests(digests, percolator.build_digests(batch, max_jobs_per_digest), max_jobs_per_digest)
+                batch = []
+        if batch:
+            _merge_digests(digests, percolator.build_digests(batch, max_jobs_per_digest), max_jobs_per_digest)
+    
+    # Queue one email task per user, dispatched in batches
+    signatures = [
+        send_job_alert_email.s(user_id, digest["job_ids"])
+        for user_id, digest in digests.items()
+        if digest["job_ids"]
+    ]
+    for start in range(0, len(signatures), JOB_ALERT_EMAIL_BATCH_SIZE):
+        group(signatures[start:start + JOB_ALERT_EMAIL_BATCH_SIZE]).apply_async()
+    
+    sent_alert_ids = [
+        alert_object_ids[alert_id]
+        for digest in digests.values()
+        for alert_id in digest["alert_ids"]
+        if alert_id in alert_object_ids
+    ]
+    await JobAlertService.mark_alerts_sent(db, sent_alert_ids, run_started)
+    await SystemService.set_setting(
+        db, JOB_ALERTS_WATERMARK_KEY, run_started.isoformat(),
+        description="Creation time of the newest job matched against job alerts"
+    )
+    
+    return {
+        "alerts_sent": len(signatures),
+        "new_jobs": new_jobs,
+        "active_alerts": len(percolator)
+    }
+
+def _merge_digests(target: Dict[str, Dict[str, Any]], batch: Dict[str, Dict[str, Any]], max_jobs: int):
+    """Fold one batch of per-user digests into the running totals."""
+    for user_id, digest in batch.items():
+        existing = target.setdefault(user_id, {"job_ids": [], "alert_ids": set()})
+        existing["alert_ids"] |= digest["alert_ids"]
+        for job_id in digest["job_ids"]:
+            if len(existing["job_ids"]) >= max_jobs:
+                break
+            if job_id not in existing["job_ids"]:
+                existing["job_ids"].append(job_id)
+
 @celery_app.task
 def cleanup_old_applications():
     """Clean up old job applications (older than 1 year and rejected)."""
@@ -9,6 +9,7 @@ from app.scraper.engine import WebScrapingEngine, ScrapingConfig
 from app.scraper.parsers import ParsedJobPost
 from app.scraper.exceptions import ScrapingError, RateLimitError, NetworkError
 from app.tasks.playwright_scraper import playwright_scrape_jobs, batch_playwright_scrape
+from app.services.websocket_service import publish_websocket_event
 from datetime import datetime, timedelta
 import logging
 from typing import List, Dict, Any
@@ -20,6 +21,15 @@ import time
 
 logger = logging.getLogger(__name__)
 
+def _publish_scraper_status(config_id: int, status: str, **extra: Any) -> None:
+    """Push a scraper status event to WebSocket subscribers on every API worker"""
+    publish_websocket_event('scraper_status', str(config_id), {
+        'type': 'scraper_status_update',
+        'scraper_id': str(config_id),
+        'data': {'status': status, **extra},
+        'timestamp': datetime.utcnow().isoformat()
+    })
+
 @celery_app.task(bind=True, max_retries=3)
 def run_scheduled_scrapers(self):
     """
@@ -131,6 +141,8 @@ def run_single_scraper(self, config_id: int):
             
             log_id = scraper_log.id
         
+        _publish_scraper_status(config_id, 'running', session_id=session_id, log_id=log_id)
+        
         # Run the actual scraping logic with performance tracking
         try:
             with PerformanceContext(session_id, config_id, config.source) as perf_session:
@@ -162,6 +174,13 @@ def run_single_scraper(self, config_id: int):
                         log_entry.metadata['performance_summary'] = perf_summary
                     db.commit()
             
+            _publish_scraper_status(
+                config_id, 'completed',
+                session_id=session_id,
+                jobs_found=result.get('jobs_found', 0),
+                jobs_created=result.get('jobs_created', 0)
+            )
+            
             logger.info(f"Scraper completed for config_id: {config_id}. "
                        f"Found {result.get('jobs_found', 0)} jobs, "
                        f"Duration: {perf_summary.get('duration_ms', 0):.2f}ms")
@@ -194,6 +213,7 @@ def run_single_scraper(self, config_id: int):
                         log_entry.metadata['performance_summary'] = perf_summary
                     db.commit()
             
+            _publish_scraper_status(config_id, 'failed', session_id=session_id, error=str(e))
             raise e
             
     except Exception as exc:
@@ -312,22 +332,24 @@ def execute_scraper(config: ScraperConfig, session_id: str = None) -> Dict[str,
                     job_start_time = time.time()
                     
                     if parsed_job.is_valid():
-                        # Store job in database using JobPostService
-                        with db_manager.session_scope() as job_db:
-                            job_data = parsed_job.to_dict()
-                            # Add required fields for job post creation
-                            job_data.update({
-                                'status': 'active',
-                                'is_remote': 'remote' in job_data.get('location', '').lower(),
-                                'job_type': job_data.get('employment_type', 'full-time'),
-                                'work_location': 'remote' if 'remote' in job_data.get('location', '').lower() else 'onsite'
-                            })
+                        with engine.tracer.span('store', board=engine.trace_board,
+                                                source=scraping_config.source, session_id=session_id):
+                            # Store job in database using JobPostService
+                            with db_manager.session_scope() as job_db:
+                                job_data = parsed_job.to_dict()
+                                # Add required fields for job post creation
+                                job_data.update({
+                                    'status': 'active',
+                                    'is_remote': 'remote' in job_data.get('location', '').lower(),
+                                    'job_type': job_data.get('employment_type', 'full-time'),
+                                    'work_location': 'remote' if 'remote' in job_data.get('location', '').lower() else 'onsite'
+                                })
                             
-                            # Use static method from JobPostService
-                            job_post = JobPostService.create_job_post(job_db, None, job_data)
-                            jobs_created += 1
+                                # Use static method from JobPostService
+                                job_post = JobPostService.create_job_post(job_db, None, job_data)
+                                jobs_created += 1
                             
-                            logger.debug(f"Created job post {job_post.id}: {job_data.get('title', 'Unknown')}")
+                                logger.debug(f"Created job post {job_post.id}: {job_data.get('title', 'Unknown')}")
                         
                         # Record job processing metrics
                         if session_id:
@@ -348,6 +370,8 @@ def execute_scraper(config: ScraperConfig, session_id: str = None) -> Dict[str,
                 except Exception as parse_error:
                     logger.warning(f"Failed to process job {i+1}: {parse_error}")
                     performance_metrics['errors_encountered'] += 1
+                    # Unstored jobs must not be skipped as unchanged on the next run
+                    engine.forget_cached_pages(scraping_session)
                     if session_id:
                         performance_tracker.record_error(session_id, f"Job processing error: {parse_error}")
                         performance_tracker.record_metric(
@@ -4,6 +4,8 @@ Autoscraper API Routes
 Enterprise-grade autoscraper endpoints for the dedicated service
 """
 
+import csv
+import io
 import time
 import json
 import asyncio
@@ -13,7 +15,7 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status, Query, BackgroundTasks, Request, UploadFile, File
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import select, func
+from sqlalchemy import select, func, insert, update
 from celery.result import AsyncResult
 from loguru import logger
 import psutil
@@ -25,7 +27,7 @@ from app.middleware.auth import get_current_user_optional, require_auth, require
 from app.models.models import (
     JobBoard, ScheduleConfig, ScrapeJob, ScrapeRun,
     RawJob, NormalizedJob, EngineState,
-    ScrapeJobStatus, EngineStatus
+    ScrapeJobStatus, EngineStatus, JobBoardType
 )
 from app.schemas import (
     JobBoardCreate, JobBoardUpdate, JobBoardResponse,
@@ -42,6 +44,7 @@ from app.schemas import (
 from app.services.services import ScrapingService, NormalizationService, EngineService
 from app.services.tasks import run_scrape_job
 from app.services.settings_service import settings_service
+from app.services.url_probe import get_probe_engine
 from config.settings import get_settings
 
 settings = get_settings()
@@ -490,6 +493,127 @@ async def create_job_board(
         )
 
 
+# Header aliases accepted for each job board CSV column
+_CSV_COLUMN_ALIASES = {
+    'name': ('name', 'job_board', 'board', 'board_name'),
+    'base_url': ('url', 'base_url', 'website', 'link'),
+    'region': ('region', 'location', 'country'),
+}
+
+
+def _resolve_csv_columns(first_row: List[str]) -> Optional[Dict[str, int]]:
+    """
+    Map column names to indexes when the first row is a header.
+
+    Returns None when the first row looks like data, in which case the
+    positional layout name,url,region is assumed.
+    """
+    cells = [cell.strip().lower() for cell in first_row]
+    first_col = cells[0] if cells else ""
+    if not ('name' in first_col or 'job' in first_col or 'board' in first_col):
+        return None
+
+    columns = {'name': 0, 'base_url': 1, 'region': 2}
+    for field, aliases in _CSV_COLUMN_ALIASES.items():
+        for index, cell in enumerate(cells):
+            if cell in aliases:
+                columns[field] = index
+                break
+    return columns
+
+
+def _iter_job_board_csv(file_obj, chunk_size: int):
+    """
+    Stream job board rows from an uploaded CSV in chunks.
+
+    Yields lists of (row_number, data, error) tuples; data is None when the
+    row is invalid, and row numbers match the line a spreadsheet would show.
+    """
+    text = io.TextIOWrapper(file_obj, encoding='utf-8-sig', newline='')
+    reader = csv.reader(text, skipinitialspace=True)
+    columns = {'name': 0, 'base_url': 1, 'region': 2}
+    chunk = []
+    first_row = True
+
+    try:
+        for row in reader:
+            row_number = reader.line_num
+            if not any(cell.strip() for cell in row):
+                continue
+            if first_row:
+                first_row = False
+                header_columns = _resolve_csv_columns(row)
+                if header_columns is not None:
+                    columns = header_columns
+                    continue
+
+            def cell(field: str) -> str:
+                index = columns[field]
+                return row[index].strip() if index < len(row) else ""
+
+            name, url, region = cell('name'), cell('base_url'), cell('region')
+            if not name or not url:
+                chunk.append((row_number, None, "Missing name or URL"))
+            elif not url.lower().startswith(('http://', 'https://')):
+                chunk.append((row_number, None, f"Invalid URL: {url}"))
+            else:
+                chunk.append((row_number, {'name': name, 'base_url': url, 'region': region or None}, None))
+
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+
+        if chunk:
+            yield chunk
+    finally:
+        # Leave the upload's underlying file open for FastAPI to close
+        text.detach()
+
+
+async def _upsert_job_board_chunk(db: Session, rows: List[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Create or update one chunk of job boards.
+
+    Existing boards are found with a single IN lookup, then new boards are
+    written with one bulk INSERT and existing ones with one bulk UPDATE
+    keyed on primary key.
+    """
+    names = [data['name'] for data in rows]
+    existing_result = await db.execute(
+        select(JobBoard.id, JobBoard.name, JobBoard.selectors).where(JobBoard.name.in_(names))
+    )
+    existing = {row.name: row for row in existing_result}
+
+    inserts = []
+    updates = []
+    for data in rows:
+        current = existing.get(data['name'])
+        if current is not None:
+            values = {'id': current.id, 'base_url': data['base_url']}
+            if data['region']:
+                # Region is stored alongside the scraping selectors
+                values['selectors'] = {**(current.selectors or {}), 'region': data['region']}
+            updates.append(values)
+        else:
+            inserts.append({
+                'name': data['name'],
+                'type': JobBoardType.HTML,  # Default to HTML scraping
+                'base_url': data['base_url'],
+                'is_active': False,  # Start inactive for safety
+                'selectors': {'region': data['region']} if data['region'] else {},
+                'rate_limit_delay': 2,
+                'max_pages': 10
+            })
+
+    if inserts:
+        await db.execute(insert(JobBoard), inserts)
+    # Bulk UPDATE groups rows by the set of columns they change
+    for keys in {tuple(sorted(values)) for values in updates}:
+        await db.execute(update(JobBoard), [v for v in updates if tuple(sorted(v)) == keys])
+
+    return {'created': len(inserts), 'updated': len(updates)}
+
+
 @router.post("/job-boards/upload-csv")
 async def upload_job_boards_csv(
     file: UploadFile = File(...),
@@ -500,6 +624,11 @@ async def upload_job_boards_csv(
     """
     Upload job boards from CSV file
     Expected CSV format: name,url,region (optional)
+
+    The file is parsed as a stream and written in chunks of
+    CSV_UPLOAD_CHUNK_SIZE rows. Each chunk costs one lookup and at most one
+    INSERT and one UPDATE. Invalid or duplicate rows and chunks that fail to
+    write are reported per row in ``errors``.
     """
     start_time = time.time()
     upload_id = f"upload_{int(time.time())}"
@@ -512,139 +641,90 @@ async def upload_job_boards_csv(
                 detail="File must be a CSV file"
             )
         
-        # Read and parse CSV content
-        content = await file.read()
-        csv_text = content.decode('utf-8')
-        lines = csv_text.strip().split('\n')
+        total_rows = 0
+        created_count = 0
+        updated_count = 0
+        skipped_count = 0
+        errors = []
+        warnings = []
+        seen_names = set()
+        probe_engine = get_probe_engine() if test_accessibility else None
+        
+        for chunk in _iter_job_board_csv(file.file, settings.CSV_UPLOAD_CHUNK_SIZE):
+            rows = []
+            for row_number, data, error in chunk:
+                total_rows += 1
+                if data is not None and data['name'] in seen_names:
+                    error = f"Duplicate job board name in file: {data['name']}"
+                if error:
+                    errors.append({"row": row_number, "name": data['name'] if data else None, "error": error})
+                    skipped_count += 1
+                    continue
+                seen_names.add(data['name'])
+                rows.append((row_number, data))
+            
+            if not rows:
+                continue
+            
+            # Probe the chunk's board URLs concurrently through the shared engine
+            if probe_engine is not None:
+                probes = await probe_engine.probe_many(data['base_url'] for _, data in rows)
+                for _, data in rows:
+                    probe = probes[data['base_url']]
+                    if not probe.accessible:
+                        warnings.append(f"{data['name']}: {probe.message}")
+            
+            try:
+                counts = await _upsert_job_board_chunk(db, [data for _, data in rows])
+                await db.commit()
+            except Exception as e:
+                await db.rollback()
+                logger.error(f"Failed to write CSV chunk of {len(rows)} job boards: {str(e)}")
+                for row_number, data in rows:
+                    errors.append({"row": row_number, "name": data['name'], "error": str(e)})
+                skipped_count += len(rows)
+                continue
+            
+            created_count += counts['created']
+            updated_count += counts['updated']
         
-        if len(lines) < 2:  # At least header + 1 data row
+        if total_rows == 0:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="CSV file must contain at least one data row"
             )
         
-        # Parse CSV data
-        job_boards_data = []
-        headers = []
-        
-        for i, line in enumerate(lines):
-            if not line.strip():
-                continue
-                
-            # Parse CSV line (simple parsing, handles quoted values)
-            columns = []
-            current_col = ""
-            in_quotes = False
-            
-            for char in line:
-                if char == '"':
-                    in_quotes = not in_quotes
-                elif char == ',' and not in_quotes:
-                    columns.append(current_col.strip())
-                    current_col = ""
-                else:
-                    current_col += char
-            columns.append(current_col.strip())  # Add last column
-            
-            if i == 0:
-                # Check if first row is header
-                first_col = columns[0].lower() if columns else ""
-                if 'name' in first_col or 'job' in first_col or 'board' in first_col:
-                    headers = [col.lower() for col in columns]
-                    continue
-                else:
-                    # No header, treat as data
-                    headers = ['name', 'base_url', 'region']
-            
-            # Process data rows
-            if len(columns) >= 2:
-                name = columns[0].strip('"').strip()
-                url = columns[1].strip('"').strip()
-                region = columns[2].strip('"').strip() if len(columns) > 2 else None
-                
-                if name and url:
-                    job_boards_data.append({
-                        'name': name,
-                        'base_url': url,
-                        'region': region
-                    })
-        
-        if not job_boards_data:
+        if not seen_names:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="No valid job board data found in CSV"
+                detail={"message": "No valid job board data found in CSV", "errors": errors[:100]}
             )
         
-        # Create job boards in database
-        created_count = 0
-        updated_count = 0
-        skipped_count = 0
-        errors = []
-        
-        for data in job_boards_data:
-            try:
-                # Check if job board already exists
-                existing_result = await db.execute(
-                    select(JobBoard).where(JobBoard.name == data['name'])
-                )
-                existing = existing_result.scalar_one_or_none()
-                
-                if existing:
-                    # Update existing job board
-                    existing.base_url = data['base_url']
-                    if data['region']:
-                        # Store region in selectors
-                        selectors = existing.selectors or {}
-                        selectors['region'] = data['region']
-                        existing.selectors = selectors
-                    updated_count += 1
-                else:
-                    # Create new job board
-                    # Store region in selectors if provided
-                    selectors = {}
-                    if data['region']:
-                        selectors['region'] = data['region']
-                    
-                    new_job_board = JobBoard(
-                        name=data['name'],
-                        type='HTML',  # Default to HTML scraping
-                        base_url=data['base_url'],
-                        is_active=False,  # Start inactive for safety
-                        selectors=selectors,
-                        rate_limit_delay=2,  # Default values
-                        max_pages=10
-                    )
-                    db.add(new_job_board)
-                    created_count += 1
-                    
-            except Exception as e:
-                errors.append(f"Error processing {data['name']}: {str(e)}")
-                skipped_count += 1
-                continue
-        
-        # Commit all changes
-        await db.commit()
-        
         duration = time.time() - start_time
-        metrics.record_http_request("POST", "/job-boards/upload-csv", 200, duration)
-        
-        logger.info(f"CSV upload completed: {created_count} created, {updated_count} updated, {skipped_count} skipped")
+        logger.info(
+            f"CSV upload completed in {duration:.2f}s: {created_count} created, "
+            f"{updated_count} updated, {skipped_count} skipped"
+        )
         
         return {
             "upload_id": upload_id,
-            "total_rows": len(job_boards_data),
+            "total_rows": total_rows,
             "created": created_count,
             "updated": updated_count,
             "skipped": skipped_count,
             "errors": errors,
+            "warnings": warnings,
             "status": "completed"
         }
         
     except HTTPException:
         raise
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="CSV file must be UTF-8 encoded"
+        )
     except Exception as e:
-        duration = time.time() - start_time
-        metrics.record_http_request("POST", "/job-boards/upload-csv", 500, duration)
         logger.error(f"Failed to upload CSV: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
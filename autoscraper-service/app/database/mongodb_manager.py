@@ -246,39 +246,30 @@ class AutoScraperMongoDBManager:
                     await session.abort_transaction()
                     raise
     
-    async def cleanup_old_data(self, days_to_keep: int = 30):
+    async def cleanup_old_data(self, days_to_keep: int = 30, time_budget: Optional[float] = None) -> dict:
         """
         Clean up old scraping data to manage storage
         
+        Expired documents are archived (per the retention rules) and deleted
+        in bounded chunks; a pass that runs out of time budget stops early
+        and the remainder is handled on the next call.
+        
         Args:
             days_to_keep: Number of days of data to keep
+            time_budget: Seconds to spend on this pass (defaults to settings)
+            
+        Returns:
+            dict: Deleted/archived counts per collection
         """
-        from datetime import datetime, timedelta
-        
-        cutoff_date = datetime.utcnow() - timedelta(days=days_to_keep)
+        from app.services.retention import create_retention_manager
         
         try:
-            # Clean up old scrape runs
-            deleted_runs = await ScrapeRun.find(
-                ScrapeRun.created_at < cutoff_date
-            ).delete()
-            
-            # Clean up old raw jobs
-            deleted_raw = await RawJob.find(
-                RawJob.created_at < cutoff_date,
-                RawJob.is_processed == True
-            ).delete()
-            
-            # Clean up old scraping metrics (keep aggregated data longer)
-            metrics_cutoff = datetime.utcnow() - timedelta(days=days_to_keep * 3)
-            deleted_metrics = await ScrapingMetrics.find(
-                ScrapingMetrics.date < metrics_cutoff
-            ).delete()
-            
-            logger.info(f"Cleanup completed: {deleted_runs.deleted_count} runs, {deleted_raw.deleted_count} raw jobs, {deleted_metrics.deleted_count} metrics")
+            retention = create_retention_manager(self.database, days_to_keep, time_budget)
+            return await retention.run()
             
         except Exception as e:
             logger.error(f"Failed to cleanup old data: {e}")
+            return {}
     
     async def get_scraping_summary(self) -> dict:
         """
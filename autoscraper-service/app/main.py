@@ -23,35 +23,39 @@ from config.settings import get_settings
 from app.middleware.auth import AuthMiddleware
 from app.middleware.rate_limit import RateLimitMiddleware
 # from app.utils.metrics import MetricsMiddleware
-from app.database.database import DatabaseManager
+from app.database.database import db_manager
 from app.api.autoscraper import router as autoscraper_router
-from app.utils.health import health_router
+from app.utils.health import health_router, health_checker
+from app.services.url_probe import get_probe_engine
+from app.services.feed_ingest import get_feed_fetcher
+from app.services.schedule_engine import get_schedule_engine
 # from app.utils.metrics import metrics_router
 
 settings = get_settings()
 
-# Global database manager instance
-db_manager = None
-
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager"""
-    global db_manager
-    
     # Startup
     logger.info("Starting RemoteHive AutoScraper Service...")
     logger.info(f"Environment: {settings.ENVIRONMENT}")
     logger.info(f"Host: {settings.HOST}:{settings.PORT}")
     
     try:
-        # Initialize database manager
-        db_manager = DatabaseManager()
+        # Initialize the shared database manager
         await db_manager.initialize()
         
         # Store in app state for access in routes
         app.state.db_manager = db_manager
         
+        # Probe dependencies in the background; health endpoints serve the cache
+        await health_checker.start()
+        
+        # Fire ScheduleConfig runs as they come due
+        if settings.SCHEDULER_ENABLED:
+            get_schedule_engine().start()
+        
         logger.info("AutoScraper Service started successfully")
         
         yield
@@ -62,8 +66,11 @@ async def lifespan(app: FastAPI):
     finally:
         # Cleanup
         logger.info("Shutting down AutoScraper Service...")
-        if db_manager:
-            db_manager.close()
+        await health_checker.stop()
+        await get_schedule_engine().stop()
+        await get_probe_engine().close()
+        await get_feed_fetcher().close()
+        await db_manager.close()
         
         logger.info("AutoScraper Service shutdown complete")
 
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Batched export of normalized jobs into the main job_posts collection
+Drains NormalizedJob documents not yet exported, upserting them into the
+main database keyed on content hash, with resumable checkpoints.
+"""
+
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId
+from loguru import logger
+from pymongo import ASCENDING, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from config.settings import get_settings
+
+# Fields the exporter owns on the main job post; anything else (views,
+# applications, moderation status edits) is left alone on re-export
+EXPORTED_FIELDS = (
+    "title", "description", "requirements", "skills_required", "job_type",
+    "experience_level", "location", "is_remote", "salary_min", "salary_max",
+    "salary_currency", "benefits", "application_deadline", "external_url",
+    "source_posted_at", "source_job_board_id", "normalized_job_id"
+)
+
+NORMALIZED_JOB_PROJECTION = {
+    "title": 1, "company": 1, "location": 1, "description": 1, "requirements": 1,
+    "benefits": 1, "salary_min": 1, "salary_max": 1, "salary_currency": 1,
+    "job_type": 1, "experience_level": 1, "remote_allowed": 1, "posted_date": 1,
+    "application_deadline": 1, "application_url": 1, "job_url": 1, "skills": 1,
+    "content_hash": 1, "job_board_id": 1
+}
+
+
+def _split_lines(value: Optional[str]) -> List[str]:
+    if not value:
+        return []
+    lines = (line.strip(" \t-*•") for line in value.splitlines())
+    return [line for line in lines if line]
+
+
+def to_job_post(normalized: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a normalized_jobs document onto main job_posts fields"""
+    return {
+        "title": normalized.get("title"),
+        "description": normalized.get("description") or "",
+        "requirements": _split_lines(normalized.get("requirements")),
+        "skills_required": normalized.get("skills") or [],
+        "job_type": normalized.get("job_type") or "unknown",
+        "experience_level": normalized.get("experience_level") or "unknown",
+        "location": normalized.get("location"),
+        "is_remote": bool(normalized.get("remote_allowed")),
+        "salary_min": normalized.get("salary_min"),
+        "salary_max": normalized.get("salary_max"),
+        "salary_currency": normalized.get("salary_currency") or "USD",
+        "benefits": _split_lines(normalized.get("benefits")),
+        "application_deadline": normalized.get("application_deadline"),
+        "external_url": normalized.get("application_url") or normalized.get("job_url"),
+        "source_posted_at": normalized.get("posted_date"),
+        "source_job_board_id": normalized.get("job_board_id"),
+        "normalized_job_id": str(normalized["_id"])
+    }
+
+
+@dataclass
+class ExportStats:
+    """Throughput counters for one export pass"""
+    batches: int = 0
+    read: int = 0
+    upserted: int = 0
+    updated: int = 0
+    failed: int = 0
+    seconds: float = 0.0
+    last_id: Optional[str] = None
+    drained: bool = False
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def exported(self) -> int:
+        return self.read - self.failed
+
+    @property
+    def jobs_per_sec(self) -> float:
+        return self.exported / self.seconds if self.seconds > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["errors"] = self.errors[-10:]
+        data["exported"] = self.exported
+        data["jobs_per_sec"] = round(self.jobs_per_sec, 2)
+        return data
+
+
+class JobExporter:
+    """
+    Exports NormalizedJob documents to the main job_posts collection.
+
+    Unexported jobs are read in ``_id`` order with keyset pagination
+    (``_id > last_id``), so each batch is an index range scan rather than
+    a growing skip. Every batch becomes one unordered ``bulk_write`` of
+    upserts keyed on ``content_hash`` (re-exports update in place), and
+    the successfully written jobs are flagged with a single
+    ``update_many``. The last ``_id`` is checkpointed after every batch,
+    so an interrupted pass resumes where it stopped. A pass that reaches
+    the end clears the checkpoint, so jobs that failed are retried next time.
+    """
+
+    def __init__(
+        self,
+        source,
+        target,
+        checkpoints,
+        employer_id: str,
+        batch_size: int = 500,
+        min_quality: float = 0.0,
+        name: str = "normalized_jobs_to_job_posts"
+    ):
+        if not employer_id:
+            raise ValueError("An employer id is required for exported job posts")
+        self.source = source
+        self.target = target
+        self.checkpoints = checkpoints
+        self.employer_id = ObjectId(employer_id) if ObjectId.is_valid(employer_id) else employer_id
+        self.batch_size = batch_size
+        self.min_quality = min_quality
+        self.name = name
+
+    async def ensure_indexes(self):
+        await self.source.create_index(
+            [("exported_to_main_db", ASCENDING), ("_id", ASCENDING)],
+            name="export_keyset"
+        )
+        await self.target.create_index(
+            "content_hash",
+            name="content_hash_unique",
+            unique=True,
+            partialFilterExpression={"content_hash": {"$type": "string"}}
+        )
+
+    async def load_checkpoint(self) -> Optional[ObjectId]:
+        checkpoint = await self.checkpoints.find_one({"_id": self.name})
+        return checkpoint.get("last_id") if checkpoint else None
+
+    async def save_checkpoint(self, last_id: Optional[ObjectId], stats: ExportStats):
+        await self.checkpoints.update_one(
+            {"_id": self.name},
+            {"$set": {"last_id": last_id, "updated_at": datetime.utcnow(), "last_pass": stats.to_dict()}},
+            upsert=True
+        )
+
+    def _pending_filter(self, after: Optional[ObjectId]) -> Dict[str, Any]:
+        query: Dict[str, Any] = {"exported_to_main_db": False, "duplicate_of": None}
+        if self.min_quality > 0:
+            query["quality_score"] = {"$gte": self.min_quality}
+        if after is not None:
+            query["_id"] = {"$gt": after}
+        return query
+
+    def _upsert(self, normalized: Dict[str, Any], now: datetime) -> UpdateOne:
+        job_post = to_job_post(normalized)
+        return UpdateOne(
+            {"content_hash": normalized["content_hash"]},
+            {
+                "$set": {**{key: job_post[key] for key in EXPORTED_FIELDS}, "updated_at": now},
+                "$setOnInsert": {
+                    "content_hash": normalized["content_hash"],
+                    "employer_id": self.employer_id,
+                    "company_name": normalized.get("company"),
+                    "status": "active",
+                    "featured": False,
+                    "views_count": 0,
+                    "applications_count": 0,
+                    "trending_score": 0.0,
+                    "created_at": now
+                }
+            },
+            upsert=True
+        )
+
+    async def export_batch(self, after: Optional[ObjectId], stats: ExportStats) -> Optional[ObjectId]:
+        """Export one batch after ``after``; returns its last _id, or None when drained"""
+        batch = await self.source.find(
+            self._pending_filter(after),
+            projection=NORMALIZED_JOB_PROJECTION
+        ).sort("_id", ASCENDING).limit(self.batch_size).to_list(length=self.batch_size)
+        if not batch:
+            return None
+
+        now = datetime.utcnow()
+        operations = [self._upsert(job, now) for job in batch]
+        failed: Dict[ObjectId, str] = {}
+        try:
+            result = await self.target.bulk_write(operations, ordered=False)
+            stats.upserted += result.upserted_count
+            stats.updated += result.modified_count
+        except BulkWriteError as e:
+            details = e.details or {}
+            stats.upserted += details.get("nUpserted", 0)
+            stats.updated += details.get("nModified", 0)
+            for error in details.get("writeErrors", []):
+                failed[batch[error["index"]]["_id"]] = error.get("errmsg", "write error")
+
+        exported_ids = [job["_id"] for job in batch if job["_id"] not in failed]
+        if exported_ids:
+            await self.source.update_many(
+                {"_id": {"$in": exported_ids}},
+                {"$set": {"exported_to_main_db": True, "exported_at": now, "export_error": None}}
+            )
+        if failed:
+            await self.source.bulk_write(
+                [UpdateOne({"_id": job_id}, {"$set": {"export_error": message}}) for job_id, message in failed.items()],
+                ordered=False
+            )
+            stats.failed += len(failed)
+            stats.errors.extend(failed.values())
+
+        stats.batches += 1
+        stats.read += len(batch)
+        return batch[-1]["_id"]
+
+    async def export_pending(
+        self,
+        max_batches: Optional[int] = None,
+        time_budget: Optional[float] = None
+    ) -> ExportStats:
+        """
+        Export until drained, ``max_batches`` batches or ``time_budget``
+        seconds, checkpointing after every batch
+        """
+        stats = ExportStats()
+        started = time.monotonic()
+        last_id = await self.load_checkpoint()
+
+        while max_batches is None or stats.batches < max_batches:
+            if time_budget is not None and time.monotonic() - started >= time_budget:
+                break
+
+            next_id = await self.export_batch(last_id, stats)
+            stats.seconds = time.monotonic() - started
+            if next_id is None:
+                stats.drained = True
+                last_id = None
+                break
+
+            last_id = next_id
+            stats.last_id = str(last_id)
+            await self.save_checkpoint(last_id, stats)
+            logger.info(
+                f"Export batch {stats.batches}: {stats.exported} exported, {stats.failed} failed, "
+                f"{stats.jobs_per_sec:.1f} jobs/s"
+            )
+
+        stats.seconds = time.monotonic() - started
+        await self.save_checkpoint(last_id, stats)
+        logger.info(
+            f"Export pass {'drained' if stats.drained else 'paused'}: {stats.exported} jobs in "
+            f"{stats.batches} batches ({stats.upserted} new, {stats.updated} updated, "
+            f"{stats.failed} failed, {stats.jobs_per_sec:.1f} jobs/s)"
+        )
+        return stats
+
+
+def create_job_exporter(autoscraper_db, main_db) -> JobExporter:
+    """Build an exporter from settings over the two motor databases"""
+    settings = get_settings()
+    return JobExporter(
+        source=autoscraper_db["normalized_jobs"],
+        target=main_db["job_posts"],
+        checkpoints=autoscraper_db["export_checkpoints"],
+        employer_id=settings.EXPORT_EMPLOYER_ID,
+        batch_size=settings.EXPORT_BATCH_SIZE,
+        min_quality=settings.EXPORT_MIN_QUALITY_SCORE
+    )
@@ -0,0 +1,228 @@
+import gzip
+import hashlib
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Union
+
+from config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedPage:
+    """What was last seen for a URL"""
+    url: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    content_hash: Optional[str]
+    status_code: Optional[int]
+    fetched_at: float
+    checked_at: float
+
+
+@dataclass
+class PageFetch:
+    """Outcome of recording a response against the cache"""
+    url: str
+    changed: bool
+    content_hash: Optional[str]
+    not_modified: bool = False
+
+
+class RawPageArchive:
+    """
+    Content-addressed store of gzip-compressed page bodies.
+
+    Bodies are keyed by their SHA-256, so an unchanged page is stored once
+    no matter how often it is fetched. Files are written to a temporary
+    name and renamed into place, which makes concurrent writers safe.
+    """
+
+    def __init__(self, root: Union[str, Path], compresslevel: int = 6):
+        self.root = Path(root)
+        self.compresslevel = compresslevel
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def digest(body: bytes) -> str:
+        return hashlib.sha256(body).hexdigest()
+
+    def path_for(self, digest: str) -> Path:
+        return self.root / digest[:2] / f"{digest}.gz"
+
+    def __contains__(self, digest: str) -> bool:
+        return self.path_for(digest).exists()
+
+    def put(self, body: bytes) -> str:
+        """Store a body and return its digest"""
+        digest = self.digest(body)
+        path = self.path_for(digest)
+        if path.exists():
+            return digest
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.GzipFile(
+                fileobj=raw, mode="wb", compresslevel=self.compresslevel, mtime=0
+            ) as compressed:
+                compressed.write(body)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        return digest
+
+    def get(self, digest: str) -> Optional[bytes]:
+        path = self.path_for(digest)
+        try:
+            with gzip.open(path, "rb") as compressed:
+                return compressed.read()
+        except FileNotFoundError:
+            return None
+
+
+class PageCache:
+    """
+    HTTP validator cache for scraped pages.
+
+    For every URL the cache remembers the ETag, Last-Modified and a hash of
+    the body. ``conditional_headers`` turns that into If-None-Match and
+    If-Modified-Since, and ``record`` reports whether a response carries
+    anything new: a 304, or a 200 whose body hashes the same as last time,
+    both count as unchanged so callers can skip parsing. Bodies go to a
+    RawPageArchive so parsers can be re-run offline with ``load_body``.
+    """
+
+    def __init__(self, root: Union[str, Path], archive_bodies: bool = True):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.archive = RawPageArchive(self.root / "raw") if archive_bodies else None
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.root / "pages.sqlite3"), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                content_hash TEXT,
+                status_code INTEGER,
+                fetched_at REAL NOT NULL,
+                checked_at REAL NOT NULL
+            )
+            """
+        )
+        self._db.commit()
+
+    def lookup(self, url: str) -> Optional[CachedPage]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT url, etag, last_modified, content_hash, status_code, fetched_at, checked_at "
+                "FROM pages WHERE url = ?",
+                (url,)
+            ).fetchone()
+        return CachedPage(*row) if row else None
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Request headers that let the server answer 304 Not Modified"""
+        entry = self.lookup(url)
+        headers = {}
+        if entry is None:
+            return headers
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def record(
+        self,
+        url: str,
+        status_code: int,
+        headers: Mapping[str, str],
+        body: Optional[bytes]
+    ) -> PageFetch:
+        """Record a response and report whether its content changed"""
+        now = time.time()
+        previous = self.lookup(url)
+
+        if status_code == 304:
+            with self._lock:
+                self._db.execute("UPDATE pages SET checked_at = ? WHERE url = ?", (now, url))
+                self._db.commit()
+            return PageFetch(
+                url=url,
+                changed=False,
+                content_hash=previous.content_hash if previous else None,
+                not_modified=True
+            )
+
+        body = body or b""
+        content_hash = self.archive.put(body) if self.archive is not None else RawPageArchive.digest(body)
+        changed = previous is None or previous.content_hash != content_hash
+
+        normalized = {key.lower(): value for key, value in headers.items()}
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO pages (url, etag, last_modified, content_hash, status_code, fetched_at, checked_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(url) DO UPDATE SET etag = excluded.etag, last_modified = excluded.last_modified, "
+                "content_hash = excluded.content_hash, status_code = excluded.status_code, "
+                "fetched_at = excluded.fetched_at, checked_at = excluded.checked_at",
+                (
+                    url,
+                    normalized.get("etag"),
+                    normalized.get("last-modified"),
+                    content_hash,
+                    status_code,
+                    now,
+                    now
+                )
+            )
+            self._db.commit()
+
+        return PageFetch(url=url, changed=changed, content_hash=content_hash)
+
+    def load_body(self, url: str) -> Optional[bytes]:
+        """Latest archived body for a URL, for offline re-parsing"""
+        entry = self.lookup(url)
+        if entry is None or entry.content_hash is None or self.archive is None:
+            return None
+        return self.archive.get(entry.content_hash)
+
+    def forget(self, url: str):
+        """Drop the validators for a URL so the next fetch is unconditional"""
+        with self._lock:
+            self._db.execute("DELETE FROM pages WHERE url = ?", (url,))
+            self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+# Shared cache; created on first use from settings
+_default_cache: Optional[PageCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_page_cache() -> Optional[PageCache]:
+    """The process-wide page cache, or None when it is disabled"""
+    global _default_cache
+    settings = get_settings()
+    if not settings.SCRAPER_PAGE_CACHE_ENABLED:
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = PageCache(settings.SCRAPER_CACHE_DIR)
+        return _default_cache
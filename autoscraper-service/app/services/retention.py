@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Retention and cold archival for autoscraper collections
+Expires old documents in bounded chunks with a per-pass time budget,
+optionally writing them to compressed archive files before deletion.
+"""
+
+import asyncio
+import gzip
+import json
+import logging
+import os
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from bson import ObjectId, json_util
+from pymongo.errors import OperationFailure
+
+from config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_FORMATS = ("jsonl", "parquet")
+
+
+@dataclass
+class RetentionRule:
+    """How long one collection keeps documents, and what happens to them after"""
+    collection: str
+    max_age_days: float
+    time_field: str = "created_at"
+    extra_filter: Dict[str, Any] = field(default_factory=dict)
+    archive: bool = False
+    ttl: bool = False
+
+    def expired_filter(self, now: datetime) -> Dict[str, Any]:
+        cutoff = now - timedelta(days=self.max_age_days)
+        return {self.time_field: {"$lt": cutoff}, **self.extra_filter}
+
+    @property
+    def expire_after_seconds(self) -> int:
+        return int(self.max_age_days * 86400)
+
+
+def build_retention_rules(
+    days_to_keep: Optional[float] = None,
+    overrides: Optional[Dict[str, Dict[str, Any]]] = None
+) -> List[RetentionRule]:
+    """
+    Default rules for runs, raw jobs and metrics, with per-collection
+    overrides from ``RETENTION_RULES`` (JSON keyed by collection name,
+    e.g. ``{"raw_jobs": {"days": 14, "archive": false}}``)
+    """
+    settings = get_settings()
+    days = days_to_keep if days_to_keep is not None else settings.RETENTION_DAYS
+    archive = settings.RETENTION_ARCHIVE_ENABLED
+    rules = {
+        "scrape_runs": RetentionRule("scrape_runs", days, archive=archive),
+        "raw_jobs": RetentionRule("raw_jobs", days, extra_filter={"is_processed": True}, archive=archive),
+        # Aggregated daily metrics are small and kept longer
+        "scraping_metrics": RetentionRule("scraping_metrics", days * 3, time_field="date"),
+    }
+
+    if overrides is None:
+        overrides = json.loads(settings.RETENTION_RULES) if settings.RETENTION_RULES else {}
+    for name, options in overrides.items():
+        rule = rules.get(name) or RetentionRule(name, days)
+        if "days" in options:
+            rule.max_age_days = float(options["days"])
+        for key in ("time_field", "extra_filter", "archive", "ttl"):
+            if key in options:
+                setattr(rule, key, options[key])
+        rules[name] = rule
+    return list(rules.values())
+
+
+class ArchiveWriter:
+    """
+    Writes expired documents to ``<dir>/<collection>/<YYYY-MM-DD>/`` as
+    gzip JSONL (extended JSON, so ObjectIds and dates round-trip) or
+    Parquet when pyarrow is available. One file per chunk, written before
+    the chunk is deleted.
+    """
+
+    def __init__(self, directory: str, fmt: str = "jsonl"):
+        if fmt not in ARCHIVE_FORMATS:
+            raise ValueError(f"Unsupported archive format: {fmt}")
+        if fmt == "parquet":
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                logger.warning("pyarrow is not installed; archiving as gzip JSONL instead of Parquet")
+                fmt = "jsonl"
+        self.directory = Path(directory)
+        self.format = fmt
+        self._sequence = 0
+
+    def _path(self, collection: str, now: datetime) -> Path:
+        self._sequence += 1
+        folder = self.directory / collection / now.strftime("%Y-%m-%d")
+        folder.mkdir(parents=True, exist_ok=True)
+        suffix = "jsonl.gz" if self.format == "jsonl" else "parquet"
+        # Workers and passes can share a second; the random part keeps names unique
+        unique = f"{os.getpid()}-{uuid.uuid4().hex[:12]}-{self._sequence:05d}"
+        return folder / f"{collection}-{now.strftime('%H%M%S')}-{unique}.{suffix}"
+
+    def _write_jsonl(self, path: Path, documents: List[Dict[str, Any]]):
+        with gzip.open(path, "wt", encoding="utf-8") as handle:
+            for document in documents:
+                handle.write(json_util.dumps(document, json_options=json_util.RELAXED_JSON_OPTIONS))
+                handle.write("\n")
+
+    def _write_parquet(self, path: Path, documents: List[Dict[str, Any]]):
+        import pandas as pd
+
+        def flatten(value):
+            if isinstance(value, ObjectId):
+                return str(value)
+            if isinstance(value, (dict, list)):
+                return json_util.dumps(value)
+            return value
+
+        frame = pd.DataFrame([{key: flatten(value) for key, value in doc.items()} for doc in documents])
+        frame.to_parquet(path, compression="zstd", index=False)
+
+    def write(self, collection: str, documents: List[Dict[str, Any]], now: Optional[datetime] = None) -> Path:
+        path = self._path(collection, now or datetime.utcnow())
+        # Write to a temp name first so a crash never leaves a truncated archive
+        partial = path.with_name(path.name + ".partial")
+        if self.format == "jsonl":
+            self._write_jsonl(partial, documents)
+        else:
+            self._write_parquet(partial, documents)
+        partial.replace(path)
+        return path
+
+
+@dataclass
+class RetentionStats:
+    """Outcome of one retention pass over one collection"""
+    collection: str
+    deleted: int = 0
+    archived: int = 0
+    chunks: int = 0
+    complete: bool = False
+    archives: List[str] = field(default_factory=list)
+
+
+class RetentionManager:
+    """
+    Applies retention rules in chunks instead of one unbounded delete.
+
+    Each chunk is at most ``chunk_size`` of the oldest expired documents
+    (an index range scan on the rule's time field). Archived collections
+    write the chunk to disk first and only then delete exactly those
+    ``_id``s. A short pause between chunks keeps the I/O rate bounded, and
+    the pass stops once ``time_budget`` seconds have been spent; whatever
+    is left is picked up by the next pass. Each rule gets an even share of
+    the budget still left when it starts, so a large backlog in an early
+    collection cannot starve the later ones.
+    """
+
+    def __init__(
+        self,
+        database,
+        rules: List[RetentionRule],
+        chunk_size: int = 1000,
+        time_budget: Optional[float] = 60.0,
+        chunk_pause: float = 0.1,
+        archive_writer: Optional[ArchiveWriter] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        if archive_writer is None and any(rule.archive for rule in rules):
+            raise ValueError("An archive writer is required for rules that archive")
+        self.database = database
+        self.rules = rules
+        self.chunk_size = chunk_size
+        self.time_budget = time_budget
+        self.chunk_pause = chunk_pause
+        self.archive_writer = archive_writer
+        self.clock = clock
+
+    async def ensure_ttl_indexes(self) -> Dict[str, bool]:
+        """
+        Let the server expire collections whose rule asks for a TTL index.
+
+        TTL deletes cannot archive, so rules that archive are skipped. Beanie
+        already owns a plain index on most time fields; that index is
+        converted in place with ``collMod`` and created fresh otherwise.
+        """
+        applied = {}
+        for rule in self.rules:
+            if not rule.ttl:
+                continue
+            if rule.archive:
+                logger.warning(f"Skipping TTL index on {rule.collection}: archived collections use chunked deletes")
+                applied[rule.collection] = False
+                continue
+
+            collection = self.database[rule.collection]
+            try:
+                if rule.extra_filter:
+                    await collection.create_index(
+                        rule.time_field,
+                        name=f"retention_ttl_{rule.time_field}",
+                        expireAfterSeconds=rule.expire_after_seconds,
+                        partialFilterExpression=rule.extra_filter
+                    )
+                else:
+                    try:
+                        await self.database.command(
+                            "collMod", rule.collection,
+                            index={"keyPattern": {rule.time_field: 1}, "expireAfterSeconds": rule.expire_after_seconds}
+                        )
+                    except OperationFailure:
+                        await collection.create_index(rule.time_field, expireAfterSeconds=rule.expire_after_seconds)
+                applied[rule.collection] = True
+            except OperationFailure as e:
+                logger.warning(f"Could not apply TTL index on {rule.collection}, falling back to chunked deletes: {e}")
+                applied[rule.collection] = False
+        return applied
+
+    async def _expire_chunk(self, rule: RetentionRule, now: datetime, stats: RetentionStats) -> int:
+        collection = self.database[rule.collection]
+        projection = None if rule.archive else {"_id": 1}
+        documents = await collection.find(
+            rule.expired_filter(now), projection
+        ).sort(rule.time_field, 1).limit(self.chunk_size).to_list(length=self.chunk_size)
+        if not documents:
+            return 0
+
+        if rule.archive:
+            path = await asyncio.to_thread(self.archive_writer.write, rule.collection, documents, now)
+            stats.archived += len(documents)
+            stats.archives.append(str(path))
+
+        result = await collection.delete_many({"_id": {"$in": [doc["_id"] for doc in documents]}})
+        stats.deleted += result.deleted_count
+        stats.chunks += 1
+        return len(documents)
+
+    async def run(self, now: Optional[datetime] = None) -> Dict[str, Dict[str, Any]]:
+        """Run one pass over every rule, splitting one time budget between them"""
+        now = now or datetime.utcnow()
+        started = self.clock()
+        results = {}
+
+        for index, rule in enumerate(self.rules):
+            stats = RetentionStats(collection=rule.collection)
+            results[rule.collection] = stats
+            rule_deadline = None
+            while True:
+                tick = self.clock()
+                if self.time_budget is not None:
+                    if rule_deadline is None:
+                        # An even share of what is left; time a rule does not use rolls over
+                        remaining_rules = len(self.rules) - index
+                        rule_deadline = tick + (started + self.time_budget - tick) / remaining_rules
+                    if tick >= rule_deadline:
+                        break
+                expired = await self._expire_chunk(rule, now, stats)
+                if expired < self.chunk_size:
+                    stats.complete = True
+                    break
+                if self.chunk_pause:
+                    await asyncio.sleep(self.chunk_pause)
+
+        summary = ", ".join(
+            f"{s.collection}: {s.deleted} deleted/{s.archived} archived{'' if s.complete else ' (partial)'}"
+            for s in results.values()
+        )
+        logger.info(f"Retention pass finished in {self.clock() - started:.1f}s: {summary}")
+        return {name: asdict(stats) for name, stats in results.items()}
+
+
+def create_retention_manager(database, days_to_keep: Optional[float] = None,
+                             time_budget: Optional[float] = None) -> RetentionManager:
+    """Build a retention manager from settings over a motor database"""
+    settings = get_settings()
+    rules = build_retention_rules(days_to_keep)
+    archive_writer = None
+    if any(rule.archive for rule in rules):
+        archive_writer = ArchiveWriter(settings.RETENTION_ARCHIVE_DIR, settings.RETENTION_ARCHIVE_FORMAT)
+    return RetentionManager(
+        database,
+        rules,
+        chunk_size=settings.RETENTION_CHUNK_SIZE,
+        time_budget=time_budget if time_budget is not None else settings.RETENTION_TIME_BUDGET_SECONDS,
+        chunk_pause=settings.RETENTION_CHUNK_PAUSE_SECONDS,
+        archive_writer=archive_writer
+    )
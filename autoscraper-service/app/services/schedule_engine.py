@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""
+Due-time scheduler for ScheduleConfig
+Keeps the next fire times of active schedules in a min-heap, loaded from
+the indexed next_run_at field, and dispatches only schedules that are due.
+"""
+
+import asyncio
+import heapq
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from loguru import logger
+
+from app.models.mongodb_models import ScheduleConfig, ScrapeJob, ScrapeJobMode, ScrapeJobStatus
+from config.settings import get_settings
+
+# dispatch(schedule, job_board_id) -> True when the scrape succeeded
+Dispatcher = Callable[[ScheduleConfig, str], Awaitable[bool]]
+
+
+def compute_next_run(schedule: ScheduleConfig, after: datetime) -> Optional[datetime]:
+    """
+    Next fire time strictly after ``after`` (naive UTC), or None for
+    manual schedules and schedules without a usable interval or cron.
+    """
+    if schedule.schedule_type == "interval" and schedule.interval_minutes:
+        # Whole seconds, so the value round-trips through Mongo's millisecond dates
+        return (after + timedelta(minutes=schedule.interval_minutes)).replace(microsecond=0)
+
+    if schedule.schedule_type == "cron" and schedule.cron_expression:
+        from apscheduler.triggers.cron import CronTrigger
+
+        try:
+            trigger = CronTrigger.from_crontab(schedule.cron_expression, timezone=schedule.timezone or "UTC")
+        except ValueError as e:
+            logger.error(f"Invalid cron expression for schedule {schedule.name}: {str(e)}")
+            return None
+        fire_time = trigger.get_next_fire_time(None, after.replace(tzinfo=timezone.utc) + timedelta(seconds=1))
+        return fire_time.astimezone(timezone.utc).replace(tzinfo=None) if fire_time else None
+
+    return None
+
+
+class ScheduleStore:
+    """
+    ScheduleConfig persistence used by the engine.
+
+    ``claim`` is a compare-and-set on next_run_at: it only succeeds while
+    the stored value still equals the one the caller loaded, so when
+    several schedulers race for the same fire time exactly one wins.
+    """
+
+    async def load_due(self, until: datetime, limit: int) -> List[ScheduleConfig]:
+        return await ScheduleConfig.find(
+            ScheduleConfig.is_active == True,
+            ScheduleConfig.next_run_at <= until
+        ).sort(+ScheduleConfig.next_run_at).limit(limit).to_list()
+
+    async def load_unscheduled(self, limit: int) -> List[ScheduleConfig]:
+        return await ScheduleConfig.find(
+            ScheduleConfig.is_active == True,
+            ScheduleConfig.next_run_at == None,
+            ScheduleConfig.schedule_type != "manual"
+        ).limit(limit).to_list()
+
+    async def claim(
+        self,
+        schedule: ScheduleConfig,
+        expected_next_run: Optional[datetime],
+        next_run: Optional[datetime],
+        fired_at: Optional[datetime]
+    ) -> bool:
+        update = {"next_run_at": next_run, "updated_at": datetime.utcnow()}
+        increments = {}
+        if fired_at is not None:
+            update["last_run_at"] = fired_at
+            increments["total_runs"] = 1
+
+        operation = {"$set": update}
+        if increments:
+            operation["$inc"] = increments
+
+        claimed = await ScheduleConfig.get_motor_collection().find_one_and_update(
+            {"_id": schedule.id, "is_active": True, "next_run_at": expected_next_run},
+            operation,
+            projection={"_id": 1}
+        )
+        return claimed is not None
+
+    async def record_result(self, schedule: ScheduleConfig, success: bool):
+        counter = "successful_runs" if success else "failed_runs"
+        await ScheduleConfig.get_motor_collection().update_one(
+            {"_id": schedule.id},
+            {"$inc": {counter: 1}}
+        )
+
+
+async def scrape_job_dispatcher(
+    schedule: ScheduleConfig,
+    job_board_id: str,
+    poll_interval: float = 2.0
+) -> bool:
+    """
+    Create a scheduled ScrapeJob for one board and run it on a Celery worker
+
+    The job goes through run_scrape_job, the task manual starts use, and
+    the result is awaited so the engine's slots stay held for the whole
+    run. A job that cannot be enqueued, or whose task fails, is marked
+    failed instead of being left pending.
+    """
+    from app.services.tasks import run_scrape_job
+
+    scrape_job = ScrapeJob(
+        schedule_config_id=str(schedule.id),
+        job_board_id=job_board_id,
+        search_terms=schedule.search_terms,
+        location=schedule.locations[0] if schedule.locations else None,
+        salary_min=schedule.salary_min,
+        salary_max=schedule.salary_max,
+        remote_only=schedule.remote_only,
+        date_posted_days=schedule.date_posted_days,
+        max_results=schedule.max_results_per_board,
+        max_retries=schedule.max_retries,
+        mode=ScrapeJobMode.SCHEDULED,
+        scheduled_at=datetime.utcnow()
+    )
+    await scrape_job.insert()
+
+    try:
+        # apply_async and the result backend are blocking clients
+        task = await asyncio.to_thread(
+            run_scrape_job.apply_async,
+            args=[str(scrape_job.id)],
+            queue="autoscraper.default"
+        )
+        while not await asyncio.to_thread(task.ready):
+            await asyncio.sleep(poll_interval)
+        result = task.result
+    except Exception as e:
+        result = {"success": False, "error": str(e)}
+
+    if isinstance(result, dict) and result.get("success", False):
+        return True
+
+    error = result.get("error", "Unknown error") if isinstance(result, dict) else str(result)
+    logger.error(f"Scheduled scrape job {scrape_job.id} for board {job_board_id} failed: {error}")
+    # Leaves jobs the worker already finished alone
+    await ScrapeJob.get_motor_collection().update_one(
+        {"_id": scrape_job.id, "status": {"$in": [ScrapeJobStatus.PENDING.value, ScrapeJobStatus.RUNNING.value]}},
+        {"$set": {
+            "status": ScrapeJobStatus.FAILED.value,
+            "error_message": error,
+            "completed_at": datetime.utcnow(),
+            "updated_at": datetime.utcnow()
+        }}
+    )
+    return False
+
+
+@dataclass
+class _Slots:
+    limit: int
+    semaphore: asyncio.Semaphore
+    in_use: int = 0
+
+
+@dataclass(order=True)
+class _HeapEntry:
+    next_run_at: datetime
+    schedule_id: str = field(compare=True)
+    schedule: ScheduleConfig = field(compare=False)
+
+
+class ScheduleEngine:
+    """
+    Fires ScheduleConfig runs when they are due.
+
+    Instead of scanning every schedule on each tick, the engine loads the
+    schedules due within ``lookahead`` (served by the next_run_at index),
+    keeps them in a min-heap and sleeps until the earliest one. A due
+    schedule is claimed by atomically moving next_run_at forward; only the
+    scheduler whose claim succeeds dispatches it. Each run scrapes the
+    schedule's job boards with at most ``max_concurrent_jobs`` in flight
+    for that schedule, ``per_board_limit`` per board and ``max_running``
+    overall. A board still queued or running from an earlier fire of the
+    same schedule is not queued again.
+    """
+
+    def __init__(
+        self,
+        store: Optional[ScheduleStore] = None,
+        dispatch: Optional[Dispatcher] = None,
+        max_running: int = 5,
+        per_board_limit: int = 1,
+        lookahead: timedelta = timedelta(minutes=5),
+        refresh_interval: float = 60.0,
+        batch_size: int = 500,
+        clock: Callable[[], datetime] = datetime.utcnow
+    ):
+        self.store = store or ScheduleStore()
+        self.dispatch = dispatch or scrape_job_dispatcher
+        self.max_running = max_running
+        self.per_board_limit = per_board_limit
+        self.lookahead = lookahead
+        self.refresh_interval = refresh_interval
+        self.batch_size = batch_size
+        self.clock = clock
+
+        self._heap: List[_HeapEntry] = []
+        self._queued: Dict[str, datetime] = {}
+        self._schedule_slots: Dict[str, _Slots] = {}
+        self._board_slots: Dict[str, asyncio.Semaphore] = {}
+        self._global_slots: Optional[asyncio.Semaphore] = None
+        self._in_flight: Set[Tuple[str, str]] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop_task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    # Heap maintenance
+
+    async def refresh(self):
+        """Reload schedules due within the lookahead window into the heap"""
+        now = self.clock()
+
+        for schedule in await self.store.load_unscheduled(self.batch_size):
+            next_run = compute_next_run(schedule, now)
+            if next_run is not None:
+                await self.store.claim(schedule, None, next_run, None)
+
+        self._heap = []
+        self._queued = {}
+        for schedule in await self.store.load_due(now + self.lookahead, self.batch_size):
+            self._push(schedule)
+
+    def _push(self, schedule: ScheduleConfig):
+        schedule_id = str(schedule.id)
+        if schedule.next_run_at is None or self._queued.get(schedule_id) == schedule.next_run_at:
+            return
+        self._queued[schedule_id] = schedule.next_run_at
+        heapq.heappush(self._heap, _HeapEntry(schedule.next_run_at, schedule_id, schedule))
+
+    def notify(self, schedule: Optional[ScheduleConfig] = None):
+        """
+        Tell the engine a schedule was created or changed. A schedule due
+        within the lookahead goes straight into the heap; otherwise the
+        next refresh picks it up.
+        """
+        if schedule is not None and schedule.is_active and schedule.next_run_at is not None:
+            if schedule.next_run_at <= self.clock() + self.lookahead:
+                self._push(schedule)
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def seconds_until_next(self) -> Optional[float]:
+        if not self._heap:
+            return None
+        return max(0.0, (self._heap[0].next_run_at - self.clock()).total_seconds())
+
+    # Firing
+
+    async def fire_due(self) -> int:
+        """Claim and dispatch every heap entry that is due; returns runs started"""
+        fired = 0
+        now = self.clock()
+        while self._heap and self._heap[0].next_run_at <= now:
+            entry = heapq.heappop(self._heap)
+            if self._queued.get(entry.schedule_id) != entry.next_run_at:
+                continue  # superseded by a newer entry for the same schedule
+            del self._queued[entry.schedule_id]
+
+            schedule = entry.schedule
+            # Missed fires collapse into this one; the next run is computed from now
+            next_run = compute_next_run(schedule, now)
+            try:
+                claimed = await self.store.claim(schedule, entry.next_run_at, next_run, now)
+            except Exception as e:
+                logger.error(f"Failed to claim schedule {schedule.name}: {str(e)}")
+                continue
+            if not claimed:
+                logger.debug(f"Schedule {schedule.name} was claimed elsewhere or changed")
+                continue
+
+            schedule.next_run_at = next_run
+            schedule.last_run_at = now
+            self._start_run(schedule)
+            fired += 1
+
+            if next_run is not None and next_run <= now + self.lookahead:
+                self._push(schedule)
+        return fired
+
+    def _start_run(self, schedule: ScheduleConfig):
+        if self._global_slots is None:
+            self._global_slots = asyncio.Semaphore(self.max_running)
+        schedule_id = str(schedule.id)
+        queued = 0
+        for job_board_id in schedule.job_board_ids:
+            key = (schedule_id, job_board_id)
+            if key in self._in_flight:
+                logger.info(f"Skipping board {job_board_id} for {schedule.name}: previous run still active")
+                continue
+            self._in_flight.add(key)
+            task = asyncio.get_running_loop().create_task(self._run_board(schedule, job_board_id))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            queued += 1
+        logger.info(f"Schedule {schedule.name} fired: {queued} board(s) queued")
+
+    def _slots_for(self, schedule: ScheduleConfig) -> _Slots:
+        schedule_id = str(schedule.id)
+        limit = max(1, schedule.max_concurrent_jobs or 1)
+        slots = self._schedule_slots.get(schedule_id)
+        if slots is None or (slots.limit != limit and slots.in_use == 0):
+            slots = _Slots(limit=limit, semaphore=asyncio.Semaphore(limit))
+            self._schedule_slots[schedule_id] = slots
+        return slots
+
+    async def _run_board(self, schedule: ScheduleConfig, job_board_id: str):
+        schedule_slots = self._slots_for(schedule)
+        board_slots = self._board_slots.setdefault(job_board_id, asyncio.Semaphore(self.per_board_limit))
+        schedule_slots.in_use += 1
+        try:
+            async with schedule_slots.semaphore, board_slots, self._global_slots:
+                try:
+                    success = bool(await self.dispatch(schedule, job_board_id))
+                except Exception as e:
+                    logger.error(f"Scheduled scrape of board {job_board_id} for {schedule.name} failed: {str(e)}")
+                    success = False
+            try:
+                await self.store.record_result(schedule, success)
+            except Exception as e:
+                logger.error(f"Failed to record result for schedule {schedule.name}: {str(e)}")
+        finally:
+            schedule_slots.in_use -= 1
+            self._in_flight.discard((str(schedule.id), job_board_id))
+
+    # Lifecycle
+
+    async def run(self):
+        """Main loop: sleep until the next due schedule or refresh, then fire"""
+        self._wakeup = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        next_refresh = 0.0
+
+        while not self._stopping:
+            if loop.time() >= next_refresh:
+                try:
+                    await self.refresh()
+                except Exception as e:
+                    logger.error(f"Failed to load schedules: {str(e)}")
+                next_refresh = loop.time() + self.refresh_interval
+
+            await self.fire_due()
+
+            timeout = next_refresh - loop.time()
+            until_next = self.seconds_until_next()
+            if until_next is not None:
+                timeout = min(timeout, until_next)
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=max(0.0, timeout))
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self):
+        if self._loop_task is None or self._loop_task.done():
+            self._stopping = False
+            self._loop_task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self, wait_for_runs: bool = False):
+        """Stop firing; in-flight scrapes are cancelled unless ``wait_for_runs``"""
+        self._stopping = True
+        if self._wakeup is not None:
+            self._wakeup.set()
+        if self._loop_task is not None:
+            await asyncio.gather(self._loop_task, return_exceptions=True)
+            self._loop_task = None
+        if not wait_for_runs:
+            for task in list(self._tasks):
+                task.cancel()
+        await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "running": self._loop_task is not None and not self._loop_task.done(),
+            "queued_schedules": len(self._queued),
+            "next_fire_in_seconds": self.seconds_until_next(),
+            "boards_in_flight": len(self._in_flight)
+        }
+
+
+# Shared engine; started by the service lifespan when SCHEDULER_ENABLED is set
+_default_engine: Optional[ScheduleEngine] = None
+
+
+def get_schedule_engine() -> ScheduleEngine:
+    global _default_engine
+    if _default_engine is None:
+        settings = get_settings()
+        _default_engine = ScheduleEngine(
+            max_running=settings.MAX_CONCURRENT_SCRAPES,
+            per_board_limit=settings.SCHEDULER_PER_BOARD_CONCURRENCY,
+            lookahead=timedelta(seconds=settings.SCHEDULER_LOOKAHEAD_SECONDS),
+            refresh_interval=settings.SCHEDULER_REFRESH_SECONDS
+        )
+    return _default_engine
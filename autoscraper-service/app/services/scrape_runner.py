@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Runs ScrapeJob documents against their JobBoard on MongoDB
+Claims a pending job, scrapes the board's listing pages with its selectors,
+stores new postings as raw_jobs and records the outcome on the job.
+"""
+
+import asyncio
+import hashlib
+import uuid
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+from urllib.parse import quote_plus
+
+import requests
+from bs4 import BeautifulSoup
+from bson import ObjectId
+from loguru import logger
+from pymongo import ReturnDocument
+
+from app.models.mongodb_models import ScrapeJobStatus
+from app.services.page_cache import get_page_cache
+from app.services.services import create_content_hash, extract_job_data
+from config.settings import get_settings
+
+# Same safety limit as the HTML scraper
+MAX_PAGES = 50
+
+
+@dataclass
+class ScrapeJobStats:
+    """Counters for one scrape job run"""
+    pages_scraped: int = 0
+    pages_unchanged: int = 0
+    jobs_found: int = 0
+    jobs_saved: int = 0
+    duplicates_skipped: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def page_url(job_board: Dict[str, Any], scrape_job: Dict[str, Any], page: int) -> str:
+    """
+    URL of one listing page. The board's ``search_url_template`` may use
+    ``{query}``, ``{location}`` and ``{page}``; without ``{page}``, pages
+    after the first get a ``page`` query parameter.
+    """
+    template = job_board.get("search_url_template") or job_board["base_url"]
+    url = template.format(
+        query=quote_plus(" ".join(scrape_job.get("search_terms") or [])),
+        location=quote_plus(scrape_job.get("location") or ""),
+        page=page
+    )
+    if "{page}" not in template and page > 1:
+        url += f"{'&' if '?' in url else '?'}page={page}"
+    return url
+
+
+async def fetch_page(url: str, headers: Dict[str, str]) -> requests.Response:
+    settings = get_settings()
+    # requests is a blocking client
+    return await asyncio.to_thread(
+        requests.get,
+        url,
+        headers={"User-Agent": settings.SCRAPE_USER_AGENT, **headers},
+        timeout=settings.SCRAPE_TIMEOUT
+    )
+
+
+class ScrapeJobRunner:
+    """
+    Runs one ScrapeJob document to completion over motor collections.
+
+    The job is claimed with a conditional update from pending to running,
+    so a task delivered twice scrapes once. Each listing page becomes one
+    ``scrape_runs`` document, and its postings that are new for the board
+    (by content hash) are stored with one ``insert_many``. Pages that are
+    unchanged since the last scrape are skipped through the page cache. The
+    job's counters, status and error are written when it finishes; a
+    successful run also updates the board's last scrape and job total.
+    """
+
+    def __init__(
+        self,
+        database,
+        fetch: Optional[Callable[[str, Dict[str, str]], Awaitable[Any]]] = None,
+        page_cache=None,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep
+    ):
+        self.jobs = database["scrape_jobs"]
+        self.boards = database["job_boards"]
+        self.runs = database["scrape_runs"]
+        self.raw_jobs = database["raw_jobs"]
+        self.fetch = fetch or fetch_page
+        self.page_cache = page_cache
+        self.sleep = sleep
+
+    async def _claim(self, job_id: ObjectId) -> Optional[Dict[str, Any]]:
+        now = datetime.utcnow()
+        return await self.jobs.find_one_and_update(
+            {"_id": job_id, "status": ScrapeJobStatus.PENDING.value},
+            {"$set": {"status": ScrapeJobStatus.RUNNING.value, "started_at": now, "updated_at": now}},
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def _finish(self, scrape_job: Dict[str, Any], stats: ScrapeJobStats, error: Optional[str] = None):
+        now = datetime.utcnow()
+        started_at = scrape_job.get("started_at") or now
+        await self.jobs.update_one(
+            {"_id": scrape_job["_id"]},
+            {"$set": {
+                "status": (ScrapeJobStatus.FAILED if error else ScrapeJobStatus.COMPLETED).value,
+                "error_message": error,
+                "completed_at": now,
+                "duration_seconds": (now - started_at).total_seconds(),
+                "total_pages_scraped": stats.pages_scraped,
+                "total_jobs_found": stats.jobs_found,
+                "total_jobs_processed": stats.jobs_saved + stats.duplicates_skipped,
+                "total_jobs_saved": stats.jobs_saved,
+                "total_duplicates_skipped": stats.duplicates_skipped,
+                "updated_at": now
+            }}
+        )
+
+    async def _scrape_page(
+        self,
+        scrape_job: Dict[str, Any],
+        job_board: Dict[str, Any],
+        url: str,
+        page: int,
+        stats: ScrapeJobStats
+    ) -> bool:
+        """Store one page's new postings; False when the page has no listings"""
+        headers = dict(job_board.get("headers") or {})
+        if self.page_cache is not None:
+            headers.update(self.page_cache.conditional_headers(url))
+        started_at = datetime.utcnow()
+        response = await self.fetch(url, headers)
+        if response.status_code >= 400:
+            raise RuntimeError(f"HTTP {response.status_code} for {url}")
+
+        if self.page_cache is not None:
+            page_fetch = await asyncio.to_thread(
+                self.page_cache.record, url, response.status_code, response.headers, response.content
+            )
+            if not page_fetch.changed:
+                logger.info(f"Page {page} unchanged since last scrape, skipping")
+                stats.pages_unchanged += 1
+                return True
+
+        selectors = job_board["selectors"]
+        soup = BeautifulSoup(response.content, "html.parser")
+        elements = soup.select(selectors.get("job_container", ".job"))
+        if not elements:
+            # Fetch it in full next time in case the selectors change
+            if self.page_cache is not None:
+                self.page_cache.forget(url)
+            return False
+
+        board_id = str(job_board["_id"])
+        postings: Dict[str, Dict[str, Any]] = {}
+        listed = 0
+        for element in elements:
+            job_data = extract_job_data(element, selectors, job_board["base_url"])
+            if job_data.get("title") and job_data.get("url"):
+                listed += 1
+                content_hash = create_content_hash(job_data["title"], job_data["url"], job_data.get("description", ""))
+                postings.setdefault(content_hash, job_data)
+
+        existing = await self.raw_jobs.find(
+            {"job_board_id": board_id, "content_hash": {"$in": list(postings)}},
+            projection={"content_hash": 1}
+        ).to_list(length=None)
+        for doc in existing:
+            postings.pop(doc["content_hash"], None)
+        duplicates = listed - len(postings)
+
+        now = datetime.utcnow()
+        run_id = str(uuid.uuid4())
+        raw_jobs = [
+            {
+                "job_id": str(uuid.uuid4()),
+                "scrape_run_id": run_id,
+                "job_board_id": board_id,
+                "title": job_data.get("title"),
+                "company": job_data.get("company"),
+                "location": job_data.get("location"),
+                "description": job_data.get("description"),
+                "salary": job_data.get("salary"),
+                "posted_date": job_data.get("posted_date"),
+                "job_url": job_data["url"],
+                "raw_data": {**job_data, "source": "html", "page_number": page, "scrape_timestamp": now.isoformat()},
+                "is_processed": False,
+                "content_hash": content_hash,
+                "url_hash": hashlib.md5(job_data["url"].encode("utf-8")).hexdigest(),
+                "created_at": now
+            }
+            for content_hash, job_data in postings.items()
+        ]
+        try:
+            if raw_jobs:
+                await self.raw_jobs.insert_many(raw_jobs, ordered=False)
+            await self.runs.insert_one({
+                "run_id": run_id,
+                "scrape_job_id": str(scrape_job["_id"]),
+                "page_number": page,
+                "page_url": url,
+                "status": ScrapeJobStatus.COMPLETED.value,
+                "started_at": started_at,
+                "completed_at": now,
+                "duration_seconds": (now - started_at).total_seconds(),
+                "jobs_found_on_page": len(elements),
+                "jobs_processed": listed,
+                "jobs_saved": len(raw_jobs),
+                "duplicates_skipped": duplicates,
+                "http_status_code": response.status_code,
+                "response_size_bytes": len(response.content),
+                "created_at": now,
+                "updated_at": now
+            })
+        except Exception:
+            # Unchanged-page skipping must not hide postings that were never stored
+            if self.page_cache is not None:
+                self.page_cache.forget(url)
+            raise
+
+        stats.pages_scraped += 1
+        stats.jobs_found += len(elements)
+        stats.jobs_saved += len(raw_jobs)
+        stats.duplicates_skipped += duplicates
+        return True
+
+    async def _scrape(self, scrape_job: Dict[str, Any], job_board: Dict[str, Any], stats: ScrapeJobStats):
+        if not job_board.get("selectors"):
+            raise ValueError("No selectors configured for HTML scraping")
+        max_pages = min(job_board.get("max_pages_per_search") or 1, MAX_PAGES)
+        max_results = scrape_job.get("max_results")
+        delay = job_board.get("rate_limit_delay") or 0
+
+        for page in range(1, max_pages + 1):
+            url = page_url(job_board, scrape_job, page)
+            logger.info(f"Scraping page {page}: {url}")
+            if not await self._scrape_page(scrape_job, job_board, url, page, stats):
+                logger.info(f"No job elements found on page {page}, stopping")
+                break
+            if max_results and stats.jobs_saved >= max_results:
+                break
+            if delay > 0 and page < max_pages:
+                await self.sleep(delay)
+
+    async def run(self, job_id: str) -> Dict[str, Any]:
+        """Claim and run a pending job; returns its counters and whether it succeeded"""
+        scrape_job = await self._claim(ObjectId(job_id)) if ObjectId.is_valid(job_id) else None
+        if scrape_job is None:
+            existing = await self.jobs.find_one({"_id": ObjectId(job_id)}) if ObjectId.is_valid(job_id) else None
+            error = f"Job is already {existing['status']}" if existing else "Job not found"
+            logger.error(f"Scrape job {job_id} not run: {error}")
+            return {"success": False, "error": error}
+
+        stats = ScrapeJobStats()
+        board_id = scrape_job["job_board_id"]
+        try:
+            job_board = await self.boards.find_one({"_id": ObjectId(board_id) if ObjectId.is_valid(board_id) else board_id})
+            if job_board is None:
+                raise LookupError(f"Job board {board_id} not found")
+            await self._scrape(scrape_job, job_board, stats)
+        except Exception as e:
+            logger.error(f"Scrape job {job_id} failed: {str(e)}")
+            await self._finish(scrape_job, stats, error=str(e))
+            return {"success": False, "error": str(e), **stats.to_dict()}
+
+        await self._finish(scrape_job, stats)
+        await self.boards.update_one(
+            {"_id": job_board["_id"]},
+            {"$set": {"last_successful_scrape": datetime.utcnow()}, "$inc": {"total_jobs_scraped": stats.jobs_saved}}
+        )
+        logger.info(
+            f"Scrape job {job_id} completed: {stats.jobs_saved} new jobs from {stats.pages_scraped} pages "
+            f"({stats.duplicates_skipped} duplicates, {stats.pages_unchanged} unchanged pages)"
+        )
+        return {"success": True, **stats.to_dict()}
+
+
+def create_scrape_runner(database) -> ScrapeJobRunner:
+    """Build a runner over the autoscraper's motor database"""
+    return ScrapeJobRunner(database, page_cache=get_page_cache())
@@ -3,7 +3,6 @@ from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 from loguru import logger
 import requests
-import feedparser
 from bs4 import BeautifulSoup
 import re
 import time
@@ -19,6 +18,9 @@ from app.models.models import (
     JobBoardType, ScrapeJobStatus, ScrapeJobMode, EngineState, EngineStatus
 )
 from config.settings import get_settings
+from app.services.feed_ingest import get_feed_fetcher
+from app.services.page_cache import get_page_cache
+from app.services.taxonomy import TaxonomyMatch, get_taxonomy
 
 settings = get_settings()
 
@@ -45,6 +47,68 @@ class NormalizationResult:
     quality_scores: Optional[List[float]] = None
 
 
+def extract_job_data(job_element, selectors: Dict[str, str], base_url: str) -> Dict[str, Any]:
+    """Extract job data from HTML element using selectors"""
+    try:
+        job_data = {}
+
+        # Extract title
+        title_selector = selectors.get('title', '.title')
+        title_element = job_element.select_one(title_selector)
+        if title_element:
+            job_data['title'] = title_element.get_text(strip=True)
+
+        # Extract company
+        company_selector = selectors.get('company', '.company')
+        company_element = job_element.select_one(company_selector)
+        if company_element:
+            job_data['company'] = company_element.get_text(strip=True)
+
+        # Extract location
+        location_selector = selectors.get('location', '.location')
+        location_element = job_element.select_one(location_selector)
+        if location_element:
+            job_data['location'] = location_element.get_text(strip=True)
+
+        # Extract description
+        description_selector = selectors.get('description', '.description')
+        description_element = job_element.select_one(description_selector)
+        if description_element:
+            job_data['description'] = description_element.get_text(strip=True)
+
+        # Extract salary
+        salary_selector = selectors.get('salary', '.salary')
+        salary_element = job_element.select_one(salary_selector)
+        if salary_element:
+            job_data['salary'] = salary_element.get_text(strip=True)
+
+        # Extract URL
+        url_selector = selectors.get('url', 'a')
+        url_element = job_element.select_one(url_selector)
+        if url_element:
+            href = url_element.get('href', '')
+            if href:
+                job_data['url'] = urljoin(base_url, href)
+
+        # Extract posted date
+        date_selector = selectors.get('posted_date', '.date')
+        date_element = job_element.select_one(date_selector)
+        if date_element:
+            job_data['posted_date'] = date_element.get_text(strip=True)
+
+        return job_data
+
+    except Exception as e:
+        logger.error(f"Error extracting job data: {str(e)}")
+        return {}
+
+
+def create_content_hash(title: str, url: str, description: str) -> str:
+    """Create a hash for content deduplication"""
+    content = f"{title}|{url}|{description[:200]}"
+    return hashlib.md5(content.encode('utf-8')).hexdigest()
+
+
 class ScrapingService:
     """Service for handling web scraping operations"""
     
@@ -55,6 +119,8 @@ class ScrapingService:
             'User-Agent': 'RemoteHive AutoScraper/1.0 (Enterprise Job Scraping Service)'
         })
         self.executor = ThreadPoolExecutor(max_workers=settings.max_concurrent_jobs)
+        self.page_cache = get_page_cache()
+        self.feed_fetcher = get_feed_fetcher()
     
     async def scrape_job_board(self, job_board_id: str, scrape_job_id: str) -> ScrapingResult:
         """Main entry point for scraping a job board"""
@@ -122,7 +188,12 @@ class ScrapingService:
             )
     
     async def _scrape_rss_feed(self, job_board: JobBoard, scrape_job: ScrapeJob, db: Session) -> ScrapingResult:
-        """Scrape RSS feed from a job board"""
+        """
+        Scrape RSS feed from a job board
+
+        The request is conditional on the feed's stored ETag/Last-Modified
+        and only entries newer than the stored watermark are stored.
+        """
         try:
             logger.info(f"Starting RSS scraping for {job_board.name}")
             
@@ -135,26 +206,50 @@ class ScrapingService:
                     error_message="No RSS URL configured for job board"
                 )
             
-            # Fetch RSS feed
-            response = await asyncio.get_event_loop().run_in_executor(
-                self.executor,
-                lambda: self.session.get(job_board.rss_url, timeout=job_board.request_timeout)
+            started_at = datetime.utcnow()
+            update = await self.feed_fetcher.fetch(
+                job_board.rss_url,
+                headers=job_board.headers,
+                timeout=job_board.request_timeout
             )
-            response.raise_for_status()
+            if not update.ok:
+                raise RuntimeError(update.error)
             
-            # Parse RSS feed
-            feed = feedparser.parse(response.content)
-            
-            if feed.bozo:
-                logger.warning(f"RSS feed parsing warning for {job_board.name}: {feed.bozo_exception}")
+            if update.not_modified:
+                logger.info(f"RSS feed unchanged for {job_board.name}")
+                self.feed_fetcher.commit(update)
+                return ScrapingResult(
+                    success=True,
+                    items_found=0,
+                    items_processed=0,
+                    items_saved=0,
+                    metadata={'not_modified': True}
+                )
             
-            items_found = len(feed.entries)
+            items_found = len(update.entries)
             items_processed = 0
             items_saved = 0
             
-            logger.info(f"Found {items_found} RSS entries for {job_board.name}")
+            logger.info(
+                f"Found {items_found} new RSS entries for {job_board.name} "
+                f"({update.total_entries} in feed)"
+            )
             
-            for entry in feed.entries:
+            # One run for the whole fetch
+            scrape_run = ScrapeRun(
+                scrape_job_id=scrape_job.id,
+                run_type="rss",
+                url=job_board.rss_url,
+                page_number=1,
+                started_at=started_at,
+                items_found=items_found,
+                http_status_code=update.status_code,
+                response_size_bytes=update.response_size
+            )
+            db.add(scrape_run)
+            db.flush()  # Get the ID
+            
+            for entry in update.entries:
                 try:
                     # Extract basic information
                     title = entry.get('title', '').strip()
@@ -186,23 +281,6 @@ class ScrapingService:
                         logger.debug(f"Skipping duplicate RSS entry: {title}")
                         continue
                     
-                    # Create scrape run
-                    scrape_run = ScrapeRun(
-                        scrape_job_id=scrape_job.id,
-                        run_type="rss",
-                        url=job_board.rss_url,
-                        page_number=1,
-                        started_at=datetime.utcnow(),
-                        completed_at=datetime.utcnow(),
-                        items_found=1,
-                        items_processed=1,
-                        items_created=1,
-                        http_status_code=response.status_code,
-                        response_size_bytes=len(response.content)
-                    )
-                    db.add(scrape_run)
-                    db.flush()  # Get the ID
-                    
                     # Create raw job entry
                     raw_job = RawJob(
                         scrape_run_id=scrape_run.id,
@@ -231,16 +309,17 @@ class ScrapingService:
                     db.add(raw_job)
                     items_saved += 1
                     items_processed += 1
-                    
-                    # Apply rate limiting
-                    if job_board.rate_limit_delay > 0:
-                        await asyncio.sleep(job_board.rate_limit_delay)
                         
                 except Exception as e:
                     logger.error(f"Error processing RSS entry: {str(e)}")
                     continue
             
+            scrape_run.completed_at = datetime.utcnow()
+            scrape_run.items_processed = items_processed
+            scrape_run.items_created = items_saved
             db.commit()
+            # Only advance the watermark once the entries are stored
+            self.feed_fetcher.commit(update)
             
             return ScrapingResult(
                 success=True,
@@ -248,14 +327,17 @@ class ScrapingService:
                 items_processed=items_processed,
                 items_saved=items_saved,
                 metadata={
-                    'feed_title': feed.feed.get('title', ''),
-                    'feed_description': feed.feed.get('description', ''),
-                    'feed_updated': feed.feed.get('updated', '')
+                    'feed_title': update.feed.get('title', ''),
+                    'feed_description': update.feed.get('description', ''),
+                    'feed_updated': update.feed.get('updated', ''),
+                    'feed_entries': update.total_entries,
+                    'not_modified': False
                 }
             )
             
         except Exception as e:
             logger.error(f"RSS scraping failed for {job_board.name}: {str(e)}")
+            db.rollback()
             return ScrapingResult(
                 success=False,
                 items_found=0,
@@ -281,6 +363,7 @@ class ScrapingService:
             total_items_found = 0
             total_items_processed = 0
             total_items_saved = 0
+            pages_unchanged = 0
             
             max_pages = min(job_board.max_pages, 50)  # Safety limit
             
@@ -294,13 +377,32 @@ class ScrapingService:
                     
                     logger.info(f"Scraping page {page_num}: {page_url}")
                     
-                    # Fetch page
+                    # Fetch page, conditionally when it was seen before
+                    conditional_headers = self.page_cache.conditional_headers(page_url) if self.page_cache else None
                     response = await asyncio.get_event_loop().run_in_executor(
                         self.executor,
-                        lambda: self.session.get(page_url, timeout=job_board.request_timeout)
+                        lambda: self.session.get(
+                            page_url, timeout=job_board.request_timeout, headers=conditional_headers
+                        )
                     )
                     response.raise_for_status()
                     
+                    # Skip parsing pages that are unchanged since the last run;
+                    # hashing and archiving the body happens off the event loop
+                    page_fetch = None
+                    if self.page_cache is not None:
+                        page_fetch = await asyncio.get_event_loop().run_in_executor(
+                            self.executor,
+                            self.page_cache.record,
+                            page_url, response.status_code, response.headers, response.content
+                        )
+                    if page_fetch is not None and not page_fetch.changed:
+                        logger.info(f"Page {page_num} unchanged since last scrape, skipping")
+                        pages_unchanged += 1
+                        if job_board.rate_limit_delay > 0:
+                            await asyncio.sleep(job_board.rate_limit_delay)
+                        continue
+                    
                     # Parse HTML
                     soup = BeautifulSoup(response.content, 'html.parser')
                     
@@ -308,6 +410,9 @@ class ScrapingService:
                     job_elements = soup.select(job_board.selectors.get('job_container', '.job'))
                     
                     if not job_elements:
+                        # Fetch it in full next time in case the selectors change
+                        if self.page_cache is not None:
+                            self.page_cache.forget(page_url)
                         logger.info(f"No job elements found on page {page_num}, stopping")
                         break
                     
@@ -407,6 +512,7 @@ class ScrapingService:
                 items_saved=total_items_saved,
                 metadata={
                     'pages_scraped': page_num,
+                    'pages_unchanged': pages_unchanged,
                     'max_pages': max_pages
                 }
             )
@@ -445,63 +551,11 @@ class ScrapingService:
     
     def _extract_job_data(self, job_element, selectors: Dict[str, str], base_url: str) -> Dict[str, Any]:
         """Extract job data from HTML element using selectors"""
-        try:
-            job_data = {}
-            
-            # Extract title
-            title_selector = selectors.get('title', '.title')
-            title_element = job_element.select_one(title_selector)
-            if title_element:
-                job_data['title'] = title_element.get_text(strip=True)
-            
-            # Extract company
-            company_selector = selectors.get('company', '.company')
-            company_element = job_element.select_one(company_selector)
-            if company_element:
-                job_data['company'] = company_element.get_text(strip=True)
-            
-            # Extract location
-            location_selector = selectors.get('location', '.location')
-            location_element = job_element.select_one(location_selector)
-            if location_element:
-                job_data['location'] = location_element.get_text(strip=True)
-            
-            # Extract description
-            description_selector = selectors.get('description', '.description')
-            description_element = job_element.select_one(description_selector)
-            if description_element:
-                job_data['description'] = description_element.get_text(strip=True)
-            
-            # Extract salary
-            salary_selector = selectors.get('salary', '.salary')
-            salary_element = job_element.select_one(salary_selector)
-            if salary_element:
-                job_data['salary'] = salary_element.get_text(strip=True)
-            
-            # Extract URL
-            url_selector = selectors.get('url', 'a')
-            url_element = job_element.select_one(url_selector)
-            if url_element:
-                href = url_element.get('href', '')
-                if href:
-                    job_data['url'] = urljoin(base_url, href)
-            
-            # Extract posted date
-            date_selector = selectors.get('posted_date', '.date')
-            date_element = job_element.select_one(date_selector)
-            if date_element:
-                job_data['posted_date'] = date_element.get_text(strip=True)
-            
-            return job_data
-            
-        except Exception as e:
-            logger.error(f"Error extracting job data: {str(e)}")
-            return {}
+        return extract_job_data(job_element, selectors, base_url)
     
     def _create_content_hash(self, title: str, url: str, description: str) -> str:
         """Create a hash for content deduplication"""
-        content = f"{title}|{url}|{description[:200]}"
-        return hashlib.md5(content.encode('utf-8')).hexdigest()
+        return create_content_hash(title, url, description)
     
     def __del__(self):
         """Cleanup resources"""
@@ -666,11 +720,10 @@ class NormalizationService:
             # Experience level extraction
             normalized['experience_level'] = self._extract_experience_level(title, description)
             
-            # Skills extraction
-            normalized['skills'] = self._extract_skills(title, description)
-            
-            # Benefits extraction
-            normalized['benefits'] = self._extract_benefits(description)
+            # Skills and benefits come from a single taxonomy pass
+            tags = get_taxonomy().extract(f"{title} {description}")
+            normalized['skills'] = self._extract_skills(title, description, tags)
+            normalized['benefits'] = self._extract_benefits(description, tags)
             
             # Remote work detection
             normalized['is_remote'] = self._detect_remote_work(title, description, location)
@@ -874,52 +927,18 @@ class NormalizationService:
         
         return 'Mid-level'  # Default
     
-    def _extract_skills(self, title: str, description: str) -> List[str]:
+    def _extract_skills(self, title: str, description: str, tags: Optional[TaxonomyMatch] = None) -> List[str]:
         """Extract skills from title and description"""
-        text = f"{title} {description}".lower()
-        
-        # Common tech skills
-        skills = [
-            'python', 'java', 'javascript', 'typescript', 'react', 'angular', 'vue',
-            'node.js', 'express', 'django', 'flask', 'spring', 'sql', 'postgresql',
-            'mysql', 'mongodb', 'redis', 'docker', 'kubernetes', 'aws', 'azure',
-            'gcp', 'git', 'linux', 'html', 'css', 'sass', 'webpack', 'babel',
-            'rest', 'graphql', 'microservices', 'agile', 'scrum', 'ci/cd'
-        ]
-        
-        found_skills = []
-        for skill in skills:
-            if skill in text:
-                found_skills.append(skill.title())
-        
-        return found_skills[:10]  # Limit to 10 skills
+        tags = tags or get_taxonomy().extract(f"{title} {description}")
+        return tags.labels('skills')[:10]  # Limit to 10 skills
     
-    def _extract_benefits(self, description: str) -> List[str]:
+    def _extract_benefits(self, description: str, tags: Optional[TaxonomyMatch] = None) -> List[str]:
         """Extract benefits from job description"""
         if not description:
             return []
         
-        text = description.lower()
-        
-        benefits = {
-            'health insurance': ['health insurance', 'medical insurance', 'healthcare'],
-            'dental insurance': ['dental insurance', 'dental coverage'],
-            'vision insurance': ['vision insurance', 'vision coverage'],
-            '401k': ['401k', '401(k)', 'retirement plan'],
-            'paid time off': ['pto', 'paid time off', 'vacation days'],
-            'remote work': ['remote work', 'work from home', 'flexible location'],
-            'flexible hours': ['flexible hours', 'flexible schedule'],
-            'stock options': ['stock options', 'equity', 'stock grants'],
-            'gym membership': ['gym membership', 'fitness'],
-            'free lunch': ['free lunch', 'free meals', 'catered meals']
-        }
-        
-        found_benefits = []
-        for benefit, keywords in benefits.items():
-            if any(keyword in text for keyword in keywords):
-                found_benefits.append(benefit)
-        
-        return found_benefits
+        tags = tags or get_taxonomy().extract(description)
+        return tags.labels('benefits')
     
     def _detect_remote_work(self, title: str, description: str, location: str) -> bool:
         """Detect if job allows remote work"""
@@ -4,16 +4,14 @@ Celery Tasks for Autoscraper Service
 Background tasks for scraping operations
 """
 
-import time
-from datetime import datetime
+import asyncio
 from celery import Celery
+from motor.motor_asyncio import AsyncIOMotorClient
 from loguru import logger
-from sqlalchemy.orm import Session
-from sqlalchemy import select
 
-from app.database.database import DatabaseManager
-from app.models.models import ScrapeJob, JobBoard, ScrapeJobStatus
-from app.services.services import ScrapingService
+from app.services.job_exporter import create_job_exporter
+from app.services.retention import create_retention_manager
+from app.services.scrape_runner import create_scrape_runner
 from config.settings import get_settings
 
 settings = get_settings()
@@ -34,10 +32,32 @@ celery_app.conf.update(
     enable_utc=True,
     task_routes={
         'app.services.tasks.run_scrape_job': {'queue': 'autoscraper.default'},
+        'app.services.tasks.export_normalized_jobs': {'queue': 'autoscraper.default'},
+        'app.services.tasks.cleanup_old_data': {'queue': 'autoscraper.default'},
     }
 )
 
-db_manager = DatabaseManager()
+# Periodic tasks; run with `celery -A app.services.tasks beat` next to the worker
+celery_app.conf.beat_schedule = {
+    'export-normalized-jobs': {
+        'task': 'app.services.tasks.export_normalized_jobs',
+        'schedule': settings.EXPORT_INTERVAL_MINUTES * 60,
+        'options': {'queue': 'autoscraper.default'}
+    },
+    'cleanup-old-data': {
+        'task': 'app.services.tasks.cleanup_old_data',
+        'schedule': settings.RETENTION_INTERVAL_MINUTES * 60,
+        'options': {'queue': 'autoscraper.default'}
+    },
+}
+
+
+async def _run_scrape_job(job_id):
+    client = AsyncIOMotorClient(settings.MONGODB_URL)
+    try:
+        return await create_scrape_runner(client[settings.MONGODB_DATABASE_NAME]).run(job_id)
+    finally:
+        client.close()
 
 
 @celery_app.task(bind=True, name='app.services.tasks.run_scrape_job')
@@ -52,82 +72,76 @@ def run_scrape_job(self, job_id: str):
         dict: Result of the scrape operation
     """
     logger.info(f"Starting scrape job {job_id}")
-    
     try:
-        # Get database session
-        with db_manager.get_session() as db:
-            # Find the scrape job
-            scrape_job_result = db.execute(
-                select(ScrapeJob).where(ScrapeJob.id == job_id)
-            )
-            scrape_job = scrape_job_result.scalar_one_or_none()
-            
-            if not scrape_job:
-                logger.error(f"Scrape job {job_id} not found")
-                return {"success": False, "error": "Job not found"}
-            
-            # Get job board
-            job_board_result = db.execute(
-                select(JobBoard).where(JobBoard.id == scrape_job.job_board_id)
-            )
-            job_board = job_board_result.scalar_one_or_none()
-            
-            if not job_board:
-                logger.error(f"Job board {scrape_job.job_board_id} not found")
-                scrape_job.status = ScrapeJobStatus.FAILED
-                scrape_job.error_message = "Job board not found"
-                scrape_job.completed_at = datetime.utcnow()
-                db.commit()
-                return {"success": False, "error": "Job board not found"}
-            
-            # Update job status to running
-            scrape_job.status = ScrapeJobStatus.RUNNING
-            scrape_job.started_at = datetime.utcnow()
-            db.commit()
-            
-            # Initialize scraping service
-            scraping_service = ScrapingService()
-            
-            # Execute the scraping
-            result = scraping_service.scrape_job_board(
-                job_board=job_board,
-                scrape_job=scrape_job,
-                max_pages=scrape_job.max_pages
-            )
-            
-            # Update job status based on result
-            if result.get("success", False):
-                scrape_job.status = ScrapeJobStatus.COMPLETED
-                scrape_job.jobs_scraped = result.get("jobs_scraped", 0)
-                scrape_job.pages_scraped = result.get("pages_scraped", 0)
-                logger.info(f"Scrape job {job_id} completed successfully")
-            else:
-                scrape_job.status = ScrapeJobStatus.FAILED
-                scrape_job.error_message = result.get("error", "Unknown error")
-                logger.error(f"Scrape job {job_id} failed: {scrape_job.error_message}")
-            
-            scrape_job.completed_at = datetime.utcnow()
-            db.commit()
-            
-            return result
-            
+        return asyncio.run(_run_scrape_job(job_id))
     except Exception as e:
         logger.error(f"Error executing scrape job {job_id}: {str(e)}")
-        
-        # Update job status to failed
-        try:
-            with db_manager.get_session() as db:
-                scrape_job_result = db.execute(
-                    select(ScrapeJob).where(ScrapeJob.id == job_id)
-                )
-                scrape_job = scrape_job_result.scalar_one_or_none()
-                
-                if scrape_job:
-                    scrape_job.status = ScrapeJobStatus.FAILED
-                    scrape_job.error_message = str(e)
-                    scrape_job.completed_at = datetime.utcnow()
-                    db.commit()
-        except Exception as db_error:
-            logger.error(f"Failed to update job status: {str(db_error)}")
-        
-        return {"success": False, "error": str(e)}
\ No newline at end of file
+        return {"success": False, "error": str(e)}
+
+
+async def _export_normalized_jobs(max_batches, time_budget):
+    autoscraper_client = AsyncIOMotorClient(settings.MONGODB_URL)
+    main_client = AsyncIOMotorClient(settings.MAIN_MONGODB_URL)
+    try:
+        exporter = create_job_exporter(
+            autoscraper_client[settings.MONGODB_DATABASE_NAME],
+            main_client[settings.MAIN_MONGODB_DATABASE_NAME]
+        )
+        await exporter.ensure_indexes()
+        stats = await exporter.export_pending(max_batches=max_batches, time_budget=time_budget)
+        return stats.to_dict()
+    finally:
+        autoscraper_client.close()
+        main_client.close()
+
+
+@celery_app.task(bind=True, name='app.services.tasks.export_normalized_jobs')
+def export_normalized_jobs(self, max_batches: int = None, time_budget: float = None):
+    """
+    Export unexported normalized jobs to the main job_posts collection
+    
+    Args:
+        max_batches: Stop after this many batches (resumes from the checkpoint next run)
+        time_budget: Stop after roughly this many seconds
+    
+    Returns:
+        dict: Export throughput and counters for the pass
+    """
+    if not (settings.MAIN_MONGODB_URL and settings.MAIN_MONGODB_DATABASE_NAME):
+        message = "Normalized job export skipped: MAIN_MONGODB_URL and MAIN_MONGODB_DATABASE_NAME are not set"
+        logger.warning(message)
+        return {"success": False, "skipped": True, "error": message}
+    try:
+        return {"success": True, **asyncio.run(_export_normalized_jobs(max_batches, time_budget))}
+    except Exception as e:
+        logger.error(f"Normalized job export failed: {str(e)}")
+        return {"success": False, "error": str(e)}
+
+
+async def _cleanup_old_data(days_to_keep, time_budget):
+    client = AsyncIOMotorClient(settings.MONGODB_URL)
+    try:
+        retention = create_retention_manager(client[settings.MONGODB_DATABASE_NAME], days_to_keep, time_budget)
+        await retention.ensure_ttl_indexes()
+        return await retention.run()
+    finally:
+        client.close()
+
+
+@celery_app.task(bind=True, name='app.services.tasks.cleanup_old_data')
+def cleanup_old_data(self, days_to_keep: float = None, time_budget: float = None):
+    """
+    Archive and delete expired runs, raw jobs and metrics in bounded chunks
+    
+    Args:
+        days_to_keep: Override the default retention period
+        time_budget: Stop after roughly this many seconds
+    
+    Returns:
+        dict: Deleted/archived counts per collection
+    """
+    try:
+        return {"success": True, "collections": asyncio.run(_cleanup_old_data(days_to_keep, time_budget))}
+    except Exception as e:
+        logger.error(f"Retention pass failed: {str(e)}")
+        return {"success": False, "error": str(e)}
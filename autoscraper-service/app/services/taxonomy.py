@@ -0,0 +1,203 @@
+import json
+import re
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Bundled keyword taxonomy: category -> label -> phrases. Labels are listed
+# in priority order, which is what ``TaxonomyMatch.primary`` goes by.
+TAXONOMY_PATH = Path(__file__).parent / "data" / "taxonomy.json"
+
+# Words and single punctuation marks; phrases and text are split the same
+# way, so matches always fall on word boundaries ("java" never hits
+# "javascript") and "c++", "401(k)" or "ci/cd" still match literally.
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def phrase_pattern(tokens: List[str]) -> str:
+    """
+    Regex matching a phrase's tokens as consecutive tokens of a text.
+
+    Word tokens need a non-word character (or the text edge) on their
+    outer side and whitespace between two of them; punctuation tokens may
+    touch their neighbours. This is the same boundary ``tokenize`` draws.
+    The pattern starts with the literal first token, checking the boundary
+    before it with a lookbehind, so ``re`` can scan for that literal.
+    """
+    words = [bool(re.match(r"\w", token)) for token in tokens]
+    first = re.escape(tokens[0])
+    parts = [first, rf"(?<!\w{first})" if words[0] else ""]
+    for index, token in enumerate(tokens[1:], 1):
+        parts.append(r"\s+" if words[index] and words[index - 1] else r"\s*")
+        parts.append(re.escape(token))
+    if words[-1]:
+        parts.append(r"(?!\w)")
+    return "".join(parts)
+
+
+class TaxonomyMatch:
+    """Labels found in one text, per category, in order of first appearance"""
+
+    __slots__ = ("_found", "_priority")
+
+    def __init__(self, found: Dict[str, Dict[str, int]], priority: Dict[str, Dict[str, int]]):
+        self._found = found
+        self._priority = priority
+
+    def labels(self, category: str) -> List[str]:
+        return list(self._found.get(category, ()))
+
+    def counts(self, category: str) -> Dict[str, int]:
+        return dict(self._found.get(category, {}))
+
+    def primary(self, category: str, default: Optional[str] = None) -> Optional[str]:
+        """The highest-priority label found in a category"""
+        found = self._found.get(category)
+        if not found:
+            return default
+        rank = self._priority[category]
+        return min(found, key=rank.__getitem__)
+
+    def to_dict(self) -> Dict[str, List[str]]:
+        return {category: list(labels) for category, labels in self._found.items()}
+
+
+class Taxonomy:
+    """
+    Every phrase of every category compiled into one Aho-Corasick automaton.
+
+    The automaton runs over word tokens rather than characters, so one
+    pass over a description reports skills, benefits, job type and
+    seniority together, and the cost per token does not grow with the
+    number of phrases.
+
+    Callers that want one category's top label use ``primary`` instead:
+    it tries each label's phrases in priority order and stops at the first
+    hit. A phrase is only run as a regex when its first token occurs in
+    the text as a plain substring, so most phrases cost one ``in`` check
+    and the text is never tokenized.
+    """
+
+    def __init__(self, categories: Dict[str, Dict[str, List[str]]]):
+        self.categories = categories
+        self._priority = {
+            category: {label: rank for rank, label in enumerate(labels)}
+            for category, labels in categories.items()
+        }
+        self._goto: List[Dict[str, int]] = [{}]
+        self._out: List[Tuple[Tuple[str, str], ...]] = [()]
+        for category, labels in categories.items():
+            for label, phrases in labels.items():
+                for phrase in phrases:
+                    self._add(tokenize(phrase), (category, label))
+        self._fail = self._link()
+        # category -> [(label, [(first token, compiled phrase search)])]
+        self._label_patterns: Dict[str, List[Tuple[str, List[Tuple[str, Callable]]]]] = {}
+        self._label_patterns_lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, path: Path = TAXONOMY_PATH) -> "Taxonomy":
+        with open(path, encoding="utf-8") as handle:
+            return cls(json.load(handle)["categories"])
+
+    def _add(self, tokens: List[str], output: Tuple[str, str]):
+        if not tokens:
+            return
+        state = 0
+        for token in tokens:
+            nxt = self._goto[state].get(token)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._out.append(())
+                self._goto[state][token] = nxt
+            state = nxt
+        if output not in self._out[state]:
+            self._out[state] += (output,)
+
+    def _link(self) -> List[int]:
+        """Breadth-first failure links; each state also inherits its suffix states' outputs"""
+        fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, child in self._goto[state].items():
+                queue.append(child)
+                fallback = fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = fail[fallback]
+                target = self._goto[fallback].get(token, 0)
+                fail[child] = target if target != child else 0
+                self._out[child] += tuple(o for o in self._out[fail[child]] if o not in self._out[child])
+        return fail
+
+    def extract(self, text: Optional[str]) -> TaxonomyMatch:
+        found: Dict[str, Dict[str, int]] = {}
+        if text:
+            goto, fail, out = self._goto, self._fail, self._out
+            state = 0
+            for token in TOKEN_PATTERN.findall(text.lower()):
+                while state and token not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(token, 0)
+                for category, label in out[state]:
+                    labels = found.setdefault(category, {})
+                    labels[label] = labels.get(label, 0) + 1
+        return TaxonomyMatch(found, self._priority)
+
+    def _patterns(self, category: str) -> List[Tuple[str, List[Tuple[str, Callable]]]]:
+        patterns = self._label_patterns.get(category)
+        if patterns is None:
+            with self._label_patterns_lock:
+                patterns = self._label_patterns.get(category)
+                if patterns is None:
+                    patterns = [
+                        (label, [
+                            (tokens[0], re.compile(phrase_pattern(tokens)).search)
+                            for tokens in map(tokenize, phrases) if tokens
+                        ])
+                        for label, phrases in self.categories.get(category, {}).items()
+                    ]
+                    self._label_patterns[category] = patterns
+        return patterns
+
+    def primary(self, text: Optional[str], category: str, default: Optional[str] = None) -> Optional[str]:
+        """Same as ``extract(text).primary(category, default)`` for a single category"""
+        if not text:
+            return default
+        text = text.lower()
+        for label, phrases in self._patterns(category):
+            for first, search in phrases:
+                if first in text and search(text):
+                    return label
+        return default
+
+    def extract_batch(self, texts: Iterable[Optional[str]]) -> List[TaxonomyMatch]:
+        """One match per text, in order; repeated texts are scanned once"""
+        seen: Dict[Optional[str], TaxonomyMatch] = {}
+        results = []
+        for text in texts:
+            match = seen.get(text)
+            if match is None:
+                match = seen[text] = self.extract(text)
+            results.append(match)
+        return results
+
+
+# Shared taxonomy; compiled on first use
+_default_taxonomy: Optional[Taxonomy] = None
+_default_taxonomy_lock = threading.Lock()
+
+
+def get_taxonomy() -> Taxonomy:
+    """The process-wide taxonomy compiled from the bundled data file"""
+    global _default_taxonomy
+    with _default_taxonomy_lock:
+        if _default_taxonomy is None:
+            _default_taxonomy = Taxonomy.from_file()
+        return _default_taxonomy
@@ -0,0 +1,231 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, replace
+from typing import Dict, Iterable, Optional, Callable, Awaitable
+from urllib.parse import urlparse
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (compatible; RemoteHive/1.0; +https://remotehive.com)"
+
+# HEAD responses that say nothing about whether GET would succeed
+_HEAD_FALLBACK_STATUSES = {400, 403, 404, 405, 406, 429, 500, 501, 503}
+
+
+@dataclass
+class ProbeResult:
+    """Outcome of one accessibility probe"""
+    url: str
+    accessible: bool
+    message: str
+    status: Optional[int] = None
+    method: Optional[str] = None
+    final_url: Optional[str] = None
+    elapsed_ms: float = 0.0
+    from_cache: bool = False
+
+
+def host_key(url: str) -> str:
+    """Cache key for a URL: scheme and host"""
+    parsed = urlparse(url)
+    return f"{parsed.scheme.lower()}://{parsed.netloc.lower()}"
+
+
+class URLProbeEngine:
+    """
+    Concurrent website accessibility checker.
+
+    One pooled aiohttp session is shared by every probe. Concurrency is
+    bounded globally and per host, DNS lookups are cached by the connector,
+    and results are cached per host so a CSV listing many pages of the same
+    board contacts that board once. Each probe tries HEAD first and falls
+    back to GET when the server rejects or mishandles HEAD.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 100,
+        per_host_limit: int = 2,
+        timeout: float = 10.0,
+        cache_ttl_seconds: float = 600.0,
+        dns_cache_ttl_seconds: int = 300,
+        user_agent: str = DEFAULT_USER_AGENT
+    ):
+        self.max_concurrency = max_concurrency
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.dns_cache_ttl_seconds = dns_cache_ttl_seconds
+        self.user_agent = user_agent
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._cache: Dict[str, tuple] = {}
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_concurrency,
+                limit_per_host=self.per_host_limit,
+                use_dns_cache=True,
+                ttl_dns_cache=self.dns_cache_ttl_seconds
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={"User-Agent": self.user_agent}
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+
+    def _cached(self, key: str) -> Optional[ProbeResult]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        stored_at, result = entry
+        if time.monotonic() - stored_at > self.cache_ttl_seconds:
+            del self._cache[key]
+            return None
+        return result
+
+    async def probe(self, url: str, timeout: Optional[float] = None) -> ProbeResult:
+        """
+        Check whether a website answers with a non-error status.
+
+        Concurrent probes of the same host share one request, and a fresh
+        cached result for the host is returned without any network traffic.
+        """
+        key = host_key(url)
+        cached = self._cached(key)
+        if cached is not None:
+            return replace(cached, url=url, from_cache=True)
+
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            result = await asyncio.shield(pending)
+            return replace(result, url=url, from_cache=True)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await self._probe_uncached(url, timeout)
+            self._cache[key] = (time.monotonic(), result)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Nobody else may be waiting; mark the exception as retrieved
+            future.exception()
+            raise
+        finally:
+            del self._in_flight[key]
+
+    async def _probe_uncached(self, url: str, timeout: Optional[float]) -> ProbeResult:
+        session = await self._get_session()
+        request_timeout = aiohttp.ClientTimeout(total=timeout) if timeout else None
+        started = time.monotonic()
+
+        async with self._semaphore:
+            try:
+                status, final_url = await self._request(session, "HEAD", url, request_timeout)
+                method = "HEAD"
+                if status in _HEAD_FALLBACK_STATUSES:
+                    status, final_url = await self._request(session, "GET", url, request_timeout)
+                    method = "GET"
+            except (aiohttp.ServerDisconnectedError, aiohttp.ClientResponseError):
+                # Some servers drop HEAD requests outright
+                try:
+                    status, final_url = await self._request(session, "GET", url, request_timeout)
+                    method = "GET"
+                except aiohttp.ClientError as e:
+                    return self._failure(url, f"Connection error: {str(e)}", started)
+                except asyncio.TimeoutError:
+                    return self._failure(url, "Connection error: timed out", started)
+            except aiohttp.ClientError as e:
+                return self._failure(url, f"Connection error: {str(e)}", started)
+            except asyncio.TimeoutError:
+                return self._failure(url, "Connection error: timed out", started)
+            except Exception as e:
+                return self._failure(url, f"Accessibility test failed: {str(e)}", started)
+
+        accessible = 200 <= status < 400
+        return ProbeResult(
+            url=url,
+            accessible=accessible,
+            message="Website is accessible" if accessible else f"Website returned status code: {status}",
+            status=status,
+            method=method,
+            final_url=final_url,
+            elapsed_ms=round((time.monotonic() - started) * 1000, 2)
+        )
+
+    @staticmethod
+    async def _request(session: aiohttp.ClientSession, method: str, url: str, timeout) -> tuple:
+        kwargs = {"allow_redirects": True}
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        # The body is never read; the connection is released on exit
+        async with session.request(method, url, **kwargs) as response:
+            return response.status, str(response.url)
+
+    @staticmethod
+    def _failure(url: str, message: str, started: float) -> ProbeResult:
+        return ProbeResult(
+            url=url,
+            accessible=False,
+            message=message,
+            elapsed_ms=round((time.monotonic() - started) * 1000, 2)
+        )
+
+    async def probe_many(
+        self,
+        urls: Iterable[str],
+        timeout: Optional[float] = None,
+        on_result: Optional[Callable[[ProbeResult], Awaitable[None]]] = None
+    ) -> Dict[str, ProbeResult]:
+        """
+        Probe many URLs concurrently.
+
+        Args:
+            urls: URLs to check; duplicates are probed once
+            timeout: Per-request timeout overriding the engine default
+            on_result: Optional coroutine called as each probe completes
+
+        Returns:
+            Mapping of URL to its result
+        """
+        unique_urls = list(dict.fromkeys(u for u in urls if u))
+
+        async def run(url: str) -> ProbeResult:
+            result = await self.probe(url, timeout)
+            if on_result is not None:
+                await on_result(result)
+            return result
+
+        results = await asyncio.gather(*(run(url) for url in unique_urls))
+        return dict(zip(unique_urls, results))
+
+    def clear_cache(self):
+        self._cache.clear()
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+# Shared engine; its session is created on first use in the running loop
+_default_engine: Optional[URLProbeEngine] = None
+
+
+def get_probe_engine() -> URLProbeEngine:
+    global _default_engine
+    if _default_engine is None:
+        _default_engine = URLProbeEngine()
+    return _default_engine
@@ -4,18 +4,18 @@ Health Check Utilities
 Enterprise-grade health monitoring for autoscraper service
 """
 
+import asyncio
 import time
+import httpx
 import psutil
-import redis
+import redis.asyncio as aioredis
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import text
-from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from loguru import logger
 
-from app.database.database import DatabaseManager
+from app.database.database import db_manager
 from config.settings import get_settings
 
 settings = get_settings()
@@ -46,15 +46,33 @@ class ReadinessResponse(BaseModel):
 
 
 class HealthChecker:
-    """Health check implementation"""
+    """
+    Background health prober.
+
+    All checks run concurrently on a fixed interval, each bounded by its own
+    timeout, and the latest results are cached. Probe endpoints only read the
+    cache, so Kubernetes polling never touches the database, Redis or the
+    Celery broker directly.
+    """
+    
+    # Checks that decide readiness
+    READINESS_CHECKS = ("database", "redis")
     
-    def __init__(self):
+    def __init__(self, interval: Optional[float] = None, timeout: Optional[float] = None):
         self.start_time = time.time()
+        self.interval = interval or settings.HEALTH_CHECK_INTERVAL
+        self.timeout = timeout or settings.HEALTH_CHECK_TIMEOUT
         self.redis_client = None
+        self._celery_app = None
+        self._http_client = None
+        self._results: Dict[str, Dict[str, Any]] = {}
+        self._last_run: Optional[datetime] = None
+        self._task: Optional[asyncio.Task] = None
+        self._run_lock = asyncio.Lock()
         
         # Initialize Redis client for health checks
         try:
-            self.redis_client = redis.from_url(
+            self.redis_client = aioredis.from_url(
                 settings.REDIS_URL,
                 socket_connect_timeout=2,
                 socket_timeout=2
@@ -66,33 +84,105 @@ class HealthChecker:
         """Get service uptime in seconds"""
         return time.time() - self.start_time
     
-    async def check_database(self) -> Dict[str, Any]:
-        """Check database connectivity"""
+    async def start(self):
+        """Run the checks once, then keep refreshing them in the background"""
+        if self._task and not self._task.done():
+            return
+        await self.run_checks()
+        self._task = asyncio.create_task(self._probe_loop())
+        logger.info(f"Health prober started (interval {self.interval}s, timeout {self.timeout}s)")
+    
+    async def stop(self):
+        """Stop the background prober and release clients"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._http_client:
+            await self._http_client.aclose()
+            self._http_client = None
+        if self.redis_client:
+            await self.redis_client.close()
+    
+    async def _probe_loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.run_checks()
+            except Exception as e:
+                logger.error(f"Health probe cycle failed: {e}")
+    
+    def _checks(self) -> Dict[str, Any]:
+        return {
+            "database": self.check_database,
+            "redis": self.check_redis,
+            "celery": self.check_celery,
+            "system_resources": self.check_system_resources,
+            "main_service": self.check_main_service
+        }
+    
+    async def _run_check(self, name: str, check) -> Dict[str, Any]:
+        started = time.time()
         try:
-            start_time = time.time()
-            db_manager = DatabaseManager()
-            await db_manager.initialize()
-            
-            async with db_manager.get_session() as session:
-                result = await session.execute(text("SELECT 1"))
-                result.scalar()
-            
-            response_time = (time.time() - start_time) * 1000  # ms
-            
-            return {
-                "status": "healthy",
-                "response_time_ms": round(response_time, 2),
-                "connection_pool_size": db_manager.engine.pool.size(),
-                "checked_out_connections": db_manager.engine.pool.checkedout()
-            }
+            result = await asyncio.wait_for(check(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Health check '{name}' timed out after {self.timeout}s")
+            result = {"status": "unhealthy", "error": f"Timed out after {self.timeout}s"}
         except Exception as e:
-            logger.error(f"Database health check failed: {e}")
+            logger.error(f"Health check '{name}' failed: {e}")
+            result = {"status": "unhealthy", "error": str(e)}
+        result["checked_at"] = datetime.utcnow().isoformat()
+        result["duration_ms"] = round((time.time() - started) * 1000, 2)
+        return result
+    
+    async def run_checks(self) -> Dict[str, Dict[str, Any]]:
+        """Run every check concurrently and replace the cached results"""
+        async with self._run_lock:
+            checks = self._checks()
+            results = await asyncio.gather(*(
+                self._run_check(name, check) for name, check in checks.items()
+            ))
+            self._results = dict(zip(checks, results))
+            self._last_run = datetime.utcnow()
+            return self._results
+    
+    def is_stale(self) -> bool:
+        """True when the prober has missed several cycles"""
+        if self._last_run is None:
+            return True
+        age = (datetime.utcnow() - self._last_run).total_seconds()
+        return age > self.interval * 3 + self.timeout
+    
+    async def get_cached(self, name: str) -> Dict[str, Any]:
+        """Latest result of one check, running the checks if none has completed yet"""
+        if self._last_run is None:
+            await self.run_checks()
+        return self._results.get(name, {"status": "unknown"})
+    
+    async def check_database(self) -> Dict[str, Any]:
+        """Check database connectivity"""
+        client = db_manager.mongodb_manager.client
+        if client is None:
             return {
                 "status": "unhealthy",
-                "error": str(e)
+                "error": "Database not connected"
             }
+        
+        start_time = time.time()
+        await client.admin.command("ping")
+        response_time = (time.time() - start_time) * 1000  # ms
+        
+        return {
+            "status": "healthy",
+            "database_type": "mongodb",
+            "database_name": settings.MONGODB_DATABASE_NAME,
+            "response_time_ms": round(response_time, 2)
+        }
     
-    def check_redis(self) -> Dict[str, Any]:
+    async def check_redis(self) -> Dict[str, Any]:
         """Check Redis connectivity"""
         if not self.redis_client:
             return {
@@ -100,144 +190,118 @@ class HealthChecker:
                 "error": "Redis client not initialized"
             }
         
-        try:
-            start_time = time.time()
-            self.redis_client.ping()
-            response_time = (time.time() - start_time) * 1000  # ms
-            
-            # Get Redis info
-            info = self.redis_client.info()
-            
-            return {
-                "status": "healthy",
-                "response_time_ms": round(response_time, 2),
-                "redis_version": info.get("redis_version"),
-                "connected_clients": info.get("connected_clients"),
-                "used_memory_human": info.get("used_memory_human")
-            }
-        except Exception as e:
-            logger.error(f"Redis health check failed: {e}")
-            return {
-                "status": "unhealthy",
-                "error": str(e)
-            }
+        start_time = time.time()
+        await self.redis_client.ping()
+        response_time = (time.time() - start_time) * 1000  # ms
+        
+        # Get Redis info
+        info = await self.redis_client.info()
+        
+        return {
+            "status": "healthy",
+            "response_time_ms": round(response_time, 2),
+            "redis_version": info.get("redis_version"),
+            "connected_clients": info.get("connected_clients"),
+            "used_memory_human": info.get("used_memory_human")
+        }
     
-    def check_celery(self) -> Dict[str, Any]:
-        """Check Celery worker status"""
-        try:
+    def _get_celery_app(self):
+        if self._celery_app is None:
             from celery import Celery
             
-            # Create Celery app for inspection
-            celery_app = Celery(
+            # Built once and reused for every probe cycle
+            self._celery_app = Celery(
                 'autoscraper',
                 broker=settings.CELERY_BROKER_URL,
                 backend=settings.CELERY_RESULT_BACKEND
             )
-            
-            # Get active workers
-            inspect = celery_app.control.inspect()
-            active_workers = inspect.active()
-            
-            if active_workers:
-                worker_count = len(active_workers)
-                return {
-                    "status": "healthy",
-                    "active_workers": worker_count,
-                    "workers": list(active_workers.keys())
-                }
-            else:
-                return {
-                    "status": "unhealthy",
-                    "error": "No active Celery workers found"
-                }
-        except Exception as e:
-            logger.error(f"Celery health check failed: {e}")
+        return self._celery_app
+    
+    async def check_celery(self) -> Dict[str, Any]:
+        """Check Celery worker status"""
+        # A ping broadcast is much lighter than inspect().active()
+        reply_timeout = max(0.5, self.timeout - 1)
+        replies = await asyncio.to_thread(
+            self._get_celery_app().control.ping, timeout=reply_timeout
+        )
+        
+        if replies:
+            workers = [name for reply in replies for name in reply]
             return {
-                "status": "unhealthy",
-                "error": str(e)
+                "status": "healthy",
+                "active_workers": len(workers),
+                "workers": workers
             }
+        return {
+            "status": "unhealthy",
+            "error": "No active Celery workers found"
+        }
     
-    def check_system_resources(self) -> Dict[str, Any]:
+    async def check_system_resources(self) -> Dict[str, Any]:
         """Check system resource usage"""
+        return await asyncio.to_thread(self._system_resources)
+    
+    @staticmethod
+    def _system_resources() -> Dict[str, Any]:
+        # CPU usage since the previous probe; does not sleep
+        cpu_percent = psutil.cpu_percent(interval=None)
+        
+        # Memory usage
+        memory = psutil.virtual_memory()
+        
+        # Disk usage
+        disk = psutil.disk_usage('/')
+        
+        # Load average (Unix-like systems)
+        load_avg = None
         try:
-            # CPU usage
-            cpu_percent = psutil.cpu_percent(interval=1)
-            
-            # Memory usage
-            memory = psutil.virtual_memory()
-            
-            # Disk usage
-            disk = psutil.disk_usage('/')
-            
-            # Load average (Unix-like systems)
-            load_avg = None
-            try:
-                load_avg = psutil.getloadavg()
-            except AttributeError:
-                # Windows doesn't have load average
-                pass
-            
-            return {
-                "status": "healthy",
-                "cpu_percent": cpu_percent,
-                "memory": {
-                    "total_gb": round(memory.total / (1024**3), 2),
-                    "available_gb": round(memory.available / (1024**3), 2),
-                    "percent_used": memory.percent
-                },
-                "disk": {
-                    "total_gb": round(disk.total / (1024**3), 2),
-                    "free_gb": round(disk.free / (1024**3), 2),
-                    "percent_used": round((disk.used / disk.total) * 100, 2)
-                },
-                "load_average": load_avg
-            }
-        except Exception as e:
-            logger.error(f"System resource check failed: {e}")
-            return {
-                "status": "unhealthy",
-                "error": str(e)
-            }
+            load_avg = psutil.getloadavg()
+        except AttributeError:
+            # Windows doesn't have load average
+            pass
+        
+        return {
+            "status": "healthy",
+            "cpu_percent": cpu_percent,
+            "memory": {
+                "total_gb": round(memory.total / (1024**3), 2),
+                "available_gb": round(memory.available / (1024**3), 2),
+                "percent_used": memory.percent
+            },
+            "disk": {
+                "total_gb": round(disk.total / (1024**3), 2),
+                "free_gb": round(disk.free / (1024**3), 2),
+                "percent_used": round((disk.used / disk.total) * 100, 2)
+            },
+            "load_average": load_avg
+        }
     
-    def check_main_service(self) -> Dict[str, Any]:
+    async def check_main_service(self) -> Dict[str, Any]:
         """Check main RemoteHive service connectivity"""
-        try:
-            import httpx
-            
-            url = f"{settings.MAIN_SERVICE_URL}{settings.MAIN_SERVICE_HEALTH_ENDPOINT}"
-            
-            with httpx.Client(timeout=5.0) as client:
-                start_time = time.time()
-                response = client.get(url)
-                response_time = (time.time() - start_time) * 1000  # ms
-                
-                if response.status_code == 200:
-                    return {
-                        "status": "healthy",
-                        "response_time_ms": round(response_time, 2),
-                        "main_service_status": response.status_code
-                    }
-                else:
-                    return {
-                        "status": "unhealthy",
-                        "error": f"Main service returned status {response.status_code}"
-                    }
-        except Exception as e:
-            logger.error(f"Main service health check failed: {e}")
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(timeout=self.timeout)
+        
+        url = f"{settings.MAIN_SERVICE_URL}{settings.MAIN_SERVICE_HEALTH_ENDPOINT}"
+        start_time = time.time()
+        response = await self._http_client.get(url)
+        response_time = (time.time() - start_time) * 1000  # ms
+        
+        if response.status_code == 200:
             return {
-                "status": "unhealthy",
-                "error": str(e)
+                "status": "healthy",
+                "response_time_ms": round(response_time, 2),
+                "main_service_status": response.status_code
             }
+        return {
+            "status": "unhealthy",
+            "error": f"Main service returned status {response.status_code}"
+        }
     
     async def get_comprehensive_health(self) -> HealthStatus:
-        """Get comprehensive health status"""
-        checks = {
-            "database": await self.check_database(),
-            "redis": self.check_redis(),
-            "celery": self.check_celery(),
-            "system_resources": self.check_system_resources(),
-            "main_service": self.check_main_service()
-        }
+        """Get comprehensive health status from the cached results"""
+        if self._last_run is None:
+            await self.run_checks()
+        checks = dict(self._results)
         
         # Determine overall status
         unhealthy_checks = [
@@ -245,11 +309,11 @@ class HealthChecker:
             if check.get("status") == "unhealthy"
         ]
         
-        overall_status = "unhealthy" if unhealthy_checks else "healthy"
+        overall_status = "unhealthy" if unhealthy_checks or self.is_stale() else "healthy"
         
         return HealthStatus(
             status=overall_status,
-            timestamp=datetime.utcnow(),
+            timestamp=self._last_run,
             environment=settings.ENVIRONMENT,
             uptime_seconds=self.get_uptime(),
             checks=checks
@@ -257,12 +321,13 @@ class HealthChecker:
     
     async def get_readiness(self) -> ReadinessResponse:
         """Get readiness status (for Kubernetes readiness probe)"""
-        db_check = await self.check_database()
-        redis_check = self.check_redis()
+        if self._last_run is None:
+            await self.run_checks()
+        stale = self.is_stale()
         
         checks = {
-            "database": db_check.get("status") == "healthy",
-            "redis": redis_check.get("status") == "healthy"
+            name: not stale and self._results.get(name, {}).get("status") == "healthy"
+            for name in self.READINESS_CHECKS
         }
         
         ready = all(checks.values())
@@ -285,7 +350,7 @@ health_router = APIRouter()
 
 @health_router.get("/", response_model=HealthStatus)
 async def health_check():
-    """Comprehensive health check endpoint"""
+    """Comprehensive health check endpoint (cached)"""
     return await health_checker.get_comprehensive_health()
 
 
@@ -306,22 +371,22 @@ async def readiness_probe():
 @health_router.get("/database")
 async def database_health():
     """Database-specific health check"""
-    return await health_checker.check_database()
+    return await health_checker.get_cached("database")
 
 
 @health_router.get("/redis")
 async def redis_health():
     """Redis-specific health check"""
-    return health_checker.check_redis()
+    return await health_checker.get_cached("redis")
 
 
 @health_router.get("/celery")
 async def celery_health():
     """Celery-specific health check"""
-    return health_checker.check_celery()
+    return await health_checker.get_cached("celery")
 
 
 @health_router.get("/system")
 async def system_health():
     """System resources health check"""
-    return health_checker.check_system_resources()
\ No newline at end of file
+    return await health_checker.get_cached("system_resources")
\ No newline at end of file
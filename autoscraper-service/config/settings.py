@@ -6,7 +6,7 @@ Enterprise-grade configuration management
 
 import os
 from typing import List, Optional
-from pydantic import field_validator
+from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings
 from pathlib import Path
 
@@ -48,6 +48,16 @@ class AutoscraperSettings(BaseSettings):
     MONGODB_SOCKET_TIMEOUT: int = int(os.getenv("MONGODB_SOCKET_TIMEOUT", "30000"))
     DB_SLOW_QUERY_THRESHOLD: float = float(os.getenv("DB_SLOW_QUERY_THRESHOLD", "1.0"))
     
+    # Export of normalized jobs into the main job_posts collection
+    # From the environment only, no default: a wrong default would write into another
+    # database. The export task is skipped while either is unset.
+    MAIN_MONGODB_URL: Optional[str] = Field(default=None, validation_alias="MAIN_MONGODB_URL")
+    MAIN_MONGODB_DATABASE_NAME: Optional[str] = Field(default=None, validation_alias="MAIN_MONGODB_DATABASE_NAME")
+    EXPORT_INTERVAL_MINUTES: float = float(os.getenv("EXPORT_INTERVAL_MINUTES", "5"))
+    EXPORT_EMPLOYER_ID: str = os.getenv("EXPORT_EMPLOYER_ID", "")
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", "500"))
+    EXPORT_MIN_QUALITY_SCORE: float = float(os.getenv("EXPORT_MIN_QUALITY_SCORE", "0.0"))
+    
     # Redis Configuration (for rate limiting and caching)
     REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/1")
     REDIS_POOL_SIZE: int = int(os.getenv("REDIS_POOL_SIZE", "10"))
@@ -74,8 +84,9 @@ class AutoscraperSettings(BaseSettings):
     RATE_LIMIT_WINDOW_SECONDS: int = 60  # seconds
     
     # Health Check Configuration
-    HEALTH_CHECK_TIMEOUT: int = 30
-    HEALTH_CHECK_INTERVAL: int = 60
+    # Checks run in the background every interval; each check has its own timeout
+    HEALTH_CHECK_TIMEOUT: float = float(os.getenv("HEALTH_CHECK_TIMEOUT", "5"))
+    HEALTH_CHECK_INTERVAL: int = int(os.getenv("HEALTH_CHECK_INTERVAL", "15"))
     
     # Monitoring
     METRICS_ENABLED: bool = True
@@ -107,8 +118,27 @@ class AutoscraperSettings(BaseSettings):
     
     # Performance Configuration
     MAX_CONCURRENT_SCRAPES: int = int(os.getenv("MAX_CONCURRENT_SCRAPES", "5"))
+    SCHEDULER_ENABLED: bool = os.getenv("SCHEDULER_ENABLED", "false").lower() == "true"
+    SCHEDULER_PER_BOARD_CONCURRENCY: int = int(os.getenv("SCHEDULER_PER_BOARD_CONCURRENCY", "1"))
+    SCHEDULER_LOOKAHEAD_SECONDS: int = int(os.getenv("SCHEDULER_LOOKAHEAD_SECONDS", "300"))
+    SCHEDULER_REFRESH_SECONDS: float = float(os.getenv("SCHEDULER_REFRESH_SECONDS", "60"))
     MEMORY_LIMIT_MB: int = int(os.getenv("MEMORY_LIMIT_MB", "512"))
     CPU_LIMIT_PERCENT: int = int(os.getenv("CPU_LIMIT_PERCENT", "80"))
+    SCRAPER_PAGE_CACHE_ENABLED: bool = os.getenv("SCRAPER_PAGE_CACHE_ENABLED", "true").lower() == "true"
+    SCRAPER_CACHE_DIR: str = os.getenv("SCRAPER_CACHE_DIR", "./cache/scraper")
+    SCRAPER_FEED_CONCURRENCY: int = int(os.getenv("SCRAPER_FEED_CONCURRENCY", "10"))
+    CSV_UPLOAD_CHUNK_SIZE: int = int(os.getenv("CSV_UPLOAD_CHUNK_SIZE", "500"))
+    
+    # Data Retention
+    RETENTION_DAYS: float = float(os.getenv("RETENTION_DAYS", "30"))
+    RETENTION_RULES: str = os.getenv("RETENTION_RULES", "")
+    RETENTION_CHUNK_SIZE: int = int(os.getenv("RETENTION_CHUNK_SIZE", "1000"))
+    RETENTION_CHUNK_PAUSE_SECONDS: float = float(os.getenv("RETENTION_CHUNK_PAUSE_SECONDS", "0.1"))
+    RETENTION_TIME_BUDGET_SECONDS: float = float(os.getenv("RETENTION_TIME_BUDGET_SECONDS", "60"))
+    RETENTION_ARCHIVE_ENABLED: bool = os.getenv("RETENTION_ARCHIVE_ENABLED", "true").lower() == "true"
+    RETENTION_ARCHIVE_DIR: str = os.getenv("RETENTION_ARCHIVE_DIR", "./archive")
+    RETENTION_ARCHIVE_FORMAT: str = os.getenv("RETENTION_ARCHIVE_FORMAT", "jsonl")
+    RETENTION_INTERVAL_MINUTES: float = float(os.getenv("RETENTION_INTERVAL_MINUTES", "60"))
     
     # Development Settings
     DEBUG: bool = os.getenv("DEBUG", "false").lower() == "true"
@@ -137,6 +167,14 @@ class AutoscraperSettings(BaseSettings):
             raise ValueError(f"Log level must be one of {allowed}")
         return v.upper()
     
+    @field_validator("MAIN_MONGODB_URL", "MAIN_MONGODB_DATABASE_NAME")
+    @classmethod
+    def validate_export_target(cls, v):
+        # An empty variable counts as unset
+        if v is not None and not v.strip():
+            return None
+        return v
+    
     @field_validator("PORT")
     @classmethod
     def validate_port(cls, v):
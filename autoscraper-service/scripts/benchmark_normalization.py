@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Normalization Benchmark
+Times NormalizationService._normalize_job_data on the recorded raw jobs in
+scripts/fixtures/scrapers/raw_jobs.json and on a large synthetic batch.
+Run directly for a table, or with --json as scripts/benchmark_scrapers.py does.
+"""
+
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add the project root to Python path
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(BASE_DIR))
+
+from loguru import logger
+
+from app.models.models import RawJob
+from app.services.services import NormalizationService
+
+RAW_JOBS_FIXTURE = BASE_DIR.parent / "scripts" / "fixtures" / "scrapers" / "raw_jobs.json"
+
+# Normalization logs per job at debug level; keep stdout clean for --json
+logger.remove()
+
+
+def load_raw_jobs(batch: int):
+    records = json.loads(RAW_JOBS_FIXTURE.read_text(encoding="utf-8"))
+    recorded = [RawJob(**record) for record in records]
+
+    synthetic = []
+    for i in range(batch):
+        record = dict(records[i % len(records)])
+        record["title"] = f"{record['title']} #{i}"
+        synthetic.append(RawJob(**record))
+    return recorded, synthetic
+
+
+def measure(name: str, fn, iterations: int) -> dict:
+    fn()
+    gc.collect()
+
+    items = 0
+    started = time.perf_counter()
+    for _ in range(iterations):
+        items += fn()
+    seconds = time.perf_counter() - started
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {"name": name, "items": items, "seconds": seconds, "peak_mb": peak / (1024 * 1024)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark raw job normalization")
+    parser.add_argument("--iterations", type=int, default=20, help="Timed iterations for the recorded jobs")
+    parser.add_argument("--batch", type=int, default=1000, help="Raw jobs in the synthetic batch")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    service = NormalizationService()
+    recorded, synthetic = load_raw_jobs(args.batch)
+
+    def normalize(raw_jobs):
+        def call():
+            return sum(1 for raw_job in raw_jobs if service._normalize_job_data(raw_job) is not None)
+        return call
+
+    results = [
+        measure("normalize/recorded", normalize(recorded), args.iterations * 10),
+        measure("normalize/batch", normalize(synthetic), max(1, args.iterations // 10)),
+    ]
+
+    if args.json:
+        print(json.dumps(results))
+        return
+
+    for result in results:
+        rate = result["items"] / result["seconds"] if result["seconds"] > 0 else 0.0
+        print(f"{result['name']:<24} {result['items']:>8} {rate:>12.1f} jobs/s {result['peak_mb']:>8.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+# Add the parent directory to the path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.health import HealthChecker
+
+
+class StubHealthChecker(HealthChecker):
+    """Health checker whose checks are plain coroutines supplied by the test"""
+
+    def __init__(self, checks, interval=60.0, timeout=0.1):
+        super().__init__(interval=interval, timeout=timeout)
+        self.redis_client = None
+        self.stub_checks = checks
+
+    def _checks(self):
+        return self.stub_checks
+
+
+def healthy(calls=None):
+    async def check():
+        if calls is not None:
+            calls.append(time.monotonic())
+        return {"status": "healthy"}
+    return check
+
+
+def hangs():
+    async def check():
+        await asyncio.sleep(10)
+        return {"status": "healthy"}
+    return check
+
+
+def fails():
+    async def check():
+        raise ConnectionError("connection refused")
+    return check
+
+
+def test_checks_run_concurrently_and_time_out_individually():
+    checker = StubHealthChecker({
+        "database": healthy(),
+        "redis": hangs(),
+        "celery": hangs(),
+        "main_service": fails()
+    }, timeout=0.2)
+
+    started = time.monotonic()
+    results = asyncio.run(checker.run_checks())
+    elapsed = time.monotonic() - started
+
+    # Both hanging checks were bounded by one timeout, not two
+    assert elapsed < 0.35
+    assert results["database"]["status"] == "healthy"
+    assert results["redis"]["status"] == "unhealthy"
+    assert results["redis"]["error"] == "Timed out after 0.2s"
+    assert results["main_service"]["status"] == "unhealthy"
+    assert results["main_service"]["error"] == "connection refused"
+    assert all("checked_at" in r and "duration_ms" in r for r in results.values())
+
+    readiness = asyncio.run(checker.get_readiness())
+    assert not readiness.ready and readiness.checks == {"database": True, "redis": False}
+
+
+def test_probes_read_the_cache_and_go_unready_when_stale():
+    calls = []
+    checker = StubHealthChecker({"database": healthy(calls), "redis": healthy()}, interval=10, timeout=1)
+
+    async def scenario():
+        first = await checker.get_readiness()
+        again = await checker.get_readiness()
+        cached = await checker.get_cached("database")
+        # The prober has missed more than three cycles
+        checker._last_run = datetime.utcnow() - timedelta(seconds=checker.interval * 3 + checker.timeout + 1)
+        stale = await checker.get_readiness()
+        health = await checker.get_comprehensive_health()
+        return first, again, cached, stale, health
+
+    first, again, cached, stale, health = asyncio.run(scenario())
+
+    assert first.ready and again.ready
+    assert len(calls) == 1  # only the first probe ran the checks
+    assert cached["status"] == "healthy"
+    assert checker.is_stale()
+    assert not stale.ready and stale.checks == {"database": False, "redis": False}
+    # Stale results mark the service unhealthy even though every check passed
+    assert health.status == "unhealthy"
+    assert health.checks["database"]["status"] == "healthy"
+
+
+def test_background_prober_refreshes_until_stopped():
+    calls = []
+    checker = StubHealthChecker({"database": healthy(calls), "redis": healthy()}, interval=0.02, timeout=0.1)
+
+    async def scenario():
+        await checker.start()
+        await asyncio.sleep(0.11)
+        await checker.stop()
+        stopped_at = len(calls)
+        await asyncio.sleep(0.05)
+        return stopped_at
+
+    stopped_at = asyncio.run(scenario())
+
+    assert stopped_at >= 3
+    assert len(calls) == stopped_at
+    assert not checker.is_stale()
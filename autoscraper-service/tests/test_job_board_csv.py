@@ -0,0 +1,114 @@
+import asyncio
+import io
+import os
+import sys
+
+import pytest
+
+# Add the parent directory to the path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.api.autoscraper import _iter_job_board_csv, _upsert_job_board_chunk
+from app.models.models import Base, JobBoard
+
+
+def parse(content: bytes, chunk_size: int = 100):
+    return list(_iter_job_board_csv(io.BytesIO(content), chunk_size))
+
+
+def test_bom_and_header_aliases_are_resolved():
+    content = (
+        "\ufeffBoard,Location,Website\r\n"
+        "Remote OK,EU,https://remoteok.com\r\n"
+        "\r\n"
+        "We Work Remotely,US,https://weworkremotely.com\r\n"
+    ).encode("utf-8")
+
+    [chunk] = parse(content)
+
+    # Blank lines are skipped but row numbers still match the file
+    assert chunk == [
+        (2, {"name": "Remote OK", "base_url": "https://remoteok.com", "region": "EU"}, None),
+        (4, {"name": "We Work Remotely", "base_url": "https://weworkremotely.com", "region": "US"}, None),
+    ]
+
+
+def test_headerless_files_use_the_positional_layout_and_report_bad_rows():
+    content = (
+        b"Remote OK, https://remoteok.com, EU\n"
+        b"No URL,,\n"
+        b"Bad URL,ftp://example.com\n"
+        b"Jobspresso,https://jobspresso.co\n"
+    )
+
+    chunks = parse(content, chunk_size=2)
+
+    assert [len(chunk) for chunk in chunks] == [2, 2]
+    rows = [row for chunk in chunks for row in chunk]
+    assert rows[0] == (1, {"name": "Remote OK", "base_url": "https://remoteok.com", "region": "EU"}, None)
+    assert rows[1] == (2, None, "Missing name or URL")
+    assert rows[2] == (3, None, "Invalid URL: ftp://example.com")
+    assert rows[3][1] == {"name": "Jobspresso", "base_url": "https://jobspresso.co", "region": None}
+
+
+def test_upload_file_stays_open_after_parsing():
+    upload = io.BytesIO(b"name,url\nRemote OK,https://remoteok.com\n")
+    list(_iter_job_board_csv(upload, 10))
+    assert not upload.closed
+
+
+def test_chunk_upsert_splits_inserts_and_updates():
+    async def scenario():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(lambda c: Base.metadata.create_all(c, tables=[JobBoard.__table__]))
+
+        statements = []
+        event.listen(
+            engine.sync_engine, "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement.split()[0])
+        )
+
+        async with AsyncSession(engine) as db:
+            first = await _upsert_job_board_chunk(db, [
+                {"name": "Remote OK", "base_url": "https://remoteok.com", "region": "EU"},
+                {"name": "Jobspresso", "base_url": "https://jobspresso.co", "region": None},
+            ])
+            await db.commit()
+            statements_first = list(statements)
+            statements.clear()
+
+            second = await _upsert_job_board_chunk(db, [
+                {"name": "Remote OK", "base_url": "https://remoteok.io", "region": None},
+                {"name": "Jobspresso", "base_url": "https://jobspresso.com", "region": "US"},
+                {"name": "Working Nomads", "base_url": "https://workingnomads.com", "region": None},
+            ])
+            await db.commit()
+            statements_second = list(statements)
+
+            rows = (await db.execute(
+                select(JobBoard.name, JobBoard.base_url, JobBoard.selectors, JobBoard.is_active)
+                .order_by(JobBoard.name)
+            )).all()
+        await engine.dispose()
+        return first, second, statements_first, statements_second, rows
+
+    first, second, statements_first, statements_second, rows = asyncio.run(scenario())
+
+    assert first == {"created": 2, "updated": 0}
+    assert second == {"created": 1, "updated": 2}
+    # One lookup and one bulk INSERT; then one UPDATE per distinct column set
+    assert statements_first == ["SELECT", "INSERT"]
+    assert statements_second.count("SELECT") == 1
+    assert statements_second.count("INSERT") == 1
+    assert statements_second.count("UPDATE") == 2
+    assert [tuple(row) for row in rows] == [
+        ("Jobspresso", "https://jobspresso.com", {"region": "US"}, False),
+        ("Remote OK", "https://remoteok.io", {"region": "EU"}, False),
+        ("Working Nomads", "https://workingnomads.com", {}, False),
+    ]
@@ -0,0 +1,159 @@
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+from bson import ObjectId
+
+# Add the parent directory to the path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.job_exporter import JobExporter
+
+EMPLOYER_ID = str(ObjectId())
+
+
+def _matches(doc, query):
+    for key, condition in query.items():
+        value = doc.get(key)
+        if isinstance(condition, dict):
+            if "$gt" in condition and not (value is not None and value > condition["$gt"]):
+                return False
+            if "$gte" in condition and not (value is not None and value >= condition["$gte"]):
+                return False
+            if "$in" in condition and value not in condition["$in"]:
+                return False
+        elif value != condition:
+            return False
+    return True
+
+
+class _Cursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, key, direction):
+        self.docs = sorted(self.docs, key=lambda d: d[key], reverse=direction < 0)
+        return self
+
+    def limit(self, count):
+        self.docs = self.docs[:count]
+        return self
+
+    async def to_list(self, length=None):
+        return [dict(d) for d in self.docs]
+
+
+class InMemoryCollection:
+    """The handful of motor collection calls the exporter makes"""
+
+    def __init__(self, docs=()):
+        self.docs = [dict(d) for d in docs]
+        self.calls = []
+
+    def find(self, query, projection=None):
+        self.calls.append("find")
+        return _Cursor([d for d in self.docs if _matches(d, query)])
+
+    async def find_one(self, query):
+        return next((dict(d) for d in self.docs if _matches(d, query)), None)
+
+    async def update_one(self, query, update, upsert=False):
+        doc = next((d for d in self.docs if _matches(d, query)), None)
+        if doc is None and upsert:
+            doc = dict(query)
+            self.docs.append(doc)
+        if doc is not None:
+            doc.update(update["$set"])
+
+    async def update_many(self, query, update):
+        self.calls.append("update_many")
+        for doc in self.docs:
+            if _matches(doc, query):
+                doc.update(update["$set"])
+
+    async def bulk_write(self, operations, ordered=True):
+        self.calls.append("bulk_write")
+        upserted = modified = 0
+        for op in operations:
+            query, update = op._filter, op._doc
+            doc = next((d for d in self.docs if _matches(d, query)), None)
+            if doc is None:
+                doc = {**query, **update.get("$setOnInsert", {})}
+                self.docs.append(doc)
+                upserted += 1
+            else:
+                modified += 1
+            doc.update(update["$set"])
+        return SimpleNamespace(upserted_count=upserted, modified_count=modified)
+
+
+def normalized_job(i, content_hash=None):
+    return {
+        "_id": ObjectId(),
+        "title": f"Python Developer {i}",
+        "company": "Northwind",
+        "description": "Build APIs",
+        "requirements": "- Python\n- SQL",
+        "skills": ["python"],
+        "remote_allowed": True,
+        "content_hash": content_hash or f"hash-{i}",
+        "job_board_id": "board-1",
+        "exported_to_main_db": False,
+        "duplicate_of": None,
+    }
+
+
+def test_export_batches_upserts_and_marks_once_per_batch():
+    jobs = [normalized_job(i) for i in range(5)] + [normalized_job(99, content_hash="hash-0")]
+    source = InMemoryCollection(jobs)
+    target = InMemoryCollection()
+    checkpoints = InMemoryCollection()
+    exporter = JobExporter(source, target, checkpoints, EMPLOYER_ID, batch_size=2)
+
+    stats = asyncio.run(exporter.export_pending())
+
+    assert stats.drained and stats.batches == 3 and stats.read == 6
+    assert (stats.upserted, stats.updated, stats.failed) == (5, 1, 0)
+    assert len(target.docs) == 5
+    assert all(doc["exported_to_main_db"] for doc in source.docs)
+    assert source.calls.count("update_many") == 3
+    post = next(doc for doc in target.docs if doc["content_hash"] == "hash-1")
+    assert post["requirements"] == ["Python", "SQL"]
+    assert post["is_remote"] is True and post["status"] == "active"
+    # A drained pass clears the checkpoint so failed jobs get retried
+    assert checkpoints.docs[0]["last_id"] is None
+
+
+def test_interrupted_export_resumes_from_checkpoint():
+    jobs = [normalized_job(i) for i in range(6)]
+    source = InMemoryCollection(jobs)
+    target = InMemoryCollection()
+    checkpoints = InMemoryCollection()
+    exporter = JobExporter(source, target, checkpoints, EMPLOYER_ID, batch_size=2)
+
+    first = asyncio.run(exporter.export_pending(max_batches=1))
+    # Simulate a lost flag update: the resumed pass must not start over
+    source.docs[0]["exported_to_main_db"] = False
+    second = asyncio.run(exporter.export_pending())
+
+    assert not first.drained and checkpoints.docs[0]["last_pass"]["exported"] == 4
+    assert first.last_id == str(jobs[1]["_id"])
+    assert second.read == 4
+    assert len(target.docs) == 6
+
+
+def test_export_task_is_skipped_without_an_export_target(monkeypatch):
+    from app.services import tasks
+
+    monkeypatch.setattr(tasks.settings, "MAIN_MONGODB_URL", None)
+
+    def connect(*args, **kwargs):
+        raise AssertionError("the export target must not be contacted")
+
+    monkeypatch.setattr(tasks, "AsyncIOMotorClient", connect)
+
+    result = tasks.export_normalized_jobs.run()
+
+    assert result["success"] is False and result["skipped"] is True
+    assert "MAIN_MONGODB_URL" in result["error"]
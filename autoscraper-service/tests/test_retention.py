@@ -0,0 +1,157 @@
+import asyncio
+import gzip
+import os
+import sys
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from bson import ObjectId, json_util
+
+# Add the parent directory to the path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.retention import ArchiveWriter, RetentionManager, RetentionRule, build_retention_rules
+
+NOW = datetime(2024, 6, 1, 12, 0, 0)
+
+
+def _matches(doc, query):
+    for key, condition in query.items():
+        value = doc.get(key)
+        if isinstance(condition, dict):
+            if "$lt" in condition and not (value is not None and value < condition["$lt"]):
+                return False
+            if "$in" in condition and value not in condition["$in"]:
+                return False
+        elif value != condition:
+            return False
+    return True
+
+
+class _Cursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, key, direction):
+        self.docs = sorted(self.docs, key=lambda d: d[key], reverse=direction < 0)
+        return self
+
+    def limit(self, count):
+        self.docs = self.docs[:count]
+        return self
+
+    async def to_list(self, length=None):
+        return [dict(d) for d in self.docs]
+
+
+class InMemoryCollection:
+    def __init__(self, docs=()):
+        self.docs = [dict(d) for d in docs]
+        self.deletes = []
+
+    def find(self, query, projection=None):
+        return _Cursor([d for d in self.docs if _matches(d, query)])
+
+    async def delete_many(self, query):
+        before = len(self.docs)
+        self.docs = [d for d in self.docs if not _matches(d, query)]
+        self.deletes.append(before - len(self.docs))
+        return SimpleNamespace(deleted_count=before - len(self.docs))
+
+
+def raw_job(age_days, processed=True):
+    return {"_id": ObjectId(), "title": "Engineer", "is_processed": processed,
+            "created_at": NOW - timedelta(days=age_days)}
+
+
+def test_expired_raw_jobs_are_archived_then_deleted_in_chunks(tmp_path):
+    raw_jobs = InMemoryCollection(
+        [raw_job(40 + i) for i in range(5)] + [raw_job(45, processed=False), raw_job(3)]
+    )
+    database = {"raw_jobs": raw_jobs}
+    rule = RetentionRule("raw_jobs", 30, extra_filter={"is_processed": True}, archive=True)
+    manager = RetentionManager(database, [rule], chunk_size=2, chunk_pause=0,
+                               archive_writer=ArchiveWriter(str(tmp_path)))
+
+    results = asyncio.run(manager.run(now=NOW))
+
+    stats = results["raw_jobs"]
+    assert stats["complete"] and stats["deleted"] == 5 and stats["archived"] == 5
+    assert raw_jobs.deletes == [2, 2, 1]
+    assert len(raw_jobs.docs) == 2  # unprocessed and recent jobs survive
+    archived = []
+    for path in stats["archives"]:
+        with gzip.open(path, "rt", encoding="utf-8") as handle:
+            archived.extend(json_util.loads(line) for line in handle)
+    assert len(archived) == 5 and all(isinstance(doc["_id"], ObjectId) for doc in archived)
+
+
+def test_archive_names_do_not_collide_within_a_second(tmp_path):
+    first, second = ArchiveWriter(str(tmp_path)), ArchiveWriter(str(tmp_path))
+
+    paths = [writer.write("raw_jobs", [{"_id": ObjectId()}], now=NOW) for writer in (first, second, first)]
+
+    # Separate passes (and workers) write in the same second without overwriting each other
+    assert len(set(paths)) == 3
+    assert all(path.exists() for path in paths)
+
+
+def test_time_budget_stops_pass_early():
+    runs = InMemoryCollection([{"_id": ObjectId(), "created_at": NOW - timedelta(days=60)} for _ in range(10)])
+    ticks = iter(range(100))
+    manager = RetentionManager({"scrape_runs": runs}, [RetentionRule("scrape_runs", 30)],
+                               chunk_size=3, time_budget=2, chunk_pause=0, clock=lambda: next(ticks))
+
+    results = asyncio.run(manager.run(now=NOW))
+
+    assert not results["scrape_runs"]["complete"]
+    assert results["scrape_runs"]["deleted"] == 3
+    assert len(runs.docs) == 7
+
+
+def test_time_budget_is_split_so_later_rules_are_not_starved():
+    runs = InMemoryCollection([{"_id": ObjectId(), "created_at": NOW - timedelta(days=60)} for _ in range(10)])
+    metrics = InMemoryCollection([{"_id": ObjectId(), "date": NOW - timedelta(days=120)} for _ in range(10)])
+    ticks = iter(range(100))
+    manager = RetentionManager(
+        {"scrape_runs": runs, "scraping_metrics": metrics},
+        [RetentionRule("scrape_runs", 30), RetentionRule("scraping_metrics", 90, time_field="date")],
+        chunk_size=1, time_budget=8, chunk_pause=0, clock=lambda: next(ticks)
+    )
+
+    results = asyncio.run(manager.run(now=NOW))
+
+    # scrape_runs alone has enough backlog to use the whole budget
+    assert results["scrape_runs"]["deleted"] == 4
+    assert results["scraping_metrics"]["deleted"] == 2
+    assert not results["scrape_runs"]["complete"] and not results["scraping_metrics"]["complete"]
+
+
+def test_unused_share_rolls_over_to_later_rules():
+    runs = InMemoryCollection([{"_id": ObjectId(), "created_at": NOW - timedelta(days=60)}])
+    metrics = InMemoryCollection([{"_id": ObjectId(), "date": NOW - timedelta(days=120)} for _ in range(10)])
+    ticks = iter(range(100))
+    manager = RetentionManager(
+        {"scrape_runs": runs, "scraping_metrics": metrics},
+        [RetentionRule("scrape_runs", 30), RetentionRule("scraping_metrics", 90, time_field="date")],
+        chunk_size=2, time_budget=8, chunk_pause=0, clock=lambda: next(ticks)
+    )
+
+    results = asyncio.run(manager.run(now=NOW))
+
+    assert results["scrape_runs"]["complete"] and results["scrape_runs"]["deleted"] == 1
+    # Started at tick 2 with 6 of the 8 ticks left
+    assert results["scraping_metrics"]["deleted"] == 10
+
+
+def test_per_collection_overrides():
+    rules = {rule.collection: rule for rule in build_retention_rules(
+        days_to_keep=10,
+        overrides={"raw_jobs": {"days": 2, "archive": False}, "engine_states": {"days": 7, "ttl": True}}
+    )}
+
+    assert rules["scrape_runs"].max_age_days == 10
+    assert rules["scraping_metrics"].max_age_days == 30
+    assert rules["raw_jobs"].max_age_days == 2 and not rules["raw_jobs"].archive
+    assert rules["raw_jobs"].extra_filter == {"is_processed": True}
+    assert rules["engine_states"].ttl and rules["engine_states"].expire_after_seconds == 7 * 86400
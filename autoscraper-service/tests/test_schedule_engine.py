@@ -0,0 +1,230 @@
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+# Add the parent directory to the path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services import schedule_engine, tasks
+from app.services.schedule_engine import ScheduleEngine, compute_next_run, scrape_job_dispatcher
+
+START = datetime(2024, 3, 1, 12, 0, 0)
+
+
+def make_schedule(schedule_id, next_run_at, boards, max_concurrent_jobs=3, interval_minutes=10):
+    return SimpleNamespace(
+        id=schedule_id,
+        name=f"schedule-{schedule_id}",
+        is_active=True,
+        schedule_type="interval",
+        interval_minutes=interval_minutes,
+        cron_expression=None,
+        timezone="UTC",
+        job_board_ids=boards,
+        max_concurrent_jobs=max_concurrent_jobs,
+        next_run_at=next_run_at,
+        last_run_at=None
+    )
+
+
+class InMemoryScheduleStore:
+    """Stands in for the Mongo collection; claim is the same compare-and-set"""
+
+    def __init__(self, schedules):
+        self.rows = {s.id: dict(vars(s)) for s in schedules}
+        self.results = []
+
+    def _as_schedule(self, row):
+        return SimpleNamespace(**row)
+
+    async def load_due(self, until, limit):
+        rows = [r for r in self.rows.values() if r["is_active"] and r["next_run_at"] and r["next_run_at"] <= until]
+        return [self._as_schedule(r) for r in sorted(rows, key=lambda r: r["next_run_at"])[:limit]]
+
+    async def load_unscheduled(self, limit):
+        rows = [r for r in self.rows.values() if r["is_active"] and r["next_run_at"] is None]
+        return [self._as_schedule(r) for r in rows[:limit]]
+
+    async def claim(self, schedule, expected_next_run, next_run, fired_at):
+        row = self.rows[schedule.id]
+        if not row["is_active"] or row["next_run_at"] != expected_next_run:
+            return False
+        row["next_run_at"] = next_run
+        if fired_at is not None:
+            row["last_run_at"] = fired_at
+        return True
+
+    async def record_result(self, schedule, success):
+        self.results.append((schedule.id, success))
+
+
+def test_only_due_schedules_fire_and_racing_engines_fire_once():
+    store = InMemoryScheduleStore([
+        make_schedule("due", START - timedelta(minutes=1), ["board-a"]),
+        make_schedule("later", START + timedelta(minutes=3), ["board-b"]),
+        make_schedule("far", START + timedelta(hours=2), ["board-c"]),
+    ])
+    dispatched = []
+
+    async def dispatch(schedule, board_id):
+        dispatched.append((schedule.id, board_id))
+        return True
+
+    async def scenario():
+        first = ScheduleEngine(store=store, dispatch=dispatch, clock=lambda: START)
+        second = ScheduleEngine(store=store, dispatch=dispatch, clock=lambda: START)
+        await first.refresh()
+        await second.refresh()
+        fired = [await first.fire_due(), await second.fire_due()]
+        await asyncio.gather(*first._tasks, *second._tasks)
+        return fired, first.seconds_until_next()
+
+    fired, until_next = asyncio.run(scenario())
+
+    assert fired == [1, 0]
+    assert dispatched == [("due", "board-a")]
+    assert store.rows["due"]["next_run_at"] == START + timedelta(minutes=10)
+    assert store.rows["far"]["next_run_at"] == START + timedelta(hours=2)
+    assert until_next == 180.0
+    assert store.results == [("due", True)]
+
+
+def test_schedule_and_board_concurrency_limits():
+    boards = [f"board-{i}" for i in range(6)]
+    store = InMemoryScheduleStore([
+        make_schedule("wide", START, boards, max_concurrent_jobs=2),
+        make_schedule("overlap", START, ["board-0"], max_concurrent_jobs=5),
+    ])
+    running = {"schedule": 0, "board-0": 0}
+    peaks = {"schedule": 0, "board-0": 0}
+
+    async def dispatch(schedule, board_id):
+        if schedule.id == "wide":
+            running["schedule"] += 1
+            peaks["schedule"] = max(peaks["schedule"], running["schedule"])
+        if board_id == "board-0":
+            running["board-0"] += 1
+            peaks["board-0"] = max(peaks["board-0"], running["board-0"])
+        await asyncio.sleep(0.01)
+        if schedule.id == "wide":
+            running["schedule"] -= 1
+        if board_id == "board-0":
+            running["board-0"] -= 1
+        return True
+
+    async def scenario():
+        engine = ScheduleEngine(store=store, dispatch=dispatch, per_board_limit=1, clock=lambda: START)
+        await engine.refresh()
+        await engine.fire_due()
+        await asyncio.gather(*engine._tasks)
+
+    asyncio.run(scenario())
+
+    assert peaks == {"schedule": 2, "board-0": 1}
+    assert len(store.results) == 7
+
+
+def test_interval_next_run_is_whole_seconds():
+    schedule = make_schedule("s", None, [], interval_minutes=15)
+    after = datetime(2024, 3, 1, 12, 0, 0, 654321)
+
+    assert compute_next_run(schedule, after) == datetime(2024, 3, 1, 12, 15, 0)
+    schedule.schedule_type = "manual"
+    assert compute_next_run(schedule, after) is None
+
+
+class FakeCollection:
+    def __init__(self):
+        self.updates = []
+
+    async def update_one(self, query, update):
+        self.updates.append((query, update))
+
+
+class FakeScrapeJob:
+    """Records inserts instead of writing to Mongo"""
+
+    collection = FakeCollection()
+    inserted = []
+
+    def __init__(self, **fields):
+        self.id = f"job-{len(FakeScrapeJob.inserted) + 1}"
+        self.fields = fields
+
+    async def insert(self):
+        FakeScrapeJob.inserted.append(self)
+
+    @classmethod
+    def get_motor_collection(cls):
+        return cls.collection
+
+
+class FakeAsyncResult:
+    def __init__(self, result, polls_until_ready=2):
+        self.result = result
+        self.polls = 0
+        self.polls_until_ready = polls_until_ready
+
+    def ready(self):
+        self.polls += 1
+        return self.polls >= self.polls_until_ready
+
+
+class FakeRunScrapeJob:
+    """Stands in for the Celery task; answers apply_async from a script"""
+
+    def __init__(self, outcome):
+        self.outcome = outcome
+        self.calls = []
+
+    def apply_async(self, args, queue):
+        self.calls.append((args, queue))
+        if isinstance(self.outcome, Exception):
+            raise self.outcome
+        return self.outcome
+
+
+def dispatch_with(monkeypatch, outcome):
+    FakeScrapeJob.collection = FakeCollection()
+    FakeScrapeJob.inserted = []
+    task = FakeRunScrapeJob(outcome)
+    monkeypatch.setattr(schedule_engine, "ScrapeJob", FakeScrapeJob)
+    monkeypatch.setattr(tasks, "run_scrape_job", task)
+    schedule = SimpleNamespace(
+        id="nightly", search_terms=["python"], locations=["Remote"], salary_min=None, salary_max=None,
+        remote_only=True, date_posted_days=1, max_results_per_board=50, max_retries=2
+    )
+    success = asyncio.run(scrape_job_dispatcher(schedule, "board-a", poll_interval=0))
+    return success, task
+
+
+def test_dispatcher_runs_the_job_through_celery_and_waits(monkeypatch):
+    result = FakeAsyncResult({"success": True, "jobs_scraped": 12}, polls_until_ready=3)
+
+    success, task = dispatch_with(monkeypatch, result)
+
+    [job] = FakeScrapeJob.inserted
+    assert success
+    assert task.calls == [([job.id], "autoscraper.default")]
+    assert job.fields["job_board_id"] == "board-a" and job.fields["location"] == "Remote"
+    assert result.polls == 3
+    assert FakeScrapeJob.collection.updates == []
+
+
+def test_dispatcher_fails_the_job_instead_of_orphaning_it(monkeypatch):
+    success, _ = dispatch_with(monkeypatch, ConnectionError("broker unreachable"))
+
+    [job] = FakeScrapeJob.inserted
+    [(query, update)] = FakeScrapeJob.collection.updates
+    assert not success
+    assert query == {"_id": job.id, "status": {"$in": ["pending", "running"]}}
+    assert update["$set"]["status"] == "failed"
+    assert update["$set"]["error_message"] == "broker unreachable"
+
+    success, _ = dispatch_with(monkeypatch, FakeAsyncResult({"success": False, "error": "Job board not found"}))
+
+    [(_, update)] = FakeScrapeJob.collection.updates
+    assert not success
+    assert update["$set"]["error_message"] == "Job board not found"
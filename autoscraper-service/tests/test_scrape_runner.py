@@ -0,0 +1,180 @@
+import asyncio
+import os
+import sys
+from datetime import datetime
+from types import SimpleNamespace
+
+from bson import ObjectId
+
+# Add the parent directory to the path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services import scrape_runner, tasks
+from app.services.services import create_content_hash
+
+LISTING = """
+<div class="job"><h2 class="title">{title}</h2><span class="company">Acme</span>
+<a href="/jobs/{slug}">apply</a><p class="description">Build things</p></div>
+"""
+
+
+def listing_page(*titles):
+    body = "".join(LISTING.format(title=title, slug=title.lower().replace(" ", "-")) for title in titles)
+    return f"<html><body>{body}</body></html>".encode("utf-8")
+
+
+def _matches(doc, query):
+    for key, condition in query.items():
+        if isinstance(condition, dict) and "$in" in condition:
+            if doc.get(key) not in condition["$in"]:
+                return False
+        elif doc.get(key) != condition:
+            return False
+    return True
+
+
+class InMemoryCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def to_list(self, length=None):
+        return self.docs
+
+
+class InMemoryCollection:
+    """The motor collection methods the scrape runner issues"""
+
+    def __init__(self, docs=()):
+        self.docs = [dict(doc) for doc in docs]
+
+    async def find_one(self, query, projection=None):
+        return next((dict(doc) for doc in self.docs if _matches(doc, query)), None)
+
+    def find(self, query, projection=None):
+        return InMemoryCursor([dict(doc) for doc in self.docs if _matches(doc, query)])
+
+    async def find_one_and_update(self, query, update, return_document=None):
+        for doc in self.docs:
+            if _matches(doc, query):
+                doc.update(update["$set"])
+                return dict(doc)
+        return None
+
+    async def update_one(self, query, update):
+        for doc in self.docs:
+            if _matches(doc, query):
+                doc.update(update.get("$set", {}))
+                for key, amount in update.get("$inc", {}).items():
+                    doc[key] = doc.get(key, 0) + amount
+                return
+
+    async def insert_one(self, doc):
+        self.docs.append({"_id": ObjectId(), **doc})
+
+    async def insert_many(self, docs, ordered=True):
+        for doc in docs:
+            await self.insert_one(doc)
+
+
+class InMemoryClient:
+    """Stands in for AsyncIOMotorClient; every database name maps to the same collections"""
+
+    def __init__(self, collections):
+        self.collections = collections
+        self.closed = False
+
+    def __getitem__(self, name):
+        return self.collections
+
+    def close(self):
+        self.closed = True
+
+
+BOARD_ID = ObjectId()
+JOB_ID = ObjectId()
+
+
+def scrape_database(existing_titles=()):
+    board = {
+        "_id": BOARD_ID, "name": "Remote OK", "base_url": "https://remoteok.example",
+        "search_url_template": "https://remoteok.example/search?q={query}", "max_pages_per_search": 5,
+        "rate_limit_delay": 0, "headers": {}, "total_jobs_scraped": 0,
+        "selectors": {"job_container": ".job", "title": ".title", "url": "a"}
+    }
+    job = {"_id": JOB_ID, "job_board_id": str(BOARD_ID), "status": "pending", "search_terms": ["python dev"],
+           "max_results": 100}
+    existing = [
+        {"job_board_id": str(BOARD_ID), "content_hash": create_content_hash(
+            title, f"https://remoteok.example/jobs/{title.lower().replace(' ', '-')}", "Build things")}
+        for title in existing_titles
+    ]
+    return {
+        "job_boards": InMemoryCollection([board]),
+        "scrape_jobs": InMemoryCollection([job]),
+        "scrape_runs": InMemoryCollection(),
+        "raw_jobs": InMemoryCollection(existing),
+    }
+
+
+def run_task(monkeypatch, database, pages):
+    fetched = []
+
+    async def fetch(url, headers):
+        fetched.append(url)
+        status, content = pages[len(fetched) - 1]
+        return SimpleNamespace(status_code=status, headers={}, content=content)
+
+    client = InMemoryClient(database)
+    monkeypatch.setattr(tasks, "AsyncIOMotorClient", lambda url: client)
+    monkeypatch.setattr(scrape_runner, "fetch_page", fetch)
+    monkeypatch.setattr(scrape_runner, "get_page_cache", lambda: None)
+    result = tasks.run_scrape_job.run(str(JOB_ID))
+    assert client.closed
+    return result, fetched
+
+
+def test_task_scrapes_the_mongo_job_and_records_the_outcome(monkeypatch):
+    database = scrape_database(existing_titles=["Data Engineer"])
+    pages = [
+        (200, listing_page("Python Developer", "Data Engineer", "Python Developer")),
+        (200, listing_page("SRE")),
+        (200, listing_page()),
+    ]
+
+    result, fetched = run_task(monkeypatch, database, pages)
+
+    assert result["success"] and result["jobs_saved"] == 2 and result["pages_scraped"] == 2
+    assert fetched == [
+        "https://remoteok.example/search?q=python+dev",
+        "https://remoteok.example/search?q=python+dev&page=2",
+        "https://remoteok.example/search?q=python+dev&page=3",
+    ]
+    job = database["scrape_jobs"].docs[0]
+    assert job["status"] == "completed" and job["error_message"] is None
+    assert job["total_jobs_found"] == 4 and job["total_jobs_saved"] == 2 and job["total_duplicates_skipped"] == 2
+    new_jobs = [doc for doc in database["raw_jobs"].docs if "job_id" in doc]
+    assert sorted(doc["title"] for doc in new_jobs) == ["Python Developer", "SRE"]
+    assert all(doc["job_board_id"] == str(BOARD_ID) and not doc["is_processed"] for doc in new_jobs)
+    runs = database["scrape_runs"].docs
+    assert [run["scrape_job_id"] for run in runs] == [str(JOB_ID)] * 2
+    assert {doc["scrape_run_id"] for doc in new_jobs} == {run["run_id"] for run in runs}
+    board = database["job_boards"].docs[0]
+    assert board["total_jobs_scraped"] == 2 and isinstance(board["last_successful_scrape"], datetime)
+
+    # A redelivered task does not scrape the job again
+    again, fetched_again = run_task(monkeypatch, database, pages)
+    assert again == {"success": False, "error": "Job is already completed"}
+    assert fetched_again == []
+
+
+def test_task_marks_the_job_failed_when_the_board_errors(monkeypatch):
+    database = scrape_database()
+
+    result, _ = run_task(monkeypatch, database, [(200, listing_page("SRE")), (503, b"")])
+
+    assert not result["success"] and result["jobs_saved"] == 1
+    job = database["scrape_jobs"].docs[0]
+    assert job["status"] == "failed"
+    assert job["error_message"] == "HTTP 503 for https://remoteok.example/search?q=python+dev&page=2"
+    assert job["total_jobs_saved"] == 1
+    assert database["job_boards"].docs[0]["total_jobs_scraped"] == 0
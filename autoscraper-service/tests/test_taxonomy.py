@@ -0,0 +1,18 @@
+import os
+import sys
+
+# Add the parent directory to the path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.taxonomy import get_taxonomy
+
+
+def test_bundled_taxonomy_extracts_skills_and_benefits_together():
+    tags = get_taxonomy().extract(
+        "Lead engineer for our REST APIs in Go and Kubernetes. Less meetings, more shipping. "
+        "Catered meals, gym membership and a flexible schedule."
+    )
+
+    assert tags.labels("skills") == ["REST", "Go", "Kubernetes"]
+    assert tags.labels("benefits") == ["free lunch", "gym membership", "flexible hours"]
+    assert tags.primary("seniority") == "senior"
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Middleware Overhead Benchmark for RemoteHive
+
+Compares the per-request cost of the previous stack of BaseHTTPMiddleware
+classes (error handling, health check, validation, security, CSRF, enhanced
+metrics and the version/documentation/security ``http`` middlewares) with the
+single
+RequestPipelineMiddleware. Requests are driven straight through ASGI, so the
+numbers exclude network and server overhead.
+
+Usage:
+    python scripts/benchmark_middleware.py [--requests 2000]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI, Request
+from loguru import logger
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.config import settings
+from app.middleware.error_handler import ErrorHandlingMiddleware, HealthCheckMiddleware
+from app.middleware.security import SecurityMiddleware, CSRFProtectionMiddleware
+from app.middleware.validation import ValidationMiddleware, ValidationConfig, RequestValidator
+from app.middleware.enhanced_middleware import EnhancedMiddleware
+from app.middleware.pipeline import RequestPipelineMiddleware, build_default_stages
+from app.api.versioning import get_api_version, version_registry
+
+# Rate limits would otherwise reject most of the benchmark traffic
+settings.RATE_LIMIT_REQUESTS = 10 ** 9
+ValidationConfig.RATE_LIMIT_REQUESTS = 10 ** 9
+
+# Per-request log lines would dominate the timings
+logger.remove()
+logging.disable(logging.CRITICAL)
+
+# A request that has not completed after this long is reported as stalled
+STALL_TIMEOUT_SECONDS = 2.0
+
+CLIENT_IPS = [f"10.0.{i // 250}.{i % 250}" for i in range(500)]
+
+JOB_PAYLOAD = json.dumps({
+    "title": "Senior Python Developer",
+    "company": "RemoteHive",
+    "description": "Build scalable remote job matching services. " * 20,
+    "skills": ["python", "fastapi", "mongodb", "redis"],
+    "salary": {"min": 90000, "max": 140000, "currency": "USD"}
+}).encode()
+
+
+def create_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/v1/jobs")
+    async def list_jobs():
+        return {"items": [], "total": 0}
+
+    @app.post("/api/v1/jobs")
+    async def create_job(request: Request):
+        data = await request.json()
+        return {"title": data["title"]}
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    return app
+
+
+def build_legacy_app() -> FastAPI:
+    """The middleware stack as it was assembled in app.main and setup_enhanced_api"""
+    app = create_app()
+    app.add_middleware(ErrorHandlingMiddleware)
+    app.add_middleware(HealthCheckMiddleware)
+    app.add_middleware(ValidationMiddleware)
+    app.add_middleware(SecurityMiddleware)
+    app.add_middleware(CSRFProtectionMiddleware)
+
+    async def version_middleware(request, call_next):
+        api_version = get_api_version(request)
+        request.state.api_version = api_version
+        response = await call_next(request)
+        response.headers["X-API-Version"] = api_version.value
+        response.headers["X-API-Supported-Versions"] = ",".join(
+            v.value for v in version_registry.get_active_versions()
+        )
+        return response
+
+    async def documentation_middleware(request, call_next):
+        response = await call_next(request)
+        response.headers["X-API-Version"] = "2.0.0"
+        response.headers["X-API-Name"] = "RemoteHive API"
+        return response
+
+    async def integration_security_middleware(request, call_next):
+        if request.method in ["POST", "PUT", "PATCH"]:
+            body = await request.body()
+            if body:
+                try:
+                    data = json.loads(body.decode())
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    data = body.decode('utf-8', errors='ignore')
+                RequestValidator.scan_for_threats(data)
+        response = await call_next(request)
+        response.headers["X-Content-Type-Options"] = "nosniff"
+        return response
+
+    app.add_middleware(BaseHTTPMiddleware, dispatch=version_middleware)
+    app.add_middleware(EnhancedMiddleware)
+    app.add_middleware(BaseHTTPMiddleware, dispatch=documentation_middleware)
+    app.add_middleware(BaseHTTPMiddleware, dispatch=integration_security_middleware)
+    return app
+
+
+def build_pipeline_app() -> FastAPI:
+    app = create_app()
+    app.add_middleware(RequestPipelineMiddleware, stages=build_default_stages())
+    return app
+
+
+def build_bare_app() -> FastAPI:
+    return create_app()
+
+
+async def call(app, method: str, path: str, body: bytes, client_ip: str) -> int:
+    headers = [(b"host", b"testserver"), (b"x-forwarded-for", client_ip.encode())]
+    if body:
+        headers += [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": headers,
+        "client": (client_ip, 50000),
+        "server": ("testserver", 80),
+    }
+    sent_body = False
+    status_code = 0
+
+    async def receive():
+        nonlocal sent_body
+        if not sent_body:
+            sent_body = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await asyncio.sleep(3600)
+
+    async def send(message):
+        nonlocal status_code
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+
+    await app(scope, receive, send)
+    return status_code
+
+
+async def measure(app, method: str, path: str, body: bytes, requests: int) -> list:
+    # Warm up routing and lazy middleware construction. With starlette < 0.28 a
+    # BaseHTTPMiddleware that reads the body leaves nothing for the app, which
+    # then waits for the client until it disconnects.
+    try:
+        await asyncio.wait_for(call(app, method, path, body, CLIENT_IPS[0]), STALL_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        return []
+    for i in range(1, 20):
+        await call(app, method, path, body, CLIENT_IPS[i])
+
+    timings = []
+    for i in range(requests):
+        started = time.perf_counter()
+        status_code = await call(app, method, path, body, CLIENT_IPS[i % len(CLIENT_IPS)])
+        timings.append(time.perf_counter() - started)
+        if status_code >= 400:
+            raise RuntimeError(f"{method} {path} returned {status_code}")
+    return timings
+
+
+async def run(requests: int):
+    apps = {
+        "bare": build_bare_app(),
+        "legacy": build_legacy_app(),
+        "pipeline": build_pipeline_app()
+    }
+    scenarios = [
+        ("GET /api/v1/jobs", "GET", "/api/v1/jobs", b""),
+        ("POST /api/v1/jobs", "POST", "/api/v1/jobs", JOB_PAYLOAD),
+        ("GET /health", "GET", "/health", b"")
+    ]
+
+    print(f"{'scenario':<20} {'stack':<10} {'mean us':>10} {'p95 us':>10} {'overhead us':>12}")
+    for label, method, path, body in scenarios:
+        baseline = None
+        for name, app in apps.items():
+            timings = await measure(app, method, path, body, requests)
+            if not timings:
+                print(f"{label:<20} {name:<10} {'stalled':>10}")
+                continue
+            mean_us = statistics.mean(timings) * 1e6
+            p95_us = sorted(timings)[int(len(timings) * 0.95)] * 1e6
+            if baseline is None:
+                baseline = mean_us
+            print(f"{label:<20} {name:<10} {mean_us:>10.1f} {p95_us:>10.1f} {mean_us - baseline:>12.1f}")
+        print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark middleware overhead")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per scenario and stack")
+    args = parser.parse_args()
+    asyncio.run(run(args.requests))
+
+
+if __name__ == "__main__":
+    main()
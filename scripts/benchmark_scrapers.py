@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Offline Scraper Benchmark for RemoteHive
+
+Times the parsing hot paths against recorded search-result pages for each
+ScraperSource (scripts/fixtures/scrapers) and against synthetic large pages
+built by repeating a fixture's job cards:
+
+- WebScrapingEngine._extract_jobs_from_page per source
+- JobPostParser.parse_job on a job detail page
+- ScrapingUtils text helpers
+- NormalizationService._normalize_job_data (autoscraper service, run in a
+  subprocess because it is a separate ``app`` package)
+
+Every case reports jobs (or items) per second and peak traced memory. With
+``--check`` the run fails when a case is slower or larger than its entry in
+thresholds.json; ``--write-thresholds`` records the current numbers with
+headroom so machines of similar speed pass.
+
+Usage:
+    python scripts/benchmark_scrapers.py [--iterations 20] [--large-cards 1000] [--check]
+"""
+
+import argparse
+import gc
+import json
+import logging
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from app.core.enums import ScraperSource
+from app.scraper.engine import ScrapingConfig, WebScrapingEngine
+from app.scraper.parsers import JobPostParser
+from app.scraper.utils import ScrapingUtils
+
+FIXTURES_DIR = ROOT / "scripts" / "fixtures" / "scrapers"
+THRESHOLDS_FILE = FIXTURES_DIR / "thresholds.json"
+NORMALIZATION_SCRIPT = ROOT / "autoscraper-service" / "scripts" / "benchmark_normalization.py"
+
+CARDS_START = "<!-- cards -->"
+CARDS_END = "<!-- /cards -->"
+FIXTURE_CARDS = 5
+
+# Extraction is logged per card on failure only; keep the output readable
+logging.disable(logging.CRITICAL)
+
+GENERIC_PARSING_RULES = {
+    "job_container": ".job",
+    "title": ".title",
+    "company": ".company",
+    "location": ".location",
+    "summary": ".summary",
+    "salary": ".salary",
+    "job_url": "a.title"
+}
+
+# source -> (fixture file, base URL, parsing rules)
+SOURCE_FIXTURES = {
+    ScraperSource.INDEED: ("indeed.html", "https://www.indeed.com", {}),
+    ScraperSource.LINKEDIN: ("linkedin.html", "https://www.linkedin.com", {}),
+    ScraperSource.GLASSDOOR: ("glassdoor.html", "https://www.glassdoor.com", {}),
+    ScraperSource.REMOTE_OK: ("remote_ok.html", "https://remoteok.com", {}),
+    ScraperSource.WE_WORK_REMOTELY: ("we_work_remotely.html", "https://weworkremotely.com", {}),
+    ScraperSource.OTHER: ("generic.html", "https://jobs.example.com", GENERIC_PARSING_RULES),
+}
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    items: int
+    seconds: float
+    peak_mb: float
+
+    @property
+    def jobs_per_sec(self) -> float:
+        return self.items / self.seconds if self.seconds > 0 else 0.0
+
+
+def load_fixture(name: str) -> str:
+    return (FIXTURES_DIR / name).read_text(encoding="utf-8")
+
+
+def synthesize_page(html: str, cards: int) -> str:
+    """Repeat a fixture's job cards until the page holds at least ``cards``"""
+    start = html.index(CARDS_START) + len(CARDS_START)
+    end = html.index(CARDS_END)
+    repeats = max(1, -(-cards // FIXTURE_CARDS))
+    return html[:start] + html[start:end] * repeats + html[end:]
+
+
+def measure(name: str, fn: Callable[[], int], iterations: int) -> BenchmarkResult:
+    """
+    Time ``fn`` (which returns how many items it handled) over several
+    iterations, then trace one extra call for peak memory. Tracing is kept
+    out of the timed loop because it slows allocation-heavy code.
+    """
+    fn()  # warm up selector and regex caches
+    gc.collect()
+
+    items = 0
+    started = time.perf_counter()
+    for _ in range(iterations):
+        items += fn()
+    seconds = time.perf_counter() - started
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return BenchmarkResult(name=name, items=items, seconds=seconds, peak_mb=peak / (1024 * 1024))
+
+
+def build_engine(source: ScraperSource) -> WebScrapingEngine:
+    _, base_url, rules = SOURCE_FIXTURES[source]
+    config = ScrapingConfig(source=source, base_url=base_url, parsing_rules=rules, use_page_cache=False)
+    return WebScrapingEngine(config)
+
+
+def extraction_cases(iterations: int, large_cards: int) -> List[BenchmarkResult]:
+    results = []
+    for source, (fixture, base_url, _) in SOURCE_FIXTURES.items():
+        engine = build_engine(source)
+        html = load_fixture(fixture)
+        large = synthesize_page(html, large_cards)
+        page_url = f"{base_url}/jobs?q=python"
+        label = source.value.lower()
+
+        results.append(measure(
+            f"extract/{label}",
+            lambda: len(engine._extract_jobs_from_page(html, page_url)),
+            iterations
+        ))
+        results.append(measure(
+            f"extract/{label}/large",
+            lambda: len(engine._extract_jobs_from_page(large, page_url)),
+            max(1, iterations // 10)
+        ))
+        engine.close()
+    return results
+
+
+def parser_cases(iterations: int, large_cards: int) -> List[BenchmarkResult]:
+    parser = JobPostParser(base_url="https://northwind.example.com", source=ScraperSource.OTHER)
+    html = load_fixture("job_detail.html")
+
+    # A long posting: the description block repeated, as some boards inline full handbooks
+    start = html.index('<div class="job-description">')
+    end = html.index('<div class="requirements">')
+    large = html[:end] + html[start:end] * max(1, large_cards // 10) + html[end:]
+
+    return [
+        measure("parse_job/detail", lambda: int(parser.parse_job(html, "https://northwind.example.com/8841") is not None), iterations * 5),
+        measure("parse_job/large", lambda: int(parser.parse_job(large, "https://northwind.example.com/8841") is not None), max(1, iterations // 2)),
+    ]
+
+
+def utils_cases(iterations: int) -> List[BenchmarkResult]:
+    raw_jobs = json.loads(load_fixture("raw_jobs.json"))
+    texts = [f"{job['title']} {job['description']}" for job in raw_jobs] * 50
+    salaries = [job["salary"] for job in raw_jobs] * 50
+
+    def run(fn: Callable[[str], object], values: List[str]) -> Callable[[], int]:
+        def call() -> int:
+            for value in values:
+                fn(value)
+            return len(values)
+        return call
+
+    return [
+        measure("utils/clean_text", run(ScrapingUtils.clean_text, texts), iterations),
+        measure("utils/parse_salary_range", run(ScrapingUtils.parse_salary_range, salaries), iterations),
+        measure("utils/detect_job_type", run(ScrapingUtils.detect_job_type, texts), iterations),
+        measure("utils/extract_experience_level", run(ScrapingUtils.extract_experience_level, texts), iterations),
+        measure("utils/calculate_content_hash", run(ScrapingUtils.calculate_content_hash, texts), iterations),
+        measure("utils/extract_urls", run(ScrapingUtils.extract_urls, texts), iterations),
+    ]
+
+
+def normalization_cases(iterations: int, large_cards: int) -> List[BenchmarkResult]:
+    """Run the autoscraper service's normalization benchmark in its own interpreter"""
+    completed = subprocess.run(
+        [
+            sys.executable, str(NORMALIZATION_SCRIPT),
+            "--iterations", str(iterations),
+            "--batch", str(large_cards),
+            "--json"
+        ],
+        cwd=str(NORMALIZATION_SCRIPT.parent.parent),
+        capture_output=True,
+        text=True,
+        timeout=600
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Normalization benchmark failed: {completed.stderr.strip()[-2000:]}")
+    return [BenchmarkResult(**row) for row in json.loads(completed.stdout)]
+
+
+def load_thresholds() -> Dict[str, Dict[str, float]]:
+    if not THRESHOLDS_FILE.exists():
+        return {}
+    return json.loads(THRESHOLDS_FILE.read_text(encoding="utf-8"))
+
+
+def check_thresholds(results: List[BenchmarkResult], thresholds: Dict[str, Dict[str, float]]) -> List[str]:
+    failures = []
+    for result in results:
+        limits = thresholds.get(result.name)
+        if not limits:
+            continue
+        min_rate = limits.get("min_jobs_per_sec")
+        max_peak = limits.get("max_peak_mb")
+        if min_rate is not None and result.jobs_per_sec < min_rate:
+            failures.append(f"{result.name}: {result.jobs_per_sec:.1f} jobs/s < {min_rate:.1f}")
+        if max_peak is not None and result.peak_mb > max_peak:
+            failures.append(f"{result.name}: peak {result.peak_mb:.2f} MB > {max_peak:.2f} MB")
+    return failures
+
+
+def write_thresholds(results: List[BenchmarkResult], speed_headroom: float, memory_headroom: float):
+    thresholds = {
+        result.name: {
+            "min_jobs_per_sec": round(result.jobs_per_sec * speed_headroom, 1),
+            "max_peak_mb": round(result.peak_mb * memory_headroom + 0.5, 2)
+        }
+        for result in results
+    }
+    THRESHOLDS_FILE.write_text(json.dumps(thresholds, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def print_results(results: List[BenchmarkResult], thresholds: Dict[str, Dict[str, float]]):
+    print(f"{'case':<36} {'items':>8} {'jobs/s':>12} {'peak MB':>9} {'min jobs/s':>11} {'max MB':>8}")
+    for result in results:
+        limits = thresholds.get(result.name, {})
+        min_rate = limits.get("min_jobs_per_sec")
+        max_peak = limits.get("max_peak_mb")
+        print(
+            f"{result.name:<36} {result.items:>8} {result.jobs_per_sec:>12.1f} {result.peak_mb:>9.2f} "
+            f"{min_rate if min_rate is not None else '-':>11} {max_peak if max_peak is not None else '-':>8}"
+        )
+
+
+def run(args) -> int:
+    results = []
+    results += extraction_cases(args.iterations, args.large_cards)
+    results += parser_cases(args.iterations, args.large_cards)
+    results += utils_cases(args.iterations)
+    if not args.skip_normalization:
+        results += normalization_cases(args.iterations, args.large_cards)
+
+    if args.only:
+        results = [result for result in results if result.name.startswith(args.only)]
+
+    if args.write_thresholds:
+        write_thresholds(results, args.speed_headroom, args.memory_headroom)
+
+    thresholds = load_thresholds()
+    print_results(results, thresholds)
+
+    if args.output:
+        rows = [{**asdict(result), "jobs_per_sec": result.jobs_per_sec} for result in results]
+        Path(args.output).write_text(json.dumps(rows, indent=2) + "\n", encoding="utf-8")
+
+    if args.check:
+        failures = check_thresholds(results, thresholds)
+        if failures:
+            print("\nRegressions:")
+            for failure in failures:
+                print(f"  {failure}")
+            return 1
+        print("\nAll cases within thresholds")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark scraper parsing offline")
+    parser.add_argument("--iterations", type=int, default=20, help="Timed iterations per fixture case")
+    parser.add_argument("--large-cards", type=int, default=1000, help="Job cards on synthetic large pages")
+    parser.add_argument("--only", help="Only report cases whose name starts with this prefix")
+    parser.add_argument("--skip-normalization", action="store_true", help="Skip the autoscraper normalization cases")
+    parser.add_argument("--check", action="store_true", help="Exit non-zero when a case breaks its threshold")
+    parser.add_argument("--write-thresholds", action="store_true", help="Record current results as thresholds")
+    parser.add_argument("--speed-headroom", type=float, default=0.5, help="Fraction of measured jobs/s to require")
+    parser.add_argument("--memory-headroom", type=float, default=1.5, help="Multiple of measured peak MB to allow")
+    parser.add_argument("--output", help="Also write results as JSON to this path")
+    sys.exit(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
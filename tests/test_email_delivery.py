@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Tests for pooled, concurrent email delivery against a local SMTP sink
+"""
+
+import socketserver
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.email_delivery import (
+    EmailDeliveryEngine,
+    OutboundEmail,
+    SMTPConnectionPool,
+    get_provider_rate_limiter,
+)
+
+
+class _SMTPSinkHandler(socketserver.StreamRequestHandler):
+    """Minimal SMTP dialogue that records delivered messages"""
+
+    def _reply(self, line: str):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        self.server.sessions += 1
+        self._reply("220 localhost sink")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode().strip().upper()
+            if command.startswith(("EHLO", "HELO")):
+                self._reply("250 localhost")
+            elif command == "DATA":
+                self._reply("354 end with .")
+                body = []
+                for data_line in self.rfile:
+                    if data_line in (b".\r\n", b".\n"):
+                        break
+                    body.append(data_line)
+                with self.server.lock:
+                    self.server.messages.append(b"".join(body).decode())
+                self._reply("250 queued")
+            elif command == "QUIT":
+                self._reply("221 bye")
+                return
+            else:
+                self._reply("250 ok")
+
+
+class _SMTPSink(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _SMTPSinkHandler)
+        self.messages = []
+        self.sessions = 0
+        self.lock = threading.Lock()
+
+
+@pytest.fixture
+def smtp_sink():
+    server = _SMTPSink()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _engine(sink, pool_size=2):
+    pool = SMTPConnectionPool("127.0.0.1", sink.server_address[1], size=pool_size, timeout=5)
+    return EmailDeliveryEngine(pool, from_email="noreply@remotehive.com", rate_per_second=1000, batch_size=10)
+
+
+def test_bulk_send_reuses_pooled_sessions(smtp_sink):
+    """Many messages go out over at most pool-size SMTP sessions"""
+    engine = _engine(smtp_sink, pool_size=2)
+    emails = [OutboundEmail(f"user{i}@example.com", "Hello", "<p>Hi</p>") for i in range(25)]
+    try:
+        reports = engine.send_all(emails)
+    finally:
+        engine.close()
+
+    assert [report.total for report in reports] == [10, 10, 5]
+    assert sum(report.sent for report in reports) == 25
+    assert len(smtp_sink.messages) == 25
+    assert smtp_sink.sessions <= 2
+
+
+def test_failed_connection_is_reported_per_message():
+    """Delivery errors are reported instead of raised"""
+    pool = SMTPConnectionPool("127.0.0.1", 1, size=1, timeout=1)
+    engine = EmailDeliveryEngine(pool, from_email="noreply@remotehive.com", rate_per_second=1000)
+    try:
+        report = engine.send_batch([OutboundEmail("a@example.com", "Hi", "<p>Hi</p>")])
+    finally:
+        engine.close()
+
+    assert report.failed == 1
+    assert report.results[0].error
+
+
+def test_templates_render_per_recipient(smtp_sink):
+    """Subject and body templates are split once and rendered per user"""
+    engine = _engine(smtp_sink)
+    try:
+        messages = engine.render_messages(
+            "<p>Hi {{ user_name }}</p>",
+            "News for {{user_name}}",
+            [{"to_email": "a@example.com", "user_name": "Ada"}, {"to_email": "b@example.com", "user_name": "Bo"}]
+        )
+    finally:
+        engine.close()
+
+    assert [m.subject for m in messages] == ["News for Ada", "News for Bo"]
+    assert [m.html_content for m in messages] == ["<p>Hi Ada</p>", "<p>Hi Bo</p>"]
+    assert len(engine._template_cache) == 2
+
+
+def test_templates_are_never_evaluated(smtp_sink):
+    """Only whitelisted placeholders are filled; other template syntax is sent verbatim"""
+    engine = _engine(smtp_sink)
+    body = "<p>{{ ''.__class__ }} {% if x %}{{ user_name }}{% endif %} {{ password }}</p>"
+    try:
+        [message] = engine.render_messages(
+            body,
+            "{{ 7 * 7 }} for {{ user_name }}",
+            [{"to_email": "a@example.com", "user_name": "<b>Eve</b>\nBcc: x@example.com", "password": "secret"}]
+        )
+    finally:
+        engine.close()
+
+    assert message.html_content == (
+        "<p>{{ ''.__class__ }} {% if x %}&lt;b&gt;Eve&lt;/b&gt;\nBcc: x@example.com{% endif %} {{ password }}</p>"
+    )
+    assert message.subject == "{{ 7 * 7 }} for <b>Eve</b> Bcc: x@example.com"
+
+
+def test_provider_limiter_follows_the_configured_rate():
+    """Engines for the same host share one limiter, retuned to the latest rate"""
+    first = get_provider_rate_limiter("smtp.limits.example", 5)
+    second = get_provider_rate_limiter("smtp.limits.example", 20)
+
+    assert first is second
+    assert second.rate == 20 and second.capacity == 20
+    assert get_provider_rate_limiter("smtp.other.example", 5) is not first
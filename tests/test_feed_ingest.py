@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Tests for incremental RSS ingestion: conditional fetches and entry watermarks
+"""
+
+import asyncio
+import sys
+import threading
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("aiohttp")
+pytest.importorskip("feedparser")
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.feed_ingest import FeedFetcher, FeedState, FeedStateStore, select_new_entries
+
+
+def _rss(items):
+    body = "".join(
+        f"<item><title>{title}</title><link>https://jobs.example.com/{guid}</link>"
+        f"<guid>{guid}</guid><pubDate>{formatdate(published, usegmt=True)}</pubDate></item>"
+        for guid, title, published in items
+    )
+    return f"<?xml version='1.0'?><rss version='2.0'><channel><title>Jobs</title>{body}</channel></rss>".encode()
+
+
+class _FeedHandler(BaseHTTPRequestHandler):
+    """Serves the current feed with an ETag derived from its items"""
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.requests.append(self.headers.get("If-None-Match"))
+            items = list(self.server.items)
+        etag = f'"{len(items)}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = _rss(items)
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def feed_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FeedHandler)
+    server.requests = []
+    server.lock = threading.Lock()
+    server.items = [("job-2", "Data Engineer", 1700000200), ("job-1", "Python Developer", 1700000100)]
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_unchanged_feed_is_skipped_and_only_new_entries_returned(feed_server, tmp_path):
+    """A 304 yields nothing and a grown feed yields only its new entries"""
+    url = f"http://127.0.0.1:{feed_server.server_address[1]}/feed.xml"
+
+    async def scenario():
+        fetcher = FeedFetcher(FeedStateStore(tmp_path / "feeds.sqlite3"))
+        try:
+            first = await fetcher.fetch(url)
+            fetcher.commit(first)
+            second = await fetcher.fetch(url)
+            fetcher.commit(second)
+            feed_server.items.insert(0, ("job-3", "Site Reliability Engineer", 1700000300))
+            third = await fetcher.fetch(url)
+            return first, second, third
+        finally:
+            await fetcher.close()
+
+    first, second, third = asyncio.run(scenario())
+
+    assert [e["id"] for e in first.entries] == ["job-2", "job-1"]
+    assert second.not_modified and second.entries == []
+    assert [e["id"] for e in third.entries] == ["job-3"]
+    assert third.total_entries == 3
+    assert feed_server.requests == [None, '"2"', '"2"']
+
+
+def test_uncommitted_update_is_fetched_again(feed_server, tmp_path):
+    """State only advances on commit, so a failed store is retried"""
+    url = f"http://127.0.0.1:{feed_server.server_address[1]}/feed.xml"
+    other = f"http://127.0.0.1:{feed_server.server_address[1]}/other.xml"
+
+    async def scenario():
+        fetcher = FeedFetcher(FeedStateStore(tmp_path / "feeds.sqlite3"))
+        try:
+            await fetcher.fetch(url)
+            return await fetcher.fetch_many([url, other, url])
+        finally:
+            await fetcher.close()
+
+    updates = asyncio.run(scenario())
+
+    assert set(updates) == {url, other}
+    assert all(len(update.entries) == 2 for update in updates.values())
+
+
+def test_undated_entries_stop_at_last_seen_guid():
+    """Without dates, entries before the last-seen GUID are the new ones"""
+    entries = [{"id": "c"}, {"id": "b"}, {"id": "a"}]
+    state = FeedState(feed_url="https://jobs.example.com/feed", last_guid="b")
+
+    new_entries, last_guid, watermark = select_new_entries(entries, state)
+
+    assert new_entries == [{"id": "c"}]
+    assert last_guid == "c"
+    assert watermark is None
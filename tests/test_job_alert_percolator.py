@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Tests for the saved-search percolator used by job alerts
+"""
+
+import asyncio
+import sys
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from bson import ObjectId
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database.services import JobAlertService
+from app.services.job_alert_percolator import JobAlertPercolator
+
+
+def _percolator(*alerts):
+    percolator = JobAlertPercolator()
+    percolator.load(alerts)
+    return percolator
+
+
+def test_keyword_phrase_requires_all_tokens():
+    """A multi-word keyword only matches when every word appears"""
+    percolator = _percolator({"_id": "a1", "user_id": "u1", "keywords": ["machine learning"]})
+
+    assert [a.alert_id for a in percolator.match({"title": "Machine Learning Engineer"})] == ["a1"]
+    assert percolator.match({"title": "Machine Operator"}) == []
+
+
+def test_filters_are_applied_to_candidates():
+    """Job type, remote, salary and location filters narrow keyword hits"""
+    percolator = _percolator({
+        "_id": "a1",
+        "user_id": "u1",
+        "keywords": ["python"],
+        "job_types": ["full-time"],
+        "remote_only": True,
+        "min_salary": 100000
+    })
+    job = {"title": "Python Developer", "job_type": "full-time", "is_remote": True, "salary_max": 120000}
+
+    assert len(percolator.match(job)) == 1
+    assert percolator.match({**job, "is_remote": False}) == []
+    assert percolator.match({**job, "job_type": "contract"}) == []
+    assert percolator.match({**job, "salary_max": 80000}) == []
+
+
+def test_alerts_without_keywords_and_removal():
+    """Type-only and catch-all alerts match, and removed alerts stop matching"""
+    percolator = _percolator(
+        {"_id": "a1", "user_id": "u1", "job_types": ["contract"]},
+        {"_id": "a2", "user_id": "u2", "locations": ["berlin"]}
+    )
+    job = {"title": "Designer", "job_type": "contract", "location": "Berlin, Germany"}
+
+    assert {a.alert_id for a in percolator.match(job)} == {"a1", "a2"}
+
+    percolator.remove_alert("a1")
+    assert [a.alert_id for a in percolator.match(job)] == ["a2"]
+
+
+def test_build_digests_groups_jobs_per_user():
+    """Matches from several jobs are grouped into one digest per user"""
+    percolator = _percolator(
+        {"_id": "a1", "user_id": "u1", "keywords": ["react", "vue"]},
+        {"_id": "a2", "user_id": "u1", "keywords": ["typescript"]}
+    )
+    jobs = [
+        {"_id": "j1", "title": "React Developer", "description": "TypeScript required"},
+        {"_id": "j2", "title": "Vue Engineer"},
+        {"_id": "j3", "title": "Accountant"}
+    ]
+
+    digests = percolator.build_digests(jobs)
+
+    assert list(digests) == ["u1"]
+    assert digests["u1"]["job_ids"] == ["j1", "j2"]
+    assert digests["u1"]["alert_ids"] == {"a1", "a2"}
+
+
+def test_alerts_store_user_ids_as_object_ids():
+    """create_alert stores the user reference as an ObjectId and rejects malformed ids"""
+    class FakeAlerts:
+        def __init__(self):
+            self.inserted = []
+
+        async def insert_one(self, document):
+            self.inserted.append(document)
+            return type("Result", (), {"inserted_id": ObjectId()})()
+
+    class FakeDB:
+        job_alerts = FakeAlerts()
+
+    user_id = "64b7f0c2a1b2c3d4e5f60718"
+    alert = asyncio.run(JobAlertService.create_alert(FakeDB, user_id, {"keywords": ["python"]}))
+
+    assert isinstance(alert["user_id"], ObjectId) and str(alert["user_id"]) == user_id
+    with pytest.raises(ValueError):
+        asyncio.run(JobAlertService.create_alert(FakeDB, "not-an-id", {}))
+    assert len(FakeDB.job_alerts.inserted) == 1
+    # The percolator still groups digests by the string form of the id
+    assert _percolator(alert).match({"title": "Python Developer"})[0].user_id == user_id
+
+
+def _matches(doc, query):
+    for key, condition in query.items():
+        value = doc.get(key)
+        if isinstance(condition, dict):
+            if "$in" in condition and value not in condition["$in"]:
+                return False
+            if "$gt" in condition and not (value is not None and value > condition["$gt"]):
+                return False
+            if "$lte" in condition and not (value is not None and value <= condition["$lte"]):
+                return False
+        elif value != condition:
+            return False
+    return True
+
+
+class InMemoryCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def to_list(self, length=None):
+        return self.docs
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self.docs:
+            yield doc
+
+
+class InMemoryCollection:
+    def __init__(self, docs=()):
+        self.docs = [dict(doc) for doc in docs]
+
+    async def find_one(self, query):
+        return next((dict(doc) for doc in self.docs if _matches(doc, query)), None)
+
+    def find(self, query):
+        return InMemoryCursor([dict(doc) for doc in self.docs if _matches(doc, query)])
+
+    async def insert_one(self, doc):
+        doc.setdefault("_id", ObjectId())
+        self.docs.append(dict(doc))
+        return SimpleNamespace(inserted_id=doc["_id"])
+
+    async def update_many(self, query, update):
+        matched = [doc for doc in self.docs if _matches(doc, query)]
+        for doc in matched:
+            doc.update(update["$set"])
+        return SimpleNamespace(modified_count=len(matched))
+
+
+def test_matched_alert_reaches_the_digest_email(monkeypatch):
+    """A digest built from alert matches resolves its user and jobs in the email task"""
+    from app.database import services
+    from app.tasks import email, jobs
+
+    user_id = ObjectId()
+    now = datetime.utcnow()
+    python_job, other_job = ObjectId(), ObjectId()
+    db = SimpleNamespace(
+        users=InMemoryCollection([{"_id": user_id, "email": "ada@example.com", "first_name": "Ada", "last_name": "L"}]),
+        job_alerts=InMemoryCollection([{"_id": ObjectId(), "user_id": user_id, "keywords": ["python"], "is_active": True}]),
+        job_posts=InMemoryCollection([
+            # Exported posts carry fields the JobPost model does not know about
+            {"_id": python_job, "title": "Python Developer", "company_name": "Acme", "description": "Django",
+             "job_type": "full-time", "status": "active", "created_at": now - timedelta(hours=1)},
+            {"_id": other_job, "title": "Accountant", "description": "Ledgers",
+             "status": "active", "created_at": now - timedelta(hours=1)},
+        ]),
+        system_settings=InMemoryCollection(),
+    )
+    dispatched = []
+    monkeypatch.setattr(jobs, "group", lambda signatures: SimpleNamespace(
+        apply_async=lambda: dispatched.extend(signatures)))
+
+    result = asyncio.run(jobs._percolate_new_jobs(db, max_jobs_per_digest=20))
+
+    assert result["alerts_sent"] == 1
+    [signature] = dispatched
+    assert signature.args == (str(user_id), [str(python_job)])
+
+    @contextmanager
+    def session_scope():
+        yield db
+
+    sent = []
+    monkeypatch.setattr(email, "get_database_manager", lambda: SimpleNamespace(session_scope=session_scope))
+    # Beanie documents can only be built once their collection is initialized
+    monkeypatch.setattr(services, "User", lambda **data: SimpleNamespace(**data))
+    monkeypatch.setattr(email, "send_email", lambda **kwargs: sent.append(kwargs) or True)
+
+    outcome = email.send_job_alert_email.run(*signature.args)
+
+    assert outcome["success"] and outcome["job_count"] == 1
+    [message] = sent
+    assert message["to_email"] == "ada@example.com"
+    assert "Python Developer" in message["html_content"] and "Acme" in message["html_content"]
+    assert "Accountant" not in message["html_content"]
+
+
+def test_job_seekers_can_create_and_list_alerts():
+    """The job-alerts endpoints store alerts the percolator keys by the user's _id"""
+    from app.api.v1.endpoints import job_seekers
+    from app.schemas.job_alert import JobAlertCreate
+
+    user_id = ObjectId()
+    current_user = {"id": user_id, "role": "job_seeker"}
+    db = SimpleNamespace(job_alerts=InMemoryCollection())
+
+    created = asyncio.run(job_seekers.create_job_alert(
+        JobAlertCreate(name="Python", keywords=["python"], remote_only=True), current_user=current_user, db=db))
+    listed = asyncio.run(job_seekers.get_job_alerts(current_user=current_user, db=db))
+
+    assert created.user_id == str(user_id) and created.is_active
+    assert [alert.id for alert in listed.alerts] == [created.id]
+    [match] = _percolator(*db.job_alerts.docs).match({"title": "Python Developer", "is_remote": True})
+    assert match.user_id == str(user_id)
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Tests for compiled-rule, concurrent batch job validation
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.job_validation_service import JobDataValidator
+from app.services.ml_parsing_service import ParsedJobData
+
+
+def make_jobs(count):
+    jobs = []
+    for i in range(count):
+        if i % 3 == 0:
+            jobs.append(ParsedJobData(title="Senior Python Engineer", company="Acme Corp", location="Remote",
+                                      description="Responsibilities include building APIs. 5+ years experience.",
+                                      salary_min=120000, salary_max=150000, job_type="full-time"))
+        elif i % 3 == 1:
+            jobs.append(ParsedJobData(title="URGENT HIRING", company="acme", location="Austin, TX",
+                                      description="lorem ipsum &amp; <b>apply</b>", salary_min=90000, salary_max=50000))
+        else:
+            jobs.append(ParsedJobData(company="Globex", application_url="https://bit.ly/abc"))
+    return jobs
+
+
+def test_batch_matches_single_job_validation():
+    validator = JobDataValidator()
+    jobs = make_jobs(9)
+
+    async def scenario():
+        singles = [await validator.validate_job_data(job) for job in jobs]
+        batch = await validator.validate_job_batch(jobs)
+        return singles, batch
+
+    singles, batch = asyncio.run(scenario())
+
+    assert [r.quality_score for r in batch["individual_results"]] == [r.quality_score for r in singles]
+    assert batch["valid_jobs"] == sum(r.is_valid for r in singles)
+    severities = [issue.severity.value for r in singles for issue in r.issues]
+    assert batch["issue_summary"] == {name: severities.count(name) for name in ("critical", "error", "warning", "info")}
+    assert batch["issue_summary"]["critical"] == 6 and batch["issue_summary"]["error"] == 6
+
+
+def test_streamed_and_process_pool_batches_agree():
+    validator = JobDataValidator()
+    jobs = make_jobs(30)
+
+    async def job_stream():
+        for job in jobs:
+            yield job
+
+    async def scenario():
+        streamed = await validator.validate_job_batch(job_stream(), include_results=False)
+        pooled = [r async for r in validator.iter_validate_jobs(jobs, chunk_size=4, use_processes=True)]
+        threaded = [r async for r in validator.iter_validate_jobs(jobs, chunk_size=4, use_processes=False)]
+        return streamed, pooled, threaded
+
+    streamed, pooled, threaded = asyncio.run(scenario())
+
+    assert streamed["total_jobs"] == 30 and streamed["individual_results"] == []
+    assert [r.quality_score for r in pooled] == [r.quality_score for r in threaded]
+    assert streamed["avg_quality_score"] == sum(r.quality_score for r in threaded) / 30
+
+
+def test_rule_sets_compile_once_per_config():
+    validator = JobDataValidator()
+    default = validator.get_rule_set()
+    validator.set_config_rules("strict", {"title": {"min_length": 30}})
+    strict = validator.get_rule_set("strict")
+    job = ParsedJobData(title="Python Engineer", company="Acme Corp", location="Remote")
+
+    async def scenario():
+        return await validator.validate_job_data(job), await validator.validate_job_data(job, None)
+
+    assert validator.get_rule_set() is default and validator.get_rule_set("strict") is strict
+    assert strict.field_rules["title"]["min_length"] == 30 and strict.field_rules["title"]["required"]
+    assert default.field_rules["title"]["min_length"] == 3
+    assert strict.field_patterns["title"]["valid"][0].pattern == validator.field_rules["title"]["patterns"]["valid"][0]
+    strict_result = validator._evaluate(job, strict)
+    default_result, _ = asyncio.run(scenario())
+    assert strict_result.field_scores["title"] < default_result.field_scores["title"]
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Tests for chunked memory CSV processing
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.memory_loader import MemoryLoader
+
+
+def _write_memory_csv(path: Path, rows: int) -> Path:
+    domains = ["jobs.example.com", "Careers.Example.org:8080", "board.example.net"]
+    pd.DataFrame({
+        "website_url": [f"https://{domains[i % 3]}/listing/{i}" for i in range(rows)],
+        "target_data_type": ["text"] * rows,
+        "successful_selectors": [".title, .company" if i % 2 else "" for i in range(rows)],
+        "extraction_context": [f" context {i} " for i in range(rows)],
+        "success_indicators": ["title found, company found"] * rows,
+        "priority": [i % 5 if i % 4 else None for i in range(rows)],
+        "tags": ["remote, python" if i % 2 else None for i in range(rows)],
+    }).to_csv(path, index=False)
+    return path
+
+
+def _process(path: Path, chunk_size: int):
+    loader = MemoryLoader(chunk_size=chunk_size)
+    return asyncio.run(loader.process_memory_upload("upload-1", str(path)))
+
+
+def test_chunk_size_does_not_change_the_result(tmp_path):
+    """Aggregation across chunk boundaries matches a single-chunk pass"""
+    path = _write_memory_csv(tmp_path / "memory.csv", rows=53)
+
+    whole = _process(path, chunk_size=1000)
+    chunked = _process(path, chunk_size=7)
+
+    assert chunked.website_patterns == whole.website_patterns
+    assert chunked.extraction_rules == whole.extraction_rules
+    assert chunked.custom_selectors == whole.custom_selectors
+    assert chunked.processed_records == whole.total_records == 53
+
+
+def test_patterns_are_grouped_by_domain(tmp_path):
+    """Rows are cleaned and grouped per lower-cased domain"""
+    path = _write_memory_csv(tmp_path / "memory.csv", rows=6)
+    context = _process(path, chunk_size=4)
+
+    assert set(context.website_patterns) == {
+        "jobs.example.com", "careers.example.org:8080", "board.example.net"
+    }
+    careers = context.website_patterns["careers.example.org:8080"]
+    assert careers["urls"] == [
+        "https://Careers.Example.org:8080/listing/1",
+        "https://Careers.Example.org:8080/listing/4",
+    ]
+    assert careers["context"] == ["context 1", "context 4"]
+    assert careers["selectors"] == {"text": [".title", ".company"]}
+    assert careers["metadata"] == {"priority": 1.0, "tags": ["remote", "python"]}
+    assert list(context.custom_selectors) == [
+        "careers.example.org:8080_text_0", "careers.example.org:8080_text_1",
+        "jobs.example.com_text_2", "jobs.example.com_text_3",
+        "board.example.net_text_4", "board.example.net_text_5",
+    ]
+    assert sorted(context.success_indicators) == ["company found", "title found"]
+
+
+def test_validation_reports_rows_across_chunks(tmp_path):
+    """Duplicate and invalid rows are found even when split across chunks"""
+    path = tmp_path / "memory.csv"
+    pd.DataFrame({
+        "website_url": ["https://a.example.com", "not a url", "https://a.example.com"],
+        "target_data_type": ["text", "text", "video"],
+        "successful_selectors": ["h1"] * 3,
+        "extraction_context": ["ctx"] * 3,
+    }).to_csv(path, index=False)
+
+    is_valid, errors = asyncio.run(MemoryLoader(chunk_size=1).validate_csv_format(str(path)))
+
+    assert not is_valid
+    assert errors == [
+        "Found 1 duplicate website URLs",
+        "Row 3: Invalid URL format",
+        "Row 4: Invalid data type 'video'",
+    ]
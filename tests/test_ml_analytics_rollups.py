@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Tests for buffered ML metric writes and rollup-backed analytics reads
+"""
+
+import asyncio
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.metric_rollups import MetricRollupStore
+from app.services.ml_analytics_service import MLAnalyticsService, MLMetric, MetricType, TimeRange
+
+
+class _Cursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def __aiter__(self):
+        self._iter = iter(self.docs)
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._iter)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+def _matches(doc, query):
+    for key, condition in query.items():
+        value = doc.get(key)
+        if isinstance(condition, dict):
+            if "$gte" in condition and not value >= condition["$gte"]:
+                return False
+            if "$lte" in condition and not value <= condition["$lte"]:
+                return False
+            if "$lt" in condition and not value < condition["$lt"]:
+                return False
+        elif value != condition:
+            return False
+    return True
+
+
+class InMemoryCollection:
+    """Applies the upsert operators the rollup store issues"""
+
+    def __init__(self):
+        self.docs = []
+        self.fail_next = None
+
+    async def create_index(self, *args, **kwargs):
+        pass
+
+    async def bulk_write(self, operations, ordered=True):
+        if self.fail_next is not None:
+            error, self.fail_next = self.fail_next, None
+            raise error
+        for op in operations:
+            doc = next((d for d in self.docs if _matches(d, op._filter)), None)
+            if doc is None:
+                doc = dict(op._filter)
+                self.docs.append(doc)
+            update = op._doc
+            for key, amount in update.get("$inc", {}).items():
+                doc[key] = doc.get(key, 0) + amount
+            for key, value in update.get("$min", {}).items():
+                doc[key] = min(doc.get(key, value), value)
+            for key, value in update.get("$max", {}).items():
+                doc[key] = max(doc.get(key, value), value)
+            for key, value in update.get("$addToSet", {}).items():
+                doc[key] = sorted(set(doc.get(key, [])) | set(value["$each"]))
+            doc.update(update.get("$set", {}))
+
+    def find(self, query, projection=None):
+        return _Cursor([dict(d) for d in self.docs if _matches(d, query)])
+
+
+class InMemoryDatabase(dict):
+    def __missing__(self, name):
+        collection = self[name] = InMemoryCollection()
+        return collection
+
+
+def metric(metric_type, value, timestamp, session_id="s1", **metadata):
+    return MLMetric(metric_type=metric_type, value=value, config_id=7, source="indeed",
+                    timestamp=timestamp, session_id=session_id, metadata=metadata or None)
+
+
+def test_sink_flushes_on_size_and_time():
+    batches = []
+    ticks = {"now": 0.0}
+    service = MLAnalyticsService(writer=batches.append)
+    service.sink.max_batch = 5
+    service.sink.flush_interval = 10
+    service.sink.clock = lambda: ticks["now"]
+    now = datetime.now()
+
+    async def scenario():
+        for i in range(12):
+            await service.record_ml_metric(metric(MetricType.CONFIDENCE_SCORE, 0.5, now))
+        sizes_after_burst = [len(b) for b in batches]
+        ticks["now"] = 11.0
+        await service.record_ml_metric(metric(MetricType.CONFIDENCE_SCORE, 0.5, now))
+        return sizes_after_burst
+
+    sizes_after_burst = asyncio.run(scenario())
+
+    assert sizes_after_burst == [5, 5]
+    assert [len(b) for b in batches] == [5, 5, 3]
+    assert service.sink.stats()["buffered"] == 0
+
+
+def test_summary_trends_and_costs_read_rollups():
+    service = MLAnalyticsService(writer=lambda rows: None)
+    now = datetime.now()
+    yesterday = now - timedelta(days=1)
+
+    async def scenario():
+        await service.record_parsing_session(7, "indeed", {
+            "session_id": "a",
+            "confidence_scores": [0.9, 0.8, 0.2],
+            "field_extraction_results": {"title": 1.0, "salary": 0.4},
+            "processing_time": 2.0,
+            "api_usage": {"requests": 3, "tokens_used": 1500},
+        })
+        await service.record_ml_metric(metric(MetricType.CONFIDENCE_SCORE, 0.1, yesterday, session_id="b"))
+        summary = await service.get_analytics_summary(7, TimeRange.WEEK)
+        costs = await service.get_cost_analysis(config_id=7)
+        missing = await service.get_analytics_summary(8, TimeRange.WEEK)
+        return summary, costs, missing
+
+    summary, costs, missing = asyncio.run(scenario())
+
+    assert missing is None
+    assert summary.total_jobs_processed == 2
+    assert round(summary.average_confidence_score, 3) == 0.5
+    assert summary.success_rate == 0.5 and summary.error_rate == 0.5
+    assert summary.field_extraction_rates == {"title": 1.0, "salary": 0.4}
+    assert summary.average_processing_time == 2.0
+    assert summary.cost_metrics["total_tokens"] == 1500
+    assert summary.trends["confidence_score"][-2:] == [0.1, (0.9 + 0.8 + 0.2) / 3]
+    assert costs["total_requests"] == 3 and costs["total_estimated_cost"] == 0.003
+
+
+def test_rollups_pick_granularity_and_prune():
+    store = MetricRollupStore()
+    now = datetime(2024, 5, 10, 12, 30)
+    for minutes in (0, 1, 61):
+        store.add(1, "confidence_score", 1.0, now - timedelta(minutes=minutes))
+    store.add(1, "confidence_score", 0.0, now - timedelta(days=10))
+
+    last_hour, _ = store.aggregate(1, now - timedelta(hours=1), now)
+    last_month, _ = store.aggregate(1, now - timedelta(days=30), now)
+    store.prune(now)
+
+    assert last_hour[("confidence_score", "")].count == 2
+    assert last_month[("confidence_score", "")].count == 4
+    assert all(key[1] >= now - timedelta(days=3) for key in store._buckets["minute"])
+    assert store.aggregate(1, now - timedelta(days=30), now)[0][("confidence_score", "")].count == 4
+
+
+def test_rollups_are_persisted_and_survive_a_restart():
+    database = InMemoryDatabase()
+    now = datetime.now()
+
+    async def record_and_close():
+        service = MLAnalyticsService(writer=None)
+        await service.start(database)
+        await service.record_parsing_session(7, "indeed", {
+            "session_id": "a", "confidence_scores": [0.9, 0.2], "api_usage": {"requests": 2, "tokens_used": 800},
+        })
+        await service.record_ml_metric(metric(MetricType.CONFIDENCE_SCORE, 0.4, now, session_id="b"))
+        # Not flushed yet, but already visible to reads
+        pending = await service.get_analytics_summary(7, TimeRange.DAY)
+        await service.close()
+        return pending
+
+    async def read_after_restart():
+        service = MLAnalyticsService(writer=None)
+        await service.start(database)
+        try:
+            return await service.get_analytics_summary(7, TimeRange.DAY)
+        finally:
+            await service.close()
+
+    pending = asyncio.run(record_and_close())
+    restored = asyncio.run(read_after_restart())
+
+    stored = database["ml_metric_rollups"].docs
+    assert {doc["granularity"] for doc in stored} == {"minute", "hour", "day"}
+    assert all(doc["expires_at"] > doc["bucket"] for doc in stored)
+    for summary in (pending, restored):
+        assert summary.total_jobs_processed == 2
+        assert round(summary.average_confidence_score, 3) == 0.5
+        assert summary.cost_metrics["total_tokens"] == 800
+
+
+def test_failed_rollup_write_is_retried_without_double_counting():
+    database = InMemoryDatabase()
+    service = MLAnalyticsService(writer=None)
+    now = datetime.now()
+
+    async def scenario():
+        await service.start(database)
+        await service.record_ml_metric(metric(MetricType.CONFIDENCE_SCORE, 1.0, now))
+        database["ml_metric_rollups"].fail_next = ConnectionError("not primary")
+        await service.flush_metrics()
+        during_outage = await service.sink.aggregate(7, now - timedelta(hours=1), now + timedelta(minutes=1))
+        await service.record_ml_metric(metric(MetricType.CONFIDENCE_SCORE, 0.0, now))
+        await service.close()
+        after = await service.sink.aggregate(7, now - timedelta(hours=1), now + timedelta(minutes=1))
+        return during_outage, after
+
+    during_outage, after = asyncio.run(scenario())
+
+    assert during_outage[0][("confidence_score", "")].count == 1
+    assert after[0][("confidence_score", "")].count == 2
+    assert service.rollups.is_empty()
+    [minute] = [d for d in database["ml_metric_rollups"].docs if d["granularity"] == "minute"]
+    assert minute["count"] == 2 and minute["minimum"] == 0.0 and minute["maximum"] == 1.0
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Tests for cached, pooled model calls in the ML parsing services
+"""
+
+import asyncio
+import sys
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("google.generativeai")
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services import ml_parsing_service as ml_module
+from app.services.gemini_client import GeminiClient
+from app.services.ml_parsing_service import MLParsingService
+from app.services.model_backend import FakeModelBackend
+
+PAGE = "<html><body><h1>Senior Python Engineer</h1><p>Acme, remote, $120,000 - $150,000</p></body></html>"
+GEMINI_RESPONSE = {
+    "title": "Senior Python Engineer",
+    "company": "Acme",
+    "location": "Remote",
+    "salary_min": 120000,
+    "salary_max": 150000,
+    "confidence_indicators": {
+        "title_confidence": 0.9,
+        "company_confidence": 0.9,
+        "salary_confidence": 0.9,
+        "overall_structure": 0.9
+    }
+}
+
+
+def test_gemini_client_coalesces_batches_and_caches():
+    backend = FakeModelBackend(responder=lambda prompt: {"job_title": "Engineer", "company_name": "Acme"})
+    client = GeminiClient(backend=backend)
+    pages = [f"<p>Job {i}</p>" for i in range(6)]
+
+    async def scenario():
+        # Identical pages in flight share one model call
+        same = await asyncio.gather(*(client.parse_job_data(PAGE) for _ in range(5)))
+        # Distinct pages queued together are handed to the backend in batches
+        distinct = await asyncio.gather(*(client.parse_job_data(page) for page in pages))
+        again = await client.parse_job_data(PAGE)
+        remapped = await client.parse_job_data(PAGE, field_mapping={"job_title": "h1"})
+        await client.pool.close()
+        return same, distinct, again, remapped
+
+    same, distinct, again, remapped = asyncio.run(scenario())
+
+    assert all(result["job_title"] == "Engineer" for result in same + distinct)
+    assert again == same[0]
+    assert len(backend.prompts) == 1 + len(pages) + 1
+    assert max(backend.batches) > 1
+    assert client.get_model_info()["cache"]["hits"] == 1
+
+
+def test_parsing_service_caches_config_and_results(monkeypatch):
+    config = SimpleNamespace(gemini_api_enabled=True, field_mapping="{}", updated_at=datetime(2024, 1, 1))
+    queries = []
+
+    class FakeSession:
+        def query(self, model):
+            queries.append(model)
+            return SimpleNamespace(filter=lambda *args: SimpleNamespace(first=lambda: config))
+
+    monkeypatch.setattr(ml_module, "get_db_session", lambda: iter([FakeSession()]))
+    monkeypatch.setattr(ml_module.MLParsingConfig, "scraper_config_id", "scraper_config_id", raising=False)
+    backend = FakeModelBackend([GEMINI_RESPONSE])
+    service = MLParsingService(backend=backend)
+
+    async def scenario():
+        first = await service.parse_job_data(PAGE, "scraper-1")
+        # Markup changes that leave the text alone still hit the cache
+        second = await service.parse_job_data(PAGE.replace("<p>", "<p class='x'>"), "scraper-1")
+        config.updated_at = datetime(2024, 2, 1)
+        service.invalidate_config("scraper-1")
+        third = await service.parse_job_data(PAGE, "scraper-1")
+        await service.pool.close()
+        return first, second, third
+
+    first, second, third = asyncio.run(scenario())
+
+    assert first.title == second.title == third.title == "Senior Python Engineer"
+    assert second.parsing_metadata["cache_hit"] and "cache_hit" not in first.parsing_metadata
+    assert len(backend.prompts) == 2
+    assert len(queries) == 2
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Tests for the conditional-request page cache and raw page archive
+"""
+
+import gzip
+import sys
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+requests = pytest.importorskip("requests")
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.page_cache import PageCache, RawPageArchive
+
+
+class _ListingHandler(BaseHTTPRequestHandler):
+    """Serves /etag with an ETag and /plain without validators"""
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.requests.append((self.path, self.headers.get("If-None-Match")))
+        body = self.server.body
+        etag = f'"{len(body)}"'
+        if self.path == "/etag" and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        if self.path == "/etag":
+            self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def listing_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ListingHandler)
+    server.requests = []
+    server.lock = threading.Lock()
+    server.body = b"<ul><li class='job'>Python Developer</li></ul>"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _fetch(cache: PageCache, url: str):
+    response = requests.get(url, headers=cache.conditional_headers(url), timeout=5)
+    return cache.record(url, response.status_code, response.headers, response.content)
+
+
+def test_etag_turns_refetch_into_not_modified(listing_server, tmp_path):
+    """A page with an ETag is revalidated and reported unchanged"""
+    cache = PageCache(tmp_path)
+    url = f"http://127.0.0.1:{listing_server.server_address[1]}/etag"
+    etag = f'"{len(listing_server.body)}"'
+
+    first = _fetch(cache, url)
+    second = _fetch(cache, url)
+    listing_server.body += b"<li class='job'>Data Engineer</li>"
+    third = _fetch(cache, url)
+    cache.close()
+
+    assert first.changed and not first.not_modified
+    assert not second.changed and second.not_modified
+    assert third.changed
+    assert [inm for _, inm in listing_server.requests] == [None, etag, etag]
+
+
+def test_identical_body_without_validators_is_unchanged(listing_server, tmp_path):
+    """Servers that send no validators are compared by content hash"""
+    cache = PageCache(tmp_path)
+    url = f"http://127.0.0.1:{listing_server.server_address[1]}/plain"
+
+    assert _fetch(cache, url).changed
+    assert not _fetch(cache, url).changed
+    assert cache.load_body(url) == listing_server.body
+    cache.close()
+
+
+def _engine(cache: PageCache, url: str):
+    from app.core.enums import ScraperSource
+    from app.scraper.engine import ScrapingConfig, WebScrapingEngine
+
+    config = ScrapingConfig(source=ScraperSource.REMOTE_OK, base_url=url, max_pages=1,
+                            rate_limit_delay=0.01, use_page_cache=False)
+    engine = WebScrapingEngine(config)
+    engine.page_cache = cache
+    return engine
+
+
+def _session(engine):
+    from app.scraper.engine import ScrapingSession
+
+    return ScrapingSession(session_id="s1", config=engine.config, start_time=datetime.utcnow())
+
+
+def test_page_is_forgotten_when_its_processing_fails(listing_server, tmp_path):
+    """A validator recorded before a failure must not make the next run skip the page"""
+    pytest.importorskip("bs4")
+    cache = PageCache(tmp_path)
+    url = f"http://127.0.0.1:{listing_server.server_address[1]}/etag"
+    engine = _engine(cache, url)
+
+    def broken_extract(html, page_url):
+        raise ValueError("selector blew up")
+
+    engine._extract_jobs_from_page = broken_extract
+    session = _session(engine)
+    engine._scrape_search_results(session, url)
+
+    assert session.errors and session.cached_pages == []
+    assert cache.conditional_headers(url) == {}
+    engine.close()
+    cache.close()
+
+
+def test_pages_are_forgotten_when_jobs_fail_after_extraction(listing_server, tmp_path):
+    """Parse or store failures later in the run drop every page the session recorded"""
+    pytest.importorskip("bs4")
+    cache = PageCache(tmp_path)
+    url = f"http://127.0.0.1:{listing_server.server_address[1]}/etag"
+    engine = _engine(cache, url)
+    engine._extract_jobs_from_page = lambda html, page_url: [{"title": "Python Developer"}]
+
+    session = _session(engine)
+    engine._scrape_search_results(session, url)
+    assert session.cached_pages == [url]
+    assert cache.conditional_headers(url)
+
+    # Store step failed for one of the jobs
+    engine.forget_cached_pages(session)
+    assert session.cached_pages == []
+    assert cache.conditional_headers(url) == {}
+
+    # A job that fails to parse has the same effect
+    session = _session(engine)
+    engine._scrape_search_results(session, url)
+
+    def broken_parse(raw_job):
+        raise ValueError("bad date")
+
+    engine._parse_job_from_summary = broken_parse
+    engine._parse_raw_jobs(session)
+    assert session.jobs_valid == 0
+    assert cache.conditional_headers(url) == {}
+    engine.close()
+    cache.close()
+
+
+def test_archive_is_content_addressed_and_compressed(tmp_path):
+    """Identical bodies share one gzip file named by their hash"""
+    archive = RawPageArchive(tmp_path)
+    body = b"<html>" + b"remote job " * 500 + b"</html>"
+
+    digest = archive.put(body)
+    assert archive.put(body) == digest
+    path = archive.path_for(digest)
+    assert list(tmp_path.rglob("*.gz")) == [path]
+    assert path.stat().st_size < len(body)
+    assert gzip.decompress(path.read_bytes()) == body
+    assert archive.get(digest) == body
+    assert archive.get("0" * 64) is None
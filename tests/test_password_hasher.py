@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests for the pooled password hasher: off-loop hashing, back-pressure and rehash-on-login
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("passlib")
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from passlib.context import CryptContext
+
+from app.core import local_auth, password_hasher
+from app.core.password_hasher import PasswordHasher, PasswordHasherBusy
+
+
+def pbkdf2_context(rounds):
+    # pbkdf2 stands in for bcrypt: same passlib API, tunable cost, no native backend needed
+    return CryptContext(schemes=["pbkdf2_sha256"], pbkdf2_sha256__rounds=rounds,
+                        pbkdf2_sha256__min_rounds=rounds)
+
+
+def test_hashing_leaves_the_event_loop_responsive():
+    hasher = PasswordHasher(pbkdf2_context(300000), max_workers=2, max_queue=8)
+
+    async def scenario():
+        ticks = 0
+        done = asyncio.Event()
+
+        async def ticker():
+            nonlocal ticks
+            while not done.is_set():
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        ticking = asyncio.create_task(ticker())
+        hashes = await asyncio.gather(*(hasher.hash(f"password-{i}") for i in range(4)))
+        done.set()
+        await ticking
+        verified = await hasher.verify("password-0", hashes[0])
+        return ticks, verified
+
+    ticks, verified = asyncio.run(scenario())
+    hasher.shutdown()
+
+    assert verified
+    assert ticks >= 5
+    stats = hasher.stats()
+    assert stats["completed"] == 5 and stats["queue_depth"] == 0 and stats["avg_hash_ms"] > 0
+
+
+def test_saturated_pool_rejects_instead_of_queueing():
+    hasher = PasswordHasher(pbkdf2_context(200000), max_workers=1, max_queue=1)
+
+    async def scenario():
+        return await asyncio.gather(*(hasher.hash("pw") for _ in range(5)), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    hasher.shutdown()
+
+    rejected = [r for r in results if isinstance(r, PasswordHasherBusy)]
+    assert len(rejected) == 3
+    assert rejected[0].status_code == 503 and rejected[0].headers["Retry-After"] == "1"
+    assert hasher.stats()["rejected"] == 3 and hasher.stats()["completed"] == 2
+
+
+def test_login_rehashes_outdated_hashes(monkeypatch):
+    old_hash = pbkdf2_context(1000).hash("s3cret")
+    hasher = PasswordHasher(pbkdf2_context(2000), max_workers=1)
+    monkeypatch.setattr(password_hasher, "_default_hasher", hasher)
+
+    class FakeUser:
+        email = "email"
+        stored = None
+        saves = 0
+
+        def __init__(self, password_hash):
+            self.password_hash = password_hash
+
+        @classmethod
+        async def find_one(cls, *args):
+            return cls.stored
+
+        async def save(self):
+            FakeUser.saves += 1
+
+    FakeUser.stored = FakeUser(old_hash)
+    monkeypatch.setattr(local_auth, "User", FakeUser)
+
+    async def scenario():
+        wrong = await local_auth.authenticate_user(None, "a@b.c", "wrong")
+        first = await local_auth.authenticate_user(None, "a@b.c", "s3cret")
+        upgraded = first.password_hash
+        second = await local_auth.authenticate_user(None, "a@b.c", "s3cret")
+        return wrong, first, upgraded, second
+
+    wrong, first, upgraded, second = asyncio.run(scenario())
+    hasher.shutdown()
+
+    assert wrong is None and first is not None and second is not None
+    assert upgraded != old_hash and "$2000$" in upgraded
+    # Only the first successful login rewrites the hash
+    assert FakeUser.saves == 1
+    assert hasher.stats()["rehashed"] == 1
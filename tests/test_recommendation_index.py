@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Tests for the TF-IDF job recommendation index, its per-user cache and invalidation
+"""
+
+import asyncio
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("sklearn")
+pytest.importorskip("motor")
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database import services as database_services
+from app.database.services import JobPostService
+from app.services import ai_service
+from app.services.recommendation_engine import JobRecommendationIndex
+
+JOBS = [
+    {"_id": "j1", "id": 1, "title": "Senior Python Developer", "skills_required": '["python", "django"]',
+     "description": "Build Django APIs in Python", "job_type": "full_time", "is_remote": True,
+     "salary_min": 120000, "status": "active"},
+    {"_id": "j2", "id": 2, "title": "Python Data Engineer", "skills_required": '["python", "spark"]',
+     "description": "Spark pipelines in Python", "job_type": "contract", "is_remote": True,
+     "salary_min": 90000, "status": "active"},
+    {"_id": "j3", "id": 3, "title": "Frontend React Developer", "skills_required": '["react", "typescript"]',
+     "description": "React and TypeScript user interfaces", "job_type": "full_time", "is_remote": False,
+     "salary_min": 110000, "status": "active"},
+    {"_id": "j4", "id": 4, "title": "Python Backend Engineer", "skills_required": '["python", "fastapi"]',
+     "description": "FastAPI services in Python", "job_type": "full_time", "is_remote": True,
+     "salary_min": 100000, "status": "active"},
+]
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = list(documents)
+
+    def sort(self, *args):
+        return self
+
+    def limit(self, n):
+        self.documents = self.documents[:n]
+        return self
+
+    async def to_list(self, length=None):
+        return self.documents
+
+    def __aiter__(self):
+        async def iterate():
+            for document in self.documents:
+                yield document
+        return iterate()
+
+
+class FakeCollection:
+    def __init__(self, documents=()):
+        self.documents = [dict(d) for d in documents]
+        self.finds = 0
+
+    def _matches(self, document, query):
+        return all(document.get(key) == value for key, value in query.items() if not isinstance(value, dict))
+
+    def find(self, query=None, projection=None):
+        self.finds += 1
+        return FakeCursor(d for d in self.documents if self._matches(d, query or {}))
+
+    async def find_one(self, query):
+        return next((d for d in self.documents if self._matches(d, query)), None)
+
+    async def find_one_and_delete(self, query):
+        document = await self.find_one(query)
+        if document is not None:
+            self.documents.remove(document)
+        return document
+
+
+class FakeDB:
+    def __init__(self, job_seeker):
+        self.users = FakeCollection([{"_id": "u1", "job_seeker": job_seeker}])
+        self.job_applications = FakeCollection()
+        self.saved_jobs = FakeCollection()
+        self.job_posts = FakeCollection(JOBS)
+
+
+def build_index(jobs=JOBS):
+    index = JobRecommendationIndex(n_features=2 ** 12)
+    for job in jobs:
+        index.upsert_job(job)
+    return index
+
+
+def test_scoring_ranks_by_similarity_and_applies_filters():
+    index = build_index()
+
+    ranked = index.score("python django developer", top_k=3)
+    assert [job_id for job_id, _ in ranked][0] == "j1"
+    assert "j3" not in [job_id for job_id, _ in ranked]
+    assert ranked[0][1] >= ranked[1][1] >= ranked[2][1]
+
+    assert [j for j, _ in index.score("python", top_k=5, job_types=["contract"])] == ["j2"]
+    assert "j3" not in [j for j, _ in index.score("react", top_k=5, remote_only=True)]
+    assert {j for j, _ in index.score("python", top_k=5, min_salary=100000)} == {"j1", "j3", "j4"}
+    assert "j1" not in [j for j, _ in index.score("python django", top_k=5, exclude_ids=["j1"])]
+
+    # Closing a post removes it; reopening brings it back
+    index.upsert_job(dict(JOBS[0], status="closed"))
+    assert index.size == 3 and "j1" not in [j for j, _ in index.score("python django", top_k=5)]
+    index.upsert_job(JOBS[0])
+    assert index.score("python django", top_k=1)[0][0] == "j1"
+
+
+def test_cache_is_keyed_by_profile_and_limit(monkeypatch):
+    index = JobRecommendationIndex(n_features=2 ** 12)
+    monkeypatch.setattr(ai_service, "recommendation_index", index)
+    seeker = {"_id": "s1", "current_title": "Python developer", "skills": '["python"]'}
+    db = FakeDB(seeker)
+    service = ai_service.AIService()
+    service.available = False
+
+    async def scenario():
+        small = await service.generate_job_recommendations(db, "u1", limit=1)
+        large = await service.generate_job_recommendations(db, "u1", limit=3)
+        again = await service.generate_job_recommendations(db, "u1", limit=3)
+        return small, large, again
+
+    small, large, again = asyncio.run(scenario())
+
+    assert len(small) == 1
+    # A larger limit is not served from the smaller cached list
+    assert len(large) == 3
+    assert again == large
+    fingerprint = index.profile_fingerprint(seeker, [], 3)
+    assert index.get_cached("u1", fingerprint) == large
+    assert index.get_cached("u1", index.profile_fingerprint(dict(seeker, skills='["react"]'), [], 3)) is None
+
+
+def test_profile_updates_and_deletes_invalidate(monkeypatch):
+    index = build_index()
+    monkeypatch.setattr(database_services, "recommendation_index", index)
+    fingerprint = index.profile_fingerprint({"skills": '["python"]'}, [], 2)
+    index.set_cached("u1", fingerprint, [{"id": "j1"}, {"id": "j4"}])
+
+    db = FakeDB({})
+
+    async def scenario():
+        deleted = await JobPostService.delete_job_post(db, 1)
+        missing = await JobPostService.delete_job_post(db, 99)
+        return deleted, missing
+
+    deleted, missing = asyncio.run(scenario())
+
+    assert deleted and not missing
+    assert index.get_job("j1") is None and index.size == 3
+    assert [j["id"] for j in db.job_posts.documents] == [2, 3, 4]
+    # Cached results drop the deleted job
+    assert index.get_cached("u1", fingerprint) == [{"id": "j4"}]
+
+    index.invalidate_user("u1")
+    assert index.get_cached("u1", fingerprint) is None
+
+
+def test_sync_drops_jobs_deleted_or_closed_by_other_workers():
+    index = JobRecommendationIndex(n_features=2 ** 12, sync_interval_seconds=0)
+    db = FakeDB({})
+
+    async def scenario():
+        await index.ensure_synced(db)
+        assert index.size == 4
+        # Another worker deletes one post and closes another without touching updated_at
+        db.job_posts.documents = [d for d in db.job_posts.documents if d["_id"] != "j1"]
+        next(d for d in db.job_posts.documents if d["_id"] == "j3")["status"] = "closed"
+
+        # The request is served from the current index while the sync runs in the background
+        await index.ensure_synced(db)
+        assert index.get_job("j1") is not None
+        await index._refresh_task
+
+    asyncio.run(scenario())
+
+    assert index.size == 2 and index.get_job("j1") is None and index.get_job("j3") is None
+    assert {j for j, _ in index.score("python react", top_k=5)} == {"j2", "j4"}
+
+
+def test_build_and_scoring_run_off_the_event_loop(monkeypatch):
+    index = JobRecommendationIndex(n_features=2 ** 12)
+    rebuild = index._rebuild
+    rebuild_threads = []
+
+    def recording_rebuild():
+        rebuild_threads.append(threading.get_ident())
+        rebuild()
+
+    monkeypatch.setattr(index, "_rebuild", recording_rebuild)
+
+    db = FakeDB({})
+
+    async def scenario():
+        # A request arriving during the startup build waits for that build
+        index.start(db)
+        await index.ensure_synced(db)
+        index.upsert_job(dict(JOBS[0], title="Python Django Lead"))
+        ranked = await index.score_async("python django", top_k=1)
+        await index.close()
+        return ranked
+
+    ranked = asyncio.run(scenario())
+
+    assert ranked[0][0] == "j1" and index.size == 4
+    assert len(rebuild_threads) == 2 and threading.get_ident() not in rebuild_threads
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Tests for the hash/set backed RedisStateManager
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("redis")
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.redis_service import EXTEND_LOCK_SCRIPT, RELEASE_LOCK_SCRIPT, RedisStateManager
+
+
+class InMemoryRedis:
+    """Just the async redis commands the state manager issues"""
+
+    def __init__(self):
+        self.data = {}
+        self.commands = []
+
+    def pipeline(self, transaction=True):
+        return _Pipeline(self)
+
+    async def ping(self):
+        return True
+
+    async def hset(self, key, field=None, value=None, mapping=None):
+        self.commands.append("hset")
+        bucket = self.data.setdefault(key, {})
+        bucket.update(mapping or {field: value})
+        return len(mapping or {field: value})
+
+    async def hgetall(self, key):
+        return dict(self.data.get(key, {}))
+
+    async def expire(self, key, seconds):
+        return key in self.data
+
+    async def delete(self, *keys):
+        return sum(1 for key in keys if self.data.pop(key, None) is not None)
+
+    async def sadd(self, key, *members):
+        self.commands.append(("sadd", len(members)))
+        bucket = self.data.setdefault(key, set())
+        before = len(bucket)
+        bucket.update(members)
+        return len(bucket) - before
+
+    async def scard(self, key):
+        return len(self.data.get(key, set()))
+
+    async def smembers(self, key):
+        return set(self.data.get(key, set()))
+
+    async def sismember(self, key, member):
+        return member in self.data.get(key, set())
+
+    async def pfadd(self, key, *members):
+        return await self.sadd(key, *members)
+
+    async def pfcount(self, key):
+        return await self.scard(key)
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def eval(self, script, numkeys, key, token, *args):
+        if self.data.get(key) != token:
+            return 0
+        if script == RELEASE_LOCK_SCRIPT:
+            return await self.delete(key)
+        assert script == EXTEND_LOCK_SCRIPT
+        return 1
+
+    async def scan_iter(self, match=None, count=None):
+        prefix = match.rstrip("*")
+        for key in list(self.data):
+            if key.startswith(prefix):
+                yield key
+
+
+class _Pipeline:
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+        return queue
+
+    async def execute(self):
+        return [await getattr(self.client, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+def make_manager(**kwargs):
+    manager = RedisStateManager(client=InMemoryRedis(), **kwargs)
+    checkpoints = []
+
+    async def record_backup(scraper_id, state):
+        checkpoints.append((scraper_id, state))
+
+    manager._backup_state_to_db = record_backup
+    return manager, checkpoints
+
+
+def test_progress_appends_urls_and_checkpoints_on_interval():
+    manager, checkpoints = make_manager(checkpoint_interval=3600)
+
+    async def scenario():
+        await manager.set_scraper_state(1, {"current_state": "running", "is_paused": False})
+        for page in range(1, 6):
+            await manager.update_scraper_progress(1, page, [f"https://jobs.example/{page}/{i}" for i in range(3)])
+        # Re-sending already seen URLs does not double count
+        await manager.update_scraper_progress(1, 6, ["https://jobs.example/1/0"])
+        await manager.pause_scraper(1)
+        return await manager.get_scraper_state(1), await manager.get_scraper_state(1, include_urls=True)
+
+    state, with_urls = asyncio.run(scenario())
+
+    assert state["current_page"] == 6 and state["total_processed"] == 15
+    assert state["is_paused"] is True and state["current_state"] == "paused"
+    assert "processed_urls" not in state and len(with_urls["processed_urls"]) == 15
+    assert [cmd for cmd in manager.redis_client.commands if cmd[0] == "sadd"] == [("sadd", 3)] * 5 + [("sadd", 1)]
+    # First write and the pause are checkpointed; the per-page updates are not
+    assert len(checkpoints) == 2
+    assert len(checkpoints[-1][1]["processed_urls"]) == 15
+
+
+def test_hyperloglog_mode_counts_without_listing():
+    manager, checkpoints = make_manager(url_tracking="hll", checkpoint_interval=0)
+
+    async def scenario():
+        await manager.update_scraper_progress(2, 1, ["a", "b", "c"])
+        await manager.update_scraper_progress(2, 2, ["c", "d"])
+        return await manager.get_scraper_state(2, include_urls=True)
+
+    state = asyncio.run(scenario())
+
+    assert state["total_processed"] == 4 and "processed_urls" not in state
+    assert checkpoints[-1][1]["total_processed"] == 4
+    with pytest.raises(ValueError):
+        asyncio.run(manager.is_url_processed(2, "a"))
+
+
+def test_lock_release_only_removes_own_token():
+    client = InMemoryRedis()
+    first = RedisStateManager(client=client)
+    second = RedisStateManager(client=client)
+
+    async def scenario():
+        acquired = await first.acquire_scraper_lock(9, timeout=30)
+        blocked = await second.acquire_scraper_lock(9)
+        foreign_release = await second.release_scraper_lock(9)
+        # The lock expires and another worker takes it over
+        del client.data["scraper_lock:9"]
+        taken_over = await second.acquire_scraper_lock(9)
+        stale_extend = await first.extend_scraper_lock(9)
+        stale_release = await first.release_scraper_lock(9)
+        still_held = "scraper_lock:9" in client.data
+        own_release = await second.release_scraper_lock(9)
+        return acquired, blocked, foreign_release, taken_over, stale_extend, stale_release, still_held, own_release
+
+    assert asyncio.run(scenario()) == (True, False, False, True, False, False, True, True)
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Tests for the pure-ASGI request pipeline: body replay, rejection, bypass paths and headers
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("httpx")
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.middleware.pipeline import PipelineStage, RequestPipelineMiddleware
+from app.middleware.validation import ValidationConfig
+
+
+@pytest.fixture
+def no_rate_limits(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_REQUESTS", 10 ** 9, raising=False)
+    monkeypatch.setattr(ValidationConfig, "RATE_LIMIT_REQUESTS", 10 ** 9)
+
+
+def _app(stages=None):
+    app = FastAPI()
+    app.state.calls = []
+
+    @app.post("/api/v1/jobs")
+    async def create_job(request: Request):
+        data = await request.json()
+        app.state.calls.append(data)
+        return {"title": data["title"]}
+
+    @app.get("/api/v1/jobs")
+    async def list_jobs():
+        app.state.calls.append("list")
+        return {"items": []}
+
+    @app.get("/api/v1/boom")
+    async def boom():
+        raise RuntimeError("database unavailable")
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    app.add_middleware(RequestPipelineMiddleware, stages=stages)
+    return app
+
+
+def test_json_body_is_replayed_to_the_endpoint(no_rate_limits):
+    app = _app()
+    client = TestClient(app)
+
+    response = client.post("/api/v1/jobs", json={"title": "Python Developer", "skills": ["python"]})
+
+    assert response.status_code == 200
+    assert response.json() == {"title": "Python Developer"}
+    assert app.state.calls == [{"title": "Python Developer", "skills": ["python"]}]
+    # Every stage stamped its headers on the way out
+    assert response.headers["X-Request-ID"]
+    assert response.headers["X-API-Name"] == "RemoteHive API"
+    assert response.headers["X-API-Version"] == "v1"
+    assert response.headers["X-Content-Type-Options"] == "nosniff"
+    assert response.headers["X-Frame-Options"] == "DENY"
+    assert "X-Processing-Time" in response.headers
+
+
+def test_xss_payload_is_rejected_before_the_endpoint(no_rate_limits):
+    app = _app()
+    client = TestClient(app)
+
+    response = client.post("/api/v1/jobs", json={"title": "<script>alert(1)</script>"})
+
+    assert response.status_code == 400
+    assert response.json()["error"]["code"] == "SECURITY_VIOLATION"
+    assert app.state.calls == []
+    # Rejections still carry the request id and security headers
+    assert response.headers["X-Request-ID"]
+    assert response.headers["X-Content-Type-Options"] == "nosniff"
+
+
+def test_bypass_paths_skip_every_stage(no_rate_limits):
+    app = _app()
+    client = TestClient(app)
+
+    response = client.get("/health")
+
+    assert response.status_code == 200
+    assert "X-Request-ID" not in response.headers
+    assert "X-API-Name" not in response.headers
+
+
+def test_endpoint_errors_are_mapped_by_the_error_stage(no_rate_limits):
+    client = TestClient(_app(), raise_server_exceptions=False)
+
+    response = client.get("/api/v1/boom")
+
+    assert response.status_code == 500
+    assert response.json()["error"]["code"] == "INTERNAL_SERVER_ERROR"
+    assert response.headers["X-Request-ID"] == response.json()["error"]["request_id"]
+
+
+class RecordingStage(PipelineStage):
+    def __init__(self, name, log, reject_path=None, read_body=False):
+        self.name = name
+        self.log = log
+        self.reject_path = reject_path
+        self.read_body = read_body
+
+    async def before(self, ctx):
+        self.log.append(("before", self.name))
+        if self.read_body:
+            self.log.append(("body", await ctx.body()))
+        if ctx.path == self.reject_path:
+            return JSONResponse({"rejected_by": self.name}, status_code=403)
+        return None
+
+    def after(self, ctx, headers):
+        self.log.append(("after", self.name))
+        headers[f"X-Stage-{self.name}"] = str(ctx.status_code)
+
+    def finish(self, ctx):
+        self.log.append(("finish", self.name))
+
+
+def test_stages_run_in_order_and_short_circuit():
+    log = []
+    app = _app([
+        RecordingStage("outer", log, read_body=True),
+        RecordingStage("inner", log, reject_path="/api/v1/jobs"),
+    ])
+    client = TestClient(app)
+
+    rejected = client.get("/api/v1/jobs")
+    assert rejected.status_code == 403 and rejected.json() == {"rejected_by": "inner"}
+    assert rejected.headers["X-Stage-outer"] == "403"
+    assert app.state.calls == []
+    assert log == [
+        ("before", "outer"), ("body", b""), ("before", "inner"),
+        ("after", "inner"), ("after", "outer"),
+        ("finish", "inner"), ("finish", "outer"),
+    ]
+
+    # A body already read by a stage still reaches the endpoint
+    log.clear()
+    only_outer = _app([RecordingStage("outer", log, read_body=True)])
+    response = TestClient(only_outer).post("/api/v1/jobs", json={"title": "Data Engineer"})
+    assert response.status_code == 200
+    assert only_outer.state.calls == [{"title": "Data Engineer"}]
+    assert log[1] == ("body", b'{"title": "Data Engineer"}')
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Tests for the offline scraper benchmark fixtures and threshold checks
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("bs4")
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+_spec = importlib.util.spec_from_file_location("benchmark_scrapers", ROOT / "scripts" / "benchmark_scrapers.py")
+benchmark_scrapers = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(benchmark_scrapers)
+
+
+@pytest.mark.parametrize("source", list(benchmark_scrapers.SOURCE_FIXTURES))
+def test_fixture_pages_still_match_extractors(source):
+    """Every recorded page yields its cards, and synthetic pages scale with them"""
+    fixture, base_url, _ = benchmark_scrapers.SOURCE_FIXTURES[source]
+    engine = benchmark_scrapers.build_engine(source)
+    html = benchmark_scrapers.load_fixture(fixture)
+
+    jobs = engine._extract_jobs_from_page(html, f"{base_url}/jobs")
+    large_jobs = engine._extract_jobs_from_page(benchmark_scrapers.synthesize_page(html, 50), f"{base_url}/jobs")
+    engine.close()
+
+    assert len(jobs) >= benchmark_scrapers.FIXTURE_CARDS
+    assert all(job["title"] and job["company"] for job in jobs)
+    assert len(large_jobs) == len(jobs) * 10
+
+
+def test_threshold_check_reports_slow_and_large_cases():
+    Result = benchmark_scrapers.BenchmarkResult
+    results = [
+        Result(name="extract/indeed", items=100, seconds=1.0, peak_mb=0.5),
+        Result(name="parse_job/detail", items=100, seconds=0.1, peak_mb=4.0),
+        Result(name="utils/clean_text", items=100, seconds=0.1, peak_mb=0.1),
+    ]
+    thresholds = {
+        "extract/indeed": {"min_jobs_per_sec": 500.0, "max_peak_mb": 1.0},
+        "parse_job/detail": {"min_jobs_per_sec": 500.0, "max_peak_mb": 1.0},
+    }
+
+    failures = benchmark_scrapers.check_thresholds(results, thresholds)
+
+    assert len(failures) == 2
+    assert failures[0].startswith("extract/indeed: 100.0 jobs/s")
+    assert failures[1].startswith("parse_job/detail: peak 4.00 MB")
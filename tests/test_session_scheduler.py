@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared scraping session scheduler
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.session_scheduler import SessionScheduler
+
+
+class _Recorder:
+    """Handler that records start order and peak concurrency"""
+
+    def __init__(self, delay: float = 0.01):
+        self.delay = delay
+        self.started = []
+        self.running = {}
+        self.peak_total = 0
+        self.peak_per_session = {}
+
+    def handler(self, session_id):
+        async def run(item, token):
+            self.started.append((session_id, item))
+            self.running[session_id] = self.running.get(session_id, 0) + 1
+            self.peak_total = max(self.peak_total, sum(self.running.values()))
+            self.peak_per_session[session_id] = max(
+                self.peak_per_session.get(session_id, 0), self.running[session_id]
+            )
+            try:
+                await asyncio.sleep(self.delay)
+            finally:
+                self.running[session_id] -= 1
+            return item != "bad"
+        return run
+
+
+def test_budgets_and_fair_interleaving():
+    """Sessions share the global budget in turn and respect their own limit"""
+    recorder = _Recorder()
+
+    async def scenario():
+        scheduler = SessionScheduler(max_concurrency=3)
+        scheduler.submit("big", range(30), recorder.handler("big"), max_concurrency=3)
+        scheduler.submit("small", ["a", "b", "bad"], recorder.handler("small"), max_concurrency=1)
+        results = await asyncio.gather(scheduler.wait("big"), scheduler.wait("small"))
+        await scheduler.close()
+        return results
+
+    big, small = asyncio.run(scenario())
+
+    assert recorder.peak_total <= 3
+    assert recorder.peak_per_session["small"] == 1
+    # The small session is not queued behind all thirty items of the big one
+    first_small = [session for session, _ in recorder.started].index("small")
+    assert first_small <= 3
+    assert (big.completed, big.failed) == (30, 0)
+    assert (small.completed, small.failed) == (2, 1)
+
+
+def test_pause_resume_and_stop():
+    """Paused sessions dispatch nothing; stopped sessions cancel in-flight work"""
+    recorder = _Recorder(delay=0.05)
+    progress = []
+
+    async def scenario():
+        scheduler = SessionScheduler(max_concurrency=4)
+        scheduler.submit("s", range(10), recorder.handler("s"), max_concurrency=2,
+                         on_progress=progress.append)
+        await asyncio.sleep(0.01)
+        scheduler.pause("s")
+        await asyncio.sleep(0.15)
+        paused = scheduler.snapshot("s")
+        started_while_paused = len(recorder.started)
+
+        scheduler.resume("s")
+        await asyncio.sleep(0.07)
+        scheduler.stop("s")
+        final = await scheduler.wait("s")
+        await scheduler.close()
+        return paused, started_while_paused, final
+
+    paused, started_while_paused, final = asyncio.run(scenario())
+
+    assert paused.paused and paused.in_progress == 0
+    assert (paused.completed, paused.pending) == (2, 8)
+    assert started_while_paused == 2
+    assert final.stopped and final.pending == 0 and final.in_progress == 0
+    assert 2 < final.completed < 10
+    assert progress[-1].completed == final.completed
+
+
+def test_stop_right_after_dispatch_releases_every_slot():
+    """Items cancelled before their first step still free both budgets and finish the session"""
+    recorder = _Recorder(delay=0.01)
+
+    async def scenario():
+        scheduler = SessionScheduler(max_concurrency=2)
+        scheduler.submit("s", range(10), recorder.handler("s"), max_concurrency=2)
+        # Let the dispatcher create tasks that have not started yet
+        await asyncio.sleep(0)
+        dispatched = scheduler.snapshot("s").in_progress
+        scheduler.stop("s")
+        final = await asyncio.wait_for(scheduler.wait("s"), timeout=1)
+        state = (scheduler.is_scheduled("s"), scheduler._budget._value)
+
+        # Other sessions are not starved by leaked slots
+        scheduler.submit("t", range(3), recorder.handler("t"), max_concurrency=2)
+        other = await asyncio.wait_for(scheduler.wait("t"), timeout=1)
+        await scheduler.close()
+        return dispatched, final, state, other
+
+    dispatched, final, (still_scheduled, budget), other = asyncio.run(scenario())
+
+    assert dispatched == 2
+    assert recorder.started == [("t", 0), ("t", 1), ("t", 2)]
+    assert final.stopped and final.in_progress == 0 and final.completed == 0
+    assert not still_scheduled and budget == 2
+    assert other.completed == 3
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Tests for stage spans, latency histograms, the span file sink and the session profiler
+"""
+
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("psutil")
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.performance.tracing import JsonFileSpanSink, LatencyHistogram, StageTracer
+from app.performance.tracker import MetricType, PerformanceTracker
+
+
+def _exported_spans(path):
+    spans = []
+    for line in Path(path).read_text().splitlines():
+        for resource in json.loads(line)["resourceSpans"]:
+            for scope in resource["scopeSpans"]:
+                spans.extend(scope["spans"])
+    return spans
+
+
+def _busy(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def test_spans_aggregate_per_board_and_export_as_otlp(tmp_path):
+    sink = JsonFileSpanSink(str(tmp_path / "spans.jsonl"), max_buffer=2)
+    tracer = StageTracer(sink=sink)
+
+    with tracer.session("session-1", board="jobs.example", source="indeed") as trace:
+        with tracer.span("fetch", url="https://jobs.example/?page=1"):
+            time.sleep(0.01)
+        with tracer.span("normalize"):
+            # The detail fetch is a child; normalize keeps only its own time
+            with tracer.span("fetch", url="https://jobs.example/1"):
+                time.sleep(0.02)
+        with pytest.raises(RuntimeError):
+            with tracer.span("store"):
+                raise RuntimeError("duplicate key")
+    with tracer.span("fetch", board="other.example", source="indeed", session_id="session-2"):
+        pass
+
+    assert tracer.histogram("fetch", board="jobs.example").count == 2
+    assert tracer.histogram("fetch", source="indeed").count == 3
+    assert tracer.summary(board="jobs.example")["fetch"]["max_ms"] >= 20
+    assert list(tracer.summary(board="jobs.example")) == ["fetch", "normalize", "store"]
+    assert trace.stage_ms["fetch"] >= 30 and trace.stage_ms["normalize"] < 20
+    assert trace.breakdown()["fetch"]["share"] > 0.5
+    assert {entry["stage"]: entry["errors"] for entry in tracer.snapshot()}["store"] == 1
+
+    spans = _exported_spans(sink.path)
+    assert len(spans) == 4  # the session scope flushed its spans on exit
+    by_name = {}
+    for span in spans:
+        by_name.setdefault(span["name"], []).append(span)
+    assert len({span["traceId"] for span in spans}) == 1
+    assert by_name["fetch"][1]["parentSpanId"] == by_name["normalize"][0]["spanId"]
+    assert by_name["store"][0]["status"] == {"code": 2, "message": "RuntimeError: duplicate key"}
+    attributes = {a["key"]: a["value"] for a in by_name["fetch"][0]["attributes"]}
+    assert attributes["board"] == {"stringValue": "jobs.example"}
+    assert attributes["session.id"] == {"stringValue": "session-1"}
+
+    with pytest.raises(ValueError):
+        tracer.span("upload")
+
+
+def test_unsampled_sessions_still_count_in_histograms(tmp_path):
+    sink = JsonFileSpanSink(str(tmp_path / "spans.jsonl"))
+    tracer = StageTracer(sink=sink, sample_rate=0.0)
+
+    async def scenario():
+        async with tracer.session("session-3", board="remote.example", source="generic"):
+            async with tracer.span("render"):
+                await asyncio.sleep(0.005)
+
+    asyncio.run(scenario())
+
+    assert tracer.histogram("render", board="remote.example").count == 1
+    assert not sink.path.exists()
+
+
+def test_profiler_is_toggled_per_session(tmp_path):
+    tracer = StageTracer(profiling_enabled=False, profile_interval=0.001, profile_dir=str(tmp_path))
+
+    with tracer.session("quiet", board="a.example") as quiet:
+        _busy(0.02)
+    with tracer.session("profiled", board="a.example", profile=True) as profiled:
+        with tracer.span("parse"):
+            _busy(0.2)
+
+    assert quiet.profile is None
+    assert profiled.profile["samples"] > 0
+    top = dict(profiled.profile["top_functions"])
+    assert max(top, key=top.get).endswith(":_busy")
+    assert "_busy" in Path(profiled.profile["folded_path"]).read_text()
+
+
+def test_histogram_quantiles_and_bounded_global_metrics():
+    histogram = LatencyHistogram()
+    for value in [3] * 90 + [400] * 10:
+        histogram.observe(value)
+    assert histogram.quantile(0.5) == 5 and histogram.quantile(0.95) == 400
+
+    tracker = PerformanceTracker(max_global_metrics=100)
+    for i in range(250):
+        tracker.record_metric("unknown-session", "page_scraped", i, MetricType.COUNTER)
+    assert len(tracker.global_metrics) == 100
+    assert tracker.global_metrics[0].value == 150
+    tracker.cleanup_old_metrics()
+    assert tracker.global_metrics.maxlen == 100
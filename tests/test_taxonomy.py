@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Tests for the keyword taxonomy automaton and the extractors built on it
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.taxonomy import Taxonomy, get_taxonomy
+
+DESCRIPTION = (
+    "Senior Backend Engineer (full-time). You will build microservices in Python and Node.js, "
+    "ship through CI/CD on AWS and tune PostgreSQL. C++ or C# is a plus; JavaScript is not required. "
+    "We offer healthcare, a 401(k) match, equity and the option to work from home."
+)
+
+
+def test_single_pass_extracts_every_category():
+    tags = get_taxonomy().extract(DESCRIPTION)
+
+    assert tags.labels("skills") == [
+        "Microservices", "Python", "Node.js", "CI/CD", "AWS", "PostgreSQL", "C++", "C#", "JavaScript"
+    ]
+    assert tags.labels("benefits") == ["health insurance", "401k", "stock options", "remote work"]
+    assert tags.primary("job_type") == "full-time"
+    assert tags.primary("seniority") == "senior"
+    # Phrases only match whole words
+    assert "Java" not in tags.labels("skills")
+
+
+def test_overlapping_phrases_and_priority():
+    taxonomy = Taxonomy({
+        "benefits": {"time off": ["time off"], "paid time off": ["paid time off"]},
+        "seniority": {"entry": ["junior"], "senior": ["senior", "5+ years"]},
+    })
+
+    tags = taxonomy.extract("Paid time off for senior staff; juniors and junior staff with 5+ years too")
+
+    assert tags.labels("benefits") == ["paid time off", "time off"]
+    assert tags.counts("seniority") == {"senior": 2, "entry": 1}
+    # Priority follows the label order in the taxonomy, not frequency
+    assert tags.primary("seniority") == "entry"
+    assert taxonomy.extract("").primary("seniority", "unknown") == "unknown"
+
+
+def test_batch_reuses_results_for_repeated_text():
+    texts = [DESCRIPTION, "Part time contract role", DESCRIPTION, None]
+
+    results = get_taxonomy().extract_batch(texts)
+
+    assert [r.primary("job_type") for r in results] == ["full-time", "part-time", "full-time", None]
+    assert results[0] is results[2]
+
+
+def test_scraping_utils_classifiers_use_word_boundaries():
+    from app.scraper.utils import ScrapingUtils
+
+    # "ft" and "pt" used to match inside "software" and "description"
+    assert ScrapingUtils.detect_job_type("Software developer job description") == "unknown"
+    assert ScrapingUtils.detect_job_type("Remote role, part-time") == "part-time"
+    assert ScrapingUtils.extract_experience_level("Head of Data") == "executive"
+    assert ScrapingUtils.extract_experience_level(None) == "unknown"
+
+
+def test_single_category_primary_matches_full_extract():
+    taxonomy = get_taxonomy()
+    texts = [
+        DESCRIPTION, "Software developer job description", "Full - time, 100% remote",
+        "C++ lead, 5+years", "Head of Data", "graduate/junior intern", "", None,
+    ]
+
+    for text in texts:
+        for category in ("job_type", "seniority", "skills"):
+            expected = taxonomy.extract(text).primary(category, "unknown")
+            assert taxonomy.primary(text, category, "unknown") == expected, (text, category)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared website accessibility probe engine
+"""
+
+import asyncio
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.url_probe import URLProbeEngine
+
+
+class _BoardHandler(BaseHTTPRequestHandler):
+    """Answers GET everywhere; rejects HEAD on /no-head"""
+
+    def log_message(self, *args):
+        pass
+
+    def _record(self):
+        with self.server.lock:
+            self.server.requests.append((self.command, self.path))
+
+    def do_HEAD(self):
+        self._record()
+        self.send_response(405 if self.path.startswith("/no-head") else 200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self):
+        self._record()
+        status = 404 if self.path.startswith("/missing") else 200
+        body = b"ok"
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def board_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _BoardHandler)
+    server.requests = []
+    server.lock = threading.Lock()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+async def _probe_many(urls, **engine_options):
+    engine = URLProbeEngine(**engine_options)
+    try:
+        return await engine.probe_many(urls)
+    finally:
+        await engine.close()
+
+
+def test_head_falls_back_to_get(board_server):
+    """A board that rejects HEAD is still reported as accessible via GET"""
+    url = f"http://127.0.0.1:{board_server.server_address[1]}/no-head"
+    results = asyncio.run(_probe_many([url]))
+
+    assert results[url].accessible
+    assert results[url].method == "GET"
+    assert board_server.requests == [("HEAD", "/no-head"), ("GET", "/no-head")]
+
+
+def test_results_are_cached_per_host(board_server):
+    """Many URLs on one host cost a single probe"""
+    base = f"http://127.0.0.1:{board_server.server_address[1]}"
+    urls = [f"{base}/jobs?page={i}" for i in range(20)]
+    results = asyncio.run(_probe_many(urls))
+
+    assert all(result.accessible for result in results.values())
+    assert len(board_server.requests) == 1
+    assert sum(1 for result in results.values() if result.from_cache) == 19
+
+
+def test_unreachable_host_is_reported():
+    """Connection failures become inaccessible results, not exceptions"""
+    url = "http://127.0.0.1:1/"
+    results = asyncio.run(_probe_many([url], timeout=2))
+
+    assert not results[url].accessible
+    assert results[url].message.startswith("Connection error")
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Tests for the buffered job view counter: aggregation, bulk flush and failure recovery
+"""
+
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("motor")
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pymongo.errors import BulkWriteError
+
+from app.services.view_counter import PENDING_VIEWS_KEY, JobViewBuffer, decayed_trending_score
+
+
+class InMemoryRedis:
+    """Just the async hash commands the view buffer issues"""
+
+    def __init__(self):
+        self.data = {}
+
+    async def ping(self):
+        return True
+
+    async def hincrby(self, key, field, amount=1):
+        bucket = self.data.setdefault(key, {})
+        bucket[field] = str(int(bucket.get(field, 0)) + amount)
+        return int(bucket[field])
+
+    async def rename(self, source, target):
+        if source not in self.data:
+            raise RuntimeError("ERR no such key")
+        self.data[target] = self.data.pop(source)
+
+    async def hgetall(self, key):
+        return dict(self.data.get(key, {}))
+
+    async def delete(self, *keys):
+        return sum(1 for key in keys if self.data.pop(key, None) is not None)
+
+    def pipeline(self, transaction=True):
+        return _Pipeline(self)
+
+    async def close(self):
+        pass
+
+
+class _Pipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def hincrby(self, *args):
+        self.calls.append(args)
+
+    async def execute(self):
+        return [await self.redis.hincrby(*args) for args in self.calls]
+
+
+class FakeJobPosts:
+    def __init__(self, error=None):
+        self.error = error
+        self.writes = []
+
+    async def bulk_write(self, operations, ordered=True):
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+        self.writes.append({op._filter["id"]: op._doc[0]["$set"]["views_count"]["$add"][1] for op in operations})
+        return type("Result", (), {"modified_count": len(operations)})()
+
+
+class FakeDB:
+    def __init__(self, error=None):
+        self.job_posts = FakeJobPosts(error)
+
+
+def redis_buffer():
+    buffer = JobViewBuffer()
+    buffer._redis = InMemoryRedis()
+    return buffer
+
+
+def test_views_are_buffered_and_flushed_in_one_bulk_write():
+    buffer = redis_buffer()
+    db = FakeDB()
+
+    async def scenario():
+        for job_id in (1, 1, 2, 1, "ext-9"):
+            await buffer.record_view(db, job_id)
+        pending = dict(buffer._redis.data[PENDING_VIEWS_KEY])
+        stats = await buffer.flush(db)
+        empty = await buffer.flush(db)
+        return pending, stats, empty
+
+    pending, stats, empty = asyncio.run(scenario())
+
+    assert pending == {"1": "3", "2": "1", "ext-9": "1"}
+    assert db.job_posts.writes == [{1: 3, 2: 1, "ext-9": 1}]
+    assert stats == {"jobs_updated": 3, "views_flushed": 5}
+    assert empty == {"jobs_updated": 0, "views_flushed": 0}
+    assert buffer._redis.data == {}
+
+
+def test_in_process_fallback_flushes_at_threshold():
+    buffer = JobViewBuffer(local_flush_threshold=3)
+    # Pretend Redis just failed so the buffer stays local
+    buffer._redis_failed_at = time.monotonic()
+    db = FakeDB()
+
+    async def scenario():
+        await buffer.record_view(db, 7)
+        await buffer.record_view(db, 7)
+        before = list(db.job_posts.writes)
+        await buffer.record_view(db, 8)
+        return before
+
+    before = asyncio.run(scenario())
+
+    assert before == []
+    assert db.job_posts.writes == [{7: 2, 8: 1}]
+    assert not buffer._local
+
+
+def test_failed_flush_requeues_views():
+    buffer = redis_buffer()
+    db = FakeDB(error=ConnectionError("primary stepped down"))
+
+    async def scenario():
+        for job_id in (1, 1, 2):
+            await buffer.record_view(db, job_id)
+        with pytest.raises(ConnectionError):
+            await buffer.flush(db)
+        requeued = dict(buffer._redis.data[PENDING_VIEWS_KEY])
+        await buffer.record_view(db, 1)
+        await buffer.flush(db)
+        return requeued
+
+    requeued = asyncio.run(scenario())
+
+    assert requeued == {"1": "2", "2": "1"}
+    assert db.job_posts.writes == [{1: 3, 2: 1}]
+
+
+def test_partial_bulk_failure_requeues_only_failed_jobs():
+    buffer = redis_buffer()
+    error = BulkWriteError({"writeErrors": [{"index": 1, "code": 121, "errmsg": "validation"}]})
+    db = FakeDB(error=error)
+
+    async def scenario():
+        for job_id in (1, 2, 2):
+            await buffer.record_view(db, job_id)
+        with pytest.raises(BulkWriteError):
+            await buffer.flush(db)
+        return dict(buffer._redis.data[PENDING_VIEWS_KEY])
+
+    assert asyncio.run(scenario()) == {"2": "2"}
+
+
+def test_requeue_falls_back_to_process_when_redis_is_gone():
+    buffer = JobViewBuffer()
+    buffer._local.update({"3": 4})
+    buffer._redis_failed_at = time.monotonic()
+    db = FakeDB(error=ConnectionError("down"))
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(buffer.flush(db))
+
+    assert buffer._local == {"3": 4}
+
+
+def test_trending_score_decays_with_half_life():
+    now = datetime(2026, 1, 1, 12)
+    job = {"trending_score": 8.0, "trending_updated_at": now - timedelta(hours=12)}
+
+    assert decayed_trending_score(job, now) == pytest.approx(2.0)
+    assert decayed_trending_score({"trending_score": 5.0}, now) == 0.0
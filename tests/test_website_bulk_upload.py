@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Tests for chunked bulk website uploads: validation, per-row failures and chunk writes
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.config import settings
+from app.services import website_management_service
+from app.services.website_management_service import WebsiteManagementService
+
+
+class FakeQuery:
+    def __init__(self, record):
+        self.record = record
+
+    def filter(self, *args):
+        return self
+
+    def first(self):
+        return self.record
+
+
+class FakeSession:
+    """Synchronous session double recording bulk inserts"""
+
+    def __init__(self, fail_on_insert=None):
+        self.upload = SimpleNamespace(status="processing", processed_records=0, failed_records=0,
+                                      error_details=None, completed_at=None, error_message=None)
+        self.inserts = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.fail_on_insert = fail_on_insert
+
+    def query(self, model):
+        return FakeQuery(self.upload)
+
+    def bulk_insert_mappings(self, model, mappings):
+        if self.fail_on_insert is not None and len(self.inserts) == self.fail_on_insert:
+            self.inserts.append(None)
+            raise RuntimeError("duplicate key value")
+        self.inserts.append([mapping["name"] for mapping in mappings])
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def refresh(self, record):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def stub_models(monkeypatch):
+    # The SQL models are not importable in the MongoDB build; the service only passes them through
+    monkeypatch.setattr(website_management_service, "MemoryUpload",
+                        SimpleNamespace(upload_id=None), raising=False)
+    monkeypatch.setattr(website_management_service, "ManagedWebsite", object(), raising=False)
+    monkeypatch.setattr(settings, "BULK_UPLOAD_CHUNK_SIZE", 2)
+
+
+def run_upload(db, websites, enable_validation):
+    service = WebsiteManagementService(db)
+    asyncio.run(service._process_websites_async(
+        "upload-1", websites, user_id=1, enable_validation=enable_validation,
+        auto_categorize=True, default_rate_limit=5, default_max_pages=100
+    ))
+    return db.upload
+
+
+def test_rows_without_a_name_fail_alone_when_validation_is_off():
+    db = FakeSession()
+    websites = [
+        {"name": "Remote OK", "url": "https://remoteok.com"},
+        {"url": "https://nameless.example"},
+        {"name": "Jobspresso", "url": "https://jobspresso.co"},
+    ]
+
+    upload = run_upload(db, websites, enable_validation=False)
+
+    assert db.inserts == [["Remote OK"], ["Jobspresso"]]
+    assert upload.status == "completed_with_errors"
+    assert upload.processed_records == 2 and upload.failed_records == 1
+    assert upload.error_details == [{"row": 3, "errors": ["Processing error: 'name'"]}]
+
+
+def test_validation_rejects_rows_before_the_chunk_is_written():
+    db = FakeSession()
+    websites = [
+        {"name": "Remote OK", "url": "https://remoteok.com", "category": "job_boards"},
+        {"name": "Broken", "url": "not a url", "category": "job_boards"},
+        {"name": "Jobspresso", "url": "https://jobspresso.co", "category": "job_boards"},
+    ]
+
+    upload = run_upload(db, websites, enable_validation=True)
+
+    assert db.inserts == [["Remote OK"], ["Jobspresso"]]
+    assert upload.failed_records == 1
+    assert [detail["row"] for detail in upload.error_details] == [3]
+
+
+def test_failed_chunk_reports_each_of_its_rows():
+    db = FakeSession(fail_on_insert=0)
+    websites = [
+        {"name": "Remote OK", "url": "https://remoteok.com"},
+        {"url": "https://nameless.example"},
+        {"name": "Jobspresso", "url": "https://jobspresso.co"},
+    ]
+
+    upload = run_upload(db, websites, enable_validation=False)
+
+    assert db.rollbacks == 1
+    assert db.inserts == [None, ["Jobspresso"]]
+    assert upload.processed_records == 1 and upload.failed_records == 2
+    # The nameless row is reported once, not again with its chunk
+    assert sorted(detail["row"] for detail in upload.error_details) == [2, 3]
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Tests for per-connection WebSocket queues, their drop policies and the Redis backplane
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("redis")
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services import websocket_service
+from app.services.websocket_service import DISCONNECT, DROP_OLDEST, RedisBackplane, WebSocketManager
+
+
+class SlowWebSocket:
+    """Accepts and records messages; sends block until the test releases them"""
+
+    def __init__(self):
+        self.sent = []
+        self.release = asyncio.Event()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, payload):
+        await self.release.wait()
+        self.sent.append(json.loads(payload))
+
+
+class FakePubSub:
+    """Yields the queued messages once, then idles like a quiet channel"""
+
+    def __init__(self, messages):
+        self.messages = messages
+
+    async def listen(self):
+        for message in self.messages:
+            yield message
+        await asyncio.Event().wait()
+
+
+class RecordingRedis:
+    def __init__(self):
+        self.published = []
+
+    async def publish(self, channel, message):
+        self.published.append((channel, message))
+
+
+def test_drop_oldest_keeps_the_newest_messages_for_a_slow_client():
+    async def scenario():
+        manager = WebSocketManager(max_queue_size=2, drop_policy=DROP_OLDEST)
+        websocket = SlowWebSocket()
+        await manager.connect(websocket, "scraper_status", "scraper-1")
+        # Let the sender pick up the greeting and block on it
+        await asyncio.sleep(0)
+        for i in range(4):
+            await manager.send_scraper_status_update("scraper-1", {"seq": i})
+        channel = manager.channels[websocket]
+        dropped = channel.dropped_messages
+        websocket.release.set()
+        for _ in range(10):
+            await asyncio.sleep(0)
+        connected = websocket in manager.connection_metadata
+        await manager.stop_backplane()
+        return websocket.sent, dropped, connected
+
+    sent, dropped, connected = asyncio.run(scenario())
+
+    assert connected
+    assert dropped == 2
+    assert sent[0]["type"] == "connection_established"
+    assert [message["data"]["seq"] for message in sent[1:]] == [2, 3]
+
+
+def test_disconnect_policy_drops_clients_that_fall_behind():
+    async def scenario():
+        manager = WebSocketManager(max_queue_size=2, drop_policy=DISCONNECT)
+        slow, fast = SlowWebSocket(), SlowWebSocket()
+        fast.release.set()
+        await manager.connect(slow, "csv_import", "upload-1")
+        await manager.connect(fast, "csv_import", "upload-1")
+        await asyncio.sleep(0)
+        for i in range(3):
+            await manager.send_csv_import_update("upload-1", {"seq": i})
+            await asyncio.sleep(0)
+        state = (slow in manager.connection_metadata, fast in manager.connection_metadata,
+                 slow in manager.channels, len(manager.connections["csv_import"]["upload-1"]))
+        await manager.stop_backplane()
+        return state, fast.sent
+
+    (slow_connected, fast_connected, slow_channel, group_size), fast_sent = asyncio.run(scenario())
+
+    assert not slow_connected and not slow_channel
+    assert fast_connected and group_size == 1
+    assert [message["data"]["seq"] for message in fast_sent[1:]] == [0, 1, 2]
+
+
+def test_backplane_skips_its_own_messages_and_bad_envelopes():
+    async def scenario():
+        backplane = RedisBackplane("redis://unused")
+        other = RedisBackplane("redis://unused")
+        delivered = []
+
+        async def handler(connection_type, identifier, payload):
+            delivered.append((connection_type, identifier, json.loads(payload)))
+
+        backplane._redis = RecordingRedis()
+        await backplane.publish("analytics", "dash-1", json.dumps({"n": 1}))
+        own = backplane._redis.published[0][1]
+
+        other._redis = RecordingRedis()
+        await other.publish("analytics", "dash-1", json.dumps({"n": 2}))
+        foreign = other._redis.published[0][1]
+
+        backplane._handler = handler
+        backplane._pubsub = FakePubSub([
+            {"type": "subscribe", "data": 1},
+            {"type": "message", "data": own},
+            {"type": "message", "data": "not json"},
+            {"type": "message", "data": foreign},
+        ])
+        listener = asyncio.create_task(backplane._listen())
+        for _ in range(5):
+            await asyncio.sleep(0)
+        listener.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await listener
+        return backplane._redis.published, delivered
+
+    published, delivered = asyncio.run(scenario())
+
+    assert published[0][0] == websocket_service.WEBSOCKET_EVENTS_CHANNEL
+    assert delivered == [("analytics", "dash-1", {"n": 2})]
+
+
+def test_sync_publisher_reuses_one_client_per_url(monkeypatch):
+    import redis
+
+    created = []
+
+    class FakeClient:
+        def __init__(self):
+            self.published = []
+
+        def publish(self, channel, message):
+            self.published.append((channel, json.loads(message)))
+
+    def from_url(url, **kwargs):
+        created.append(url)
+        return FakeClient()
+
+    monkeypatch.setattr(redis.Redis, "from_url", staticmethod(from_url))
+    monkeypatch.setattr(websocket_service, "_publish_clients", {})
+
+    for i in range(3):
+        assert websocket_service.publish_websocket_event("admin_general", None, {"i": i},
+                                                         redis_url="redis://events")
+
+    assert created == ["redis://events"]
+    client = websocket_service._publish_clients["redis://events"]
+    envelopes = [message for _, message in client.published]
+    assert [json.loads(envelope["payload"])["i"] for envelope in envelopes] == [0, 1, 2]
+    assert all(envelope["origin"] is None for envelope in envelopes)